@@ -11,6 +11,7 @@ from . import (
     melody,
     micro_edits,
     phrase,
+    phrase_columns,
     preprocessing,
     range_guard,
     salvage,
@@ -28,6 +29,7 @@ __all__ = [
     "melody",
     "micro_edits",
     "phrase",
+    "phrase_columns",
     "phrase_from_note_events",
     "preprocessing",
     "range_guard",
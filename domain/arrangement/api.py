@@ -6,6 +6,8 @@ import logging
 from dataclasses import dataclass, replace
 from typing import Callable, Iterable, Sequence, Tuple
 
+from shared.cancellation import CancellationToken, raise_if_cancelled
+
 from .config import (
     DEFAULT_FEATURE_FLAGS,
     DEFAULT_GRACE_SETTINGS,
@@ -14,7 +16,12 @@ from .config import (
     get_instrument_range,
 )
 from .constraints import BreathSettings, SubholeConstraintSettings
-from .difficulty import DifficultySummary, difficulty_score, summarize_difficulty
+from .difficulty import (
+    DifficultySummary,
+    difficulty_score,
+    rank_transpositions,
+    summarize_difficulty,
+)
 from .explanations import ExplanationEvent
 from .folding import FoldingResult, FoldingSettings
 from .melody import MelodyIsolationAction, isolate_melody
@@ -148,26 +155,9 @@ def _candidate_transpositions(
         if fit.transposition not in ordered:
             ordered.append(fit.transposition)
 
-    difficulty_ranked: list[tuple[float, float, int, int]] = []
-    for transposition in range(-10, 11):
-        candidate_span = span.transpose(transposition)
-        summary = summarize_difficulty(
-            candidate_span,
-            instrument,
-            grace_settings=grace_settings,
-        )
-        score = difficulty_score(summary, grace_settings=grace_settings)
-        difficulty_ranked.append(
-            (
-                score,
-                summary.fast_windway_switch_exposure,
-                abs(transposition),
-                transposition,
-            )
-        )
-
-    difficulty_ranked.sort()
-    for _, _, _, candidate in difficulty_ranked[:top_k]:
+    for _, _, _, candidate in rank_transpositions(
+        span, instrument, range(-10, 11), top_k=top_k, grace_settings=grace_settings
+    ):
         if candidate not in ordered:
             ordered.append(candidate)
 
@@ -189,8 +179,9 @@ def arrange_span(
     breath_settings: BreathSettings | None = None,
     grace_settings: GraceSettings | None = None,
     progress_callback: ProgressCallback | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> ArrangementResult:
-    """Arrange ``span`` for ``instrument`` respecting feature flags."""
+    """Arrange ``span`` for ``instrument``, checking ``cancellation`` per transposition."""
 
     active_flags = flags or DEFAULT_FEATURE_FLAGS
     melody_result = isolate_melody(span)
@@ -214,6 +205,7 @@ def arrange_span(
     report(0.0, "Selecting candidate transpositions")
 
     for index, transposition in enumerate(candidates, start=1):
+        raise_if_cancelled(cancellation)
         start_percent = ((index - 1) / total_candidates) * 100.0
         report(start_percent, f"Testing transposition {transposition:+d}")
         candidate_span = base_span.transpose(transposition)
@@ -327,6 +319,7 @@ def _arrange_for_instrument(
     breath_settings: BreathSettings | None = None,
     grace_settings: GraceSettings | None = None,
     progress_callback: ProgressCallback | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> InstrumentArrangement:
     instrument = get_instrument_range(instrument_id)
     result = arrange_span(
@@ -340,6 +333,7 @@ def _arrange_for_instrument(
         breath_settings=breath_settings,
         grace_settings=grace_settings,
         progress_callback=progress_callback,
+        cancellation=cancellation,
     )
     active_grace = grace_settings or DEFAULT_GRACE_SETTINGS
     summary = summarize_difficulty(result.span, instrument, grace_settings=active_grace)
@@ -372,6 +366,7 @@ def arrange(
     breath_settings: BreathSettings | None = None,
     grace_settings: GraceSettings | None = None,
     progress_callback: ProgressCallback | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> ArrangementStrategyResult:
     """Arrange ``span`` using the requested instrument selection strategy."""
 
@@ -409,6 +404,7 @@ def arrange(
                 100.0,
                 prefix=instrument_id or "current",
             ),
+            cancellation=cancellation,
         )
         report(100.0, f"Arranged {instrument_id or 'current instrument'}")
         return ArrangementStrategyResult(
@@ -432,6 +428,7 @@ def arrange(
             breath_settings=breath_settings,
             grace_settings=grace_config,
             progress_callback=progress_callback,
+            cancellation=cancellation,
         )
 
     candidate_ids: list[str] = []
@@ -459,6 +456,7 @@ def arrange(
             breath_settings=breath_settings,
             grace_settings=grace_config,
             progress_callback=_scaled_progress(report, start, end, prefix=prefix),
+            cancellation=cancellation,
         )
         comparisons.append(comparison)
         report(end, f"Evaluated {prefix}")
@@ -109,6 +109,7 @@ DEFAULT_GRACE_SETTINGS = GraceSettings()
 
 
 _INSTRUMENT_RANGES: Dict[str, InstrumentRange] = {}
+_registry_version = 0
 
 
 def register_instrument_range(instrument_id: str, instrument: InstrumentRange) -> None:
@@ -122,7 +123,9 @@ def register_instrument_range(instrument_id: str, instrument: InstrumentRange) -
     instrument_id = instrument_id.strip()
     if not instrument_id:
         raise ValueError("instrument_id must be a non-empty string")
+    global _registry_version
     _INSTRUMENT_RANGES[instrument_id] = instrument
+    _registry_version += 1
 
 
 def get_instrument_range(instrument_id: str) -> InstrumentRange:
@@ -144,7 +147,19 @@ def get_instrument_range(instrument_id: str) -> InstrumentRange:
 def clear_instrument_registry() -> None:
     """Remove all registered instruments (intended for tests)."""
 
+    global _registry_version
     _INSTRUMENT_RANGES.clear()
+    _registry_version += 1
+
+
+def instrument_registry_version() -> int:
+    """Return a counter that changes whenever the instrument registry does.
+
+    Caches derived from registered instruments compare it against the value
+    they were built with to know when to drop their entries.
+    """
+
+    return _registry_version
 
 
 __all__ = [
@@ -156,4 +171,5 @@ __all__ = [
     "register_instrument_range",
     "get_instrument_range",
     "clear_instrument_registry",
+    "instrument_registry_version",
 ]
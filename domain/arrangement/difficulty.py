@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from .config import DEFAULT_GRACE_SETTINGS, GraceSettings
-from .constraints import SubholeConstraintSettings, _is_subhole_note
-from .phrase import PhraseNote, PhraseSpan
-from .soft_key import InstrumentRange
+from .difficulty_profile import (
+    CATEGORY_NAMES,
+    LEAP_INTERVAL_THRESHOLD,
+    DifficultyProfile,
+    difficulty_profile,
+)
+from .phrase import PhraseSpan
+from .phrase_columns import ColumnarPhraseSpan
+from .soft_key import InstrumentRange, PitchHistogram
 
-_LEAP_INTERVAL_THRESHOLD = 5
 _LEAP_WEIGHT = 0.75
 _FAST_SWITCH_WEIGHT = 0.6
 _SUBHOLE_WEIGHT = 0.5
@@ -37,122 +42,17 @@ class DifficultySummary:
         return self.hard + self.very_hard
 
 
-def _classify_note_difficulty(midi: int, instrument: InstrumentRange) -> str:
-    if midi < instrument.min_midi - 2 or midi > instrument.max_midi + 2:
-        return "very_hard"
-    if midi < instrument.min_midi or midi > instrument.max_midi:
-        return "hard"
-
-    span = max(1.0, float(instrument.span))
-    center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
-    distance = abs(midi - center)
-    medium_threshold = span * 0.2
-    hard_threshold = span * 0.35
-    if distance <= medium_threshold:
-        return "easy"
-    if distance <= hard_threshold:
-        return "medium"
-    return "hard"
-
-
-def _windways_for(note_midi: int, instrument: InstrumentRange) -> Iterable[int]:
-    windway_map = getattr(instrument, "windway_map", None)
-    if not windway_map:
-        return ()
-    if hasattr(instrument, "windways_for"):
-        return getattr(instrument, "windways_for")(note_midi)
-    return windway_map.get(int(note_midi), ())
-
-
-def _subhole_settings_for(instrument: InstrumentRange) -> SubholeConstraintSettings | None:
-    candidates = [
-        getattr(instrument, "subhole_settings", None),
-        getattr(instrument, "subhole_constraint_settings", None),
-    ]
-
-    constraints = getattr(instrument, "constraints", None)
-    if constraints is not None:
-        candidates.append(constraints)
-        candidates.extend(
-            getattr(constraints, attr, None)
-            for attr in ("subhole", "subhole_settings", "subhole_constraint_settings")
-        )
-
-    for candidate in candidates:
-        if isinstance(candidate, SubholeConstraintSettings):
-            return candidate
-    return None
-
-
-def _is_subhole_transition(
-    first: PhraseNote,
-    second: PhraseNote,
-    settings: SubholeConstraintSettings | None,
-    instrument: InstrumentRange,
-) -> bool:
-    pair = frozenset((int(first.midi), int(second.midi)))
-    if settings is not None:
-        if pair in settings.pair_limits:
-            return True
-        if _is_subhole_note(first, settings) or _is_subhole_note(second, settings):
-            return True
-    instrument_pairs = getattr(instrument, "subhole_transition_pairs", None)
-    if instrument_pairs and hasattr(instrument_pairs, "__contains__") and pair in instrument_pairs:
-        return True
-    instrument_pitches = getattr(instrument, "subhole_pitches", None)
-    if instrument_pitches and hasattr(instrument_pitches, "__contains__") and (
-        int(first.midi) in instrument_pitches or int(second.midi) in instrument_pitches
-    ):
-        return True
-    if "subhole" in first.tags or "subhole" in second.tags:
-        return True
-    return False
-
-
-def summarize_difficulty(
-    span: PhraseSpan,
-    instrument: InstrumentRange,
-    grace_settings: GraceSettings | None = None,
+def _build_summary(
+    totals: dict[str, float],
+    *,
+    weighted_distance: float,
+    total_duration: float,
+    grace_duration: float,
+    leap_weight: float,
+    fast_switch_weight: float,
+    subhole_transition_duration: float,
 ) -> DifficultySummary:
-    active_settings = grace_settings or DEFAULT_GRACE_SETTINGS
-    totals = {"easy": 0.0, "medium": 0.0, "hard": 0.0, "very_hard": 0.0}
-    weighted_distance = 0.0
-    total_duration = 0.0
-    grace_duration = 0.0
-    center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
-    leap_weight = 0.0
-    fast_switch_weight = 0.0
-    subhole_transition_duration = 0.0
-    subhole_settings = _subhole_settings_for(instrument)
-
-    pairs = list(zip(span.notes, span.notes[1:]))
-    sixteenth_duration = max(1, span.pulses_per_quarter // 4)
-
-    for note in span.notes:
-        duration = float(note.duration)
-        total_duration += duration
-        if "grace" in note.tags:
-            grace_duration += duration
-        category = _classify_note_difficulty(note.midi, instrument)
-        totals[category] += duration
-        weighted_distance += duration * abs(note.midi - center)
-
-    for first, second in pairs:
-        weight = (first.duration + second.duration) / 2.0
-        interval = abs(second.midi - first.midi)
-        if interval > _LEAP_INTERVAL_THRESHOLD:
-            leap_weight += weight
-
-        first_windways = set(_windways_for(first.midi, instrument))
-        second_windways = set(_windways_for(second.midi, instrument))
-        transition_duration = min(first.duration, second.duration)
-        if _is_subhole_transition(first, second, subhole_settings, instrument):
-            subhole_transition_duration += transition_duration
-        if not first_windways or not second_windways:
-            continue
-        if not first_windways.isdisjoint(second_windways):
-            continue
-        fast_switch_weight += min(transition_duration, sixteenth_duration)
+    """Turn accumulated per-note and per-pair totals into a summary."""
 
     tessitura_distance = 0.0
     if total_duration > 0:
@@ -182,6 +82,105 @@ def summarize_difficulty(
     )
 
 
+def _accumulate(
+    profile: DifficultyProfile,
+    midis: Sequence[int],
+    durations: Sequence[int],
+    grace_flags: Sequence[bool],
+    subhole_flags: Sequence[bool],
+    sixteenth_duration: int,
+) -> DifficultySummary:
+    """Score a span given column-wise note data; every pitch must be covered."""
+
+    base, size = profile.base, profile.size
+    categories, distances = profile.categories, profile.distances
+    windway_masks, subhole_pairs = profile.windway_masks, profile.subhole_pairs
+    indices = [midi - base for midi in midis]
+
+    totals = [0.0, 0.0, 0.0, 0.0]
+    weighted_distance = 0.0
+    total_duration = 0.0
+    grace_duration = 0.0
+    for index, raw_duration, is_grace in zip(indices, durations, grace_flags):
+        duration = float(raw_duration)
+        total_duration += duration
+        if is_grace:
+            grace_duration += duration
+        totals[categories[index]] += duration
+        weighted_distance += duration * distances[index]
+
+    leap_weight = 0.0
+    fast_switch_weight = 0.0
+    subhole_transition_duration = 0.0
+    for first, second, first_duration, second_duration, first_subhole, second_subhole in zip(
+        indices, indices[1:], durations, durations[1:], subhole_flags, subhole_flags[1:]
+    ):
+        if abs(second - first) > LEAP_INTERVAL_THRESHOLD:
+            leap_weight += (first_duration + second_duration) / 2.0
+        transition_duration = min(first_duration, second_duration)
+        if first_subhole or second_subhole or subhole_pairs[first * size + second]:
+            subhole_transition_duration += transition_duration
+        first_mask = windway_masks[first]
+        second_mask = windway_masks[second]
+        if first_mask and second_mask and not first_mask & second_mask:
+            fast_switch_weight += min(transition_duration, sixteenth_duration)
+
+    return _build_summary(
+        dict(zip(CATEGORY_NAMES, totals)),
+        weighted_distance=weighted_distance,
+        total_duration=total_duration,
+        grace_duration=grace_duration,
+        leap_weight=leap_weight,
+        fast_switch_weight=fast_switch_weight,
+        subhole_transition_duration=subhole_transition_duration,
+    )
+
+
+def summarize_difficulty(
+    span: PhraseSpan,
+    instrument: InstrumentRange,
+    grace_settings: GraceSettings | None = None,
+) -> DifficultySummary:
+    if isinstance(span, ColumnarPhraseSpan):
+        return _summarize_columns(span, instrument)
+
+    notes = span.notes
+    midis = [note.midi for note in notes]
+    profile = _profile_for(instrument, midis)
+    return _accumulate(
+        profile,
+        midis,
+        [note.duration for note in notes],
+        ["grace" in note.tags for note in notes],
+        ["subhole" in note.tags for note in notes],
+        max(1, span.pulses_per_quarter // 4),
+    )
+
+
+def _summarize_columns(span: ColumnarPhraseSpan, instrument: InstrumentRange) -> DifficultySummary:
+    """Column-wise :func:`summarize_difficulty` that never builds note objects."""
+
+    tag_table = span.tag_table
+    grace_ids = [("grace" in tags) for tags in tag_table]
+    subhole_ids = [("subhole" in tags) for tags in tag_table]
+    tag_ids = span.tag_ids
+    midis = span.midis
+    return _accumulate(
+        _profile_for(instrument, midis),
+        midis,
+        span.durations,
+        [grace_ids[tag_id] for tag_id in tag_ids],
+        [subhole_ids[tag_id] for tag_id in tag_ids],
+        max(1, span.pulses_per_quarter // 4),
+    )
+
+
+def _profile_for(instrument: InstrumentRange, midis: Sequence[int]) -> DifficultyProfile:
+    if not midis:
+        return difficulty_profile(instrument)
+    return difficulty_profile(instrument, min(midis), max(midis))
+
+
 def difficulty_score(
     summary: DifficultySummary,
     grace_settings: GraceSettings | None = None,
@@ -227,4 +226,84 @@ def difficulty_score(
     )
 
 
-__all__ = ["DifficultySummary", "difficulty_score", "summarize_difficulty"]
+def rank_transpositions(
+    span: PhraseSpan,
+    instrument: InstrumentRange,
+    transpositions: Iterable[int],
+    *,
+    top_k: int,
+    grace_settings: GraceSettings | None = None,
+) -> list[tuple[float, float, int, int]]:
+    """Return the ``top_k`` easiest transpositions of *span*, best first.
+
+    Each entry is ``(difficulty_score, fast windway switch exposure,
+    abs(transposition), transposition)``, matching a full sort of every
+    candidate. Category durations, grace time and leap weight come from one
+    pitch histogram per offset; since the pair-based windway and subhole
+    penalties can only raise a score, that partial score bounds it from
+    below, and only offsets whose bound can still reach the top ``k`` are
+    transposed and summarised in full.
+    """
+
+    candidates = list(transpositions)
+    if top_k <= 0 or not candidates:
+        return []
+
+    notes = span.notes
+    histogram = PitchHistogram.from_span(span)
+    total_duration = 0.0
+    grace_duration = 0.0
+    for note in notes:
+        duration = float(note.duration)
+        total_duration += duration
+        if "grace" in note.tags:
+            grace_duration += duration
+    leap_weight = 0.0
+    for first, second in zip(notes, notes[1:]):
+        if abs(second.midi - first.midi) > LEAP_INTERVAL_THRESHOLD:
+            leap_weight += (first.duration + second.duration) / 2.0
+
+    profile = difficulty_profile(instrument)
+    if histogram.pitches:
+        profile = difficulty_profile(
+            instrument,
+            histogram.pitches[0] + min(candidates),
+            histogram.pitches[-1] + max(candidates),
+        )
+    bounds = []
+    for transposition in candidates:
+        totals = [0, 0, 0, 0]
+        for pitch, duration in zip(histogram.pitches, histogram.durations):
+            totals[profile.category(pitch + transposition)] += duration
+        partial = _build_summary(
+            dict(zip(CATEGORY_NAMES, map(float, totals))),
+            weighted_distance=0.0,
+            total_duration=total_duration,
+            grace_duration=grace_duration,
+            leap_weight=leap_weight,
+            fast_switch_weight=0.0,
+            subhole_transition_duration=0.0,
+        )
+        bound = difficulty_score(partial, grace_settings=grace_settings)
+        bounds.append((bound, abs(transposition), transposition))
+    bounds.sort()
+
+    ranked: list[tuple[float, float, int, int]] = []
+    for bound, distance, transposition in bounds:
+        if len(ranked) >= top_k and bound > ranked[top_k - 1][0]:
+            break
+        summary = summarize_difficulty(
+            span.transpose(transposition), instrument, grace_settings=grace_settings
+        )
+        score = difficulty_score(summary, grace_settings=grace_settings)
+        ranked.append((score, summary.fast_windway_switch_exposure, distance, transposition))
+        ranked.sort()
+    return ranked[:top_k]
+
+
+__all__ = [
+    "DifficultySummary",
+    "difficulty_score",
+    "rank_transpositions",
+    "summarize_difficulty",
+]
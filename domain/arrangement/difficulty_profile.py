@@ -0,0 +1,303 @@
+"""Per-instrument lookup tables used by difficulty scoring.
+
+:func:`summarize_difficulty` classifies every note and inspects every note
+pair of every candidate span. Everything those checks need from the
+instrument depends only on MIDI numbers, so :func:`difficulty_profile`
+evaluates them once per instrument into flat tables: a category and a
+tessitura distance per pitch, a windway bitmask per pitch (two pitches force a
+windway switch when both masks are set and share no bit), and a square matrix
+of pitch pairs that count as subhole transitions. Profiles are cached per
+instrument object and dropped whenever the instrument registry changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, Iterable
+
+from .config import instrument_registry_version
+from .constraints import SubholeConstraintSettings
+from .soft_key import InstrumentRange
+
+CATEGORY_NAMES = ("easy", "medium", "hard", "very_hard")
+CATEGORY_INDEX = {name: index for index, name in enumerate(CATEGORY_NAMES)}
+
+LEAP_INTERVAL_THRESHOLD = 5
+DEFAULT_MAX_PROFILES = 64
+_MIDI_LOW = 0
+_MIDI_HIGH = 127
+
+
+def _classify_note_difficulty(midi: int, instrument: InstrumentRange) -> str:
+    if midi < instrument.min_midi - 2 or midi > instrument.max_midi + 2:
+        return "very_hard"
+    if midi < instrument.min_midi or midi > instrument.max_midi:
+        return "hard"
+
+    span = max(1.0, float(instrument.span))
+    center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
+    distance = abs(midi - center)
+    medium_threshold = span * 0.2
+    hard_threshold = span * 0.35
+    if distance <= medium_threshold:
+        return "easy"
+    if distance <= hard_threshold:
+        return "medium"
+    return "hard"
+
+
+def _windways_for(note_midi: int, instrument: InstrumentRange) -> Iterable[int]:
+    windway_map = getattr(instrument, "windway_map", None)
+    if not windway_map:
+        return ()
+    if hasattr(instrument, "windways_for"):
+        return getattr(instrument, "windways_for")(note_midi)
+    return windway_map.get(int(note_midi), ())
+
+
+def _subhole_settings_for(instrument: InstrumentRange) -> SubholeConstraintSettings | None:
+    candidates = [
+        getattr(instrument, "subhole_settings", None),
+        getattr(instrument, "subhole_constraint_settings", None),
+    ]
+
+    constraints = getattr(instrument, "constraints", None)
+    if constraints is not None:
+        candidates.append(constraints)
+        candidates.extend(
+            getattr(constraints, attr, None)
+            for attr in ("subhole", "subhole_settings", "subhole_constraint_settings")
+        )
+
+    for candidate in candidates:
+        if isinstance(candidate, SubholeConstraintSettings):
+            return candidate
+    return None
+
+
+def _is_subhole_transition(
+    first_midi: int,
+    first_tags: FrozenSet[str],
+    second_midi: int,
+    second_tags: FrozenSet[str],
+    settings: SubholeConstraintSettings | None,
+    instrument: InstrumentRange,
+) -> bool:
+    pair = frozenset((int(first_midi), int(second_midi)))
+    if "subhole" in first_tags or "subhole" in second_tags:
+        return True
+    if settings is not None:
+        if pair in settings.pair_limits:
+            return True
+        if first_midi in settings.subhole_pitches or second_midi in settings.subhole_pitches:
+            return True
+    instrument_pairs = getattr(instrument, "subhole_transition_pairs", None)
+    if instrument_pairs and hasattr(instrument_pairs, "__contains__") and pair in instrument_pairs:
+        return True
+    instrument_pitches = getattr(instrument, "subhole_pitches", None)
+    if instrument_pitches and hasattr(instrument_pitches, "__contains__") and (
+        int(first_midi) in instrument_pitches or int(second_midi) in instrument_pitches
+    ):
+        return True
+    return False
+
+
+def _subhole_matrix(
+    instrument: InstrumentRange,
+    settings: SubholeConstraintSettings | None,
+    base: int,
+    size: int,
+) -> bytes:
+    matrix = bytearray(size * size)
+    pitches: set[int] = set()
+    if settings is not None:
+        pitches.update(settings.subhole_pitches)
+    instrument_pitches = getattr(instrument, "subhole_pitches", None)
+    if instrument_pitches and hasattr(instrument_pitches, "__contains__"):
+        pitches.update(midi for midi in range(base, base + size) if midi in instrument_pitches)
+    for midi in pitches:
+        index = midi - base
+        if 0 <= index < size:
+            matrix[index * size : (index + 1) * size] = b"\x01" * size
+            matrix[index::size] = b"\x01" * size
+
+    def mark(first: int, second: int) -> None:
+        first -= base
+        second -= base
+        if 0 <= first < size and 0 <= second < size:
+            matrix[first * size + second] = 1
+            matrix[second * size + first] = 1
+
+    if settings is not None:
+        for pair in settings.pair_limits:
+            first, second = sorted(pair)
+            mark(first, second)
+    instrument_pairs = getattr(instrument, "subhole_transition_pairs", None)
+    if instrument_pairs and hasattr(instrument_pairs, "__contains__"):
+        # Only membership is guaranteed, so probe every pair of the table.
+        for first in range(base, base + size):
+            for second in range(first, base + size):
+                if frozenset((first, second)) in instrument_pairs:
+                    mark(first, second)
+    return bytes(matrix)
+
+
+class DifficultyProfile:
+    """Lookup tables for one instrument over the pitches ``base .. base + size - 1``.
+
+    Index the tables with ``midi - base``; :meth:`covers` tells whether a
+    pitch is inside them. The scalar helpers fall back to the uncompiled
+    checks for pitches outside the table.
+    """
+
+    __slots__ = (
+        "instrument",
+        "subhole_settings",
+        "center",
+        "base",
+        "size",
+        "categories",
+        "distances",
+        "windway_masks",
+        "subhole_pairs",
+    )
+
+    def __init__(self, instrument: InstrumentRange, low: int, high: int) -> None:
+        self.instrument = instrument
+        self.subhole_settings = _subhole_settings_for(instrument)
+        self.center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
+        self.base = base = min(int(low), _MIDI_LOW)
+        self.size = size = max(int(high), _MIDI_HIGH) + 1 - base
+        pitches = range(base, base + size)
+        self.categories = bytes(
+            CATEGORY_INDEX[_classify_note_difficulty(midi, instrument)] for midi in pitches
+        )
+        self.distances = tuple(abs(midi - self.center) for midi in pitches)
+        bits: dict[int, int] = {}
+        masks = []
+        for midi in pitches:
+            mask = 0
+            for windway in _windways_for(midi, instrument):
+                mask |= 1 << bits.setdefault(windway, len(bits))
+            masks.append(mask)
+        self.windway_masks = tuple(masks)
+        self.subhole_pairs = _subhole_matrix(instrument, self.subhole_settings, base, size)
+
+    def covers(self, midi: int) -> bool:
+        return 0 <= midi - self.base < self.size
+
+    def category(self, midi: int) -> int:
+        """Return the :data:`CATEGORY_NAMES` index for *midi*."""
+
+        if self.covers(midi):
+            return self.categories[midi - self.base]
+        return CATEGORY_INDEX[_classify_note_difficulty(midi, self.instrument)]
+
+    def pair_values(
+        self,
+        first_midi: int,
+        first_duration: int,
+        first_tags: FrozenSet[str],
+        second_midi: int,
+        second_duration: int,
+        second_tags: FrozenSet[str],
+        sixteenth_duration: int,
+    ) -> tuple[float, float, float]:
+        """Return leap weight, fast windway switch weight and subhole duration."""
+
+        leap_weight = 0.0
+        if abs(second_midi - first_midi) > LEAP_INTERVAL_THRESHOLD:
+            leap_weight = (first_duration + second_duration) / 2.0
+        transition_duration = min(first_duration, second_duration)
+
+        if not (self.covers(first_midi) and self.covers(second_midi)):
+            subhole_duration = 0.0
+            if _is_subhole_transition(
+                first_midi,
+                first_tags,
+                second_midi,
+                second_tags,
+                self.subhole_settings,
+                self.instrument,
+            ):
+                subhole_duration = transition_duration
+            first_windways = set(_windways_for(first_midi, self.instrument))
+            second_windways = set(_windways_for(second_midi, self.instrument))
+            if not first_windways or not second_windways:
+                return (leap_weight, 0.0, subhole_duration)
+            if not first_windways.isdisjoint(second_windways):
+                return (leap_weight, 0.0, subhole_duration)
+            return (leap_weight, min(transition_duration, sixteenth_duration), subhole_duration)
+
+        first = first_midi - self.base
+        second = second_midi - self.base
+        subhole_duration = 0.0
+        if (
+            "subhole" in first_tags
+            or "subhole" in second_tags
+            or self.subhole_pairs[first * self.size + second]
+        ):
+            subhole_duration = transition_duration
+        first_mask = self.windway_masks[first]
+        second_mask = self.windway_masks[second]
+        if first_mask and second_mask and not first_mask & second_mask:
+            return (leap_weight, min(transition_duration, sixteenth_duration), subhole_duration)
+        return (leap_weight, 0.0, subhole_duration)
+
+
+_profiles: OrderedDict[int, DifficultyProfile] = OrderedDict()
+_profiles_version = instrument_registry_version()
+_profiles_lock = threading.Lock()
+
+
+def difficulty_profile(
+    instrument: InstrumentRange,
+    low: int = _MIDI_LOW,
+    high: int = _MIDI_HIGH,
+) -> DifficultyProfile:
+    """Return the cached profile of *instrument*, widened to cover ``low .. high``."""
+
+    global _profiles_version
+    key = id(instrument)
+    with _profiles_lock:
+        version = instrument_registry_version()
+        if version != _profiles_version:
+            _profiles.clear()
+            _profiles_version = version
+        profile = _profiles.get(key)
+        if (
+            profile is not None
+            and profile.instrument is instrument
+            and profile.covers(low)
+            and profile.covers(high)
+        ):
+            _profiles.move_to_end(key)
+            return profile
+        if profile is not None and profile.instrument is instrument:
+            low = min(low, profile.base)
+            high = max(high, profile.base + profile.size - 1)
+
+    profile = DifficultyProfile(instrument, low, high)
+    with _profiles_lock:
+        if _profiles_version == version:
+            _profiles[key] = profile
+            _profiles.move_to_end(key)
+            while len(_profiles) > DEFAULT_MAX_PROFILES:
+                _profiles.popitem(last=False)
+    return profile
+
+
+def clear_difficulty_profiles() -> None:
+    """Drop every cached profile."""
+
+    with _profiles_lock:
+        _profiles.clear()
+
+
+__all__ = [
+    "CATEGORY_NAMES",
+    "DifficultyProfile",
+    "clear_difficulty_profiles",
+    "difficulty_profile",
+]
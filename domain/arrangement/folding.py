@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Tuple
+from typing import Sequence, Tuple
 
 from shared.ottava import OttavaShift
 
-from .phrase import PhraseNote, PhraseSpan
+from .phrase import PhraseSpan
+from .phrase_columns import ColumnarPhraseSpan
 from .soft_key import InstrumentRange
 
 
@@ -74,10 +75,10 @@ class _DPCell:
     substitution_penalty: float
 
 
-def _generate_options(note: PhraseNote, settings: FoldingSettings) -> Tuple[_CandidateOption, ...]:
+def _generate_options(midi: int, settings: FoldingSettings) -> Tuple[_CandidateOption, ...]:
     options: set[_CandidateOption] = set()
     for shift in (-1, 0, 1):
-        base_midi = note.midi + (12 * shift)
+        base_midi = midi + (12 * shift)
         options.add(_CandidateOption(base_midi, shift, False, 0))
         if settings.substitution_interval_limit <= 0:
             continue
@@ -97,10 +98,10 @@ def _register_penalty(midi: int, instrument: InstrumentRange, settings: FoldingS
     return 0.0
 
 
-def _state_cost(note: PhraseNote, option: _CandidateOption, instrument: InstrumentRange, settings: FoldingSettings) -> tuple[float, float, float]:
+def _state_cost(midi: int, option: _CandidateOption, instrument: InstrumentRange, settings: FoldingSettings) -> tuple[float, float, float]:
     register_pen = _register_penalty(option.midi, instrument, settings)
     substitution_pen = settings.substitution_penalty if option.substituted else 0.0
-    deviation_pen = abs(option.midi - note.midi) * settings.pitch_deviation_weight
+    deviation_pen = abs(option.midi - midi) * settings.pitch_deviation_weight
     shift_pen = abs(option.shift) * settings.shift_penalty
     total = register_pen + substitution_pen + deviation_pen + shift_pen
     return total, register_pen, substitution_pen
@@ -125,17 +126,17 @@ def fold_octaves_with_slack(
     """Fold phrase octaves using DP while allowing finite penalties for slack."""
 
     active_settings = settings or FoldingSettings()
-    notes = span.notes
-    if not notes:
+    midis = span.midis if isinstance(span, ColumnarPhraseSpan) else [note.midi for note in span.notes]
+    if not midis:
         return FoldingResult(span, 0.0, ())
 
-    option_grid = [_generate_options(note, active_settings) for note in notes]
+    option_grid = [_generate_options(midi, active_settings) for midi in midis]
     dp_table: list[dict[_CandidateOption, _DPCell]] = []
 
-    for index, (note, options) in enumerate(zip(notes, option_grid)):
+    for index, (midi, options) in enumerate(zip(midis, option_grid)):
         row: dict[_CandidateOption, _DPCell] = {}
         for option in options:
-            state_cost, register_pen, substitution_pen = _state_cost(note, option, instrument, active_settings)
+            state_cost, register_pen, substitution_pen = _state_cost(midi, option, instrument, active_settings)
             if index == 0:
                 row[option] = _DPCell(state_cost, None, 0.0, register_pen, substitution_pen)
                 continue
@@ -156,36 +157,24 @@ def fold_octaves_with_slack(
             row[option] = _DPCell(best_cost, best_prev, best_transition, register_pen, substitution_pen)
         if not row:
             # If we cannot find any transitions, fall back to keeping the original note.
-            fallback_option = _CandidateOption(notes[index].midi, 0, False, 0)
-            state_cost, register_pen, substitution_pen = _state_cost(notes[index], fallback_option, instrument, active_settings)
+            fallback_option = _CandidateOption(midi, 0, False, 0)
+            state_cost, register_pen, substitution_pen = _state_cost(midi, fallback_option, instrument, active_settings)
             row[fallback_option] = _DPCell(state_cost, None, 0.0, register_pen, substitution_pen)
         dp_table.append(row)
 
     final_row = dp_table[-1]
     best_option, best_cell = min(final_row.items(), key=lambda item: item[1].cost)
 
-    new_notes = list(notes)
     steps: list[FoldingStep] = []
     option: _CandidateOption | None = best_option
-    index = len(notes) - 1
+    index = len(midis) - 1
 
     while option is not None and index >= 0:
         cell = dp_table[index][option]
-        note = notes[index]
-        updated = note.with_midi(option.midi)
-        if option.shift != 0:
-            direction = "up" if option.shift > 0 else "down"
-            shift_size = 8 * abs(option.shift)
-            updated = updated.add_ottava_shift(
-                OttavaShift(source="octave-shift", direction=direction, size=shift_size)
-            )
-        if option.substituted:
-            updated = updated.with_tags(note.tags.union({"substituted"}))
-        new_notes[index] = updated
         steps.append(
             FoldingStep(
                 index=index,
-                original_midi=note.midi,
+                original_midi=midis[index],
                 midi=option.midi,
                 shift=option.shift,
                 substituted=option.substituted,
@@ -198,10 +187,53 @@ def fold_octaves_with_slack(
         index -= 1
 
     steps.reverse()
-    result_span = span.with_notes(new_notes)
+    if isinstance(span, ColumnarPhraseSpan):
+        result_span = _apply_steps_to_columns(span, steps)
+    else:
+        result_span = _apply_steps_to_notes(span, steps)
     return FoldingResult(result_span, best_cell.cost, tuple(steps))
 
 
+def _shift_marker(shift: int) -> OttavaShift:
+    direction = "up" if shift > 0 else "down"
+    return OttavaShift(source="octave-shift", direction=direction, size=8 * abs(shift))
+
+
+def _apply_steps_to_notes(span: PhraseSpan, steps: Sequence[FoldingStep]) -> PhraseSpan:
+    new_notes = list(span.notes)
+    for step in steps:
+        note = new_notes[step.index]
+        updated = note.with_midi(step.midi)
+        if step.shift != 0:
+            updated = updated.add_ottava_shift(_shift_marker(step.shift))
+        if step.substituted:
+            updated = updated.with_tags(note.tags.union({"substituted"}))
+        new_notes[step.index] = updated
+    return span.with_notes(new_notes)
+
+
+def _apply_steps_to_columns(
+    span: ColumnarPhraseSpan, steps: Sequence[FoldingStep]
+) -> ColumnarPhraseSpan:
+    midis = span.midis[:]
+    shifted: dict[int, list[int]] = {}
+    substituted: list[int] = []
+    for step in steps:
+        midis[step.index] = step.midi
+        if step.shift != 0:
+            shifted.setdefault(step.shift, []).append(step.index)
+        if step.substituted:
+            substituted.append(step.index)
+
+    # Re-pitching may reorder chord tones, so annotate before replacing pitches.
+    result = span
+    for shift, indices in sorted(shifted.items()):
+        result = result.with_ottava_shift(indices, _shift_marker(shift))
+    if substituted:
+        result = result.with_tag(substituted, "substituted")
+    return result.with_midis(midis)
+
+
 __all__ = [
     "FoldingResult",
     "FoldingSettings",
@@ -10,7 +10,16 @@ from .engine import (
     evaluate_spans,
     run_engine,
 )
+from .evaluator import (
+    EvaluationContext,
+    ProcessPoolEvaluator,
+    ProgramEvaluator,
+    SerialEvaluator,
+    ThreadPoolEvaluator,
+    create_evaluator,
+)
 from .explain import explain_program
+from .incremental import IncrementalEvaluator
 from .init import generate_random_program, seed_programs, translate_salvage_trace
 from .ops import (
     ChoiceDomain,
@@ -22,6 +31,8 @@ from .ops import (
     SimplifyRhythm,
     SpanDescriptor,
 )
+from .convergence import ConvergenceMonitor, hypervolume
+from .pareto import ParetoArchive, pareto_fronts
 from .repair import repair_program
 from .session import GPSessionConfig, GPSessionLog, GPSessionResult, run_gp_session
 from .selection import (
@@ -61,10 +72,17 @@ __all__ = [
     "EngineHooks",
     "EngineResult",
     "EngineState",
+    "EvaluationContext",
     "GPPrimitive",
     "GlobalTranspose",
+    "IncrementalEvaluator",
     "LocalOctave",
     "ParameterDomain",
+    "ProcessPoolEvaluator",
+    "ProgramEvaluator",
+    "SerialEvaluator",
+    "ThreadPoolEvaluator",
+    "create_evaluator",
     "explain_program",
     "generate_random_program",
     "GPSessionConfig",
@@ -97,13 +115,17 @@ __all__ = [
     "evaluate_spans",
     "validate_program",
     "Individual",
+    "ParetoArchive",
     "SelectionConfig",
     "advance_generation",
     "crowding_distance",
     "nondominated_sort",
+    "pareto_fronts",
     "select_population",
     "update_archive",
     "run_gp_session",
+    "ConvergenceMonitor",
+    "hypervolume",
     "arrange_v3_gp",
     "GPInstrumentCandidate",
     "GPArrangementStrategyResult",
@@ -0,0 +1,125 @@
+"""Stagnation detectors that end GP sessions once the Pareto front settles."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Sequence
+
+from .engine import EngineState
+from .pareto import Vector
+from .session_logging import fitness_sort_key
+
+HYPERVOLUME_CONVERGED = "hypervolume_converged"
+ARCHIVE_UNCHANGED = "archive_unchanged"
+WINNER_UNCHANGED = "winner_unchanged"
+
+
+def hypervolume(points: Sequence[Vector], reference: Vector) -> float:
+    """Return the volume dominated by *points* and bounded by *reference*.
+
+    Objectives are minimised. Points that do not beat *reference* in every
+    objective contribute nothing. The volume is computed exactly by slicing
+    along the last objective, which is fast for archive-sized fronts.
+    """
+
+    inside = [
+        point for point in points if all(value < bound for value, bound in zip(point, reference))
+    ]
+    if not inside:
+        return 0.0
+    if len(reference) == 1:
+        return reference[0] - min(point[0] for point in inside)
+    inside.sort(key=lambda point: point[-1])
+    volume = 0.0
+    for index, point in enumerate(inside):
+        upper = inside[index + 1][-1] if index + 1 < len(inside) else reference[-1]
+        depth = upper - point[-1]
+        if depth > 0.0:
+            volume += depth * hypervolume([item[:-1] for item in inside[: index + 1]], reference[:-1])
+    return volume
+
+
+class ConvergenceMonitor:
+    """Engine termination hook that reports when the search has stagnated.
+
+    Each enabled detector looks back over *window* generations:
+
+    * ``hypervolume_epsilon`` stops once the archive hypervolume grew by no
+      more than that fraction of its value *window* generations earlier;
+    * ``archive`` stops once the archive members and their fitness have not
+      changed;
+    * ``winner`` stops once the best program has not changed.
+
+    The reference point for the hypervolume is fixed at the first generation
+    seen, just beyond the worst value of each objective.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        *,
+        hypervolume_epsilon: float | None = None,
+        archive: bool = False,
+        winner: bool = False,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if hypervolume_epsilon is not None and hypervolume_epsilon < 0:
+            raise ValueError("hypervolume_epsilon cannot be negative")
+        self.window = window
+        self.hypervolume_epsilon = hypervolume_epsilon
+        self.archive = archive
+        self.winner = winner
+        self._reference: Vector | None = None
+        self._volumes: Deque[float] = deque(maxlen=window + 1)
+        self._archives: Deque[frozenset] = deque(maxlen=window + 1)
+        self._winners: Deque[tuple] = deque(maxlen=window + 1)
+
+    @property
+    def enabled(self) -> bool:
+        return self.hypervolume_epsilon is not None or self.archive or self.winner
+
+    def __call__(self, state: EngineState) -> str | None:
+        candidates = state.archive or state.population
+        if not candidates:
+            return None
+        if self.hypervolume_epsilon is not None:
+            vectors = [individual.fitness.as_tuple() for individual in candidates]
+            if self._reference is None:
+                self._reference = self._reference_point(
+                    vectors + [individual.fitness.as_tuple() for individual in state.population]
+                )
+            self._volumes.append(hypervolume(vectors, self._reference))
+        if self.archive:
+            self._archives.append(
+                frozenset((member.program, member.fitness.as_tuple()) for member in candidates)
+            )
+        if self.winner:
+            self._winners.append(min(candidates, key=fitness_sort_key).program)
+
+        if self._full(self._volumes):
+            baseline = self._volumes[0]
+            if self._volumes[-1] - baseline <= self.hypervolume_epsilon * abs(baseline):
+                return HYPERVOLUME_CONVERGED
+        if self._full(self._archives) and len(set(self._archives)) == 1:
+            return ARCHIVE_UNCHANGED
+        if self._full(self._winners) and len(set(self._winners)) == 1:
+            return WINNER_UNCHANGED
+        return None
+
+    def _full(self, history: Deque) -> bool:
+        return len(history) == self.window + 1
+
+    @staticmethod
+    def _reference_point(vectors: Sequence[Vector]) -> Vector:
+        worst = [max(values) for values in zip(*vectors)]
+        return tuple(value + max(abs(value) * 0.1, 1e-6) for value in worst)
+
+
+__all__ = [
+    "ARCHIVE_UNCHANGED",
+    "ConvergenceMonitor",
+    "HYPERVOLUME_CONVERGED",
+    "WINNER_UNCHANGED",
+    "hypervolume",
+]
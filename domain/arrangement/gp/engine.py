@@ -11,6 +11,7 @@ from domain.arrangement.difficulty import DifficultySummary, difficulty_score, s
 from domain.arrangement.folding import FoldingResult, FoldingSettings, fold_octaves_with_slack
 from domain.arrangement.phrase import PhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
+from shared.cancellation import CancellationToken, raise_if_cancelled
 
 from .selection import Individual
 from .session_logging import GenerationLog
@@ -224,8 +225,17 @@ class EngineResult:
     termination_reason: str
 
 
-def run_engine(config: EngineConfig, hooks: EngineHooks) -> EngineResult:
-    """Execute a GP loop using ``hooks`` until ``config`` terminates it."""
+def run_engine(
+    config: EngineConfig,
+    hooks: EngineHooks,
+    *,
+    cancellation: CancellationToken | None = None,
+) -> EngineResult:
+    """Execute a GP loop using ``hooks`` until ``config`` terminates it.
+
+    ``cancellation`` is checked before every generation; once cancelled the
+    loop raises :class:`~shared.cancellation.OperationCancelled`.
+    """
 
     start = time.monotonic()
     population, archive = hooks.initialize()
@@ -238,6 +248,7 @@ def run_engine(config: EngineConfig, hooks: EngineHooks) -> EngineResult:
     termination_reason = "generation_limit"
 
     for generation in range(config.generations):
+        raise_if_cancelled(cancellation)
         elapsed = time.monotonic() - start
         if generation > 0 and config.time_budget_seconds is not None and elapsed >= config.time_budget_seconds:
             termination_reason = "time_budget_exceeded"
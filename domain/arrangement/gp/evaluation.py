@@ -42,6 +42,18 @@ def evaluate_program(
         config=fitness_config,
         grace_settings=grace_settings,
     )
+    return finalize_individual(program, fitness, metadata=metadata, penalties=penalties)
+
+
+def finalize_individual(
+    program: Sequence[GPPrimitive],
+    fitness: FitnessVector,
+    *,
+    metadata: Mapping[str, object] | None = None,
+    penalties: ScoringPenalties | None = None,
+) -> Individual:
+    """Apply program-level scoring penalties and wrap *fitness* in an individual."""
+
     penalties = penalties or ScoringPenalties()
     simplify_count = sum(
         1 for operation in program if isinstance(operation, SimplifyRhythm)
@@ -68,5 +80,5 @@ def evaluate_program(
     return Individual(program=tuple(program), fitness=fitness, metadata=metadata_dict)
 
 
-__all__ = ["evaluate_program"]
+__all__ = ["evaluate_program", "finalize_individual"]
 
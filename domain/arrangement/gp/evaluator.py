@@ -0,0 +1,335 @@
+"""Pluggable batch evaluators used to score GP programs."""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Mapping, Sequence
+
+from domain.arrangement.config import GraceSettings
+from domain.arrangement.phrase import PhraseSpan
+from domain.arrangement.phrase_columns import ColumnarPhraseSpan
+from domain.arrangement.soft_key import InstrumentRange
+
+from .evaluation import evaluate_program
+from .fitness import FitnessConfig
+from .incremental import IncrementalEvaluator
+from .fitness_cache import (
+    FitnessCache,
+    canonical_program_key,
+    instrument_cache_key,
+    rebind_individual,
+)
+from .ops import GPPrimitive
+from .penalties import ScoringPenalties
+from .selection import Individual
+
+
+logger = logging.getLogger(__name__)
+
+EVALUATOR_KINDS: tuple[str, ...] = ("serial", "thread", "process")
+
+ProgramScorer = Callable[[Sequence[GPPrimitive], "Mapping[str, object] | None"], Individual]
+
+
+@dataclass(frozen=True)
+class EvaluationContext:
+    """Session-wide inputs shared by every program evaluation."""
+
+    phrase: PhraseSpan
+    instrument: InstrumentRange
+    fitness_config: FitnessConfig | None
+    penalties: ScoringPenalties | None = None
+    grace_settings: GraceSettings | None = None
+    incremental: bool = False
+
+    def __post_init__(self) -> None:
+        # Every program is applied to this phrase; the columnar form lets
+        # primitives and difficulty scans work on columns, not note objects.
+        object.__setattr__(self, "phrase", ColumnarPhraseSpan.from_span(self.phrase))
+
+    def build_scorer(self) -> ProgramScorer:
+        """Return the callable used to score programs in this process.
+
+        Incremental scorers keep per-window state and a prefix cache, so each
+        evaluator (or worker process) builds its own instead of pickling one.
+        """
+
+        if not self.incremental:
+            return self.evaluate
+        return IncrementalEvaluator(
+            self.phrase,
+            self.instrument,
+            fitness_config=self.fitness_config,
+            penalties=self.penalties,
+            grace_settings=self.grace_settings,
+        ).evaluate
+
+    def evaluate(
+        self,
+        program: Sequence[GPPrimitive],
+        metadata: Mapping[str, object] | None = None,
+    ) -> Individual:
+        return evaluate_program(
+            program,
+            phrase=self.phrase,
+            instrument=self.instrument,
+            fitness_config=self.fitness_config,
+            metadata=metadata,
+            penalties=self.penalties,
+            grace_settings=self.grace_settings,
+        )
+
+
+def _validate_batch(
+    programs: Sequence[Sequence[GPPrimitive]],
+    metadata: Sequence[Mapping[str, object] | None] | None,
+) -> list[Mapping[str, object] | None]:
+    if metadata is None:
+        return [None] * len(programs)
+    if len(metadata) != len(programs):
+        raise ValueError("metadata must align with the provided programs")
+    return list(metadata)
+
+
+class ProgramEvaluator:
+    """Score batches of programs one after another on the calling thread.
+
+    When a :class:`FitnessCache` is attached, programs scored earlier in the
+    session (or repeated within the batch) are served from the cache and only
+    the remaining programs reach :meth:`_evaluate`.
+    """
+
+    kind = "serial"
+
+    def __init__(self, context: EvaluationContext, *, cache: FitnessCache | None = None) -> None:
+        self.context = context
+        self.cache = cache
+        self._instrument_key = instrument_cache_key(context.instrument)
+        self._scorer = context.build_scorer()
+
+    def evaluate_batch(
+        self,
+        programs: Sequence[Sequence[GPPrimitive]],
+        metadata: Sequence[Mapping[str, object] | None] | None = None,
+    ) -> list[Individual]:
+        """Return one scored individual per program, preserving input order."""
+
+        entries = _validate_batch(programs, metadata)
+        if not programs:
+            return []
+        if self.cache is None:
+            return self._evaluate(list(programs), entries)
+        return self._evaluate_cached(list(programs), entries, self.cache)
+
+    def _evaluate_cached(
+        self,
+        programs: list[Sequence[GPPrimitive]],
+        metadata: list[Mapping[str, object] | None],
+        cache: FitnessCache,
+    ) -> list[Individual]:
+        results: list[Individual | None] = [None] * len(programs)
+        pending: dict[tuple[object, ...], list[int]] = {}
+        for index, program in enumerate(programs):
+            key = ("program", self._instrument_key, canonical_program_key(program))
+            waiting = pending.get(key)
+            if waiting is not None:
+                cache.record_hit()
+                waiting.append(index)
+                continue
+            cached = cache.get(key)
+            if isinstance(cached, Individual):
+                results[index] = rebind_individual(cached, program, metadata[index])
+                continue
+            pending[key] = [index]
+
+        if pending:
+            first_indices = [indices[0] for indices in pending.values()]
+            scored = self._evaluate(
+                [programs[index] for index in first_indices],
+                [metadata[index] for index in first_indices],
+            )
+            for (key, indices), individual in zip(pending.items(), scored):
+                cache.put(key, individual)
+                results[indices[0]] = individual
+                for index in indices[1:]:
+                    results[index] = rebind_individual(
+                        individual, programs[index], metadata[index]
+                    )
+
+        return [result for result in results if result is not None]
+
+    def _evaluate(
+        self,
+        programs: list[Sequence[GPPrimitive]],
+        metadata: list[Mapping[str, object] | None],
+    ) -> list[Individual]:
+        return [self._scorer(program, entry) for program, entry in zip(programs, metadata)]
+
+    def close(self) -> None:
+        """Release any worker resources held by the evaluator."""
+
+    def __enter__(self) -> "ProgramEvaluator":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+SerialEvaluator = ProgramEvaluator
+
+
+class _PooledEvaluator(ProgramEvaluator, ABC):
+    """Common executor lifecycle for thread and process pool evaluators."""
+
+    def __init__(
+        self,
+        context: EvaluationContext,
+        *,
+        max_workers: int | None = None,
+        cache: FitnessCache | None = None,
+    ) -> None:
+        super().__init__(context, cache=cache)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self._executor: Executor | None = None
+
+    @abstractmethod
+    def _create_executor(self) -> Executor:
+        """Return the executor that scores this evaluator's batches."""
+
+    def _executor_for_batch(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    def close(self) -> None:
+        executor = self._executor
+        self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ThreadPoolEvaluator(_PooledEvaluator):
+    """Score programs on a shared thread pool."""
+
+    kind = "thread"
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="gp-evaluator",
+        )
+
+    def _evaluate(
+        self,
+        programs: list[Sequence[GPPrimitive]],
+        metadata: list[Mapping[str, object] | None],
+    ) -> list[Individual]:
+        if len(programs) == 1:
+            return super()._evaluate(programs, metadata)
+        executor = self._executor_for_batch()
+        return list(executor.map(self._scorer, programs, metadata))
+
+
+_WORKER_SCORER: ProgramScorer | None = None
+
+
+def _initialize_worker(context: EvaluationContext) -> None:
+    global _WORKER_SCORER
+    _WORKER_SCORER = context.build_scorer()
+
+
+def _evaluate_in_worker(
+    program: Sequence[GPPrimitive],
+    metadata: Mapping[str, object] | None,
+) -> Individual:
+    if _WORKER_SCORER is None:  # pragma: no cover - defensive guard
+        raise RuntimeError("GP evaluator worker was not initialised")
+    return _WORKER_SCORER(program, metadata)
+
+
+class ProcessPoolEvaluator(_PooledEvaluator):
+    """Score programs on a process pool seeded once with the session context.
+
+    The phrase, instrument and fitness configuration travel to each worker a
+    single time through the pool initializer; afterwards only programs and
+    their metadata are pickled per evaluation.
+    """
+
+    kind = "process"
+
+    def _create_executor(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialize_worker,
+            initargs=(self.context,),
+        )
+
+    def _evaluate(
+        self,
+        programs: list[Sequence[GPPrimitive]],
+        metadata: list[Mapping[str, object] | None],
+    ) -> list[Individual]:
+        if len(programs) == 1:
+            return super()._evaluate(programs, metadata)
+        executor = self._executor_for_batch()
+        chunksize = max(1, len(programs) // (self.max_workers * 4))
+        return list(
+            executor.map(
+                _evaluate_in_worker,
+                [tuple(program) for program in programs],
+                metadata,
+                chunksize=chunksize,
+            )
+        )
+
+
+def _context_is_picklable(context: EvaluationContext) -> bool:
+    try:
+        pickle.dumps(context)
+    except Exception:
+        return False
+    return True
+
+
+def create_evaluator(
+    kind: str,
+    context: EvaluationContext,
+    *,
+    max_workers: int | None = None,
+    cache: FitnessCache | None = None,
+) -> ProgramEvaluator:
+    """Return an evaluator of ``kind`` bound to ``context``.
+
+    Process pools need a picklable context; configurations holding lambdas
+    (for example custom fitness normalizers) fall back to serial evaluation.
+    """
+
+    if kind not in EVALUATOR_KINDS:
+        raise ValueError(f"Unknown GP evaluator kind: {kind!r}")
+    if max_workers is not None and max_workers <= 0:
+        raise ValueError("max_workers must be positive")
+    if kind == "thread":
+        return ThreadPoolEvaluator(context, max_workers=max_workers, cache=cache)
+    if kind == "process":
+        if _context_is_picklable(context):
+            return ProcessPoolEvaluator(context, max_workers=max_workers, cache=cache)
+        logger.warning(
+            "GP evaluation context cannot be sent to worker processes; using serial evaluation"
+        )
+    return ProgramEvaluator(context, cache=cache)
+
+
+__all__ = [
+    "EVALUATOR_KINDS",
+    "EvaluationContext",
+    "ProcessPoolEvaluator",
+    "ProgramEvaluator",
+    "SerialEvaluator",
+    "ThreadPoolEvaluator",
+    "create_evaluator",
+]
@@ -5,11 +5,12 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass, field
 
-from typing import Callable, Iterable, MutableMapping, Sequence
+from typing import Callable, Iterable, Mapping, MutableMapping, Sequence
 
 from ..config import GraceSettings
 from ..difficulty import DifficultySummary, difficulty_score, summarize_difficulty
 from ..phrase import PhraseNote, PhraseSpan
+from ..phrase_columns import ColumnarPhraseSpan
 from ..soft_key import InstrumentRange
 from .ops import GPPrimitive
 from ..melody import isolate_melody
@@ -96,18 +97,19 @@ class FitnessConfig:
     fidelity_components: FidelityConfig = field(default_factory=FidelityConfig)
 
 
+def _span_midis(span: PhraseSpan) -> Sequence[int]:
+    if isinstance(span, ColumnarPhraseSpan):
+        return span.midis
+    return [note.midi for note in span.notes]
+
+
 def _melodic_contour(span: PhraseSpan) -> tuple[int, ...]:
-    if len(span.notes) < 2:
+    midis = _span_midis(span)
+    if len(midis) < 2:
         return ()
-    contour: list[int] = []
-    for prev, current in zip(span.notes, span.notes[1:]):
-        if current.midi > prev.midi:
-            contour.append(1)
-        elif current.midi < prev.midi:
-            contour.append(-1)
-        else:
-            contour.append(0)
-    return tuple(contour)
+    return tuple(
+        (current > prev) - (current < prev) for prev, current in zip(midis, midis[1:])
+    )
 
 
 def _contour_similarity(original: PhraseSpan, candidate: PhraseSpan) -> float:
@@ -128,9 +130,38 @@ def _contour_similarity(original: PhraseSpan, candidate: PhraseSpan) -> float:
     return matched / max_length
 
 
+def _lcs_length(first: Sequence[int], second: Sequence[int]) -> int:
+    """Return the longest common subsequence length of two integer sequences.
+
+    Uses Hyyrö's bit-parallel recurrence: each bit of ``row`` tracks one
+    position of the shorter sequence, so every symbol of the longer sequence
+    updates a whole DP row with a handful of big-integer operations. Time is
+    O(n*m/w) for machine word size *w* and memory is linear.
+    """
+
+    if len(first) > len(second):
+        first, second = second, first
+    if not first:
+        return 0
+
+    masks: dict[int, int] = {}
+    for index, value in enumerate(first):
+        masks[value] = masks.get(value, 0) | (1 << index)
+
+    full = (1 << len(first)) - 1
+    row = full
+    for value in second:
+        mask = masks.get(value)
+        if mask is None:
+            continue
+        matches = row & mask
+        row = ((row + matches) | (row - matches)) & full
+    return len(first) - row.bit_count()
+
+
 def _longest_common_subsequence_ratio(original: PhraseSpan, candidate: PhraseSpan) -> float:
-    original_midis = [note.midi for note in original.notes]
-    candidate_midis = [note.midi for note in candidate.notes]
+    original_midis = _span_midis(original)
+    candidate_midis = _span_midis(candidate)
 
     if not original_midis and not candidate_midis:
         return 1.0
@@ -140,15 +171,7 @@ def _longest_common_subsequence_ratio(original: PhraseSpan, candidate: PhraseSpa
     if len_a == 0 or len_b == 0:
         return 0.0
 
-    dp = [[0] * (len_b + 1) for _ in range(len_a + 1)]
-    for i in range(len_a):
-        for j in range(len_b):
-            if original_midis[i] == candidate_midis[j]:
-                dp[i + 1][j + 1] = dp[i][j] + 1
-            else:
-                dp[i + 1][j + 1] = max(dp[i][j + 1], dp[i + 1][j])
-
-    lcs_length = dp[len_a][len_b]
+    lcs_length = _lcs_length(original_midis, candidate_midis)
     denominator = max(len_a, len_b)
     if denominator == 0:
         return 1.0
@@ -161,23 +184,23 @@ def _normalized_tessitura_distance(summary: DifficultySummary, instrument: Instr
 
 
 def _pitch_penalty_for_shift(
-    original_notes: Sequence[PhraseNote],
-    candidate_notes: Sequence[PhraseNote],
+    original_midis: Sequence[int],
+    candidate_midis: Sequence[int],
     shift: int,
 ) -> float:
-    max_length = max(len(original_notes), len(candidate_notes))
+    max_length = max(len(original_midis), len(candidate_midis))
     if max_length == 0:
         return 0.0
 
-    paired_length = min(len(original_notes), len(candidate_notes))
+    paired_length = min(len(original_midis), len(candidate_midis))
     mismatches = max_length - paired_length
     distance_total = 0
 
-    for source, arranged in zip(original_notes, candidate_notes):
-        adjusted = arranged.midi - shift
-        if source.midi != adjusted:
+    for source, arranged in zip(original_midis, candidate_midis):
+        adjusted = arranged - shift
+        if source != adjusted:
             mismatches += 1
-        distance_total += abs(source.midi - adjusted)
+        distance_total += abs(source - adjusted)
 
     mismatch_ratio = mismatches / max_length
     if paired_length == 0:
@@ -189,22 +212,19 @@ def _pitch_penalty_for_shift(
 
 
 def pitch_penalty(original: PhraseSpan, candidate: PhraseSpan) -> float:
-    if not original.notes and not candidate.notes:
-        return 0.0
-
-    original_notes = original.notes
-    candidate_notes = candidate.notes
-    max_length = max(len(original_notes), len(candidate_notes))
+    original_midis = _span_midis(original)
+    candidate_midis = _span_midis(candidate)
+    max_length = max(len(original_midis), len(candidate_midis))
     if max_length == 0:
         return 0.0
 
-    paired_length = min(len(original_notes), len(candidate_notes))
+    paired_length = min(len(original_midis), len(candidate_midis))
     if paired_length == 0:
         return 1.0
 
     shift_candidates: set[int] = {0}
-    for source, arranged in zip(original_notes, candidate_notes):
-        diff = arranged.midi - source.midi
+    for source, arranged in zip(original_midis, candidate_midis):
+        diff = arranged - source
         if diff == 0:
             continue
         aligned_values = {
@@ -217,12 +237,48 @@ def pitch_penalty(original: PhraseSpan, candidate: PhraseSpan) -> float:
                 shift_candidates.add(aligned)
 
     penalties = [
-        _pitch_penalty_for_shift(original_notes, candidate_notes, shift)
+        _pitch_penalty_for_shift(original_midis, candidate_midis, shift)
         for shift in shift_candidates
     ]
     return min(penalties)
 
 
+def _pitch_penalty_from_differences(differences: Mapping[int, int], count: int) -> float:
+    """Return :func:`pitch_penalty` for two equal-length spans.
+
+    ``differences`` maps each ``candidate.midi - original.midi`` value of the
+    index-aligned note pairs to its number of occurrences across ``count``
+    pairs, which lets callers maintain the histogram incrementally.
+    """
+
+    if count == 0:
+        return 0.0
+
+    shift_candidates: set[int] = {0}
+    for diff in differences:
+        if diff == 0:
+            continue
+        aligned_values = {
+            int(round(diff / 12.0)) * 12,
+            int(math.floor(diff / 12.0)) * 12,
+            int(math.ceil(diff / 12.0)) * 12,
+        }
+        for aligned in aligned_values:
+            if aligned != 0:
+                shift_candidates.add(aligned)
+
+    penalties: list[float] = []
+    for shift in shift_candidates:
+        mismatches = count - differences.get(shift, 0)
+        distance_total = sum(
+            occurrences * abs(diff - shift) for diff, occurrences in differences.items()
+        )
+        mismatch_ratio = mismatches / count
+        distance_ratio = min(1.0, distance_total / (12.0 * count))
+        penalties.append(max(mismatch_ratio, distance_ratio))
+    return min(penalties)
+
+
 def _top_voice_span(span: PhraseSpan) -> PhraseSpan:
     if not span.notes:
         return span
@@ -259,8 +315,8 @@ def melody_pitch_penalty(
     top_original = _top_voice_span(original)
     top_candidate = _top_voice_span(candidate)
     top_penalty = _pitch_penalty_for_shift(
-        top_original.notes,
-        top_candidate.notes,
+        _span_midis(top_original),
+        _span_midis(top_candidate),
         0,
     )
     if top_penalty == 0.0:
@@ -273,14 +329,17 @@ def melody_pitch_penalty(
 def _program_parsimony_penalty(
     program: Sequence[GPPrimitive],
     phrase: PhraseSpan,
+    *,
+    total_duration: int | None = None,
 ) -> float:
     if not program:
         return 0.0
 
+    phrase_duration = phrase.total_duration if total_duration is None else total_duration
     span_counts: MutableMapping[tuple[str, tuple[int, int]], int] = {}
     for operation in program:
         try:
-            resolved = operation.span.resolve(phrase)
+            resolved = operation.span.resolve_for_duration(phrase_duration)
         except ValueError:
             continue
         key = (operation.span.label, resolved)
@@ -311,25 +370,40 @@ def compute_fitness(
     playability_penalty = difficulty_score(
         difficulty_summary, grace_settings=grace_settings
     )
-    playability_value = applied_config.playability.apply(playability_penalty)
-
     contour_similarity = _contour_similarity(original, candidate)
-    contour_penalty = 1.0 - contour_similarity
     lcs_ratio = _longest_common_subsequence_ratio(original, candidate)
-    lcs_penalty = 1.0 - lcs_ratio
-    pitch_penalty_value = pitch_penalty(original, candidate)
-    fidelity_penalty = applied_config.fidelity_components.combine(
+    return _combine_components(
+        applied_config,
+        playability_penalty=playability_penalty,
+        contour_penalty=1.0 - contour_similarity,
+        lcs_penalty=1.0 - lcs_ratio,
+        pitch_penalty_value=pitch_penalty(original, candidate),
+        tessitura_distance=_normalized_tessitura_distance(difficulty_summary, instrument),
+        program_size_penalty=_program_parsimony_penalty(program_values, original),
+    )
+
+
+def _combine_components(
+    config: FitnessConfig,
+    *,
+    playability_penalty: float,
+    contour_penalty: float,
+    lcs_penalty: float,
+    pitch_penalty_value: float,
+    tessitura_distance: float,
+    program_size_penalty: float,
+) -> FitnessVector:
+    """Weight raw objective components into a rounded fitness vector."""
+
+    playability_value = config.playability.apply(playability_penalty)
+    fidelity_penalty = config.fidelity_components.combine(
         contour_penalty,
         lcs_penalty,
         pitch_penalty_value,
     )
-    fidelity_value = applied_config.fidelity.apply(fidelity_penalty)
-
-    tessitura_distance = _normalized_tessitura_distance(difficulty_summary, instrument)
-    tessitura_value = applied_config.tessitura.apply(tessitura_distance)
-
-    program_size_penalty = _program_parsimony_penalty(program_values, original)
-    program_size_value = applied_config.program_size.apply(program_size_penalty)
+    fidelity_value = config.fidelity.apply(fidelity_penalty)
+    tessitura_value = config.tessitura.apply(tessitura_distance)
+    program_size_value = config.program_size.apply(program_size_penalty)
 
     return FitnessVector(
         playability=round(playability_value, 12),
@@ -0,0 +1,156 @@
+"""Bounded memoisation of GP program scores within a session."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Mapping, Sequence
+
+from domain.arrangement.phrase import PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange
+
+from .ops import GPPrimitive
+from .selection import Individual
+
+
+DEFAULT_FITNESS_CACHE_SIZE = 4096
+
+ProgramKey = tuple[tuple[object, ...], ...]
+
+
+def canonical_program_key(program: Sequence[GPPrimitive]) -> ProgramKey:
+    """Return a hashable structural key describing *program*.
+
+    The key captures the primitive type, its parameters and the raw span
+    descriptor, so equal programs map to the same entry even when they were
+    rebuilt independently by crossover or mutation.
+    """
+
+    entries: list[tuple[object, ...]] = []
+    for operation in program:
+        parameters = tuple(sorted(operation.parameter_values().items()))
+        span = operation.span
+        start = None if span.start_onset is None else int(span.start_onset)
+        end = None if span.end_onset is None else int(span.end_onset)
+        entries.append((type(operation).__name__, parameters, span.label, start, end))
+    return tuple(entries)
+
+
+def instrument_cache_key(instrument: InstrumentRange) -> tuple[object, ...]:
+    """Return a hashable key for *instrument*, including windway assignments."""
+
+    windway_ids = tuple(getattr(instrument, "windway_ids", ()) or ())
+    windway_map = getattr(instrument, "windway_map", None) or {}
+    return (
+        type(instrument).__name__,
+        instrument.min_midi,
+        instrument.max_midi,
+        instrument.comfort_center,
+        windway_ids,
+        tuple(sorted((int(midi), tuple(indices)) for midi, indices in windway_map.items())),
+    )
+
+
+def span_cache_key(span: PhraseSpan) -> str:
+    """Return a digest of *span*'s notes and resolution.
+
+    Equal digests mean equal spans, so callers can key on the phrase without
+    hashing every note on each lookup.
+    """
+
+    text = repr((span.pulses_per_quarter, span.notes))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FitnessCache:
+    """Thread-safe LRU cache of scored programs with hit/miss accounting.
+
+    A ``max_entries`` of zero disables storage while still counting misses,
+    which keeps the logged statistics meaningful when caching is turned off.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_FITNESS_CACHE_SIZE) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries cannot be negative")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> object | None:
+        """Return the cached value for *key*, or ``None`` when absent."""
+
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def record_hit(self) -> None:
+        """Count a lookup satisfied without consulting the cache entries."""
+
+        with self._lock:
+            self.hits += 1
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Store *value* under *key*, evicting the least recently used entries."""
+
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+def rebind_individual(
+    cached: Individual,
+    program: Sequence[GPPrimitive],
+    metadata: Mapping[str, object] | None,
+) -> Individual:
+    """Return *cached* re-labelled with the caller's *program* and *metadata*."""
+
+    metadata_dict = dict(metadata or {})
+    cached_metadata = cached.metadata or {}
+    if "simplify_ops" in cached_metadata and "simplify_ops" not in metadata_dict:
+        metadata_dict["simplify_ops"] = cached_metadata["simplify_ops"]
+    return Individual(program=tuple(program), fitness=cached.fitness, metadata=metadata_dict)
+
+
+__all__ = [
+    "DEFAULT_FITNESS_CACHE_SIZE",
+    "FitnessCache",
+    "ProgramKey",
+    "canonical_program_key",
+    "instrument_cache_key",
+    "rebind_individual",
+    "span_cache_key",
+]
@@ -0,0 +1,425 @@
+"""Incremental fitness evaluation for span-local GP primitives.
+
+``evaluate_program`` re-applies a whole program and rescans the entire phrase
+for every candidate. GP primitives never add, remove or move notes in time:
+``LocalOctave`` and ``SimplifyRhythm`` only rewrite the notes inside the window
+resolved from their ``SpanDescriptor`` and ``GlobalTranspose`` shifts every
+pitch. :class:`IncrementalEvaluator` exploits this by splitting the source
+phrase into bar-sized windows and keeping, per window, partial sums of the
+``DifficultySummary`` components, contour matches and a histogram of pitch
+differences against the source. Applying a primitive rebuilds only the windows
+it touches (plus the boundary pair of the following window), and intermediate
+states are cached by program prefix so offspring that share a parent's prefix
+only pay for the primitives that differ.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+from domain.arrangement.config import GraceSettings
+from domain.arrangement.difficulty import _build_summary, difficulty_score
+from domain.arrangement.difficulty_profile import difficulty_profile
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange
+
+from .evaluation import finalize_individual
+from .fitness import (
+    FitnessConfig,
+    FitnessVector,
+    _combine_components,
+    _lcs_length,
+    _normalized_tessitura_distance,
+    _pitch_penalty_from_differences,
+    _program_parsimony_penalty,
+)
+from .fitness_cache import canonical_program_key
+from .ops import GPPrimitive, GlobalTranspose, LocalOctave, SimplifyRhythm
+from .penalties import ScoringPenalties
+from .selection import Individual
+
+
+DEFAULT_MAX_CACHED_STATES = 256
+
+# easy, medium, hard, very_hard, weighted distance, total duration, grace duration
+_NoteTotals = tuple[float, float, float, float, float, float, float]
+# leap weight, fast windway switch weight, subhole duration, contour matches
+_PairTotals = tuple[float, float, float, int]
+
+_NO_PAIRS: _PairTotals = (0.0, 0.0, 0.0, 0)
+
+
+def _sign(value: int) -> int:
+    if value > 0:
+        return 1
+    if value < 0:
+        return -1
+    return 0
+
+
+@dataclass(frozen=True)
+class _Window:
+    """Notes of one bar-sized window together with their partial sums."""
+
+    lo: int
+    notes: tuple[PhraseNote, ...]
+    note_totals: _NoteTotals
+    inner_pairs: _PairTotals
+    boundary_pair: _PairTotals
+    differences: Mapping[int, int]
+    max_end: int
+    dirty: bool
+
+
+@dataclass(frozen=True)
+class _State:
+    windows: tuple[_Window, ...]
+    total_duration: int
+
+
+class IncrementalEvaluator:
+    """Score programs against *phrase* by updating per-window statistics.
+
+    The resulting individuals match :func:`evaluate_program`; the only
+    difference is the order in which floating-point partial sums are added.
+    """
+
+    def __init__(
+        self,
+        phrase: PhraseSpan,
+        instrument: InstrumentRange,
+        *,
+        fitness_config: FitnessConfig | None,
+        penalties: ScoringPenalties | None = None,
+        grace_settings: GraceSettings | None = None,
+        window_pulses: int | None = None,
+        max_cached_states: int = DEFAULT_MAX_CACHED_STATES,
+    ) -> None:
+        self.phrase = phrase
+        self.instrument = instrument
+        self.fitness_config = fitness_config or FitnessConfig()
+        self.penalties = penalties
+        self.grace_settings = grace_settings
+        self.max_cached_states = max(0, max_cached_states)
+        self._center = (
+            instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
+        )
+        self._profile = difficulty_profile(instrument)
+        self._sixteenth = max(1, phrase.pulses_per_quarter // 4)
+
+        notes = phrase.notes
+        self._original_midis = tuple(note.midi for note in notes)
+        self._original_contour = tuple(
+            _sign(current - previous)
+            for previous, current in zip(self._original_midis, self._original_midis[1:])
+        )
+        self._phrase_duration = phrase.total_duration
+
+        pulses = window_pulses or phrase.pulses_per_quarter * 4
+        self._window_pulses = max(1, int(pulses))
+        self._window_keys: list[int] = []
+        groups: list[tuple[int, list[PhraseNote]]] = []
+        for index, note in enumerate(notes):
+            key = note.onset // self._window_pulses
+            if not self._window_keys or self._window_keys[-1] != key:
+                self._window_keys.append(key)
+                groups.append((index, []))
+            groups[-1][1].append(note)
+
+        windows: list[_Window] = []
+        for lo, group in groups:
+            previous_last = windows[-1].notes[-1] if windows else None
+            windows.append(self._build_window(lo, tuple(group), previous_last))
+        base = _State(windows=tuple(windows), total_duration=self._phrase_duration)
+
+        self._lock = threading.Lock()
+        self._states: OrderedDict[tuple[object, ...], _State] = OrderedDict()
+        self._base_state = base
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def evaluate(
+        self,
+        program: Sequence[GPPrimitive],
+        metadata: Mapping[str, object] | None = None,
+    ) -> Individual:
+        """Return the scored individual for *program* (see ``evaluate_program``)."""
+
+        program = tuple(program)
+        state = self._state_for(program)
+        fitness = self._fitness(program, state)
+        return finalize_individual(
+            program, fitness, metadata=metadata, penalties=self.penalties
+        )
+
+    # ------------------------------------------------------------------
+    # Program application
+    # ------------------------------------------------------------------
+    def _state_for(self, program: tuple[GPPrimitive, ...]) -> _State:
+        key = canonical_program_key(program)
+        state = self._base_state
+        start = 0
+        with self._lock:
+            for length in range(len(program), 0, -1):
+                cached = self._states.get(key[:length])
+                if cached is not None:
+                    self._states.move_to_end(key[:length])
+                    state = cached
+                    start = length
+                    break
+
+        for length in range(start + 1, len(program) + 1):
+            state = self._apply(program[length - 1], state)
+            self._remember(key[:length], state)
+        return state
+
+    def _remember(self, key: tuple[object, ...], state: _State) -> None:
+        if self.max_cached_states == 0:
+            return
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_cached_states:
+                self._states.popitem(last=False)
+
+    def _apply(self, operation: GPPrimitive, state: _State) -> _State:
+        if isinstance(operation, GlobalTranspose):
+            if operation.semitones == 0:
+                return state
+            semitones = operation.semitones
+            return self._replace_windows(
+                state,
+                {
+                    index: tuple(note.with_midi(note.midi + semitones) for note in window.notes)
+                    for index, window in enumerate(state.windows)
+                },
+            )
+        if isinstance(operation, LocalOctave):
+            return self._apply_local_octave(operation, state)
+        if isinstance(operation, SimplifyRhythm):
+            return self._apply_simplify_rhythm(operation, state)
+        return state
+
+    def _affected_windows(self, start: int, end: int) -> range:
+        first = bisect_left(self._window_keys, start // self._window_pulses)
+        last = bisect_right(self._window_keys, (end - 1) // self._window_pulses)
+        return range(first, last)
+
+    def _apply_local_octave(self, operation: LocalOctave, state: _State) -> _State:
+        try:
+            start, end = operation.span.resolve_for_duration(state.total_duration)
+        except ValueError:
+            return state
+        if operation.octaves == 0:
+            return state
+
+        semitones = operation.octaves * 12
+        updates: dict[int, tuple[PhraseNote, ...]] = {}
+        for index in self._affected_windows(start, end):
+            notes = state.windows[index].notes
+            if not any(start <= note.onset < end for note in notes):
+                continue
+            shifted = [
+                note.with_midi(note.midi + semitones) if start <= note.onset < end else note
+                for note in notes
+            ]
+            updates[index] = tuple(sorted(shifted, key=lambda note: (note.onset, note.midi)))
+        return self._replace_windows(state, updates)
+
+    def _apply_simplify_rhythm(self, operation: SimplifyRhythm, state: _State) -> _State:
+        try:
+            start, end = operation.span.resolve_for_duration(state.total_duration)
+        except ValueError:
+            return state
+
+        subdivisions = max(1, int(operation.subdivisions))
+        unit = max(1, self.phrase.pulses_per_quarter // subdivisions)
+        updates: dict[int, tuple[PhraseNote, ...]] = {}
+        for index in self._affected_windows(start, end):
+            notes = state.windows[index].notes
+            updated: list[PhraseNote] = []
+            changed = False
+            for note in notes:
+                if not (start <= note.onset < end):
+                    updated.append(note)
+                    continue
+                quantized = max(unit, round(note.duration / unit) * unit)
+                duration = min(quantized, max(1, end - note.onset))
+                if duration != note.duration:
+                    changed = True
+                    note = note.with_duration(duration)
+                updated.append(note)
+            if changed:
+                updates[index] = tuple(updated)
+        return self._replace_windows(state, updates)
+
+    def _replace_windows(
+        self, state: _State, updates: Mapping[int, tuple[PhraseNote, ...]]
+    ) -> _State:
+        if not updates:
+            return state
+        windows = list(state.windows)
+        for index in sorted(updates):
+            previous_last = windows[index - 1].notes[-1] if index > 0 else None
+            windows[index] = self._build_window(
+                windows[index].lo, updates[index], previous_last
+            )
+            following = index + 1
+            if following < len(windows) and following not in updates:
+                neighbour = windows[following]
+                windows[following] = _Window(
+                    lo=neighbour.lo,
+                    notes=neighbour.notes,
+                    note_totals=neighbour.note_totals,
+                    inner_pairs=neighbour.inner_pairs,
+                    boundary_pair=self._pair_totals(
+                        windows[index].notes[-1], neighbour.notes[0], neighbour.lo - 1
+                    ),
+                    differences=neighbour.differences,
+                    max_end=neighbour.max_end,
+                    dirty=neighbour.dirty,
+                )
+        total_duration = max((window.max_end for window in windows), default=0)
+        return _State(windows=tuple(windows), total_duration=total_duration)
+
+    # ------------------------------------------------------------------
+    # Window statistics
+    # ------------------------------------------------------------------
+    def _pair_totals(self, first: PhraseNote, second: PhraseNote, index: int) -> _PairTotals:
+        leap, fast_switch, subhole = self._profile.pair_values(
+            first.midi,
+            first.duration,
+            first.tags,
+            second.midi,
+            second.duration,
+            second.tags,
+            self._sixteenth,
+        )
+        matched = int(_sign(second.midi - first.midi) == self._original_contour[index])
+        return (leap, fast_switch, subhole, matched)
+
+    def _build_window(
+        self,
+        lo: int,
+        notes: tuple[PhraseNote, ...],
+        previous_last: PhraseNote | None,
+    ) -> _Window:
+        categories = [0.0, 0.0, 0.0, 0.0]
+        weighted_distance = 0.0
+        total_duration = 0.0
+        grace_duration = 0.0
+        differences: Counter[int] = Counter()
+        max_end = 0
+        for offset, note in enumerate(notes):
+            duration = float(note.duration)
+            total_duration += duration
+            if "grace" in note.tags:
+                grace_duration += duration
+            categories[self._profile.category(note.midi)] += duration
+            weighted_distance += duration * abs(note.midi - self._center)
+            differences[note.midi - self._original_midis[lo + offset]] += 1
+            max_end = max(max_end, note.onset + note.duration)
+
+        leap = fast_switch = subhole = 0.0
+        matched = 0
+        for offset in range(len(notes) - 1):
+            pair = self._pair_totals(notes[offset], notes[offset + 1], lo + offset)
+            leap += pair[0]
+            fast_switch += pair[1]
+            subhole += pair[2]
+            matched += pair[3]
+
+        boundary = (
+            _NO_PAIRS
+            if previous_last is None
+            else self._pair_totals(previous_last, notes[0], lo - 1)
+        )
+        return _Window(
+            lo=lo,
+            notes=notes,
+            note_totals=(
+                categories[0],
+                categories[1],
+                categories[2],
+                categories[3],
+                weighted_distance,
+                total_duration,
+                grace_duration,
+            ),
+            inner_pairs=(leap, fast_switch, subhole, matched),
+            boundary_pair=boundary,
+            differences=differences,
+            max_end=max_end,
+            dirty=any(diff != 0 for diff in differences),
+        )
+
+    # ------------------------------------------------------------------
+    # Fitness
+    # ------------------------------------------------------------------
+    def _fitness(self, program: tuple[GPPrimitive, ...], state: _State) -> FitnessVector:
+        windows = state.windows
+        note_totals = [0.0] * 7
+        pair_totals = [0.0, 0.0, 0.0, 0]
+        differences: Counter[int] = Counter()
+        for window in windows:
+            for position, value in enumerate(window.note_totals):
+                note_totals[position] += value
+            for position in range(4):
+                pair_totals[position] += window.inner_pairs[position]
+                pair_totals[position] += window.boundary_pair[position]
+            differences.update(window.differences)
+
+        summary = _build_summary(
+            {
+                "easy": note_totals[0],
+                "medium": note_totals[1],
+                "hard": note_totals[2],
+                "very_hard": note_totals[3],
+            },
+            weighted_distance=note_totals[4],
+            total_duration=note_totals[5],
+            grace_duration=note_totals[6],
+            leap_weight=pair_totals[0],
+            fast_switch_weight=pair_totals[1],
+            subhole_transition_duration=pair_totals[2],
+        )
+
+        count = len(self._original_midis)
+        contour_similarity = 1.0 if count < 2 else pair_totals[3] / (count - 1)
+        return _combine_components(
+            self.fitness_config,
+            playability_penalty=difficulty_score(summary, grace_settings=self.grace_settings),
+            contour_penalty=1.0 - contour_similarity,
+            lcs_penalty=1.0 - self._lcs_ratio(windows, count),
+            pitch_penalty_value=_pitch_penalty_from_differences(differences, count),
+            tessitura_distance=_normalized_tessitura_distance(summary, self.instrument),
+            program_size_penalty=_program_parsimony_penalty(
+                program, self.phrase, total_duration=self._phrase_duration
+            ),
+        )
+
+    def _lcs_ratio(self, windows: Sequence[_Window], count: int) -> float:
+        if count == 0:
+            return 1.0
+        dirty = [index for index, window in enumerate(windows) if window.dirty]
+        if not dirty:
+            return 1.0
+
+        # Identical prefixes and suffixes always belong to an LCS, so only the
+        # span between the first and last modified window needs the full scan.
+        first, last = windows[dirty[0]], windows[dirty[-1]]
+        lo = first.lo
+        hi = last.lo + len(last.notes)
+        candidate_middle = [
+            note.midi for window in windows[dirty[0] : dirty[-1] + 1] for note in window.notes
+        ]
+        middle = _lcs_length(self._original_midis[lo:hi], candidate_middle)
+        return (lo + (count - hi) + middle) / count
+
+
+__all__ = ["DEFAULT_MAX_CACHED_STATES", "IncrementalEvaluator"]
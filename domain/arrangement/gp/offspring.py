@@ -9,8 +9,9 @@ from domain.arrangement.config import GraceSettings
 from domain.arrangement.phrase import PhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
 
-from .evaluation import evaluate_program
+from .evaluator import EvaluationContext, ProgramEvaluator
 from .fitness import FitnessConfig
+from .ops import GPPrimitive
 from .penalties import ScoringPenalties
 from .selection import Individual
 from .program_ops import primitive_sampler
@@ -32,12 +33,28 @@ def produce_offspring(
     population_size: int,
     constraints,
     grace_settings: GraceSettings | None = None,
+    evaluator: ProgramEvaluator | None = None,
 ) -> list[Individual]:
-    """Generate a population of offspring from *population*."""
+    """Generate a population of offspring from *population*.
+
+    Child programs are bred first and then scored as one batch through
+    *evaluator*, which defaults to serial evaluation in the calling thread.
+    """
 
     if not population:
         return []
 
+    if evaluator is None:
+        evaluator = ProgramEvaluator(
+            EvaluationContext(
+                phrase=phrase,
+                instrument=instrument,
+                fitness_config=fitness_config,
+                penalties=penalties,
+                grace_settings=grace_settings,
+            )
+        )
+
     sampler = primitive_sampler(
         rng,
         phrase,
@@ -45,8 +62,9 @@ def produce_offspring(
         span_limits,
         penalties=penalties,
     )
-    offspring: list[Individual] = []
-    while len(offspring) < population_size:
+    programs: list[Sequence[GPPrimitive]] = []
+    metadata: list[Mapping[str, object]] = []
+    while len(programs) < population_size:
         perform_crossover = len(population) >= 2 and rng.random() < crossover_rate
         if perform_crossover:
             parent_a, parent_b = rng.sample(list(population), 2)
@@ -59,22 +77,14 @@ def produce_offspring(
                 constraints=constraints,
             )
             for child_program in children:
-                metadata = {
-                    "origin": "crossover",
-                    "generation": generation_index + 1,
-                }
-                offspring.append(
-                    evaluate_program(
-                        child_program,
-                        phrase=phrase,
-                        instrument=instrument,
-                        fitness_config=fitness_config,
-                        penalties=penalties,
-                        metadata=metadata,
-                        grace_settings=grace_settings,
-                    )
+                programs.append(child_program)
+                metadata.append(
+                    {
+                        "origin": "crossover",
+                        "generation": generation_index + 1,
+                    }
                 )
-                if len(offspring) >= population_size:
+                if len(programs) >= population_size:
                     break
             continue
 
@@ -94,23 +104,15 @@ def produce_offspring(
         except RuntimeError:
             continue
 
-        metadata = {
-            "origin": "mutation",
-            "generation": generation_index + 1,
-        }
-        offspring.append(
-            evaluate_program(
-                mutated_program,
-                phrase=phrase,
-                instrument=instrument,
-                fitness_config=fitness_config,
-                penalties=penalties,
-                metadata=metadata,
-                grace_settings=grace_settings,
-            )
+        programs.append(mutated_program)
+        metadata.append(
+            {
+                "origin": "mutation",
+                "generation": generation_index + 1,
+            }
         )
 
-    return offspring
+    return evaluator.evaluate_batch(programs, metadata)
 
 
 __all__ = ["produce_offspring"]
@@ -83,7 +83,15 @@ class SpanDescriptor:
             ValueError: if the descriptor targets an empty or invalid region.
         """
 
-        total_duration = span.total_duration
+        return self.resolve_for_duration(span.total_duration)
+
+    def resolve_for_duration(self, total_duration: int) -> tuple[int, int]:
+        """Resolve bounds against a phrase lasting *total_duration* pulses.
+
+        Raises:
+            ValueError: if the descriptor targets an empty or invalid region.
+        """
+
         start = 0 if self.start_onset is None else int(self.start_onset)
         end = total_duration if self.end_onset is None else int(self.end_onset)
 
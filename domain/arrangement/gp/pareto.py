@@ -0,0 +1,225 @@
+"""Index-based Pareto ranking and a bounded elitist archive.
+
+The routines here work on plain objective tuples addressed by position, so
+no ``Individual`` is hashed while sorting. Fronts are found with efficient
+non-dominated sorting (ENS-BS): candidates are visited in lexicographic
+order, where nothing can be dominated by a later candidate, and each one is
+placed by binary search over the fronts built so far. The members of every
+front are then ordered exactly as the classic pairwise NSGA-II procedure
+would list them, so callers see the same fronts in the same order.
+"""
+
+from __future__ import annotations
+
+from operator import le, lt
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .selection import Individual
+
+Vector = tuple[float, ...]
+
+
+def vector_dominates(left: Vector, right: Vector) -> bool:
+    """Return ``True`` when *left* Pareto dominates *right* (minimisation)."""
+
+    if not left or not right:
+        return False
+    return all(map(le, left, right)) and any(map(lt, left, right))
+
+
+def _lex_dominates(earlier: Vector, later: Vector) -> bool:
+    # ``earlier`` sorts lexicographically before ``later``, so being no worse
+    # everywhere and not equal is enough for dominance.
+    return earlier != later and all(map(le, earlier, later))
+
+
+def _ens_fronts(vectors: Sequence[Vector]) -> list[list[int]]:
+    fronts: list[list[int]] = []
+    for index in sorted(range(len(vectors)), key=vectors.__getitem__):
+        vector = vectors[index]
+        low, high = 0, len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            # Members added last are lexicographically closest, so check them first.
+            if any(_lex_dominates(vectors[other], vector) for other in reversed(fronts[middle])):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(fronts):
+            fronts.append([index])
+        else:
+            fronts[low].append(index)
+    return fronts
+
+
+def _pairwise_fronts(vectors: Sequence[Vector]) -> list[list[int]]:
+    count = len(vectors)
+    dominated: list[list[int]] = [[] for _ in range(count)]
+    counts = [0] * count
+    for p in range(count):
+        for q in range(count):
+            if p == q:
+                continue
+            if vector_dominates(vectors[p], vectors[q]):
+                dominated[p].append(q)
+            elif vector_dominates(vectors[q], vectors[p]):
+                counts[p] += 1
+    fronts: list[list[int]] = []
+    current = [index for index in range(count) if counts[index] == 0]
+    while current:
+        fronts.append(current)
+        following: list[int] = []
+        for p in current:
+            for q in dominated[p]:
+                counts[q] -= 1
+                if counts[q] == 0:
+                    following.append(q)
+        current = following
+    return fronts
+
+
+def pareto_fronts(vectors: Sequence[Vector]) -> list[list[int]]:
+    """Return the Pareto fronts of *vectors* as lists of positions.
+
+    The first front is in input order. A later member is listed when the
+    last member of the previous front that dominates it is reached, with
+    input order breaking ties; this is the order in which pairwise
+    fast-non-dominated sorting releases members.
+    """
+
+    if not vectors:
+        return []
+    width = len(vectors[0])
+    if any(len(vector) != width for vector in vectors) or any(
+        value != value for vector in vectors for value in vector
+    ):
+        # Ragged or NaN objectives do not sort lexicographically.
+        return _pairwise_fronts(vectors)
+
+    fronts = _ens_fronts(vectors)
+    ordered = [sorted(fronts[0])]
+    for members in fronts[1:]:
+        previous = ordered[-1]
+        release: list[tuple[int, int]] = []
+        for index in members:
+            vector = vectors[index]
+            position = next(
+                position
+                for position in range(len(previous) - 1, -1, -1)
+                if vector_dominates(vectors[previous[position]], vector)
+            )
+            release.append((position, index))
+        release.sort()
+        ordered.append([index for _position, index in release])
+    return ordered
+
+
+def crowding_distances(vectors: Sequence[Vector], front: Sequence[int]) -> list[float]:
+    """Return NSGA-II crowding distances for the positions in *front*."""
+
+    count = len(front)
+    if count == 0:
+        return []
+    if count <= 2:
+        return [float("inf")] * count
+    distances = [0.0] * count
+    for objective in range(len(vectors[front[0]])):
+        values = [vectors[index][objective] for index in front]
+        ranked = sorted(range(count), key=lambda slot: (values[slot], slot))
+        min_value = values[ranked[0]]
+        max_value = values[ranked[-1]]
+        distances[ranked[0]] = float("inf")
+        distances[ranked[-1]] = float("inf")
+        if max_value == min_value:
+            continue
+        scale = max_value - min_value
+        for position in range(1, count - 1):
+            distances[ranked[position]] += (
+                values[ranked[position + 1]] - values[ranked[position - 1]]
+            ) / scale
+    return distances
+
+
+def truncate_by_fronts(vectors: Sequence[Vector], limit: int) -> list[int]:
+    """Return up to *limit* positions, best fronts first, crowding-trimmed last."""
+
+    selected: list[int] = []
+    for front in pareto_fronts(vectors):
+        space = limit - len(selected)
+        if space <= 0:
+            break
+        if len(front) <= space:
+            selected.extend(front)
+            continue
+        distances = crowding_distances(vectors, front)
+        ranked = sorted(range(len(front)), key=lambda slot: (-distances[slot], slot))
+        selected.extend(front[slot] for slot in ranked[:space])
+        break
+    return selected
+
+
+class ParetoArchive:
+    """Bounded elitist archive that is updated in place between generations.
+
+    Members are indexed by program so repeat candidates are merged in O(1)
+    (a newcomer replaces the stored entry only when it dominates it), and
+    each member's objective tuple is computed once. Overflowing updates are
+    trimmed with :func:`truncate_by_fronts`, exactly as
+    :func:`selection.update_archive` would.
+    """
+
+    def __init__(self, max_size: int, members: Iterable[Individual] = ()) -> None:
+        if max_size < 0:
+            raise ValueError("max_size cannot be negative")
+        self.max_size = max_size
+        self._members: list[Individual] = []
+        self._vectors: list[Vector] = []
+        self._slots: dict[tuple, int] = {}
+        self._insert_all(members)
+
+    @property
+    def members(self) -> tuple[Individual, ...]:
+        return tuple(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _insert_all(self, individuals: Iterable[Individual]) -> None:
+        for individual in individuals:
+            vector = individual.fitness.as_tuple()
+            slot = self._slots.get(individual.program)
+            if slot is None:
+                self._slots[individual.program] = len(self._members)
+                self._members.append(individual)
+                self._vectors.append(vector)
+            elif vector_dominates(vector, self._vectors[slot]):
+                self._members[slot] = individual
+                self._vectors[slot] = vector
+
+    def update(self, candidates: Iterable[Individual]) -> list[Individual]:
+        """Merge *candidates* and return the archive's new members in order."""
+
+        if self.max_size <= 0:
+            self._members, self._vectors, self._slots = [], [], {}
+            return []
+        self._insert_all(candidates)
+        if len(self._members) > self.max_size:
+            self._evict()
+        return list(self._members)
+
+    def _evict(self) -> None:
+        kept = truncate_by_fronts(self._vectors, self.max_size)
+        members = [self._members[index] for index in kept]
+        self._members = members
+        self._vectors = [self._vectors[index] for index in kept]
+        self._slots = {member.program: slot for slot, member in enumerate(members)}
+
+
+__all__ = [
+    "ParetoArchive",
+    "crowding_distances",
+    "pareto_fronts",
+    "truncate_by_fronts",
+    "vector_dominates",
+]
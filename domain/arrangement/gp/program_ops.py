@@ -7,6 +7,7 @@ from typing import Callable, Iterable, Mapping, Sequence
 from shared.ottava import OttavaShift
 
 from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.phrase_columns import ColumnarPhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
 
 from .ops import GPPrimitive, GlobalTranspose, LocalOctave, SimplifyRhythm
@@ -23,8 +24,13 @@ def apply_program(program: Sequence[GPPrimitive], span: PhraseSpan) -> PhraseSpa
 
 
 def apply_primitive(operation: GPPrimitive, span: PhraseSpan) -> PhraseSpan:
-    """Apply a single GP primitive to *span*."""
+    """Apply a single GP primitive to *span*.
 
+    Columnar spans are edited column-wise and stay columnar.
+    """
+
+    if isinstance(span, ColumnarPhraseSpan):
+        return _apply_primitive_columns(operation, span)
     if isinstance(operation, GlobalTranspose):
         return span.transpose(operation.semitones)
     if isinstance(operation, LocalOctave):
@@ -34,6 +40,14 @@ def apply_primitive(operation: GPPrimitive, span: PhraseSpan) -> PhraseSpan:
     return span
 
 
+def _octave_shift_marker(octaves: int) -> OttavaShift:
+    return OttavaShift(
+        source="octave-shift",
+        direction="up" if octaves > 0 else "down",
+        size=8 * abs(octaves),
+    )
+
+
 def _apply_local_octave(operation: LocalOctave, span: PhraseSpan) -> PhraseSpan:
     try:
         start, end = operation.span.resolve(span)
@@ -44,12 +58,7 @@ def _apply_local_octave(operation: LocalOctave, span: PhraseSpan) -> PhraseSpan:
         return span
 
     semitones = operation.octaves * 12
-    direction = "up" if semitones > 0 else "down"
-    shift = OttavaShift(
-        source="octave-shift",
-        direction=direction,
-        size=8 * abs(operation.octaves),
-    )
+    shift = _octave_shift_marker(operation.octaves)
 
     updated: list[PhraseNote] = []
     for note in span.notes:
@@ -83,6 +92,41 @@ def _apply_simplify_rhythm(operation: SimplifyRhythm, span: PhraseSpan) -> Phras
     return span.with_notes(updated)
 
 
+def _apply_primitive_columns(
+    operation: GPPrimitive, span: ColumnarPhraseSpan
+) -> ColumnarPhraseSpan:
+    # Notes sharing an onset always fall on the same side of a span boundary,
+    # so shifting or re-timing the onset range never breaks the column order.
+    if isinstance(operation, GlobalTranspose):
+        return span.transpose(operation.semitones)
+    if not isinstance(operation, (LocalOctave, SimplifyRhythm)):
+        return span
+    try:
+        start, end = operation.span.resolve(span)
+    except ValueError:
+        return span
+    indices = span.onset_range(start, end)
+
+    if isinstance(operation, LocalOctave):
+        if operation.octaves == 0 or not indices:
+            return span
+        semitones = operation.octaves * 12
+        midis = span.midis[:]
+        for index in indices:
+            midis[index] += semitones
+        return span.with_ottava_shift(
+            indices, _octave_shift_marker(operation.octaves)
+        ).with_midis(midis)
+
+    unit = max(1, span.pulses_per_quarter // max(1, int(operation.subdivisions)))
+    durations = span.durations[:]
+    onsets = span.onsets
+    for index in indices:
+        quantized = max(unit, round(durations[index] / unit) * unit)
+        durations[index] = min(quantized, max(1, end - onsets[index]))
+    return span.with_durations(durations)
+
+
 def primitive_sampler(
     rng,
     phrase: PhraseSpan,
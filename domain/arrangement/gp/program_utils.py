@@ -5,13 +5,12 @@ from __future__ import annotations
 import math
 from typing import Iterable, Mapping, Sequence, Tuple
 
-from shared.ottava import OttavaShift
-
 from domain.arrangement.melody import isolate_melody
-from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.phrase import PhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
 
 from .ops import GPPrimitive, GlobalTranspose, LocalOctave, SimplifyRhythm
+from .program_ops import apply_program
 
 
 def describe_program(program: Sequence[GPPrimitive]) -> str:
@@ -37,21 +36,6 @@ def describe_program(program: Sequence[GPPrimitive]) -> str:
     return " -> ".join(parts)
 
 
-def apply_program(program: Sequence[GPPrimitive], span: PhraseSpan) -> PhraseSpan:
-    current = span
-    for operation in program:
-        if isinstance(operation, GlobalTranspose):
-            current = current.transpose(operation.semitones)
-            continue
-        if isinstance(operation, LocalOctave):
-            current = _apply_local_octave(operation, current)
-            continue
-        if isinstance(operation, SimplifyRhythm):
-            current = _apply_simplify_rhythm(operation, current)
-            continue
-    return current
-
-
 def program_candidates(
     programs: Sequence[Sequence[GPPrimitive]],
     phrase: PhraseSpan,
@@ -237,55 +221,6 @@ def auto_range_programs(
     return tuple(programs)
 
 
-def _apply_local_octave(operation: LocalOctave, span: PhraseSpan) -> PhraseSpan:
-    try:
-        start, end = operation.span.resolve(span)
-    except ValueError:
-        return span
-
-    if operation.octaves == 0:
-        return span
-
-    semitones = operation.octaves * 12
-    direction = "up" if semitones > 0 else "down"
-    shift = OttavaShift(
-        source="octave-shift",
-        direction=direction,
-        size=8 * abs(operation.octaves),
-    )
-
-    updated: list[PhraseNote] = []
-    for note in span.notes:
-        if start <= note.onset < end:
-            updated.append(note.with_midi(note.midi + semitones).add_ottava_shift(shift))
-            continue
-        updated.append(note)
-    return span.with_notes(updated)
-
-
-def _apply_simplify_rhythm(operation: SimplifyRhythm, span: PhraseSpan) -> PhraseSpan:
-    try:
-        start, end = operation.span.resolve(span)
-    except ValueError:
-        return span
-
-    subdivisions = max(1, int(operation.subdivisions))
-    unit = max(1, span.pulses_per_quarter // subdivisions)
-    updated: list[PhraseNote] = []
-
-    for note in span.notes:
-        if not (start <= note.onset < end):
-            updated.append(note)
-            continue
-
-        quantized = max(unit, round(note.duration / unit) * unit)
-        max_duration = max(1, end - note.onset)
-        updated_duration = min(quantized, max_duration)
-        updated.append(note.with_duration(updated_duration))
-
-    return span.with_notes(updated)
-
-
 __all__ = [
     "apply_program",
     "auto_range_programs",
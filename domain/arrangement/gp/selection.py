@@ -7,6 +7,13 @@ from typing import Iterable, Mapping, Sequence
 
 from .fitness import FitnessVector
 from .ops import GPPrimitive
+from .pareto import (
+    ParetoArchive,
+    crowding_distances,
+    pareto_fronts,
+    truncate_by_fronts,
+    vector_dominates,
+)
 
 
 @dataclass(frozen=True)
@@ -38,94 +45,27 @@ class SelectionConfig:
 def dominates(left: FitnessVector, right: FitnessVector) -> bool:
     """Return ``True`` when *left* Pareto dominates *right*."""
 
-    left_values = left.as_tuple()
-    right_values = right.as_tuple()
-
-    if not left_values or not right_values:
-        return False
-
-    no_worse = all(l <= r for l, r in zip(left_values, right_values))
-    strictly_better = any(l < r for l, r in zip(left_values, right_values))
-    return no_worse and strictly_better
+    return vector_dominates(left.as_tuple(), right.as_tuple())
 
 
 def nondominated_sort(population: Sequence[Individual]) -> list[list[Individual]]:
-    """Group *population* into Pareto fronts using fast non-dominated sorting."""
+    """Group *population* into Pareto fronts using fast non-dominated sorting.
 
-    if not population:
-        return []
+    Fronts and their member order match the classic pairwise procedure; see
+    :func:`pareto.pareto_fronts`.
+    """
 
     individuals = list(population)
-    domination_counts: dict[Individual, int] = {}
-    domination_sets: dict[Individual, list[Individual]] = {}
-    first_front: list[Individual] = []
-
-    for p in individuals:
-        domination_sets[p] = []
-        domination_counts[p] = 0
-        for q in individuals:
-            if p is q:
-                continue
-            if dominates(p.fitness, q.fitness):
-                domination_sets[p].append(q)
-            elif dominates(q.fitness, p.fitness):
-                domination_counts[p] += 1
-        if domination_counts[p] == 0:
-            first_front.append(p)
-
-    fronts: list[list[Individual]] = []
-    current = first_front
-
-    while current:
-        fronts.append(current)
-        next_front: list[Individual] = []
-        added: set[Individual] = set()
-        for p in current:
-            for dominated in domination_sets[p]:
-                domination_counts[dominated] -= 1
-                if domination_counts[dominated] == 0 and dominated not in added:
-                    added.add(dominated)
-                    next_front.append(dominated)
-        current = next_front
-
-    return fronts
+    vectors = [individual.fitness.as_tuple() for individual in individuals]
+    return [[individuals[index] for index in front] for front in pareto_fronts(vectors)]
 
 
 def crowding_distance(front: Sequence[Individual]) -> dict[Individual, float]:
     """Compute crowding distances for *front* following NSGA-II heuristics."""
 
-    count = len(front)
-    if count == 0:
-        return {}
-    if count <= 2:
-        return {individual: float("inf") for individual in front}
-
-    vectors = {individual: individual.fitness.as_tuple() for individual in front}
-    objectives = len(next(iter(vectors.values())))
-    distances = {individual: 0.0 for individual in front}
-    indexed_front = list(enumerate(front))
-
-    for objective in range(objectives):
-        sorted_front = sorted(
-            indexed_front,
-            key=lambda item: (vectors[item[1]][objective], item[0]),
-        )
-        min_value = vectors[sorted_front[0][1]][objective]
-        max_value = vectors[sorted_front[-1][1]][objective]
-        distances[sorted_front[0][1]] = float("inf")
-        distances[sorted_front[-1][1]] = float("inf")
-
-        if max_value == min_value:
-            continue
-
-        scale = max_value - min_value
-        for index in range(1, count - 1):
-            current_individual = sorted_front[index][1]
-            next_value = vectors[sorted_front[index + 1][1]][objective]
-            previous_value = vectors[sorted_front[index - 1][1]][objective]
-            distances[current_individual] += (next_value - previous_value) / scale
-
-    return distances
+    vectors = [individual.fitness.as_tuple() for individual in front]
+    distances = crowding_distances(vectors, range(len(front)))
+    return dict(zip(front, distances))
 
 
 def _deduplicate(individuals: Iterable[Individual]) -> list[Individual]:
@@ -149,31 +89,15 @@ def _deduplicate(individuals: Iterable[Individual]) -> list[Individual]:
     return [seen[key] for key in order]
 
 
-def _sorted_by_crowding(front: Sequence[Individual], distances: Mapping[Individual, float]) -> list[Individual]:
-    indexed_front = list(enumerate(front))
-    indexed_front.sort(key=lambda item: (-distances[item[1]], item[0]))
-    return [individual for _, individual in indexed_front]
-
-
 def select_population(candidates: Sequence[Individual], population_size: int) -> list[Individual]:
     """Select the next generation from *candidates* using NSGA-II selection."""
 
     if population_size <= 0:
         return []
 
-    selected: list[Individual] = []
-    for front in nondominated_sort(candidates):
-        remaining = population_size - len(selected)
-        if remaining <= 0:
-            break
-        if len(front) <= remaining:
-            selected.extend(front)
-            continue
-        distances = crowding_distance(front)
-        ranked = _sorted_by_crowding(front, distances)
-        selected.extend(ranked[:remaining])
-        break
-    return selected
+    individuals = list(candidates)
+    vectors = [individual.fitness.as_tuple() for individual in individuals]
+    return [individuals[index] for index in truncate_by_fronts(vectors, population_size)]
 
 
 def update_archive(
@@ -186,25 +110,7 @@ def update_archive(
 
     if max_size <= 0:
         return []
-
-    combined = _deduplicate(list(archive) + list(candidates))
-    if len(combined) <= max_size:
-        return combined
-
-    updated: list[Individual] = []
-    for front in nondominated_sort(combined):
-        space = max_size - len(updated)
-        if space <= 0:
-            break
-        if len(front) <= space:
-            updated.extend(front)
-            continue
-        distances = crowding_distance(front)
-        ranked = _sorted_by_crowding(front, distances)
-        updated.extend(ranked[:space])
-        break
-
-    return updated
+    return ParetoArchive(max_size, archive).update(candidates)
 
 
 def advance_generation(
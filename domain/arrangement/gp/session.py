@@ -11,12 +11,16 @@ from domain.arrangement.config import GraceSettings
 from domain.arrangement.explanations import ExplanationEvent
 from domain.arrangement.phrase import PhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
+from shared.cancellation import CancellationToken
 
+from .convergence import ConvergenceMonitor
 from .engine import EngineConfig, EngineHooks, EngineState, run_engine
-from .evaluation import evaluate_program
+from .evaluator import EVALUATOR_KINDS, EvaluationContext, ProgramEvaluator, create_evaluator
 from .fitness import FidelityConfig, FitnessConfig, FitnessObjective
+from .fitness_cache import DEFAULT_FITNESS_CACHE_SIZE, FitnessCache
 from .init import seed_programs
 from .offspring import produce_offspring
+from .ops import GPPrimitive
 from .program_ops import ensure_population
 from .selection import Individual, SelectionConfig, advance_generation, update_archive
 from .session_logging import (
@@ -25,6 +29,7 @@ from .session_logging import (
     IndividualSummary,
     fitness_sort_key,
     log_generation,
+    markdown_generation_table,
     serialize_individual,
 )
 from .penalties import ScoringPenalties
@@ -93,6 +98,14 @@ class GPSessionConfig:
     fitness_config: FitnessConfig | None = field(default_factory=_default_fitness_config)
     time_budget_seconds: float | None = None
     scoring_penalties: ScoringPenalties = field(default_factory=ScoringPenalties)
+    evaluator: str = "serial"
+    evaluator_workers: int | None = None
+    fitness_cache_size: int = DEFAULT_FITNESS_CACHE_SIZE
+    incremental_evaluation: bool = True
+    stagnation_generations: int | None = None
+    hypervolume_epsilon: float | None = None
+    stop_on_unchanged_archive: bool = False
+    stop_on_unchanged_winner: bool = False
 
     def __post_init__(self) -> None:
         if self.generations <= 0:
@@ -113,6 +126,23 @@ class GPSessionConfig:
             raise ValueError("log_best_programs must be positive")
         if self.time_budget_seconds is not None and self.time_budget_seconds < 0:
             raise ValueError("time_budget_seconds cannot be negative")
+        if self.evaluator not in EVALUATOR_KINDS:
+            raise ValueError(f"evaluator must be one of {', '.join(EVALUATOR_KINDS)}")
+        if self.evaluator_workers is not None and self.evaluator_workers <= 0:
+            raise ValueError("evaluator_workers must be positive")
+        if self.fitness_cache_size < 0:
+            raise ValueError("fitness_cache_size cannot be negative")
+        if self.stagnation_generations is not None and self.stagnation_generations <= 0:
+            raise ValueError("stagnation_generations must be positive")
+        if self.hypervolume_epsilon is not None and self.hypervolume_epsilon < 0:
+            raise ValueError("hypervolume_epsilon cannot be negative")
+        uses_detector = (
+            self.hypervolume_epsilon is not None
+            or self.stop_on_unchanged_archive
+            or self.stop_on_unchanged_winner
+        )
+        if uses_detector and self.stagnation_generations is None:
+            raise ValueError("stagnation_generations is required by the convergence detectors")
 
     def as_serializable_dict(self) -> dict[str, object]:
         constraints = self.constraints
@@ -147,6 +177,14 @@ class GPSessionConfig:
                 "melody_shift_weight": self.scoring_penalties.melody_shift_weight,
                 "rhythm_simplify_weight": self.scoring_penalties.rhythm_simplify_weight,
             },
+            "evaluator": self.evaluator,
+            "evaluator_workers": self.evaluator_workers,
+            "fitness_cache_size": self.fitness_cache_size,
+            "incremental_evaluation": self.incremental_evaluation,
+            "stagnation_generations": self.stagnation_generations,
+            "hypervolume_epsilon": self.hypervolume_epsilon,
+            "stop_on_unchanged_archive": self.stop_on_unchanged_archive,
+            "stop_on_unchanged_winner": self.stop_on_unchanged_winner,
         }
 
 
@@ -159,6 +197,9 @@ class GPSessionResult:
     generations: int
     elapsed_seconds: float
     termination_reason: str
+    fitness_cache: FitnessCache | None = field(default=None, compare=False, repr=False)
+
+
 def _report_progress(
     callback: Callable[[int, int], None] | None, generation: int, total_generations: int
 ) -> None:
@@ -170,46 +211,6 @@ def _report_progress(
         logger.exception("GP session progress callback failed")
 
 
-def _program_description(entries: Sequence[Mapping[str, object]]) -> str:
-    if not entries:
-        return "<identity>"
-    parts: list[str] = []
-    for entry in entries:
-        entry_type = entry.get("type", "<unknown>")
-        span_info = entry.get("span", {}) if isinstance(entry.get("span"), Mapping) else {}
-        label = span_info.get("label", "phrase")
-        parameters = [
-            f"{key}={value}"
-            for key, value in entry.items()
-            if key not in {"type", "span"}
-        ]
-        parameter_text = ", ".join(parameters)
-        if parameter_text:
-            parts.append(f"{entry_type}({parameter_text}@{label})")
-        else:
-            parts.append(f"{entry_type}@{label}")
-    return " -> ".join(parts)
-
-
-def _markdown_generation_table(rows: Sequence[tuple[str, IndividualSummary, int]]) -> str:
-    header = "| Gen | Rank | Program | Play | Fidelity | Tessitura | Size | Origin |\n"
-    header += "| --- | --- | --- | --- | --- | --- | --- | --- |"
-    formatted_rows: list[str] = [header]
-    for label, summary, rank in rows:
-        fitness = summary.fitness
-        program_desc = _program_description(summary.program)
-        play = fitness.get("playability", 0.0)
-        fidelity = fitness.get("fidelity", 0.0)
-        tessitura = fitness.get("tessitura", 0.0)
-        size = fitness.get("program_size", 0.0)
-        metadata = summary.metadata
-        origin = metadata.get("origin", "?") if isinstance(metadata, Mapping) else "?"
-        formatted_rows.append(
-            f"| {label} | {rank} | {program_desc} | {play:.3f} | {fidelity:.3f} | {tessitura:.3f} | {size:.3f} | {origin} |"
-        )
-    return "\n".join(formatted_rows)
-
-
 def run_gp_session(
     phrase: PhraseSpan,
     instrument: InstrumentRange,
@@ -219,8 +220,20 @@ def run_gp_session(
     transposition: int = 0,
     progress_callback: Callable[[int, int], None] | None = None,
     grace_settings: GraceSettings | None = None,
+    fitness_cache: FitnessCache | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> GPSessionResult:
+    """Run a GP session for *phrase* on *instrument*.
+
+    ``fitness_cache`` lets callers inspect the memoised program scores and
+    their hit counters afterwards, or share the cache with later scoring
+    passes; a fresh cache sized by
+    ``config.fitness_cache_size`` is created otherwise. ``cancellation`` is checked between generations.
+    """
+
     rng = random.Random(config.random_seed)
+    if fitness_cache is None:
+        fitness_cache = FitnessCache(config.fitness_cache_size)
     span_limits = dict(config.span_limits or {})
 
     seeded = seed_programs(
@@ -244,18 +257,56 @@ def run_gp_session(
         penalties=config.scoring_penalties,
     )
 
-    population = [
-        evaluate_program(
-            program,
+    evaluator = create_evaluator(
+        config.evaluator,
+        EvaluationContext(
             phrase=phrase,
             instrument=instrument,
             fitness_config=config.fitness_config,
-            metadata={"origin": "seed", "generation": 0, "index": index},
             penalties=config.scoring_penalties,
             grace_settings=grace_settings,
+            incremental=config.incremental_evaluation,
+        ),
+        max_workers=config.evaluator_workers,
+        cache=fitness_cache,
+    )
+    with evaluator:
+        return _run_session_loop(
+            phrase,
+            instrument,
+            config=config,
+            rng=rng,
+            span_limits=span_limits,
+            initial_pool=initial_pool,
+            evaluator=evaluator,
+            fitness_cache=fitness_cache,
+            progress_callback=progress_callback,
+            grace_settings=grace_settings,
+            cancellation=cancellation,
         )
-        for index, program in enumerate(initial_pool)
-    ]
+
+
+def _run_session_loop(
+    phrase: PhraseSpan,
+    instrument: InstrumentRange,
+    *,
+    config: GPSessionConfig,
+    rng: random.Random,
+    span_limits: dict[str, int],
+    initial_pool: Sequence[Sequence[GPPrimitive]],
+    evaluator: ProgramEvaluator,
+    fitness_cache: FitnessCache,
+    progress_callback: Callable[[int, int], None] | None,
+    grace_settings: GraceSettings | None,
+    cancellation: CancellationToken | None = None,
+) -> GPSessionResult:
+    population = evaluator.evaluate_batch(
+        initial_pool,
+        [
+            {"origin": "seed", "generation": 0, "index": index}
+            for index in range(len(initial_pool))
+        ],
+    )
 
     selection_config = SelectionConfig(
         population_size=config.population_size,
@@ -282,6 +333,7 @@ def run_gp_session(
             current_population,
             current_archive,
             best_count=config.log_best_programs,
+            fitness_cache=fitness_cache.stats(),
         )
         _report_progress(progress_callback, state.generation, config.generations)
         if logger.isEnabledFor(logging.DEBUG):
@@ -290,10 +342,11 @@ def run_gp_session(
                 for summary in generation_log.best_programs
             )
             logger.debug(
-                "run_gp_session:generation index=%d best=[%s] archive=%d",
+                "run_gp_session:generation index=%d best=[%s] archive=%d cache=%s",
                 state.generation,
                 best_programs or "",
                 len(generation_log.archive),
+                generation_log.fitness_cache,
             )
         if config.log_markdown_generations:
             markdown_rows.extend(
@@ -338,6 +391,7 @@ def run_gp_session(
             population_size=config.population_size,
             constraints=config.constraints,
             grace_settings=grace_settings,
+            evaluator=evaluator,
         )
 
     def _selection(
@@ -358,15 +412,22 @@ def run_gp_session(
         generations=config.generations,
         time_budget_seconds=config.time_budget_seconds,
     )
+    convergence = ConvergenceMonitor(
+        config.stagnation_generations or 1,
+        hypervolume_epsilon=config.hypervolume_epsilon,
+        archive=config.stop_on_unchanged_archive,
+        winner=config.stop_on_unchanged_winner,
+    )
     engine_hooks = EngineHooks(
         initialize=_initialize,
         variation=_variation,
         selection=_selection,
         log_generation=_log_hook,
         local_search=_local_search,
+        termination=convergence if convergence.enabled else None,
     )
 
-    engine_result = run_engine(engine_config, engine_hooks)
+    engine_result = run_engine(engine_config, engine_hooks, cancellation=cancellation)
     log.generations = list(engine_result.logs)
 
     final_archive = list(engine_result.archive)
@@ -381,7 +442,7 @@ def run_gp_session(
 
     if config.log_markdown_generations and markdown_rows and logger.isEnabledFor(logging.DEBUG):
         markdown_rows.append(("final", final_summary, 1))
-        table = _markdown_generation_table(markdown_rows)
+        table = markdown_generation_table(markdown_rows)
         logger.debug("run_gp_session:best programs markdown\n%s", table)
 
     return GPSessionResult(
@@ -392,6 +453,7 @@ def run_gp_session(
         generations=engine_result.generations,
         elapsed_seconds=engine_result.elapsed_seconds,
         termination_reason=engine_result.termination_reason,
+        fitness_cache=fitness_cache,
     )
 
 __all__ = [
@@ -81,14 +81,18 @@ class GenerationLog:
     metrics: Mapping[str, object]
     best_programs: Sequence[IndividualSummary]
     archive: Sequence[IndividualSummary]
+    fitness_cache: Mapping[str, int] | None = None
 
     def to_dict(self) -> dict[str, object]:
-        return {
+        data = {
             "index": self.index,
             "metrics": dict(self.metrics),
             "best_programs": [summary.to_dict() for summary in self.best_programs],
             "archive": [summary.to_dict() for summary in self.archive],
         }
+        if self.fitness_cache is not None:
+            data["fitness_cache"] = dict(self.fitness_cache)
+        return data
 
 
 @dataclass
@@ -115,6 +119,7 @@ def log_generation(
     archive: Sequence[Individual],
     *,
     best_count: int,
+    fitness_cache: Mapping[str, int] | None = None,
 ) -> GenerationLog:
     metrics = _population_metrics(population)
     best = sorted(population, key=fitness_sort_key)[:best_count]
@@ -128,15 +133,59 @@ def log_generation(
         metrics=metrics,
         best_programs=best_summaries,
         archive=archive_summaries,
+        fitness_cache=dict(fitness_cache) if fitness_cache is not None else None,
     )
 
 
+def _program_description(entries: Sequence[Mapping[str, object]]) -> str:
+    if not entries:
+        return "<identity>"
+    parts: list[str] = []
+    for entry in entries:
+        entry_type = entry.get("type", "<unknown>")
+        span_info = entry.get("span", {}) if isinstance(entry.get("span"), Mapping) else {}
+        label = span_info.get("label", "phrase")
+        parameters = [
+            f"{key}={value}"
+            for key, value in entry.items()
+            if key not in {"type", "span"}
+        ]
+        parameter_text = ", ".join(parameters)
+        if parameter_text:
+            parts.append(f"{entry_type}({parameter_text}@{label})")
+        else:
+            parts.append(f"{entry_type}@{label}")
+    return " -> ".join(parts)
+
+
+def markdown_generation_table(rows: Sequence[tuple[str, IndividualSummary, int]]) -> str:
+    """Render ``(generation label, summary, rank)`` rows as a Markdown table."""
+
+    header = "| Gen | Rank | Program | Play | Fidelity | Tessitura | Size | Origin |\n"
+    header += "| --- | --- | --- | --- | --- | --- | --- | --- |"
+    formatted_rows: list[str] = [header]
+    for label, summary, rank in rows:
+        fitness = summary.fitness
+        program_desc = _program_description(summary.program)
+        play = fitness.get("playability", 0.0)
+        fidelity = fitness.get("fidelity", 0.0)
+        tessitura = fitness.get("tessitura", 0.0)
+        size = fitness.get("program_size", 0.0)
+        metadata = summary.metadata
+        origin = metadata.get("origin", "?") if isinstance(metadata, Mapping) else "?"
+        formatted_rows.append(
+            f"| {label} | {rank} | {program_desc} | {play:.3f} | {fidelity:.3f} | {tessitura:.3f} | {size:.3f} | {origin} |"
+        )
+    return "\n".join(formatted_rows)
+
+
 __all__ = [
     "GPSessionLog",
     "GenerationLog",
     "IndividualSummary",
     "fitness_sort_key",
     "log_generation",
+    "markdown_generation_table",
     "serialize_individual",
 ]
 
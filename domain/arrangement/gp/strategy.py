@@ -19,8 +19,10 @@ from domain.arrangement.logging_utils import (
     describe_span,
     span_note_names,
 )
+from shared.cancellation import CancellationToken, raise_if_cancelled
 
 from .fitness import compute_fitness, melody_pitch_penalty
+from .fitness_cache import DEFAULT_FITNESS_CACHE_SIZE, FitnessCache
 from .ops import GPPrimitive
 from .program_utils import (
     auto_range_programs as _auto_range_programs,
@@ -62,12 +64,15 @@ def arrange_v3_gp(
     preferred_register_shift: int | None = None,
     progress_callback: Callable[[int, int], None] | None = None,
     grace_settings: GraceSettings | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> GPArrangementStrategyResult:
     """Run a GP session for ``instrument_id`` and rank starred instruments.
 
     The return value surfaces the winning candidate, the ordered comparison list,
     the serialized Pareto archive, termination metadata, and any best-effort
     fallback computed via the arranger v2 pipeline when the GP loop exits early.
+    ``cancellation`` is checked between generations and candidate programs and
+    aborts the run with :class:`~shared.cancellation.OperationCancelled`.
     """
 
     manual_offset = manual_transposition or 0
@@ -85,6 +90,10 @@ def arrange_v3_gp(
             describe_span(phrase),
             config,
         )
+    # Shared by the session and the winner and instrument scoring passes below.
+    fitness_cache = FitnessCache(
+        getattr(config, "fitness_cache_size", DEFAULT_FITNESS_CACHE_SIZE)
+    )
     session = run_gp_session(
         phrase,
         base_instrument,
@@ -93,16 +102,19 @@ def arrange_v3_gp(
         transposition=transposition,
         progress_callback=progress_callback,
         grace_settings=active_grace,
+        fitness_cache=fitness_cache,
+        cancellation=cancellation,
     )
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(
-            "arrange_v3_gp:session complete reason=%s generations=%d elapsed=%.3fs winner_program=%s winner_fitness=%s",
+            "arrange_v3_gp:session complete reason=%s generations=%d elapsed=%.3fs winner_program=%s winner_fitness=%s cache=%s",
             session.termination_reason,
             session.generations,
             session.elapsed_seconds,
             _describe_program(session.winner.program),
             session.winner.fitness.as_tuple(),
+            fitness_cache.stats(),
         )
         for generation in session.log.generations:
             best_programs = ", ".join(
@@ -136,6 +148,7 @@ def arrange_v3_gp(
         fitness_config=config.fitness_config,
         allow_range_clamp=allow_range_clamp,
         grace_settings=active_grace,
+        fitness_cache=fitness_cache,
     )
 
     if logger.isEnabledFor(logging.DEBUG):
@@ -173,6 +186,7 @@ def arrange_v3_gp(
     candidate_keys: dict[str, SortKey] = {}
     baseline_top_voice: tuple[PhraseNote, ...] | None = None
     for candidate_id in candidate_ids:
+        raise_if_cancelled(cancellation)
         instrument = get_instrument_range(candidate_id)
         expected_offset = None
         if baseline_top_voice is not None:
@@ -190,6 +204,8 @@ def arrange_v3_gp(
             grace_settings=active_grace,
             baseline_top_voice=baseline_top_voice,
             expected_offset=expected_offset,
+            cancellation=cancellation,
+            fitness_cache=fitness_cache,
         )
         candidates.append(candidate)
         candidate_keys[candidate.instrument_id] = sort_key
@@ -279,6 +295,7 @@ def arrange_v3_gp(
             starred_ids=starred_ids,
             strategy="starred-best",
             grace_settings=active_grace,
+            cancellation=cancellation,
         )
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("arrange_v3_gp:fallback computed strategy=starred-best")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import replace
 from typing import Sequence, Tuple
 
 from domain.arrangement.config import GraceSettings
@@ -14,6 +15,12 @@ from domain.arrangement.range_guard import enforce_instrument_range
 from domain.arrangement.soft_key import InstrumentRange
 
 from .explain import explain_program
+from .fitness_cache import (
+    FitnessCache,
+    canonical_program_key,
+    instrument_cache_key,
+    span_cache_key,
+)
 from .fitness import FitnessConfig, compute_fitness, melody_pitch_penalty
 from .ops import GPPrimitive, GlobalTranspose
 from .program_utils import (
@@ -51,6 +58,76 @@ def _evaluate_program_candidate(
     reference_span: PhraseSpan | None = None,
     uniform_reference_top_voice: Sequence[PhraseNote] | None = None,
     uniform_reference_deltas: Sequence[int] | None = None,
+    fitness_cache: FitnessCache | None = None,
+) -> tuple[GPInstrumentCandidate, ExplanationEvent | None]:
+    """Score *program* for *instrument*, reusing ``fitness_cache`` when possible.
+
+    Only evaluations without top-voice alignment inputs are cached: those
+    depend on nothing but the phrase, the instrument and the program once the
+    fitness configuration of the run is fixed, so the winner pass and the
+    requested instrument's scoring pass share their entries. A given
+    ``candidate_span`` must be *program* applied to *phrase*, and the cache
+    must not outlive the ``arrange_v3_gp`` call that created it.
+    """
+
+    key = None
+    if (
+        fitness_cache is not None
+        and not (baseline_top_voice and expected_offset is not None)
+        and not uniform_reference_top_voice
+        and uniform_reference_deltas is None
+        and (reference_span is None or reference_span == phrase)
+    ):
+        key = (
+            "candidate",
+            span_cache_key(phrase),
+            instrument_id,
+            instrument_cache_key(instrument),
+            canonical_program_key(program),
+            beats_per_measure,
+            allow_range_clamp,
+        )
+        cached = fitness_cache.get(key)
+        if cached is not None:
+            candidate, range_event = cached  # type: ignore[misc]
+            return replace(candidate, program=program), range_event
+    result = _score_program_candidate(
+        program,
+        instrument_id=instrument_id,
+        instrument=instrument,
+        phrase=phrase,
+        beats_per_measure=beats_per_measure,
+        fitness_config=fitness_config,
+        candidate_span=candidate_span,
+        allow_range_clamp=allow_range_clamp,
+        grace_settings=grace_settings,
+        baseline_top_voice=baseline_top_voice,
+        expected_offset=expected_offset,
+        reference_span=reference_span,
+        uniform_reference_top_voice=uniform_reference_top_voice,
+        uniform_reference_deltas=uniform_reference_deltas,
+    )
+    if key is not None:
+        fitness_cache.put(key, result)  # type: ignore[union-attr]
+    return result
+
+
+def _score_program_candidate(
+    program: Tuple[GPPrimitive, ...],
+    *,
+    instrument_id: str,
+    instrument: InstrumentRange,
+    phrase: PhraseSpan,
+    beats_per_measure: int,
+    fitness_config: FitnessConfig | None,
+    candidate_span: PhraseSpan | None,
+    allow_range_clamp: bool,
+    grace_settings: GraceSettings | None,
+    baseline_top_voice: Sequence[PhraseNote] | None,
+    expected_offset: int | None,
+    reference_span: PhraseSpan | None,
+    uniform_reference_top_voice: Sequence[PhraseNote] | None,
+    uniform_reference_deltas: Sequence[int] | None,
 ) -> tuple[GPInstrumentCandidate, ExplanationEvent | None]:
     if candidate_span is None:
         candidate_span = phrase if not program else _apply_program(program, phrase)
@@ -16,8 +16,10 @@ from domain.arrangement.logging_utils import (
 from domain.arrangement.phrase import PhraseNote, PhraseSpan
 from domain.arrangement.range_guard import enforce_instrument_range
 from domain.arrangement.soft_key import InstrumentRange
+from shared.cancellation import CancellationToken, raise_if_cancelled
 
 from .fitness import FitnessConfig
+from .fitness_cache import FitnessCache
 from .ops import GPPrimitive
 from .program_utils import (
     auto_range_programs as _default_auto_range_programs,
@@ -78,6 +80,8 @@ def score_instrument(
     grace_settings: GraceSettings | None = None,
     baseline_top_voice: Sequence[PhraseNote] | None = None,
     expected_offset: int | None = None,
+    cancellation: CancellationToken | None = None,
+    fitness_cache: FitnessCache | None = None,
 ) -> tuple[
     "GPInstrumentCandidate",
     SortKey,
@@ -183,6 +187,7 @@ def score_instrument(
         ordered_programs = [tuple(program) for program in candidate_programs]
 
     for program in ordered_programs:
+        raise_if_cancelled(cancellation)
         program_key = tuple(program)
         if program_key in processed_programs:
             continue
@@ -270,6 +275,7 @@ def score_instrument(
                 )
                 else None
             ),
+            fitness_cache=fitness_cache,
         )
         if (
             phrase_exceeds_span
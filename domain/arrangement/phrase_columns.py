@@ -0,0 +1,293 @@
+"""Columnar, array-backed representation of :class:`PhraseSpan`.
+
+``PhraseSpan`` stores one frozen :class:`PhraseNote` per note, so every
+transpose or GP primitive allocates a fresh object per note and re-sorts the
+tuple. :class:`ColumnarPhraseSpan` keeps onsets, durations and MIDI numbers in
+parallel ``array('i')`` columns and stores tags and ottava shifts as indices
+into small interned tables. Span-wide edits only copy the columns they touch
+and never re-sort, because the arranger's edits keep the ``(onset, midi)``
+ordering intact. ``notes`` is materialised lazily for callers that still need
+``PhraseNote`` objects.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import FrozenSet, Iterable, Sequence, Tuple
+
+from shared.ottava import OttavaShift
+
+from .phrase import PhraseNote, PhraseSpan
+
+
+_EMPTY_TAGS: FrozenSet[str] = frozenset()
+_EMPTY_SHIFTS: Tuple[OttavaShift, ...] = ()
+
+
+def _intern(value: object, table: list, index: dict) -> int:
+    position = index.get(value)
+    if position is None:
+        position = len(table)
+        table.append(value)
+        index[value] = position
+    return position
+
+
+class ColumnarPhraseSpan:
+    """Phrase stored as parallel integer columns sorted by ``(onset, midi)``.
+
+    The public surface mirrors :class:`PhraseSpan` (``notes``,
+    ``pulses_per_quarter``, ``with_notes``, ``transpose``, ``total_duration``,
+    ``eighth_duration``, ``first_onset`` and ``bar_number``). Columns are
+    shared between derived spans and must be treated as read-only.
+    """
+
+    __slots__ = (
+        "onsets",
+        "durations",
+        "midis",
+        "tag_ids",
+        "ottava_ids",
+        "tag_table",
+        "ottava_table",
+        "pulses_per_quarter",
+        "_notes",
+    )
+
+    def __init__(
+        self,
+        onsets: array,
+        durations: array,
+        midis: array,
+        tag_ids: array,
+        ottava_ids: array,
+        tag_table: Tuple[FrozenSet[str], ...] = (_EMPTY_TAGS,),
+        ottava_table: Tuple[Tuple[OttavaShift, ...], ...] = (_EMPTY_SHIFTS,),
+        pulses_per_quarter: int = 480,
+    ) -> None:
+        length = len(onsets)
+        if any(len(column) != length for column in (durations, midis, tag_ids, ottava_ids)):
+            raise ValueError("phrase columns must have the same length")
+        self.onsets = onsets
+        self.durations = durations
+        self.midis = midis
+        self.tag_ids = tag_ids
+        self.ottava_ids = ottava_ids
+        self.tag_table = tag_table
+        self.ottava_table = ottava_table
+        self.pulses_per_quarter = pulses_per_quarter
+        self._notes: Tuple[PhraseNote, ...] | None = None
+
+    # ------------------------------------------------------------------
+    # Construction and conversion
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_notes(
+        cls, notes: Iterable[PhraseNote], pulses_per_quarter: int = 480
+    ) -> "ColumnarPhraseSpan":
+        """Build columns from *notes*, sorting them like :class:`PhraseSpan`."""
+
+        ordered = tuple(sorted(notes, key=lambda note: (note.onset, note.midi)))
+        return cls._from_sorted_notes(ordered, pulses_per_quarter)
+
+    @classmethod
+    def from_span(cls, span: PhraseSpan) -> "ColumnarPhraseSpan":
+        """Return the columnar form of *span*, reusing its note objects."""
+
+        if isinstance(span, ColumnarPhraseSpan):
+            return span
+        return cls._from_sorted_notes(span.notes, span.pulses_per_quarter)
+
+    @classmethod
+    def _from_sorted_notes(
+        cls, notes: Tuple[PhraseNote, ...], pulses_per_quarter: int
+    ) -> "ColumnarPhraseSpan":
+        tag_table: list = [_EMPTY_TAGS]
+        tag_index: dict = {_EMPTY_TAGS: 0}
+        ottava_table: list = [_EMPTY_SHIFTS]
+        ottava_index: dict = {_EMPTY_SHIFTS: 0}
+        span = cls(
+            array("i", [note.onset for note in notes]),
+            array("i", [note.duration for note in notes]),
+            array("i", [note.midi for note in notes]),
+            array("I", [_intern(note.tags, tag_table, tag_index) for note in notes]),
+            array(
+                "I",
+                [_intern(note.ottava_shifts, ottava_table, ottava_index) for note in notes],
+            ),
+            tuple(tag_table),
+            tuple(ottava_table),
+            pulses_per_quarter,
+        )
+        span._notes = notes
+        return span
+
+    def to_span(self) -> PhraseSpan:
+        """Return an equivalent object-per-note :class:`PhraseSpan`."""
+
+        return PhraseSpan(self.notes, self.pulses_per_quarter)
+
+    @property
+    def notes(self) -> Tuple[PhraseNote, ...]:
+        notes = self._notes
+        if notes is None:
+            tag_table = self.tag_table
+            ottava_table = self.ottava_table
+            notes = tuple(
+                PhraseNote(onset, duration, midi, ottava_table[ottava_id], tag_table[tag_id])
+                for onset, duration, midi, tag_id, ottava_id in zip(
+                    self.onsets, self.durations, self.midis, self.tag_ids, self.ottava_ids
+                )
+            )
+            self._notes = notes
+        return notes
+
+    def _derive(self, **columns: object) -> "ColumnarPhraseSpan":
+        return ColumnarPhraseSpan(
+            columns.get("onsets", self.onsets),
+            columns.get("durations", self.durations),
+            columns.get("midis", self.midis),
+            columns.get("tag_ids", self.tag_ids),
+            columns.get("ottava_ids", self.ottava_ids),
+            columns.get("tag_table", self.tag_table),
+            columns.get("ottava_table", self.ottava_table),
+            self.pulses_per_quarter,
+        )
+
+    # ------------------------------------------------------------------
+    # PhraseSpan-compatible API
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.onsets)
+
+    def with_notes(self, notes: Iterable[PhraseNote]) -> "ColumnarPhraseSpan":
+        return ColumnarPhraseSpan.from_notes(notes, self.pulses_per_quarter)
+
+    def transpose(self, semitones: int) -> "ColumnarPhraseSpan":
+        if semitones == 0:
+            return self
+        return self._derive(midis=array("i", [midi + semitones for midi in self.midis]))
+
+    @property
+    def total_duration(self) -> int:
+        if not self.onsets:
+            return 0
+        return max(map(int.__add__, self.onsets, self.durations))
+
+    def eighth_duration(self) -> int:
+        return max(1, self.pulses_per_quarter // 2)
+
+    @property
+    def first_onset(self) -> int:
+        if not self.onsets:
+            return 0
+        return self.onsets[0]
+
+    def bar_number(self, *, beats_per_measure: int = 4) -> int:
+        if beats_per_measure <= 0:
+            raise ValueError("beats_per_measure must be positive")
+
+        pulses_per_bar = max(1, self.pulses_per_quarter * beats_per_measure)
+        return (self.first_onset // pulses_per_bar) + 1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnarPhraseSpan):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple[object, ...]:
+        return (
+            self.pulses_per_quarter,
+            self.onsets.tobytes(),
+            self.durations.tobytes(),
+            self.midis.tobytes(),
+            tuple(self.tag_table[tag_id] for tag_id in self.tag_ids),
+            tuple(self.ottava_table[ottava_id] for ottava_id in self.ottava_ids),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ColumnarPhraseSpan(notes={len(self)}, "
+            f"pulses_per_quarter={self.pulses_per_quarter})"
+        )
+
+    # ------------------------------------------------------------------
+    # Column edits
+    # ------------------------------------------------------------------
+    def onset_range(self, start: int, end: int) -> range:
+        """Return the note indices whose onset lies in ``[start, end)``."""
+
+        return range(bisect_left(self.onsets, start), bisect_left(self.onsets, end))
+
+    def with_midis(self, midis: Sequence[int]) -> "ColumnarPhraseSpan":
+        """Return a span with replaced pitches, re-sorting only when required."""
+
+        updated = array("i", midis)
+        if len(updated) != len(self):
+            raise ValueError("phrase columns must have the same length")
+        derived = self._derive(midis=updated)
+        onsets = self.onsets
+        for index in range(1, len(onsets)):
+            if onsets[index] == onsets[index - 1] and updated[index] < updated[index - 1]:
+                return derived.take(range(len(onsets)))
+        return derived
+
+    def with_durations(self, durations: Sequence[int]) -> "ColumnarPhraseSpan":
+        updated = array("i", durations)
+        if len(updated) != len(self):
+            raise ValueError("phrase columns must have the same length")
+        return self._derive(durations=updated)
+
+    def with_ottava_shift(
+        self, indices: Iterable[int], shift: OttavaShift
+    ) -> "ColumnarPhraseSpan":
+        """Append *shift* to the ottava shifts of the notes at *indices*."""
+
+        table = list(self.ottava_table)
+        lookup = {value: position for position, value in enumerate(table)}
+        remapped: dict[int, int] = {}
+        ottava_ids = array("I", self.ottava_ids)
+        for index in indices:
+            current = ottava_ids[index]
+            target = remapped.get(current)
+            if target is None:
+                target = _intern(table[current] + (shift,), table, lookup)
+                remapped[current] = target
+            ottava_ids[index] = target
+        return self._derive(ottava_ids=ottava_ids, ottava_table=tuple(table))
+
+    def with_tag(self, indices: Iterable[int], tag: str) -> "ColumnarPhraseSpan":
+        """Add *tag* to the tag set of the notes at *indices*."""
+
+        table = list(self.tag_table)
+        lookup = {value: position for position, value in enumerate(table)}
+        tag_ids = array("I", self.tag_ids)
+        for index in indices:
+            tag_ids[index] = _intern(table[tag_ids[index]] | {tag}, table, lookup)
+        return self._derive(tag_ids=tag_ids, tag_table=tuple(table))
+
+    def take(self, indices: Iterable[int]) -> "ColumnarPhraseSpan":
+        """Return the notes at *indices*, ordered by ``(onset, midi)``."""
+
+        onsets, midis = self.onsets, self.midis
+        ordered = sorted(indices, key=lambda index: (onsets[index], midis[index]))
+        return self._derive(
+            onsets=array("i", [onsets[index] for index in ordered]),
+            durations=array("i", [self.durations[index] for index in ordered]),
+            midis=array("i", [midis[index] for index in ordered]),
+            tag_ids=array("I", [self.tag_ids[index] for index in ordered]),
+            ottava_ids=array("I", [self.ottava_ids[index] for index in ordered]),
+        )
+
+    def tags_at(self, index: int) -> FrozenSet[str]:
+        return self.tag_table[self.tag_ids[index]]
+
+    def ottava_shifts_at(self, index: int) -> Tuple[OttavaShift, ...]:
+        return self.ottava_table[self.ottava_ids[index]]
+
+
+__all__ = ["ColumnarPhraseSpan"]
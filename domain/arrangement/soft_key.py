@@ -49,6 +49,19 @@ class InstrumentWindwayRange(InstrumentRange):
             assignments[midi_value] = normalized
         object.__setattr__(self, "windway_map", MappingProxyType(assignments))
 
+    def __reduce__(self):
+        # ``MappingProxyType`` cannot be pickled; rebuild from a plain dict instead.
+        return (
+            type(self),
+            (
+                self.min_midi,
+                self.max_midi,
+                self.comfort_center,
+                self.windway_ids,
+                dict(self.windway_map),
+            ),
+        )
+
     def windways_for(self, midi: int) -> tuple[int, ...]:
         """Return the windway indices associated with ``midi`` if known."""
 
@@ -76,48 +89,72 @@ class KeyFit:
     score: float
 
 
-def _normalized_duration_ratios(span: PhraseSpan, transposition: int, instrument: InstrumentRange) -> tuple[float, float, float]:
-    total_duration = sum(note.duration for note in span.notes)
-    if total_duration <= 0:
-        return 0.0, 0.0, 0.0
-
-    in_range = 0
-    above = 0
-    below = 0
-    low = instrument.min_midi
-    high = instrument.max_midi
-
-    for note in span.notes:
-        midi = note.midi + transposition
-        duration = note.duration
-        if midi < low:
-            below += duration
-        elif midi > high:
-            above += duration
-        else:
-            in_range += duration
-
-    ratio = in_range / total_duration
-    return ratio, above / total_duration, below / total_duration
-
-
-def _tessitura_spread(span: PhraseSpan, transposition: int, instrument: InstrumentRange) -> float:
-    total_duration = sum(note.duration for note in span.notes)
-    if total_duration <= 0:
-        return 0.0
-
-    center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
-    weighted = 0.0
-    for note in span.notes:
-        midi = note.midi + transposition
-        weighted += note.duration * abs(midi - center)
-    normalized = weighted / total_duration
-    return normalized / instrument.span
-
-
-def _score_transposition(span: PhraseSpan, transposition: int, instrument: InstrumentRange, weights: KeySearchWeights) -> KeyFit:
-    in_range_ratio, above_ratio, below_ratio = _normalized_duration_ratios(span, transposition, instrument)
-    spread = _tessitura_spread(span, transposition, instrument)
+@dataclass(frozen=True)
+class PitchHistogram:
+    """Total sounding duration per MIDI pitch of a span, sorted by pitch.
+
+    Range and tessitura metrics only depend on how long each pitch sounds, so
+    scoring a transposition from the histogram costs O(distinct pitches)
+    rather than a pass over every note.
+    """
+
+    pitches: tuple[int, ...]
+    durations: tuple[int, ...]
+    total_duration: int
+
+    @classmethod
+    def from_span(cls, span: PhraseSpan) -> "PitchHistogram":
+        totals: dict[int, int] = {}
+        for note in span.notes:
+            totals[note.midi] = totals.get(note.midi, 0) + note.duration
+        pitches = tuple(sorted(totals))
+        durations = tuple(totals[pitch] for pitch in pitches)
+        return cls(pitches, durations, sum(durations))
+
+    def range_ratios(
+        self, transposition: int, instrument: InstrumentRange
+    ) -> tuple[float, float, float]:
+        """Return the in-range, above-range and below-range duration ratios."""
+
+        if self.total_duration <= 0:
+            return 0.0, 0.0, 0.0
+
+        in_range = 0
+        above = 0
+        below = 0
+        low = instrument.min_midi - transposition
+        high = instrument.max_midi - transposition
+        for pitch, duration in zip(self.pitches, self.durations):
+            if pitch < low:
+                below += duration
+            elif pitch > high:
+                above += duration
+            else:
+                in_range += duration
+
+        total = self.total_duration
+        return in_range / total, above / total, below / total
+
+    def tessitura_spread(self, transposition: int, instrument: InstrumentRange) -> float:
+        if self.total_duration <= 0:
+            return 0.0
+
+        center = instrument.comfort_center or (instrument.min_midi + instrument.max_midi) / 2.0
+        weighted = 0.0
+        for pitch, duration in zip(self.pitches, self.durations):
+            weighted += duration * abs(pitch + transposition - center)
+        normalized = weighted / self.total_duration
+        return normalized / instrument.span
+
+
+def _score_transposition(
+    histogram: PitchHistogram,
+    transposition: int,
+    instrument: InstrumentRange,
+    weights: KeySearchWeights,
+) -> KeyFit:
+    in_range_ratio, above_ratio, below_ratio = histogram.range_ratios(transposition, instrument)
+    spread = histogram.tessitura_spread(transposition, instrument)
     score = in_range_ratio - (weights.rho * above_ratio) - (weights.sigma * below_ratio) - (weights.tau * spread)
     return KeyFit(
         transposition=transposition,
@@ -145,8 +182,9 @@ def soft_key_search(
         return []
 
     weight_values = weights or KeySearchWeights()
+    histogram = PitchHistogram.from_span(span)
     fits = [
-        _score_transposition(span, transposition, instrument, weight_values)
+        _score_transposition(histogram, transposition, instrument, weight_values)
         for transposition in transpositions
     ]
 
@@ -167,5 +205,6 @@ __all__ = [
     "InstrumentWindwayRange",
     "KeySearchWeights",
     "KeyFit",
+    "PitchHistogram",
     "soft_key_search",
 ]
@@ -13,8 +13,10 @@ from .players import (
     _AudioPlayer,
     _CommandHandle,
     _CommandPlayer,
+    _CommandStream,
     _FailoverPlayer,
     _PlaybackHandle,
+    _PlaybackStream,
     _SimpleAudioHandle,
     _SimpleAudioPlayer,
     _WinsoundHandle,
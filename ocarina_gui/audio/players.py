@@ -24,10 +24,29 @@ class _PlaybackHandle:
         raise NotImplementedError
 
 
+class _PlaybackStream(_PlaybackHandle):
+    """Handle for playback fed incrementally with raw PCM chunks."""
+
+    def write(self, pcm: bytes) -> bool:  # pragma: no cover - interface only
+        """Queue *pcm*, blocking while the backend is full; ``False`` once broken."""
+        raise NotImplementedError
+
+    def finish(self) -> None:  # pragma: no cover - interface only
+        """Signal that no more audio follows and let queued audio drain."""
+        raise NotImplementedError
+
+
 class _AudioPlayer:
     def play(self, pcm: bytes, sample_rate: int) -> Optional[_PlaybackHandle]:  # pragma: no cover - interface only
         raise NotImplementedError
 
+    def supports_streaming(self) -> bool:
+        return False
+
+    def open_stream(self, sample_rate: int) -> Optional[_PlaybackStream]:
+        """Start a stream of 16-bit mono PCM, or return ``None`` if unsupported."""
+        return None
+
     def stop_all(self) -> None:  # pragma: no cover - interface only
         """Best-effort attempt to silence any playback started by this player."""
         raise NotImplementedError
@@ -241,24 +260,97 @@ class _CommandHandle(_PlaybackHandle):
             pass
 
 
+class _CommandStream(_PlaybackStream):
+    def __init__(self, process: subprocess.Popen[bytes]) -> None:
+        self._process = process
+
+    def write(self, pcm: bytes) -> bool:
+        stdin = self._process.stdin
+        if stdin is None or stdin.closed:
+            return False
+        try:
+            stdin.write(pcm)
+            stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+        return True
+
+    def finish(self) -> None:
+        stdin = self._process.stdin
+        if stdin is None:
+            return
+        try:
+            stdin.close()
+        except (BrokenPipeError, OSError):  # pragma: no cover - process already gone
+            pass
+
+    def stop(self) -> None:
+        # End the player before touching stdin: closing the pipe waits on any
+        # write still blocked in the feeder thread, and that write only fails
+        # once the reading process is gone.
+        proc = self._process
+        if proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=0.5)
+            except subprocess.TimeoutExpired:  # pragma: no cover - slow external command
+                try:
+                    proc.kill()
+                except Exception:  # pragma: no cover - platform specific
+                    pass
+            except Exception:  # pragma: no cover - platform specific
+                logger.warning("Audio stream stop failed", exc_info=True)
+        stdin = proc.stdin
+        if stdin is None:
+            return
+        try:
+            stdin.close()
+        except Exception:  # pragma: no cover - pipe already broken
+            pass
+
+
 class _CommandPlayer(_AudioPlayer):
-    def __init__(self, command: Sequence[str]) -> None:
+    def __init__(
+        self, command: Sequence[str], stream_command: Sequence[str] | None = None
+    ) -> None:
         self._command = list(command)
+        # Arguments reading raw PCM from stdin; ``{rate}`` is the sample rate.
+        self._stream_command = list(stream_command) if stream_command else None
 
     @classmethod
     def build(cls) -> Optional["_CommandPlayer"]:
         candidates = [
-            ("afplay", []),
-            ("aplay", ["-q"]),
-            ("paplay", []),
-            ("ffplay", ["-autoexit", "-nodisp", "-loglevel", "quiet"]),
+            ("afplay", [], None),
+            ("aplay", ["-q"], ["-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", "{rate}", "-"]),
+            ("paplay", [], ["--raw", "--format=s16le", "--channels=1", "--rate={rate}"]),
+            ("ffplay", ["-autoexit", "-nodisp", "-loglevel", "quiet"], None),
         ]
-        for executable, extra in candidates:
+        for executable, extra, stream_extra in candidates:
             path = shutil.which(executable)
             if path:
-                return cls([path, *extra])
+                stream_command = [path, *stream_extra] if stream_extra is not None else None
+                return cls([path, *extra], stream_command)
         return None
 
+    def supports_streaming(self) -> bool:
+        return self._stream_command is not None
+
+    def open_stream(self, sample_rate: int) -> Optional[_PlaybackStream]:
+        if self._stream_command is None:
+            return None
+        command = [part.format(rate=int(sample_rate)) for part in self._stream_command]
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception:  # pragma: no cover - platform specific command failures
+            logger.exception("Audio stream command launch failed")
+            return None
+        return _CommandStream(process)
+
     def play(self, pcm: bytes, sample_rate: int) -> Optional[_PlaybackHandle]:
         if not pcm:
             return None
@@ -330,6 +422,23 @@ class _FailoverPlayer(_AudioPlayer):
             except Exception:  # pragma: no cover - backend specific failures
                 logger.warning("Audio player stop_all raised", exc_info=True)
 
+    def supports_streaming(self) -> bool:
+        return any(player.supports_streaming() for player in self._players)
+
+    def open_stream(self, sample_rate: int) -> Optional[_PlaybackStream]:
+        # Players without streaming stay in the chain for full-buffer playback.
+        for player in list(self._players):
+            if not player.supports_streaming():
+                continue
+            try:
+                stream = player.open_stream(sample_rate)
+            except Exception:  # pragma: no cover - backend specific failures
+                logger.warning("Audio player open_stream raised", exc_info=True)
+                stream = None
+            if stream is not None:
+                return stream
+        return None
+
     def _promote(self, player: _AudioPlayer) -> None:
         self._players = [player, *[p for p in self._players if p is not player]]
 
@@ -367,8 +476,10 @@ __all__ = [
     "_AudioPlayer",
     "_CommandHandle",
     "_CommandPlayer",
+    "_CommandStream",
     "_FailoverPlayer",
     "_PlaybackHandle",
+    "_PlaybackStream",
     "_SimpleAudioHandle",
     "_SimpleAudioPlayer",
     "_WinsoundHandle",
@@ -0,0 +1,117 @@
+"""Render arbitrary sample windows of a score for streaming playback."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from typing import Sequence
+
+from .metronome import click_length, click_peak, click_positions, overlay_click_stem
+from .mixing import MixBuffer
+from .rendering import (
+    Event,
+    RenderConfig,
+    measure_note_peak,
+    mix_notes,
+    note_scale,
+    schedule_notes,
+)
+from shared.tempo import TempoChange, TempoMap, normalized_tempo_changes
+
+_TAIL_SECONDS = 0.5
+
+
+class ChunkSource:
+    """Score prepared for rendering one sample window at a time.
+
+    Windows mix notes by onset, scale them to the same
+    :func:`~.rendering.measure_note_peak` as :func:`~.rendering.render_events`
+    and then add the click stem, so concatenated windows reproduce a single
+    full-length render and switching between streamed and buffered playback
+    keeps the loudness. The peak is measured on the first render, which
+    runs on the streaming worker rather than the caller's thread.
+    """
+
+    def __init__(
+        self,
+        events: Sequence[Event],
+        tempo: float,
+        pulses_per_quarter: int,
+        config: RenderConfig,
+        *,
+        tempo_changes: Sequence[TempoChange] = (),
+    ) -> None:
+        self.config = config
+        self.pulses_per_quarter = max(1, int(pulses_per_quarter))
+        sample_rate = config.sample_rate
+        self.tempo_map = TempoMap(
+            self.pulses_per_quarter, normalized_tempo_changes(tempo, tempo_changes)
+        )
+        self.tempo_map.sample_rate = sample_rate
+
+        max_tick = max((start + duration for start, duration, _m, _p in events), default=0)
+        if events:
+            total_seconds = self.tempo_map.seconds_at(max_tick) if max_tick else 0.0
+            self.sample_count = max(
+                1, int(math.ceil(total_seconds * sample_rate)) + int(sample_rate * _TAIL_SECONDS)
+            )
+        else:
+            self.sample_count = 0
+
+        self._scale: float | None = None
+        self._notes = schedule_notes(
+            events, self.tempo_map, self.pulses_per_quarter, sample_rate, self.sample_count
+        )
+        self._longest = max((note[1] for note in self._notes), default=0)
+        self._note_starts = [note[0] for note in self._notes]
+
+        self._clicks: list[tuple[int, bool]] = []
+        self._click_length = click_length(sample_rate)
+        self._click_peak = click_peak(config.amplitude)
+        if config.metronome.enabled:
+            self._clicks = click_positions(
+                self.tempo_map.ticks_to_samples,
+                max_tick,
+                self.sample_count,
+                config.metronome,
+                self.pulses_per_quarter,
+                sample_rate,
+            )
+        self._click_starts = [start for start, _accent in self._clicks]
+
+    def sample_at_tick(self, tick: int) -> int:
+        return self.tempo_map.tick_to_sample(tick, self.config.sample_rate)
+
+    def tick_at_sample(self, sample: int) -> int:
+        return self.tempo_map.seconds_to_tick(sample / self.config.sample_rate)
+
+    def render(self, start: int, end: int) -> bytes:
+        """Return int16 PCM for samples ``[start, end)`` clipped to the score."""
+
+        start = max(0, int(start))
+        end = min(self.sample_count, int(end))
+        if end <= start:
+            return b""
+        if self._scale is None:
+            peak = measure_note_peak(
+                self._notes, self.pulses_per_quarter, self.config.sample_rate, self.sample_count
+            )
+            self._scale = note_scale(peak, self.config.amplitude)
+        mix = MixBuffer(end - start)
+        first = bisect_left(self._note_starts, start - self._longest)
+        mix_notes(
+            mix,
+            self._notes[first : bisect_left(self._note_starts, end)],
+            start,
+            self.pulses_per_quarter,
+            self.config.sample_rate,
+            self.sample_count,
+        )
+        pcm = bytearray(mix.scaled_pcm16(self._scale))
+        first = bisect_left(self._click_starts, start - self._click_length + 1)
+        clicks = self._clicks[first : bisect_left(self._click_starts, end)]
+        overlay_click_stem(pcm, clicks, self.config.sample_rate, self._click_peak, start)
+        return bytes(pcm)
+
+
+__all__ = ["ChunkSource"]
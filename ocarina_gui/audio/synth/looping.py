@@ -0,0 +1,99 @@
+"""Pre-rendered loop clips that repeat without an audible seam."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Hashable, Optional
+
+from viewmodels.preview_playback_viewmodel import LoopRegion
+
+from .worker import _RenderWorker
+
+LOOP_CROSSFADE_SECONDS = 0.01
+
+Render = Callable[[int, int], bytes]
+
+
+def _pcm_window(render: Render, start: int, end: int) -> bytes:
+    """Return exactly ``end - start`` int16 samples, padding with silence."""
+
+    length = max(0, end - start)
+    lead = max(0, -start)
+    pcm = render(max(0, start), end) if end > 0 else b""
+    pcm = bytes(2 * min(lead, length)) + pcm[: 2 * (length - lead)]
+    return pcm + bytes(2 * length - len(pcm))
+
+
+def loop_clip(render: Render, start: int, end: int, fade_samples: int) -> bytes:
+    """Return int16 PCM for samples ``[start, end)`` that loops seamlessly.
+
+    *render* returns PCM for a sample window (shorter near the end of the
+    score). The last *fade_samples* of the span are blended into the audio
+    just before *start*, so the clip ends on the samples that naturally lead
+    into its own first sample and repeating it leaves no click at the seam.
+    """
+
+    length = max(0, end - start)
+    body = _pcm_window(render, start, end)
+    fade = min(max(0, int(fade_samples)), length // 2)
+    if not fade:
+        return body
+    samples = array("h", body)
+    lead = array("h", _pcm_window(render, start - fade, start))
+    offset = length - fade
+    for index in range(fade):
+        weight = (index + 1) / (fade + 1)
+        samples[offset + index] = int(
+            round(samples[offset + index] * (1.0 - weight) + lead[index] * weight)
+        )
+    return samples.tobytes()
+
+
+class BufferLoop:
+    """Loop clip cut from a fully rendered buffer, kept for repeated playback.
+
+    The clip is cut, crossfaded and volume-scaled once per buffer, region and
+    volume; each repeat then reuses it instead of slicing and rescaling the
+    remainder of the score.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self._sample_rate = sample_rate
+        self._fade = max(1, int(sample_rate * LOOP_CROSSFADE_SECONDS))
+        self._key: Optional[tuple[Hashable, int, int, float]] = None
+        self._clip = b""
+
+    def playback_pcm(
+        self,
+        worker: _RenderWorker,
+        buffer: bytes,
+        version: Hashable,
+        loop: LoopRegion,
+        position: int,
+        volume: float,
+        scale: Callable[[bytes], bytes],
+    ) -> bytes:
+        """Return the audio to play from sample *position* of *buffer*.
+
+        *buffer* is the worker's buffer or PCM derived from it, identified by
+        *version* for as long as its content stays the same.
+
+        Inside an enabled loop that is the rest of the current repeat plus one
+        spare repeat, which covers the moment between the seam and the wrap
+        seek; elsewhere it is the rest of the score.
+        """
+
+        start = worker.tick_to_sample(loop.start_tick, self._sample_rate)
+        end = worker.tick_to_sample(loop.end_tick, self._sample_rate)
+        if not loop.enabled or not start <= position < end:
+            return scale(buffer[2 * position :])
+        key = (version, start, end, volume)
+        if key != self._key:
+            clip = loop_clip(lambda a, b: buffer[2 * a : 2 * b], start, end, self._fade)
+            self._clip = scale(clip)
+            self._key = key
+        offset = 2 * (position - start)
+        return self._clip[offset:] + self._clip
+
+
+__all__ = ["BufferLoop", "LOOP_CROSSFADE_SECONDS", "loop_clip"]
@@ -0,0 +1,197 @@
+"""Metronome clicks rendered as a stem separate from the note audio.
+
+The accent and weak clicks are synthesised once per sample rate and beat
+positions come from one bulk tick-to-sample pass over the tempo map, so the
+click stem of a whole score is one short PCM copy per beat. Fully rendered
+buffers hold notes only; :class:`ClickTrack` mixes the stem in when playback
+starts, which keeps toggling the metronome from re-rendering any notes.
+Clicks always sit at :func:`click_peak` over notes normalised on their own,
+so buffered and streamed playback mix them identically.
+"""
+
+from __future__ import annotations
+
+import audioop
+import math
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .rendering import Event
+    from .worker import _RenderWorker
+
+CLICK_SECONDS = 0.08
+# Accented click peak relative to the normalised peak of the notes.
+CLICK_LEVEL = 0.6
+
+_ACCENT = (1760.0, 1.0)
+_WEAK = (1320.0, 0.6)
+
+
+@dataclass(frozen=True)
+class MetronomeSettings:
+    enabled: bool
+    beats_per_measure: int
+    beat_unit: int
+
+
+NO_METRONOME = MetronomeSettings(enabled=False, beats_per_measure=4, beat_unit=4)
+
+
+def click_length(sample_rate: int) -> int:
+    return max(1, int(sample_rate * CLICK_SECONDS))
+
+
+def _synthesize_click(frequency: float, amplitude: float, length: int, sample_rate: int) -> array:
+    phase = 0.0
+    phase_step = 2.0 * math.pi * frequency / sample_rate
+    decay = max(1, int(length * 0.8))
+    samples = array("d")
+    for step in range(length):
+        envelope = 1.0 - (step / decay) if step < decay else 0.0
+        samples.append(math.sin(phase) * amplitude * envelope)
+        phase += phase_step
+    return samples
+
+
+@lru_cache(maxsize=8)
+def click_samples(sample_rate: int) -> tuple[array, array]:
+    """Return the ``(accent, weak)`` click waveforms for *sample_rate*.
+
+    The arrays are shared between callers and must not be modified.
+    """
+
+    length = click_length(sample_rate)
+    return (
+        _synthesize_click(*_ACCENT, length, sample_rate),
+        _synthesize_click(*_WEAK, length, sample_rate),
+    )
+
+
+@lru_cache(maxsize=16)
+def _click_pcm(sample_rate: int, scale: float) -> tuple[bytes, bytes]:
+    return tuple(  # type: ignore[return-value]
+        array("h", (int(value * scale) for value in click)).tobytes()
+        for click in click_samples(sample_rate)
+    )
+
+
+def click_positions(
+    ticks_to_samples: Callable[[Sequence[int], int], list[int]],
+    max_tick: int,
+    sample_count: int,
+    settings: MetronomeSettings,
+    pulses_per_quarter: int,
+    sample_rate: int,
+) -> list[tuple[int, bool]]:
+    """Return ``(start_sample, is_accent)`` for every beat up to *max_tick*.
+
+    *ticks_to_samples* is a bulk converter such as
+    :meth:`shared.tempo.TempoMap.ticks_to_samples`. Beats starting at or past
+    *sample_count* are dropped.
+    """
+
+    beat_ticks = int(round((pulses_per_quarter * 4) / max(1, settings.beat_unit)))
+    if beat_ticks <= 0 or max_tick <= 0:
+        return []
+    beats_per_measure = max(1, settings.beats_per_measure)
+    starts = ticks_to_samples(range(0, max_tick + 1, beat_ticks), sample_rate)
+    positions = []
+    for beat_index, start in enumerate(starts):
+        if start >= sample_count:
+            break
+        positions.append((start, beat_index % beats_per_measure == 0))
+    return positions
+
+
+def click_work(positions: Sequence[tuple[int, bool]], sample_count: int, sample_rate: int) -> int:
+    """Return how many click samples *positions* put inside *sample_count*."""
+
+    length = click_length(sample_rate)
+    return sum(min(length, sample_count - start) for start, _accent in positions)
+
+
+def click_peak(amplitude: float) -> float:
+    """Return the int16 peak of an accented click over notes normalised to *amplitude*."""
+
+    return amplitude * 32767.0 * CLICK_LEVEL
+
+
+def overlay_click_stem(
+    pcm: bytearray,
+    positions: Sequence[tuple[int, bool]],
+    sample_rate: int,
+    peak: float,
+    offset: int = 0,
+) -> None:
+    """Add the clicks at *positions* to int16 *pcm* in place, accents peaking at *peak*.
+
+    *pcm* holds the samples from *offset* on, so a window of a longer mix
+    receives the parts of any clicks that overlap it. Only the samples under
+    each click are touched; sums saturate at the int16 range instead of
+    wrapping.
+    """
+
+    accent, weak = _click_pcm(sample_rate, float(peak))
+    for start, is_accent in positions:
+        skip = 2 * max(0, offset - start)
+        begin = 2 * max(0, start - offset)
+        if begin >= len(pcm):
+            continue
+        click = (accent if is_accent else weak)[skip : skip + len(pcm) - begin]
+        end = begin + len(click)
+        pcm[begin:end] = audioop.add(pcm[begin:end], click, 2)
+
+
+class ClickTrack:
+    """Notes buffer with the metronome stem mixed in, kept per buffer and settings."""
+
+    def __init__(self, sample_rate: int, amplitude: float) -> None:
+        self._sample_rate = sample_rate
+        self._amplitude = amplitude
+        self._key: Optional[tuple[int, MetronomeSettings, int]] = None
+        self._mixed = b""
+
+    def mix(
+        self,
+        worker: _RenderWorker,
+        events: Sequence[Event],
+        settings: MetronomeSettings,
+        pulses_per_quarter: int,
+    ) -> tuple[bytes, tuple[int, Optional[MetronomeSettings]]]:
+        """Return the PCM to play for the worker's buffer and a key identifying it."""
+
+        # Read the generation first: a render landing in between then only
+        # causes a recompute on the next call rather than a stale cache entry.
+        generation = worker.buffer_generation
+        buffer = worker.buffer
+        if not settings.enabled or not buffer:
+            return buffer, (generation, None)
+        key = (generation, settings, pulses_per_quarter)
+        if key != self._key:
+            max_tick = max((start + length for start, length, _m, _p in events), default=0)
+            positions = click_positions(
+                worker.ticks_to_samples, max_tick, len(buffer) // 2, settings,
+                pulses_per_quarter, self._sample_rate,
+            )
+            mixed = bytearray(buffer)
+            overlay_click_stem(mixed, positions, self._sample_rate, click_peak(self._amplitude))
+            self._mixed = bytes(mixed)
+            self._key = key
+        return self._mixed, (generation, settings)
+
+
+__all__ = [
+    "CLICK_SECONDS",
+    "CLICK_LEVEL",
+    "ClickTrack",
+    "MetronomeSettings",
+    "NO_METRONOME",
+    "click_peak",
+    "click_positions",
+    "click_samples",
+    "click_work",
+    "overlay_click_stem",
+]
@@ -0,0 +1,97 @@
+"""Preallocated float mixing buffer used by the preview renderer."""
+
+from __future__ import annotations
+
+import audioop
+from array import array
+from itertools import repeat
+from operator import add, mul
+from typing import Sequence
+
+from .synthesis import _np, synthesis_backend
+
+
+class MixBuffer:
+    """Fixed-size float mix with in-place accumulation.
+
+    Samples live in a NumPy ``float64`` array when the NumPy synthesis backend
+    is active and in an ``array('d')`` otherwise; either way no per-sample
+    Python floats are kept alive, and :meth:`peak` and :meth:`scaled_pcm16`
+    each take a single pass over the mix.
+    """
+
+    def __init__(self, sample_count: int) -> None:
+        self.sample_count = max(0, int(sample_count))
+        self._numpy = _np is not None and synthesis_backend() == "numpy"
+        if self._numpy:
+            self.samples = _np.zeros(self.sample_count)
+        else:
+            self.samples = array("d", bytes(8 * self.sample_count))
+
+    def __len__(self) -> int:
+        return self.sample_count
+
+    def add(self, start: int, values: Sequence[float]) -> int:
+        """Accumulate *values* at *start*, clipped to the buffer; return the count."""
+
+        start = max(0, int(start))
+        count = min(len(values), self.sample_count - start)
+        if count <= 0:
+            return 0
+        end = start + count
+        if count < len(values):
+            values = values[:count]
+        if self._numpy:
+            self.samples[start:end] += values
+        else:
+            self.samples[start:end] = array("d", map(add, self.samples[start:end], values))
+        return count
+
+    def peak(self) -> float:
+        """Return the largest absolute sample value in the mix."""
+
+        if not self.sample_count:
+            return 0.0
+        if self._numpy:
+            return float(_np.abs(self.samples).max())
+        return max(max(self.samples), -min(self.samples))
+
+    def scaled_pcm16(self, scale: float) -> bytes:
+        """Return the mix multiplied by *scale* as int16 PCM.
+
+        Samples are truncated toward zero and clamped to ±32767, since a
+        measured peak does not have to cover every sample of the mix.
+        """
+
+        if self._numpy:
+            scaled = self.samples * scale
+            _np.clip(scaled, -32767.0, 32767.0, out=scaled)
+            return scaled.astype(_np.int16).tobytes()
+        # Try the plain conversion first; it only fails when a sample clips.
+        try:
+            pcm = array("h", map(int, map(mul, self.samples, repeat(scale))))
+        except OverflowError:
+            pcm = None
+        if pcm is None or -32768 in pcm:
+            scaled = map(mul, self.samples, repeat(scale))
+            clamped = map(max, repeat(-32767.0), map(min, repeat(32767.0), scaled))
+            pcm = array("h", map(int, clamped))
+        return pcm.tobytes()
+
+
+def apply_volume(pcm: bytes, volume: float) -> bytes:
+    """Scale int16 PCM by *volume*, returning silence at zero and *pcm* at unity."""
+
+    if not pcm:
+        return pcm
+    if volume <= 1e-6:
+        return bytes(len(pcm))
+    if abs(volume - 1.0) <= 1e-6:
+        return pcm
+    try:
+        return audioop.mul(pcm, 2, volume)
+    except Exception:
+        return pcm
+
+
+__all__ = ["MixBuffer", "apply_volume"]
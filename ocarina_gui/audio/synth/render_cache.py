@@ -0,0 +1,214 @@
+"""Content-addressed on-disk cache of fully rendered preview audio.
+
+Rendering a whole score is by far the slowest step of preparing a preview,
+and the same project is usually reopened with the same events, tempo map and
+metronome. :func:`render_events_cached` stores each full-buffer render under
+a hash of everything that determines its PCM and memory-maps it back on the
+next request. Files are pruned least-recently-used first once the cache grows
+past its byte budget.
+
+``OCARINA_RENDER_CACHE_DIR``
+    Directory holding the cache. Defaults to
+    ``~/.ocarina_arranger/render_cache``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Callable, Sequence
+
+from shared.tempo import TempoChange, TempoMap, normalized_tempo_changes
+
+from .rendering import Event, RenderConfig, render_events
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever synthesis changes the PCM produced for identical input.
+SYNTH_VERSION = 3
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_ENV_CACHE_DIR = "OCARINA_RENDER_CACHE_DIR"
+_SUFFIX = ".pcm"
+
+
+def render_cache_key(
+    events: Sequence[Event],
+    pulses_per_quarter: int,
+    tempo_changes: Sequence[TempoChange],
+    config: RenderConfig,
+) -> str:
+    """Return the cache key for rendering *events* with the normalised *tempo_changes*."""
+
+    hasher = hashlib.blake2b(digest_size=20)
+    metronome = config.metronome
+    header = (
+        f"v{SYNTH_VERSION}|{config.sample_rate}|{config.amplitude!r}|{pulses_per_quarter}|"
+        f"{metronome.enabled}|{metronome.beats_per_measure}|{metronome.beat_unit}|"
+    )
+    hasher.update(header.encode("ascii"))
+    tempo = array("d")
+    for change in tempo_changes:
+        tempo.extend((float(change.tick), float(change.tempo_bpm)))
+    hasher.update(len(tempo_changes).to_bytes(4, "little"))
+    hasher.update(tempo.tobytes())
+    hasher.update(array("q", [int(value) for event in events for value in event]).tobytes())
+    return hasher.hexdigest()
+
+
+class RenderCache:
+    """Directory of rendered PCM files bounded by *max_bytes*.
+
+    Reads bump a file's modification time, and :meth:`prune` deletes the
+    oldest files first. Every filesystem failure is logged and treated as a
+    cache miss so playback never depends on the cache.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("RenderCache max_bytes must be non-negative")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def load(self, key: str) -> mmap.mmap | None:
+        """Return the cached PCM for *key* memory-mapped read-only, if present."""
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    return None
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.debug("Render cache read failed for %s", path, exc_info=True)
+            return None
+        return mapped
+
+    def store(self, key: str, pcm: bytes) -> None:
+        """Write *pcm* under *key* and prune the cache back under its budget."""
+
+        if not pcm or len(pcm) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                return
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".tmp", delete=False
+            ) as handle:
+                handle.write(pcm)
+            os.replace(handle.name, path)
+        except OSError:
+            logger.debug("Render cache write failed for %s", path, exc_info=True)
+            return
+        self.prune()
+
+    def prune(self) -> int:
+        """Delete least recently used files until the budget holds; return bytes freed."""
+
+        with self._lock:
+            try:
+                entries = [
+                    entry
+                    for entry in os.scandir(self.directory)
+                    if entry.name.endswith(_SUFFIX) and entry.is_file()
+                ]
+                stats = [(entry.stat(), entry.path) for entry in entries]
+            except OSError:
+                return 0
+            total = sum(stat.st_size for stat, _path in stats)
+            freed = 0
+            for stat, path in sorted(stats, key=lambda item: item[0].st_mtime):
+                if total - freed <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:  # Still mapped on Windows; retry on a later prune.
+                    continue
+                freed += stat.st_size
+            return freed
+
+
+_caches: dict[Path, RenderCache] = {}
+_caches_lock = threading.Lock()
+
+
+def default_cache_directory() -> Path:
+    override = os.environ.get(_ENV_CACHE_DIR)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".ocarina_arranger" / "render_cache"
+
+
+def default_render_cache() -> RenderCache:
+    """Return the shared cache for :func:`default_cache_directory`."""
+
+    directory = default_cache_directory()
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = RenderCache(directory)
+        return cache
+
+
+def render_events_cached(
+    events: Sequence[Event],
+    tempo: float,
+    pulses_per_quarter: int,
+    config: RenderConfig,
+    progress_callback: Callable[[float], None] | None = None,
+    *,
+    tempo_changes: Sequence[TempoChange] | None = None,
+    cache: RenderCache | None = None,
+) -> tuple[bytes, TempoMap]:
+    """:func:`rendering.render_events` backed by a :class:`RenderCache`.
+
+    A hit returns the stored PCM as a read-only memory map, which slices and
+    measures like ``bytes``.
+    """
+
+    if not events:
+        return render_events(
+            events, tempo, pulses_per_quarter, config, progress_callback,
+            tempo_changes=tempo_changes,
+        )
+    cache = cache or default_render_cache()
+    normalized = normalized_tempo_changes(tempo, tempo_changes or ())
+    key = render_cache_key(events, pulses_per_quarter, normalized, config)
+    cached = cache.load(key)
+    if cached is not None:
+        tempo_map = TempoMap(pulses_per_quarter, normalized)
+        tempo_map.sample_rate = config.sample_rate
+        if progress_callback is not None:
+            progress_callback(1.0)
+        return cached, tempo_map  # type: ignore[return-value]
+    pcm, tempo_map = render_events(
+        events, tempo, pulses_per_quarter, config, progress_callback,
+        tempo_changes=tempo_changes,
+    )
+    cache.store(key, pcm)
+    return pcm, tempo_map
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "RenderCache",
+    "SYNTH_VERSION",
+    "default_render_cache",
+    "render_cache_key",
+    "render_events_cached",
+]
@@ -6,7 +6,6 @@ import atexit
 import logging
 import sys
 import threading
-import audioop
 from typing import Callable, Optional, Sequence
 
 from viewmodels.preview_playback_viewmodel import (
@@ -17,6 +16,10 @@ from viewmodels.preview_playback_viewmodel import (
 from shared.tempo import TempoChange
 
 from ..players import _AudioPlayer, _PlaybackHandle
+from .chunks import ChunkSource
+from .looping import BufferLoop
+from .metronome import NO_METRONOME, ClickTrack
+from .mixing import apply_volume
 from .patches import _SynthPatch, _patch_for_program
 from .rendering import (
     Event,
@@ -24,9 +27,10 @@ from .rendering import (
     RenderConfig,
     TempoMap,
     note_segment,
-    render_events,
     tempo_cache_key,
 )
+from .render_cache import render_events_cached
+from .streaming import PreviewStreamer
 from .worker import _RenderWorker
 from .tone import _midi_to_frequency  # noqa: F401 - re-exported for callers
 
@@ -69,7 +73,11 @@ def _safe_warning(message: str, *args: object, **kwargs: object) -> None:
 
 
 class _SynthRenderer(AudioRenderer):
-    """Very small synthesiser that renders note events to PCM audio."""
+    """Very small synthesiser that renders note events to PCM audio.
+
+    Players that can stream get chunks rendered just ahead of the playhead
+    (see :class:`PreviewStreamer`); others get the whole score as one buffer.
+    """
 
     _SAMPLE_RATE = 22050
     _AMPLITUDE = 0.45
@@ -79,7 +87,7 @@ class _SynthRenderer(AudioRenderer):
     _note_segment = staticmethod(note_segment)
     _tempo_cache_key = staticmethod(tempo_cache_key)
 
-    def __init__(self, player: _AudioPlayer) -> None:
+    def __init__(self, player: _AudioPlayer, *, streaming: bool = True) -> None:
         self._player = player
         self._events: tuple[Event, ...] = ()
         self._ppq: int = 480
@@ -90,7 +98,14 @@ class _SynthRenderer(AudioRenderer):
         self._position_tick: int = 0
         self._is_playing = False
         self._worker = _RenderWorker(render_factory=lambda: self._render_events)
+        self._streamer = (
+            PreviewStreamer(player, self._worker, self._SAMPLE_RATE, self._apply_volume)
+            if streaming
+            else None
+        )
         self._render_ready = self._worker.ready_event
+        self._buffer_loop = BufferLoop(self._SAMPLE_RATE)
+        self._click_track = ClickTrack(self._SAMPLE_RATE, self._AMPLITUDE)
         self._metronome_enabled = False
         self._beats_per_measure = 4
         self._beat_unit = 4
@@ -133,7 +148,10 @@ class _SynthRenderer(AudioRenderer):
             self._events, self._ppq, self._tempo, self._tempo_changes
         )
         self._position_tick = 0
-        self._ensure_buffer(force=True, wait=False)
+        if self._streams():
+            self._worker.begin_streamed_render(self._render_listener)()
+        else:
+            self._ensure_buffer(force=True, wait=False)
         _safe_debug(
             "SynthRenderer.prepare: events=%d ppq=%d buffer_bytes=%d (async)",
             len(self._events),
@@ -154,6 +172,8 @@ class _SynthRenderer(AudioRenderer):
             if not self._events:
                 _safe_debug("SynthRenderer.start aborted: no events available")
                 return False
+            if self._streams() and self._start_stream(position_tick):
+                return True
             self._ensure_buffer(wait=False)
             if self._buffer_is_ready():
                 started = self._play_from_tick(position_tick)
@@ -192,16 +212,19 @@ class _SynthRenderer(AudioRenderer):
                     self._position_tick,
                 )
                 return
-            _safe_debug(
-                "SynthRenderer.seek restarting playback from tick=%d",
-                self._position_tick,
-            )
+            _safe_debug("SynthRenderer.seek restarting playback from tick=%d", self._position_tick)
+            if self._streamer is not None and self._streamer.active and self._start_stream(
+                self._position_tick
+            ):
+                return
             self._play_from_tick(self._position_tick)
 
     def set_tempo(self, tempo_bpm: float) -> None:
         with self._playback_lock:
             _safe_debug("SynthRenderer.set_tempo: %.3f", tempo_bpm)
             self._tempo = tempo_bpm
+            if self._retarget_stream():
+                return
             was_playing = self._is_playing
             position = self._position_tick
             self._stop_playback()
@@ -211,14 +234,20 @@ class _SynthRenderer(AudioRenderer):
             generation = self._worker.render_generation
             self._restart_after_render(generation, position)
 
-    def set_loop(self, loop: LoopRegion) -> None:  # pragma: no cover - stored for future use
-        self._loop = loop
-        _safe_debug(
-            "SynthRenderer.set_loop: enabled=%s start=%d end=%d",
-            loop.enabled,
-            loop.start_tick,
-            loop.end_tick,
-        )
+    def set_loop(self, loop: LoopRegion) -> bool:
+        """Loop *loop*; ``True`` when a live stream repeats it without wrap seeks."""
+        _safe_debug("SynthRenderer.set_loop: %s", loop)
+        active = loop.enabled and loop.end_tick > loop.start_tick
+        with self._playback_lock:
+            self._loop = loop
+            if self._streamer is not None:
+                self._streamer.set_loop((loop.start_tick, loop.end_tick) if active else None)
+            return self.repeats_loop()
+
+    def repeats_loop(self) -> bool:
+        # Buffered playback renders a finite slice; only a live stream repeats.
+        with self._playback_lock:
+            return self._is_playing and self._streamer is not None and self._streamer.looping
 
     def set_metronome(
         self, enabled: bool, beats_per_measure: int, beat_unit: int
@@ -246,14 +275,11 @@ class _SynthRenderer(AudioRenderer):
             )
 
         with self._playback_lock:
-            was_playing = self._is_playing
-            position = self._position_tick
-            self._stop_playback()
-            self._ensure_buffer(force=True, wait=False)
-            if not was_playing:
+            # Buffers hold notes only; clicks are mixed in by _play_from_tick.
+            if self._retarget_stream():
                 return
-            generation = self._worker.render_generation
-            self._restart_after_render(generation, position)
+            if self._worker.report_buffer_reused(self._render_listener) and self._is_playing:
+                self._play_from_tick(self._position_tick)
 
     def set_volume(self, volume: float) -> bool:
         normalized = max(0.0, min(1.0, float(volume)))
@@ -264,7 +290,8 @@ class _SynthRenderer(AudioRenderer):
             self._volume = normalized
 
         with self._playback_lock:
-            if not self._is_playing:
+            # Streams scale each chunk as it is written, so nothing restarts.
+            if not self._is_playing or (self._streamer and self._streamer.active):
                 return False
             position = self._position_tick
             self._stop_handle_only()
@@ -290,20 +317,30 @@ class _SynthRenderer(AudioRenderer):
             self._is_playing = False
             _safe_debug("SynthRenderer: playback stopped")
 
-    def _ensure_buffer(self, force: bool = False, wait: bool = True) -> None:
+    def _metronome_settings(self) -> MetronomeSettings:
         with self._config_lock:
-            metronome = MetronomeSettings(
+            return MetronomeSettings(
                 enabled=self._metronome_enabled,
                 beats_per_measure=self._beats_per_measure,
                 beat_unit=self._beat_unit,
             )
+
+    def _render_config(self, metronome: MetronomeSettings) -> RenderConfig:
+        return RenderConfig(
+            sample_rate=self._SAMPLE_RATE,
+            amplitude=self._AMPLITUDE,
+            chunk_size=self._PROGRESS_CHUNK_SIZE,
+            metronome=metronome,
+        )
+
+    def _ensure_buffer(self, force: bool = False, wait: bool = True) -> None:
         self._worker.ensure_buffer(
             tempo=self._tempo,
             tempo_changes=self._tempo_changes,
             force=force,
             wait=wait,
             listener=self._render_listener,
-            metronome_settings=metronome,
+            metronome_settings=NO_METRONOME,
         )
 
     def _render_events(
@@ -315,21 +352,42 @@ class _SynthRenderer(AudioRenderer):
         progress_callback: Callable[[float], None] | None = None,
         tempo_changes: Sequence[TempoChange] | None = None,
     ) -> tuple[bytes, TempoMap]:
-        config = RenderConfig(
-            sample_rate=self._SAMPLE_RATE,
-            amplitude=self._AMPLITUDE,
-            chunk_size=self._PROGRESS_CHUNK_SIZE,
-            metronome=metronome,
-        )
-        return render_events(
+        return render_events_cached(
             events,
             tempo,
             pulses_per_quarter,
-            config,
+            self._render_config(metronome),
             progress_callback,
             tempo_changes=tempo_changes or self._tempo_changes,
         )
 
+    def _streams(self) -> bool:
+        return self._streamer is not None and self._streamer.available()
+
+    def _chunk_source(self) -> ChunkSource:
+        return ChunkSource(
+            self._events,
+            self._tempo,
+            self._ppq,
+            self._render_config(self._metronome_settings()),
+            tempo_changes=self._tempo_changes,
+        )
+
+    def _start_stream(self, tick: int) -> bool:
+        # Assumes playback lock is held.
+        self._stop_handle_only()
+        self._is_playing = self._streamer.play(self._chunk_source(), tick)
+        _safe_debug("SynthRenderer: streaming from tick=%d: %s", tick, self._is_playing)
+        return self._is_playing
+
+    def _retarget_stream(self) -> bool:
+        """Apply changed settings in streaming mode; ``False`` means re-render fully."""
+
+        if not self._streams() or (self._is_playing and not self._streamer.active):
+            return False
+        self._streamer.retarget(self._chunk_source, self._render_listener)
+        return True
+
     def _restart_after_render(self, generation: int, position: int) -> None:
         if sys.is_finalizing():
             return
@@ -368,7 +426,9 @@ class _SynthRenderer(AudioRenderer):
 
     def _play_from_tick(self, tick: int) -> bool:
         with self._playback_lock:
-            buffer = self._worker.buffer
+            buffer, version = self._click_track.mix(
+                self._worker, self._events, self._metronome_settings(), self._ppq
+            )
             if not buffer:
                 self._is_playing = False
                 self._handle = None
@@ -384,8 +444,9 @@ class _SynthRenderer(AudioRenderer):
                     tick,
                 )
                 return False
-            slice_bytes = buffer[byte_offset:]
-            slice_bytes = self._apply_volume(slice_bytes)
+            slice_bytes = self._buffer_loop.playback_pcm(
+                self._worker, buffer, version, self._loop, byte_offset // 2, self._volume, self._apply_volume
+            )
             handle = self._player.play(slice_bytes, self._SAMPLE_RATE)
             if handle is None:
                 try:
@@ -394,9 +455,7 @@ class _SynthRenderer(AudioRenderer):
                     _safe_warning("Audio player stop_all raised", exc_info=True)
                 self._handle = None
                 self._is_playing = False
-                _safe_debug(
-                    "SynthRenderer._play_from_tick: backend returned no handle"
-                )
+                _safe_debug("SynthRenderer._play_from_tick: backend returned no handle")
                 return False
             self._handle = handle
             self._is_playing = True
@@ -408,32 +467,17 @@ class _SynthRenderer(AudioRenderer):
             return True
 
     def _apply_volume(self, pcm: bytes) -> bytes:
-        volume = self._volume
-        if not pcm:
-            return pcm
-        if volume <= 1e-6:
-            return self._silence(len(pcm))
-        if abs(volume - 1.0) <= 1e-6:
-            return pcm
-        try:
-            scaled = audioop.mul(pcm, 2, volume)
-        except Exception:
-            scaled = pcm
-        return scaled
+        return apply_volume(pcm, self._volume)
 
     def _buffer_is_ready(self) -> bool:
         return bool(self._worker.buffer) and (
             self._worker.buffer_generation == self._worker.render_generation
         )
 
-    @staticmethod
-    def _silence(length: int) -> bytes:
-        frames, remainder = divmod(length, 2)
-        silence = b"\x00\x00" * frames
-        return silence + (b"\x00" if remainder else b"")
-
     def _stop_handle_only(self) -> None:
         # Assumes playback lock is held.
+        if self._streamer is not None:
+            self._streamer.stop()
         handle = self._handle
         if handle is None:
             return
@@ -3,26 +3,28 @@
 from __future__ import annotations
 
 import math
-import threading
 from array import array
-from collections import namedtuple
+from bisect import bisect_left
 from dataclasses import dataclass
 from typing import Callable, Optional, Sequence
 
+from .metronome import (
+    MetronomeSettings,
+    click_peak,
+    click_positions,
+    click_work,
+    overlay_click_stem,
+)
+from .mixing import MixBuffer
 from .patches import _patch_for_program
+from .segment_cache import CacheInfo, SegmentCache
+from .synthesis import synthesize_note
 from .tone import _midi_to_frequency
 from shared.tempo import TempoChange, TempoMap, normalized_tempo_changes
 
 Event = tuple[int, int, int, int]
 
 
-@dataclass(frozen=True)
-class MetronomeSettings:
-    enabled: bool
-    beats_per_measure: int
-    beat_unit: int
-
-
 @dataclass(frozen=True)
 class RenderConfig:
     sample_rate: int
@@ -47,26 +49,175 @@ def _pitch_normalization_gain(midi: int) -> float:
     return min(3.0, ratio**0.35)
 
 
-_note_segment_cache: dict[tuple, tuple[float, ...]] = {}
-_note_segment_lock = threading.Lock()
-_cache_hits = 0
-_cache_misses = 0
-CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
+_PEAK_WINDOW = 4096
+_PEAK_WINDOW_BUDGET = 64
+
+# ``(start_sample, length, program, midi, duration_ticks, tempo_key)``
+ScheduledNote = tuple[int, int, int, int, int, int]
+
+
+def _window_bounds(notes: Sequence[ScheduledNote], window_count: int) -> list[float]:
+    """Return an upper bound on the mixed notes in each ``_PEAK_WINDOW`` window.
+
+    A note adds at most its patch gain times its pitch gain times the sum of
+    its harmonic amplitudes, scaled by the largest value its attack/release
+    envelope reaches inside the window.
+    """
+
+    bounds = [0.0] * window_count
+    for start, length, program, midi, _ticks, _tempo_key in notes:
+        patch = _patch_for_program(program)
+        weight = (
+            abs(patch.gain)
+            * _pitch_normalization_gain(midi)
+            * sum(abs(amplitude) for _multiple, amplitude in patch.harmonics)
+        )
+        attack = max(1, min(length, int(length * patch.attack_ratio)))
+        release = max(1, min(length, int(length * patch.release_ratio)))
+        release_from = max(attack, length - release)
+        first = max(0, start) // _PEAK_WINDOW
+        last = min(window_count - 1, (start + length - 1) // _PEAK_WINDOW)
+        for window in range(first, last + 1):
+            begin = max(0, window * _PEAK_WINDOW - start)
+            end = min(length, (window + 1) * _PEAK_WINDOW - start)
+            if end <= attack:
+                envelope = end / attack
+            elif begin >= release_from:
+                envelope = (length - begin) / release
+            else:
+                envelope = 1.0
+            bounds[window] += weight * min(1.0, envelope)
+    return bounds
+
+
+def schedule_notes(
+    events: Sequence[Event],
+    tempo_map: TempoMap,
+    pulses_per_quarter: int,
+    sample_rate: int,
+    sample_count: int,
+) -> list[ScheduledNote]:
+    """Return the audible *events* placed on the sample grid, ordered by start."""
+
+    notes: list[ScheduledNote] = []
+    timings = note_timings(tempo_map, events, sample_rate)
+    for (_onset, duration, midi, program), (start, seconds) in zip(events, timings):
+        if _midi_to_frequency(midi) <= 0.0 or start >= sample_count or seconds <= 1e-6:
+            continue
+        duration_ticks = max(1, int(duration))
+        ticks_per_second = duration_ticks / max(seconds, 1e-9)
+        effective_tempo = max(1e-3, (ticks_per_second / pulses_per_quarter) * 60.0)
+        # note_segment rounds its own length; one extra sample covers that.
+        length = int(round(seconds * sample_rate)) + 1
+        notes.append(
+            (start, length, program, midi, duration_ticks, tempo_cache_key(effective_tempo))
+        )
+    notes.sort(key=lambda note: note[0])
+    return notes
+
+
+def mix_notes(
+    mix: MixBuffer,
+    notes: Sequence[ScheduledNote],
+    window_start: int,
+    pulses_per_quarter: int,
+    sample_rate: int,
+    sample_count: int,
+) -> None:
+    """Add the parts of *notes* that fall in *mix*, which starts at *window_start*.
+
+    Every note is clipped at ``sample_count``, the end of the full score.
+    """
+
+    for start, _length, program, midi, ticks, tempo_key in notes:
+        segment = note_segment(program, midi, ticks, tempo_key, pulses_per_quarter, sample_rate)
+        skip = max(0, window_start - start)
+        limit = min(len(segment), sample_count - start)
+        if skip >= limit:
+            continue
+        count = min(limit - skip, len(mix))
+        mix.add(start + skip - window_start, segment[skip : skip + count])
+
+
+def measure_note_peak(
+    notes: Sequence[ScheduledNote],
+    pulses_per_quarter: int,
+    sample_rate: int,
+    sample_count: int,
+) -> float:
+    """Return the peak of the mixed *notes*, measured window by window.
+
+    Windows are mixed from the highest :func:`_window_bounds` value down
+    until no remaining bound can beat the measured peak, so usually only the
+    loudest few windows are synthesised. Scores that would need more than
+    ``_PEAK_WINDOW_BUDGET`` windows (long sustained chords, whose bounds stay
+    above what they measure) return the loudest window measured so far and
+    rely on the PCM conversion clamping. Buffered and streamed playback both
+    scale to this value, so they play at the same loudness.
+    """
+
+    if not notes or sample_count <= 0:
+        return 0.0
+    window_count = (sample_count + _PEAK_WINDOW - 1) // _PEAK_WINDOW
+    bounds = _window_bounds(notes, window_count)
+    starts = [note[0] for note in notes]
+    longest = max(note[1] for note in notes)
+    peak = 0.0
+    ordered = sorted(range(window_count), key=lambda index: -bounds[index])
+    for window in ordered[:_PEAK_WINDOW_BUDGET]:
+        if bounds[window] <= peak:
+            break
+        begin = window * _PEAK_WINDOW
+        end = min(sample_count, begin + _PEAK_WINDOW)
+        mix = MixBuffer(end - begin)
+        overlapping = notes[bisect_left(starts, begin - longest) : bisect_left(starts, end)]
+        mix_notes(mix, overlapping, begin, pulses_per_quarter, sample_rate, sample_count)
+        peak = max(peak, mix.peak())
+    return peak
+
+
+def note_scale(peak: float, amplitude: float) -> float:
+    """Return the factor mapping mixed note samples with *peak* to int16 PCM."""
+
+    return (amplitude * 32767.0) / peak if peak > 1e-9 else 0.0
+
+
+def note_timings(
+    tempo_map: TempoMap, events: Sequence[Event], sample_rate: int
+) -> list[tuple[int, float]]:
+    """Return ``(start_sample, duration_seconds)`` for every event.
+
+    Durations span at least one tick. Onsets and ends are converted in bulk,
+    which walks the tempo segments once for onset-ordered events.
+    """
+
+    onsets = [onset for onset, _duration, _midi, _program in events]
+    ends = [onset + max(1, int(duration)) for onset, duration, _midi, _program in events]
+    rate = max(sample_rate, 1)
+    return [
+        (int(round(start * rate)), end - start if end_tick > onset else 0.0)
+        for onset, end_tick, start, end in zip(
+            onsets, ends, tempo_map.ticks_to_seconds(onsets), tempo_map.ticks_to_seconds(ends)
+        )
+    ]
+
+
+_note_segment_cache = SegmentCache()
 
 
 def clear_note_segment_cache() -> None:
     """Clear the cache used by the note_segment function."""
-    global _cache_hits, _cache_misses
-    with _note_segment_lock:
-        _note_segment_cache.clear()
-        _cache_hits = 0
-        _cache_misses = 0
+    _note_segment_cache.clear()
 
 
 def get_note_segment_cache_info() -> CacheInfo:
-    """Get statistics for the note_segment cache."""
-    with _note_segment_lock:
-        return CacheInfo(_cache_hits, _cache_misses, len(_note_segment_cache))
+    """Get hit, miss, eviction and byte statistics for the note_segment cache."""
+    return _note_segment_cache.info()
+
+
+def set_note_segment_cache_budget(byte_budget: int) -> None:
+    """Bound the note_segment cache to ``byte_budget`` bytes of samples."""
+    _note_segment_cache.set_budget(byte_budget)
 
 
 def note_segment(
@@ -76,80 +227,41 @@ def note_segment(
     tempo_key: int,
     pulses_per_quarter: int,
     sample_rate: int,
-) -> tuple[float, ...]:
-    """Generate a single note segment, using a thread-safe cache."""
-    global _cache_hits, _cache_misses
+) -> array:
+    """Generate a single note segment as ``array('f')``, using a shared cache.
+
+    Synthesis runs outside the cache's shard locks so concurrent renders do
+    not serialise on each other.
+    """
     key = (program, midi, duration_ticks, tempo_key, pulses_per_quarter, sample_rate)
+    cached = _note_segment_cache.get(key)
+    if cached is not None:
+        return cached
+
+    ticks = max(1, int(duration_ticks))
+    tempo_units = max(tempo_key, 1)
+    ppq = max(1, int(pulses_per_quarter))
+    tempo = tempo_units / 1000.0
+    ticks_per_second = max((tempo / 60.0) * ppq, 1e-6)
+    segment_seconds = ticks / ticks_per_second
+    length = max(1, int(round(segment_seconds * sample_rate)))
+    frequency = _midi_to_frequency(midi)
 
-    # Lock the entire operation. This is a robust but less concurrent solution
-    # to prevent memory corruption from simultaneous heavy calculations.
-    with _note_segment_lock:
-        if key in _note_segment_cache:
-            _cache_hits += 1
-            return _note_segment_cache[key]
-
-        _cache_misses += 1
-        ticks = max(1, int(duration_ticks))
-        tempo_units = max(tempo_key, 1)
-        ppq = max(1, int(pulses_per_quarter))
-        tempo = tempo_units / 1000.0
-        ticks_per_second = max((tempo / 60.0) * ppq, 1e-6)
-        segment_seconds = ticks / ticks_per_second
-        length = max(1, int(round(segment_seconds * sample_rate)))
-        frequency = _midi_to_frequency(midi)
-
-        if frequency <= 0.0 or length <= 0:
-            result = (0.0,) * length
+    if frequency <= 0.0 or length <= 0:
+        result = array("f", bytes(4 * length))
+    else:
+        samples = synthesize_note(
+            _patch_for_program(program),
+            frequency,
+            length,
+            sample_rate,
+            _pitch_normalization_gain(midi),
+        )
+        if isinstance(samples, array):
+            result = array("f", samples)
         else:
-            patch = _patch_for_program(program)
-            base_step = 2.0 * math.pi * frequency / sample_rate
-            vibrato_step = (
-                2.0 * math.pi * patch.vibrato_hz / sample_rate
-                if patch.vibrato_hz
-                else 0.0
-            )
-            vibrato_depth = patch.vibrato_depth
-            harmonics = patch.harmonics
-            gain = patch.gain
-            pitch_gain = _pitch_normalization_gain(midi)
-
-            attack = max(1, min(length, int(length * patch.attack_ratio)))
-            release = max(1, min(length, int(length * patch.release_ratio)))
-            attack_scale = 1.0 / attack if attack else 1.0
-            release_scale = 1.0 / release if release else 1.0
-            release_start = max(0, length - release)
-
-            segment: list[float] = [0.0] * length
-            base_phase = 0.0
-            vibrato_phase = 0.0
-
-            for index in range(length):
-                if index < attack:
-                    envelope = index * attack_scale
-                elif index >= release_start:
-                    envelope = (length - index) * release_scale
-                else:
-                    envelope = 1.0
-
-                vibrato_scale = 1.0
-                if vibrato_depth and vibrato_step:
-                    vibrato_scale += vibrato_depth * math.sin(vibrato_phase)
-                    vibrato_phase += vibrato_step
-
-                sample_value = 0.0
-                phase = base_phase
-                for multiple, amplitude in harmonics:
-                    sample_value += math.sin(phase * multiple) * amplitude
-
-                segment[index] = sample_value * envelope * gain * pitch_gain
-                step_scale = vibrato_scale if vibrato_scale > 0.0 else 0.0
-                base_phase += base_step * step_scale
-            result = tuple(segment)
-
-        if len(_note_segment_cache) > 2048:
-            _note_segment_cache.clear()
-        _note_segment_cache[key] = result
-        return result
+            result = array("f", samples.astype("float32").tobytes())
+    return _note_segment_cache.put(key, result)
 
 
 def render_events(
@@ -176,36 +288,29 @@ def render_events(
     sample_count = (
         max(1, int(math.ceil(total_seconds * sample_rate)) + int(sample_rate * 0.5))
     )
-    mix = [0.0] * sample_count
+    mix = MixBuffer(sample_count)
 
     chunk_size = max(1, int(config.chunk_size))
 
+    clicks: list[tuple[int, bool]] = []
+    if config.metronome.enabled:
+        clicks = click_positions(
+            tempo_map.ticks_to_samples,
+            max_tick,
+            sample_count,
+            config.metronome,
+            pulses_per_quarter,
+            sample_rate,
+        )
+
+    notes = schedule_notes(events, tempo_map, pulses_per_quarter, sample_rate, sample_count)
+
     total_work = 0
     if progress_callback is not None:
-        for onset, duration, midi, _program in events:
-            if _midi_to_frequency(midi) <= 0.0:
-                continue
-            start_index = tempo_map.tick_to_sample(onset, sample_rate)
-            if start_index >= sample_count:
-                continue
-            duration_seconds = tempo_map.duration_between(onset, onset + int(duration))
-            if duration_seconds <= 1e-6:
-                continue
-            estimated_samples = max(1, int(round(duration_seconds * sample_rate)))
-            limit = min(estimated_samples, sample_count - max(0, start_index))
-            if limit <= 0:
-                continue
-            total_work += limit
-
-        if config.metronome.enabled:
-            total_work += estimate_metronome_samples(
-                sample_count,
-                tempo_map,
-                max_tick,
-                config.metronome,
-                pulses_per_quarter,
-                sample_rate,
-            )
+        for start_index, length, _program, _midi, _ticks, _tempo_key in notes:
+            total_work += max(0, min(length - 1, sample_count - max(0, start_index)))
+        if clicks:
+            total_work += click_work(clicks, sample_count, sample_rate)
 
     completed_work = 0
 
@@ -221,20 +326,7 @@ def render_events(
     if progress_callback is not None and total_work > 0:
         progress_callback(0.0)
 
-    for onset, duration, midi, program in events:
-        frequency = _midi_to_frequency(midi)
-        if frequency <= 0.0:
-            continue
-        start_index = tempo_map.tick_to_sample(onset, sample_rate)
-        if start_index >= sample_count:
-            continue
-        duration_ticks = max(1, int(duration))
-        duration_seconds = tempo_map.duration_between(onset, onset + duration_ticks)
-        if duration_seconds <= 1e-6:
-            continue
-        ticks_per_second = duration_ticks / max(duration_seconds, 1e-9)
-        effective_tempo = max(1e-3, (ticks_per_second / pulses_per_quarter) * 60.0)
-        tempo_key_value = tempo_cache_key(effective_tempo)
+    for start_index, _length, program, midi, duration_ticks, tempo_key_value in notes:
         segment = note_segment(
             program,
             midi,
@@ -249,124 +341,29 @@ def render_events(
         limit = min(len(segment), sample_count - base_index)
         if limit <= 0:
             continue
-        segment_slice = segment[:limit]
-        remaining = limit
-        dest_index = base_index
-        processed = 0
-        while remaining > 0:
-            step = remaining
-            if progress_callback is not None and total_work > 0:
-                step = min(step, chunk_size)
-            dest_end = dest_index + step
-            src_slice = segment_slice[processed : processed + step]
-            existing = mix[dest_index:dest_end]
-            mix[dest_index:dest_end] = [
-                current + addition for current, addition in zip(existing, src_slice)
-            ]
-            dest_index = dest_end
-            processed += step
-            remaining -= step
-            _report_progress(step)
-
-    if config.metronome.enabled:
-        overlay_metronome(
-            mix,
-            tempo_map,
-            max_tick,
-            sample_count,
-            config.metronome,
-            pulses_per_quarter,
-            sample_rate,
-            report_progress=_report_progress if total_work > 0 else None,
-        )
+        step = limit
+        if progress_callback is not None and total_work > 0:
+            step = min(step, chunk_size)
+        for processed in range(0, limit, step):
+            added = mix.add(
+                base_index + processed, segment[processed : min(limit, processed + step)]
+            )
+            _report_progress(added)
+
+    peak = measure_note_peak(notes, pulses_per_quarter, sample_rate, sample_count)
+    scale = note_scale(peak, config.amplitude)
+    if scale <= 0.0 and not clicks:
+        pcm = b""
+    else:
+        mixed = bytearray(mix.scaled_pcm16(scale))
+        overlay_click_stem(mixed, clicks, sample_rate, click_peak(config.amplitude))
+        _report_progress(click_work(clicks, sample_count, sample_rate))
+        pcm = bytes(mixed)
 
     if progress_callback is not None and total_work > 0 and completed_work < total_work:
         _report_progress(total_work - completed_work)
 
-    peak = max((abs(val) for val in mix), default=0.0)
-    if peak <= 1e-9:
-        return b"", tempo_map
-    scale = (config.amplitude * 32767.0) / peak
-    samples = array("h", (int(max(-32767, min(32767, val * scale))) for val in mix))
-    return samples.tobytes(), tempo_map
-
-
-def overlay_metronome(
-    mix: list[float],
-    tempo_map: TempoMap,
-    max_tick: int,
-    sample_count: int,
-    settings: MetronomeSettings,
-    pulses_per_quarter: int,
-    sample_rate: int,
-    *,
-    report_progress: Callable[[int], None] | None = None,
-) -> None:
-    beat_length_ticks = int(
-        round((pulses_per_quarter * 4) / max(1, settings.beat_unit))
-    )
-    if beat_length_ticks <= 0:
-        return
-    if max_tick <= 0:
-        return
-    click_duration_samples = max(1, int(sample_rate * 0.08))
-    accent_frequency = 1760.0
-    weak_frequency = 1320.0
-    beats_per_measure = max(1, settings.beats_per_measure)
-    tick = 0
-    beat_index = 0
-    while tick <= max_tick:
-        start_sample = tempo_map.tick_to_sample(tick, sample_rate)
-        if start_sample >= sample_count:
-            break
-        end_sample = min(sample_count, start_sample + click_duration_samples)
-        if end_sample <= start_sample:
-            break
-        is_accent = beat_index % beats_per_measure == 0
-        frequency = accent_frequency if is_accent else weak_frequency
-        amplitude = 1.0 if is_accent else 0.6
-        phase = 0.0
-        phase_step = 2.0 * math.pi * frequency / sample_rate
-        decay = max(1, int(click_duration_samples * 0.8))
-        for index in range(start_sample, end_sample):
-            step = index - start_sample
-            envelope = 1.0 - (step / decay) if step < decay else 0.0
-            mix[index] += math.sin(phase) * amplitude * envelope
-            phase += phase_step
-        if report_progress is not None:
-            report_progress(end_sample - start_sample)
-        beat_index += 1
-        tick += beat_length_ticks
-
-
-def estimate_metronome_samples(
-    sample_count: int,
-    tempo_map: TempoMap,
-    max_tick: int,
-    settings: MetronomeSettings,
-    pulses_per_quarter: int,
-    sample_rate: int,
-) -> int:
-    beat_length_ticks = int(
-        round((pulses_per_quarter * 4) / max(1, settings.beat_unit))
-    )
-    if beat_length_ticks <= 0:
-        return 0
-    if max_tick <= 0:
-        return 0
-    click_duration_samples = max(1, int(sample_rate * 0.08))
-    tick = 0
-    total = 0
-    while tick <= max_tick:
-        start_sample = tempo_map.tick_to_sample(tick, sample_rate)
-        if start_sample >= sample_count:
-            break
-        end_sample = min(sample_count, start_sample + click_duration_samples)
-        if end_sample <= start_sample:
-            break
-        total += end_sample - start_sample
-        tick += beat_length_ticks
-    return total
+    return pcm, tempo_map
 
 
 __all__ = [
@@ -375,10 +372,14 @@ __all__ = [
     "RenderConfig",
     "TempoMap",
     "tempo_cache_key",
+    "ScheduledNote",
+    "measure_note_peak",
+    "mix_notes",
+    "note_scale",
     "note_segment",
+    "schedule_notes",
     "render_events",
-    "overlay_metronome",
-    "estimate_metronome_samples",
     "clear_note_segment_cache",
     "get_note_segment_cache_info",
+    "set_note_segment_cache_budget",
 ]
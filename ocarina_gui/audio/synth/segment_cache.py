@@ -0,0 +1,119 @@
+"""Byte-budgeted LRU cache for synthesised note segments."""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from typing import Hashable
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "currsize", "evictions", "nbytes", "budget"]
+)
+
+DEFAULT_BYTE_BUDGET = 64 * 1024 * 1024
+DEFAULT_SHARDS = 8
+
+
+class _Shard:
+    __slots__ = ("lock", "entries", "nbytes", "hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[Hashable, array] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class SegmentCache:
+    """LRU cache of ``array('f')`` segments bounded by total buffer size.
+
+    Keys hash to one of ``shards`` independently locked shards, each owning an
+    equal slice of the byte budget, so concurrent renders rarely contend and
+    eviction only ever scans one shard. A segment larger than a shard's
+    budget is returned to the caller but not kept.
+    """
+
+    def __init__(
+        self, byte_budget: int = DEFAULT_BYTE_BUDGET, shards: int = DEFAULT_SHARDS
+    ) -> None:
+        if shards <= 0:
+            raise ValueError("SegmentCache needs at least one shard")
+        self._shards = tuple(_Shard() for _ in range(shards))
+        self._shard_budget = 0
+        self.set_budget(byte_budget)
+
+    @property
+    def budget(self) -> int:
+        return self._shard_budget * len(self._shards)
+
+    def set_budget(self, byte_budget: int) -> None:
+        """Change the total byte budget, evicting entries that no longer fit."""
+
+        if byte_budget < 0:
+            raise ValueError("SegmentCache byte budget must not be negative")
+        self._shard_budget = int(byte_budget) // len(self._shards)
+        for shard in self._shards:
+            with shard.lock:
+                self._evict_locked(shard, 0)
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: Hashable) -> array | None:
+        shard = self._shard(key)
+        with shard.lock:
+            segment = shard.entries.get(key)
+            if segment is None:
+                shard.misses += 1
+                return None
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return segment
+
+    def put(self, key: Hashable, segment: array) -> array:
+        """Store *segment* unless another thread won the race; return the kept one."""
+
+        size = segment.itemsize * len(segment)
+        shard = self._shard(key)
+        with shard.lock:
+            existing = shard.entries.get(key)
+            if existing is not None:
+                shard.entries.move_to_end(key)
+                return existing
+            if size > self._shard_budget:
+                return segment
+            self._evict_locked(shard, size)
+            shard.entries[key] = segment
+            shard.nbytes += size
+            return segment
+
+    def _evict_locked(self, shard: _Shard, incoming: int) -> None:
+        while shard.entries and shard.nbytes + incoming > self._shard_budget:
+            _key, evicted = shard.entries.popitem(last=False)
+            shard.nbytes -= evicted.itemsize * len(evicted)
+            shard.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.nbytes = shard.hits = shard.misses = shard.evictions = 0
+
+    def info(self) -> CacheInfo:
+        hits = misses = size = evictions = nbytes = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                size += len(shard.entries)
+                evictions += shard.evictions
+                nbytes += shard.nbytes
+        return CacheInfo(hits, misses, size, evictions, nbytes, self.budget)
+
+
+__all__ = ["CacheInfo", "DEFAULT_BYTE_BUDGET", "DEFAULT_SHARDS", "SegmentCache"]
@@ -0,0 +1,392 @@
+"""Chunked look-ahead playback that feeds a streaming player through a ring."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from viewmodels.preview_playback_viewmodel import AudioRenderListener
+
+from ..players import _AudioPlayer, _PlaybackStream
+from .chunks import ChunkSource
+from .looping import LOOP_CROSSFADE_SECONDS, loop_clip
+from .worker import _RenderWorker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StreamChunk:
+    generation: int
+    source: ChunkSource
+    start: int
+    end: int
+    pcm: bytes
+
+
+class ChunkRing:
+    """Fixed-capacity FIFO of rendered chunks shared by renderer and feeder.
+
+    Slots are preallocated and reused in order. :meth:`clear` drops every
+    chunk that has not been handed to the player yet, which is all a tempo
+    change needs to discard.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("ChunkRing capacity must be positive")
+        self._slots: list[Optional[StreamChunk]] = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._count
+
+    def put(self, chunk: StreamChunk) -> bool:
+        """Append *chunk* without blocking; return ``False`` when full or closed."""
+
+        with self._condition:
+            if self._closed or self._count == len(self._slots):
+                return False
+            self._slots[(self._head + self._count) % len(self._slots)] = chunk
+            self._count += 1
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout: float | None = None) -> Optional[StreamChunk]:
+        """Pop the oldest chunk, waiting up to *timeout*; ``None`` if none arrived."""
+
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._count or self._closed, timeout
+            ) or not self._count:
+                return None
+            chunk = self._slots[self._head]
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % len(self._slots)
+            self._count -= 1
+            return chunk
+
+    def clear(self) -> int:
+        """Drop all queued chunks and return how many were discarded."""
+
+        with self._condition:
+            dropped = self._count
+            self._slots[:] = [None] * len(self._slots)
+            self._head = 0
+            self._count = 0
+            return dropped
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class StreamingPlayback:
+    """Render a few seconds ahead of the playhead and write chunks to a stream.
+
+    Each chunk is rendered by a separate task handed to *submit* (the
+    preview render worker), and at most ``ring.capacity`` chunks are ever
+    queued or rendered ahead, so look-ahead equals ``capacity`` chunks and
+    the first chunk can play as soon as it is mixed. A feeder thread pops
+    chunks, applies *volume* and blocks on :meth:`_PlaybackStream.write`,
+    which paces the whole pipeline to real time.
+
+    With a loop region set, chunks inside it are cut from one crossfaded
+    :func:`loop_clip` rendered per source, and scheduling wraps from the loop
+    end back to its start, so repeats stay queued on the same stream.
+    """
+
+    _FEED_POLL_SECONDS = 0.05
+
+    def __init__(
+        self,
+        stream: _PlaybackStream,
+        source: ChunkSource,
+        start_tick: int,
+        *,
+        submit: Callable[[Callable[[], None]], bool],
+        chunk_samples: int,
+        capacity: int,
+        volume: Callable[[bytes], bytes],
+        loop: tuple[int, int] | None = None,
+    ) -> None:
+        self._stream = stream
+        self._submit = submit
+        self._chunk_samples = max(1, int(chunk_samples))
+        self._ring = ChunkRing(capacity)
+        self._volume = volume
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._source = source
+        self._loop = loop
+        self._clip: tuple[ChunkSource, tuple[int, int], bytes] | None = None
+        self._next_sample = source.sample_at_tick(max(0, start_tick))
+        self._outstanding = 0
+        self._on_ready: Callable[[], None] | None = None
+        self._playhead_tick = max(0, start_tick)
+        self._stopped = False
+        self._feeder = threading.Thread(
+            target=self._feed, name="preview-stream", daemon=True
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            self._schedule_locked()
+        self._feeder.start()
+
+    @property
+    def playhead_tick(self) -> int:
+        """Tick reached by the audio handed to the player so far."""
+
+        with self._lock:
+            return self._playhead_tick
+
+    @property
+    def finished(self) -> bool:
+        return not self._feeder.is_alive()
+
+    def retarget(
+        self, source: ChunkSource, on_ready: Callable[[], None] | None = None
+    ) -> None:
+        """Continue from the playhead with *source*, discarding unplayed chunks.
+
+        *on_ready* runs once the first chunk rendered from *source* is queued.
+        """
+
+        with self._lock:
+            self._source = source
+            self._on_ready = on_ready
+            self._replan_locked()
+            idle = self._outstanding == 0
+            if idle:
+                self._on_ready = None
+        if idle and on_ready is not None:
+            on_ready()
+
+    def set_loop(self, loop: tuple[int, int] | None) -> None:
+        """Repeat ticks ``[start, end)`` from now on, or play straight on for ``None``."""
+
+        with self._lock:
+            if loop == self._loop:
+                return
+            self._loop = loop
+            # Queued chunks may already run past the new seam.
+            self._replan_locked()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._generation += 1
+        self._ring.close()
+        try:
+            self._stream.stop()
+        except Exception:  # pragma: no cover - backend specific failures
+            logger.warning("Failed stopping playback stream", exc_info=True)
+        if self._feeder.is_alive() and self._feeder is not threading.current_thread():
+            self._feeder.join(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _replan_locked(self) -> None:
+        self._generation += 1
+        self._ring.clear()
+        self._next_sample = self._source.sample_at_tick(self._playhead_tick)
+        self._outstanding = 0
+        self._schedule_locked()
+
+    def _loop_samples_locked(self) -> tuple[int, int] | None:
+        if self._loop is None:
+            return None
+        start, end = (self._source.sample_at_tick(tick) for tick in self._loop)
+        return (start, end) if end > start else None
+
+    def _schedule_locked(self) -> None:
+        source = self._source
+        loop = self._loop_samples_locked()
+        while not self._stopped and self._outstanding < self._ring.capacity:
+            start = self._next_sample
+            following = None
+            if loop is not None and loop[0] <= start < loop[1]:
+                end = min(loop[1], start + self._chunk_samples)
+                task = self._render_task(self._generation, source, start, end, loop)
+                if end == loop[1]:
+                    following = loop[0]
+            elif start < source.sample_count or (loop is not None and start < loop[0]):
+                end = start + self._chunk_samples
+                if loop is not None and start < loop[0]:
+                    end = min(end, loop[0])
+                else:
+                    end = min(end, source.sample_count)
+                task = self._render_task(self._generation, source, start, end)
+            else:
+                return
+            if not self._submit(task):
+                return
+            self._outstanding += 1
+            self._next_sample = end if following is None else following
+
+    def _loop_pcm(self, source: ChunkSource, loop: tuple[int, int]) -> bytes:
+        # Only the render thread touches the clip, one task at a time.
+        clip = self._clip
+        if clip is None or clip[0] is not source or clip[1] != loop:
+            fade = int(source.config.sample_rate * LOOP_CROSSFADE_SECONDS)
+            clip = (source, loop, loop_clip(source.render, loop[0], loop[1], fade))
+            self._clip = clip
+        return clip[2]
+
+    def _render_task(
+        self,
+        generation: int,
+        source: ChunkSource,
+        start: int,
+        end: int,
+        loop: tuple[int, int] | None = None,
+    ) -> Callable[[], None]:
+        def render() -> None:
+            if generation != self._generation:
+                return
+            if loop is None:
+                pcm = source.render(start, end)
+                # Silence leading up to a loop placed after the score's tail.
+                pcm += bytes(2 * (end - start) - len(pcm))
+            else:
+                pcm = self._loop_pcm(source, loop)[2 * (start - loop[0]) : 2 * (end - loop[0])]
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self._ring.put(StreamChunk(generation, source, start, end, pcm))
+                on_ready, self._on_ready = self._on_ready, None
+            if on_ready is not None:
+                on_ready()
+
+        return render
+
+    def _exhausted_locked(self) -> bool:
+        if self._outstanding or self._next_sample < self._source.sample_count:
+            return False
+        loop = self._loop_samples_locked()
+        return loop is None or not loop[0] <= self._next_sample < loop[1]
+
+    def _feed(self) -> None:
+        while True:
+            chunk = self._ring.get(self._FEED_POLL_SECONDS)
+            with self._lock:
+                if self._stopped:
+                    return
+                if chunk is None:
+                    if not self._exhausted_locked():
+                        continue
+                    break
+                if chunk.generation != self._generation:
+                    # Popped just before a retarget; it never reached the player.
+                    continue
+                self._outstanding -= 1
+                self._schedule_locked()
+                self._playhead_tick = chunk.source.tick_at_sample(chunk.end)
+            if not self._stream.write(self._volume(chunk.pcm)):
+                logger.debug("Playback stream rejected a chunk; stopping feed")
+                return
+        try:
+            self._stream.finish()
+        except Exception:  # pragma: no cover - backend specific failures
+            logger.warning("Failed finishing playback stream", exc_info=True)
+
+
+class PreviewStreamer:
+    """Own the renderer's live :class:`StreamingPlayback`, if any.
+
+    The defaults render quarter-second chunks three seconds ahead.
+    """
+
+    CHUNK_SECONDS = 0.25
+    LOOKAHEAD_CHUNKS = 12
+
+    def __init__(
+        self,
+        player: _AudioPlayer,
+        worker: _RenderWorker,
+        sample_rate: int,
+        volume: Callable[[bytes], bytes],
+    ) -> None:
+        self._player = player
+        self._worker = worker
+        self._sample_rate = sample_rate
+        self._chunk_samples = max(1, int(sample_rate * self.CHUNK_SECONDS))
+        self._capacity = self.LOOKAHEAD_CHUNKS
+        self._volume = volume
+        self._loop: tuple[int, int] | None = None
+        self._session: StreamingPlayback | None = None
+
+    def available(self) -> bool:
+        return self._player.supports_streaming()
+
+    @property
+    def active(self) -> bool:
+        return self._session is not None
+
+    @property
+    def looping(self) -> bool:
+        """``True`` while a live session repeats the configured loop."""
+        return self._loop is not None and self._session is not None
+
+    def play(self, source: ChunkSource, tick: int) -> bool:
+        """Start streaming *source* from *tick*; ``False`` if no stream opened."""
+
+        self.stop()
+        stream = self._player.open_stream(self._sample_rate)
+        if stream is None:
+            return False
+        self._session = StreamingPlayback(
+            stream,
+            source,
+            tick,
+            submit=self._worker.submit,
+            chunk_samples=self._chunk_samples,
+            capacity=self._capacity,
+            volume=self._volume,
+            loop=self._loop,
+        )
+        self._session.start()
+        return True
+
+    def set_loop(self, loop: tuple[int, int] | None) -> None:
+        """Loop ticks ``[start, end)`` in the live session and every later one."""
+
+        self._loop = loop
+        session = self._session
+        if session is not None:
+            session.set_loop(loop)
+
+    def retarget(
+        self,
+        source_factory: Callable[[], ChunkSource],
+        listener: AudioRenderListener | None,
+    ) -> None:
+        """Report a streamed render generation and move the live session to it."""
+
+        complete = self._worker.begin_streamed_render(listener)
+        session = self._session
+        if session is None or session.finished:
+            complete()
+            return
+        session.retarget(source_factory(), complete)
+
+    def stop(self) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            session.stop()
+
+
+__all__ = ["ChunkRing", "PreviewStreamer", "StreamChunk", "StreamingPlayback"]
@@ -0,0 +1,210 @@
+"""Vectorised additive synthesis for preview note segments.
+
+Two backends render the same waveform as the original per-sample loop:
+NumPy when it is importable, otherwise a block-wise pure-Python path that
+fills an ``array('d')`` one block of comprehensions at a time. Both
+accumulate the oscillator and vibrato phases sequentially and keep the loop's
+operation order, so results only differ by the last bits of ``sin``.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from itertools import accumulate, repeat
+from typing import Sequence
+
+from .patches import _SynthPatch
+
+try:
+    import numpy as _np  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - dependency optional
+    _np = None
+
+BLOCK_SIZE = 4096
+SYNTHESIS_BACKENDS: tuple[str, ...] = ("numpy", "array") if _np is not None else ("array",)
+_active_backend = SYNTHESIS_BACKENDS[0]
+
+
+def synthesis_backend() -> str:
+    """Return the name of the backend used by :func:`synthesize_note`."""
+
+    return _active_backend
+
+
+def set_synthesis_backend(name: str) -> None:
+    """Select the synthesis backend; ``"numpy"`` requires NumPy to be installed."""
+
+    global _active_backend
+    if name not in SYNTHESIS_BACKENDS:
+        raise ValueError(f"Unavailable synthesis backend: {name!r}")
+    _active_backend = name
+
+
+def synthesize_note(
+    patch: _SynthPatch,
+    frequency: float,
+    length: int,
+    sample_rate: int,
+    pitch_gain: float,
+) -> Sequence[float]:
+    """Return ``length`` samples of *patch* playing *frequency*."""
+
+    if _active_backend == "numpy":
+        return _synthesize_numpy(patch, frequency, length, sample_rate, pitch_gain)
+    return _synthesize_blocks(patch, frequency, length, sample_rate, pitch_gain)
+
+
+def _envelope_bounds(patch: _SynthPatch, length: int) -> tuple[int, float, int, float]:
+    attack = max(1, min(length, int(length * patch.attack_ratio)))
+    release = max(1, min(length, int(length * patch.release_ratio)))
+    return attack, 1.0 / attack, max(0, length - release), 1.0 / release
+
+
+def _vibrato_step(patch: _SynthPatch, sample_rate: int) -> float:
+    if not patch.vibrato_hz:
+        return 0.0
+    return 2.0 * math.pi * patch.vibrato_hz / sample_rate
+
+
+def _synthesize_numpy(
+    patch: _SynthPatch,
+    frequency: float,
+    length: int,
+    sample_rate: int,
+    pitch_gain: float,
+):
+    np = _np
+    base_step = 2.0 * math.pi * frequency / sample_rate
+    vibrato_step = _vibrato_step(patch, sample_rate)
+    attack, attack_scale, release_start, release_scale = _envelope_bounds(patch, length)
+
+    # Exclusive running sums reproduce the loop's sequential phase updates.
+    if patch.vibrato_depth and vibrato_step:
+        vibrato_phase = np.empty(length)
+        vibrato_phase[0] = 0.0
+        np.cumsum(np.full(length - 1, vibrato_step), out=vibrato_phase[1:])
+        scale = np.sin(vibrato_phase)
+        scale *= patch.vibrato_depth
+        scale += 1.0
+        np.maximum(scale, 0.0, out=scale)
+        increments = scale * base_step
+    else:
+        increments = np.full(length, base_step)
+    phase = np.empty(length)
+    phase[0] = 0.0
+    np.cumsum(increments[:-1], out=phase[1:])
+
+    samples = np.zeros(length)
+    for multiple, amplitude in patch.harmonics:
+        samples += np.sin(phase * multiple) * amplitude
+
+    envelope = np.ones(length)
+    positions = np.arange(length, dtype=np.float64)
+    release_from = max(attack, release_start)
+    envelope[release_from:] = (length - positions[release_from:]) * release_scale
+    envelope[:attack] = positions[:attack] * attack_scale
+    samples *= envelope
+    samples *= patch.gain
+    samples *= pitch_gain
+    return samples
+
+
+def _add_harmonics(
+    values: list[float] | None,
+    phases: list[float],
+    harmonics: Sequence[tuple[float, float]],
+) -> list[float]:
+    # Two partials per pass halves the interpreted passes while keeping the
+    # loop's left-to-right summation order.
+    sin = math.sin
+    if len(harmonics) == 2:
+        (first, first_amp), (second, second_amp) = harmonics
+        if values is None:
+            return [sin(p * first) * first_amp + sin(p * second) * second_amp for p in phases]
+        return [
+            v + sin(p * first) * first_amp + sin(p * second) * second_amp
+            for v, p in zip(values, phases)
+        ]
+    ((multiple, amplitude),) = harmonics
+    if values is None:
+        return [sin(p * multiple) * amplitude for p in phases]
+    return [v + sin(p * multiple) * amplitude for v, p in zip(values, phases)]
+
+
+def _synthesize_blocks(
+    patch: _SynthPatch,
+    frequency: float,
+    length: int,
+    sample_rate: int,
+    pitch_gain: float,
+) -> array:
+    sin = math.sin
+    base_step = 2.0 * math.pi * frequency / sample_rate
+    vibrato_step = _vibrato_step(patch, sample_rate)
+    vibrato = bool(patch.vibrato_depth and vibrato_step)
+    depth = patch.vibrato_depth
+    gain = patch.gain
+    harmonics = patch.harmonics
+    attack, attack_scale, release_start, release_scale = _envelope_bounds(patch, length)
+    release_from = max(attack, release_start)
+
+    output = array("d")
+    phase_start = 0.0
+    vibrato_start = 0.0
+    for block_start in range(0, length, BLOCK_SIZE):
+        block_end = min(length, block_start + BLOCK_SIZE)
+        count = block_end - block_start
+
+        if vibrato:
+            vibrato_phases = list(accumulate(repeat(vibrato_step, count), initial=vibrato_start))
+            vibrato_start = vibrato_phases.pop()
+            scales = [1.0 + depth * sin(phase) for phase in vibrato_phases]
+            increments = [base_step * (scale if scale > 0.0 else 0.0) for scale in scales]
+        else:
+            increments = repeat(base_step, count)
+        phases = list(accumulate(increments, initial=phase_start))
+        phase_start = phases.pop()
+
+        values = None
+        for offset in range(0, len(harmonics), 2):
+            values = _add_harmonics(values, phases, harmonics[offset : offset + 2])
+
+        # Attack and release ramps; the sustained middle has an envelope of 1.0.
+        attack_end = min(attack, block_end)
+        if block_start < attack_end:
+            output.extend(
+                [
+                    v * (index * attack_scale) * gain * pitch_gain
+                    for v, index in zip(values, range(block_start, attack_end))
+                ]
+            )
+        middle_start = max(block_start, attack)
+        middle_end = min(release_from, block_end)
+        if middle_end > middle_start:
+            output.extend(
+                [
+                    v * 1.0 * gain * pitch_gain
+                    for v in values[middle_start - block_start : middle_end - block_start]
+                ]
+            )
+        block_release = max(block_start, release_from)
+        if block_end > block_release:
+            output.extend(
+                [
+                    v * ((length - index) * release_scale) * gain * pitch_gain
+                    for v, index in zip(
+                        values[block_release - block_start :], range(block_release, block_end)
+                    )
+                ]
+            )
+    return output
+
+
+__all__ = [
+    "BLOCK_SIZE",
+    "SYNTHESIS_BACKENDS",
+    "set_synthesis_backend",
+    "synthesis_backend",
+    "synthesize_note",
+]
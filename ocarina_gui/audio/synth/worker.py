@@ -213,6 +213,40 @@ class _RenderWorker:
         )
         return not buffer_is_valid
 
+    def submit(self, task: Callable[[], None]) -> bool:
+        """Run *task* on the render thread; ``False`` once shut down."""
+
+        with self._lock:
+            if self._shutdown:
+                return False
+        self._tasks.put_nowait(task)
+        return True
+
+    def begin_streamed_render(
+        self, listener: AudioRenderListener | None
+    ) -> Callable[[], None]:
+        """Open a render generation served by streaming instead of a full buffer.
+
+        Any full-buffer render in flight becomes stale. The returned callback
+        reports the generation complete once its first chunk is available.
+        """
+
+        with self._lock:
+            self._render_generation += 1
+            generation = self._render_generation
+        if listener is not None:
+            try:
+                listener.render_started(generation)
+            except Exception:  # pragma: no cover - defensive listener guard
+                logger.warning("Render listener render_started failed", exc_info=True)
+                listener = None
+
+        def complete() -> None:
+            self._notify_render_progress(listener, generation, 1.0)
+            self._notify_render_complete(listener, generation, True)
+
+        return complete
+
     @property
     def buffer(self) -> bytes:
         with self._lock:
@@ -233,6 +267,39 @@ class _RenderWorker:
         rate = max(sample_rate or stored_rate, 1)
         return int(round(tick / max(ticks_per_second, 1e-3) * rate))
 
+    def ticks_to_samples(self, ticks: Sequence[int], sample_rate: int) -> list[int]:
+        """Bulk :meth:`tick_to_sample` for ascending *ticks*."""
+
+        with self._lock:
+            tempo_map = self._tempo_map
+            stored_rate = self._sample_rate
+            ticks_per_second = self._ticks_per_second
+        if tempo_map is not None:
+            return tempo_map.ticks_to_samples(ticks, sample_rate or stored_rate or 1)
+        scale = max(sample_rate or stored_rate, 1) / max(ticks_per_second, 1e-3)
+        return [int(round(tick * scale)) for tick in ticks]
+
+    def report_buffer_reused(self, listener: AudioRenderListener | None) -> bool:
+        """Report the current buffer as the render for a playback-only change.
+
+        Returns ``False`` without reporting while a render is in flight, since
+        that render's own completion already answers the request.
+        """
+
+        with self._lock:
+            if self._shutdown or self._buffer_generation != self._render_generation:
+                return False
+            generation = self._render_generation
+        if listener is not None:
+            try:
+                listener.render_started(generation)
+            except Exception:  # pragma: no cover - defensive listener guard
+                logger.warning("Render listener render_started failed", exc_info=True)
+                return True
+        self._notify_render_progress(listener, generation, 1.0)
+        self._notify_render_complete(listener, generation, True)
+        return True
+
     @property
     def buffer_generation(self) -> int:
         with self._lock:
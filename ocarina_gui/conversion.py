@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from itertools import count
 from typing import Callable, Dict, List, Protocol, Sequence
 
@@ -17,6 +19,7 @@ from ocarina_tools import (
     NoteEvent,
     transform_to_ocarina,
 )
+from ocarina_tools.exporters import SerializedScore
 from ocarina_tools.midi_import.models import MidiImportReport
 
 from .settings import TransformSettings
@@ -71,6 +74,8 @@ class ConversionResult:
     output_pdf_paths: Dict[str, str]
     output_folder: str
     midi_report: MidiImportReport | None = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    """Seconds spent writing each artifact, keyed by ``musicxml``/``mxl``/``midi``/``pdf``."""
 
 
 def derive_export_folder(output_xml_path: str) -> str:
@@ -101,6 +106,7 @@ def convert_score(
     midi_mode: str = "auto",
     arranged_events: Sequence[NoteEvent] | None = None,
     arranged_pulses_per_quarter: int | None = None,
+    export_folder: str | None = None,
 ) -> ConversionResult:
     load_result = load_score(input_path, midi_mode=midi_mode)
     tree, root = load_result
@@ -141,26 +147,33 @@ def convert_score(
 
     trimmed_events = trim_leading_silence(events)
 
-    export_folder = derive_export_folder(output_xml_path)
+    # An explicit folder is written into as is, replacing earlier outputs.
+    export_folder = export_folder or derive_export_folder(output_xml_path)
     os.makedirs(export_folder, exist_ok=True)
 
     xml_filename = os.path.basename(output_xml_path)
     export_xml_path = os.path.join(export_folder, xml_filename)
-    export_musicxml(tree, export_xml_path)
-
     base_stem, _ = os.path.splitext(xml_filename)
     output_mxl_path = os.path.join(export_folder, f"{base_stem}.mxl")
-    export_mxl(tree, output_mxl_path)
-
     output_midi_path = os.path.join(export_folder, f"{base_stem}.mid")
-    export_midi(root, output_midi_path, tempo_bpm=None)
 
     pdf_paths: Dict[str, str] = {}
     base_path = os.path.join(export_folder, base_stem)
     size = pdf_options.normalized_size()
     orientation = pdf_options.normalized_orientation()
     pdf_path = f"{base_path}-{pdf_options.filename_suffix()}.pdf"
-    export_pdf(
+
+    # The MusicXML and MXL files are written from a single serialization.
+    # The exporters run one after another: they are pure Python and hold the
+    # GIL, so a thread pool gave no speed-up.
+    if isinstance(tree, ET.ElementTree):
+        tree = SerializedScore(tree)
+    timings: Dict[str, float] = {}
+    timings["musicxml"] = _timed(export_musicxml, tree, export_xml_path)
+    timings["mxl"] = _timed(export_mxl, tree, output_mxl_path)
+    timings["midi"] = _timed(export_midi, root, output_midi_path, tempo_bpm=None)
+    timings["pdf"] = _timed(
+        export_pdf,
         root,
         pdf_path,
         size,
@@ -194,4 +207,11 @@ def convert_score(
         output_pdf_paths=pdf_paths,
         output_folder=export_folder,
         midi_report=getattr(load_result, "midi_report", None),
+        timings=timings,
     )
+
+
+def _timed(export: Callable[..., None], *args, **kwargs) -> float:
+    start = time.perf_counter()
+    export(*args, **kwargs)
+    return time.perf_counter() - start
@@ -110,6 +110,7 @@ class PianoRoll(
         self._viewport_hint = 0
 
         self._wrap_layout = None
+        self._wrap_lines = None
         self._wrap_viewport_width = 0
         self._configure_time_scrollbars()
 
@@ -213,6 +214,7 @@ class PianoRoll(
         self._loop_start_line = None
         self._loop_end_line = None
         self._wrap_layout = None
+        self._wrap_lines = None
         self._last_scroll_fraction = None
 
         self._ticks_per_measure = self._calculate_ticks_per_measure(
@@ -313,6 +315,7 @@ class PianoRoll(
                     )
                 else:
                     self._wrap_viewport_width = width
+            self._redraw_wrapped_lines()
             self._redraw_tempo_markers()
             return
         self._redraw_visible_region(force=True)
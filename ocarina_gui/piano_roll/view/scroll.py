@@ -134,6 +134,7 @@ class ScrollMixin:
             if self._time_layout_mode == "wrapped":
                 fraction = self.canvas.yview()[0]
                 self._last_scroll_fraction = fraction
+                self._redraw_wrapped_lines()
                 return
             fraction = self.canvas.xview()[0]
         except Exception:
@@ -155,6 +156,7 @@ class ScrollMixin:
 
     def _redraw_visible_region(self, force: bool = False) -> None:
         if self._time_layout_mode == "wrapped":
+            self._redraw_wrapped_lines(force=force)
             return
         viewport_width = self._get_viewport_width()
         if viewport_width <= 0:
@@ -343,3 +345,6 @@ class ScrollMixin:
     def _raise_overlay_items(self) -> None:
         raise NotImplementedError
 
+    def _redraw_wrapped_lines(self, force: bool = False) -> None:
+        raise NotImplementedError
+
@@ -9,6 +9,7 @@ import tkinter as tk
 from ..rendering import PianoRollRenderer
 from ..wrapped import WrappedLayout, WrappedLine, render_wrapped_view
 from ...themes import PianoRollPalette
+from ...wrapped_lines import WrappedLineVirtualizer
 from .types import SupportsGeometry
 
 if TYPE_CHECKING:  # pragma: no cover - only for type checking
@@ -23,6 +24,7 @@ class WrappedModeMixin:
     _palette: PianoRollPalette
     _renderer: PianoRollRenderer
     _wrap_layout: Optional[WrappedLayout]
+    _wrap_lines: Optional[WrappedLineVirtualizer]
     _wrap_viewport_width: int
     _total_ticks: int
     _content_height: int
@@ -59,9 +61,12 @@ class WrappedModeMixin:
             viewport_width=viewport_width,
             ticks_per_measure=ticks_per_measure,
             total_ticks=total_ticks,
+            viewport_top=self._wrap_viewport_top(),
+            viewport_height=self._get_viewport_height(),
         )
 
         self._wrap_layout = result.layout
+        self._wrap_lines = result.virtual_lines
         self._wrap_viewport_width = viewport_width
         self._total_ticks = result.total_ticks
         self._content_height = result.content_height
@@ -76,6 +81,26 @@ class WrappedModeMixin:
         self.set_cursor(self._cursor_tick)
         self._raise_overlay_items()
 
+    def _wrap_viewport_top(self) -> float:
+        try:
+            return float(self.canvas.canvasy(0))
+        except Exception:
+            return 0.0
+
+    def _redraw_wrapped_lines(self, force: bool = False) -> None:
+        lines = self._wrap_lines
+        if lines is None:
+            return
+        if not lines.update(
+            self._wrap_viewport_top(), self._get_viewport_height(), force=force
+        ):
+            return
+        self.canvas.tag_raise("measure_number")
+        if self._label_highlight is not None:
+            self.labels.tag_raise(self._label_highlight)
+        self.labels.tag_raise("note_label")
+        self._raise_overlay_items()
+
     def _wrap_tick_to_coords(self, tick: int) -> Tuple[float, float, float]:
         layout = self._wrap_layout
         if layout is None or not layout.lines:
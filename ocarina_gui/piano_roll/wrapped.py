@@ -13,6 +13,7 @@ from .events import Event
 from .geometry import RenderGeometry
 from .notes import label_for_midi, is_accidental
 from ..themes import PianoRollPalette
+from ..wrapped_lines import WrappedLineVirtualizer
 
 if TYPE_CHECKING:
     from .rendering import PianoRollRenderer
@@ -117,6 +118,7 @@ class WrappedRenderResult:
     loop_start_line_id: int
     loop_end_line_id: int
     cursor_line_id: int
+    virtual_lines: WrappedLineVirtualizer
 
 
 def render_wrapped_view(
@@ -133,8 +135,14 @@ def render_wrapped_view(
     viewport_width: int,
     ticks_per_measure: int,
     total_ticks: int | None = None,
+    viewport_top: float = 0.0,
+    viewport_height: int = 0,
 ) -> WrappedRenderResult:
-    """Render events using the wrapped piano roll layout."""
+    """Render events using the wrapped piano roll layout.
+
+    Only the lines near ``viewport_top`` are drawn; scrolling draws the rest
+    through :attr:`WrappedRenderResult.virtual_lines`.
+    """
 
     canvas.delete("all")
     labels.delete("all")
@@ -164,41 +172,36 @@ def render_wrapped_view(
         line_count = 1
 
     lines: list[WrappedLine] = []
-    event_onsets = tuple(event[0] for event in events)
-
     for line_index in range(line_count):
         line_start = line_index * ticks_per_line
         if effective_total and line_index == line_count - 1:
             line_end = float(effective_total)
         else:
             line_end = float(min(effective_total, line_start + ticks_per_line))
-
-        y_offset = line_index * (line_height + system_spacing)
-        y_top = float(y_offset)
-        y_bottom = float(y_offset + line_height)
-
-        tag = f"wrapped_line_{line_index}"
-
+        y_top = float(line_index * (line_height + system_spacing))
         lines.append(
             WrappedLine(
                 start=float(line_start),
                 end=line_end,
                 y_top=y_top,
-                y_bottom=y_bottom,
+                y_bottom=y_top + line_height,
             )
         )
 
+    event_onsets = tuple(event[0] for event in events)
+
+    def draw_frame(frame_tag: str, y_top: float) -> None:
         canvas.create_rectangle(
             0,
             y_top,
             width,
-            y_bottom,
+            y_top + line_height,
             outline="",
             fill=palette.background,
+            tags=(frame_tag,),
         )
-
         for midi in range(geometry.min_midi, geometry.max_midi + 1):
-            row_top = geometry.note_y(midi)
+            row_top = y_top + geometry.note_y(midi)
             fill = palette.accidental_row_fill if is_accidental(midi) else palette.natural_row_fill
             canvas.create_rectangle(
                 geometry.left_pad,
@@ -207,28 +210,33 @@ def render_wrapped_view(
                 row_top + geometry.px_per_note,
                 outline="",
                 fill=fill,
-                tags=(tag,),
+                tags=(frame_tag,),
             )
-            labels_row_top = y_offset + geometry.note_y(midi)
             labels.create_rectangle(
                 0,
-                labels_row_top,
+                row_top,
                 geometry.label_width,
-                labels_row_top + geometry.px_per_note,
+                row_top + geometry.px_per_note,
                 outline="",
                 fill=fill,
+                tags=(frame_tag,),
             )
             label = "#" if is_accidental(midi) else label_for_midi(midi)
             labels.create_text(
                 geometry.label_width - 6,
-                labels_row_top + geometry.px_per_note / 2,
+                row_top + geometry.px_per_note / 2,
                 anchor="e",
                 fill=palette.note_label_text,
                 text=label,
                 font=("TkDefaultFont", max(6, int(geometry.px_per_note * 0.6))),
-                tags=("note_label",),
+                tags=(frame_tag, "note_label"),
             )
 
+    def draw_content(line_index: int, tag: str) -> None:
+        info = lines[line_index]
+        line_start = int(info.start)
+        line_end = info.end
+
         if ticks_per_measure > 0 and events:
             measure_spacing_px = max(1, int(round(ticks_per_measure * px_per_tick)))
             if measure_spacing_px > 0:
@@ -284,9 +292,6 @@ def render_wrapped_view(
                         tags=(tag, "virtualized", "measure_line"),
                     )
 
-        if not events:
-            continue
-
         start_index = bisect_left(event_onsets, line_start)
         while start_index > 0:
             prev_onset, prev_duration, _prev_midi, _prev_program = events[start_index - 1]
@@ -316,9 +321,17 @@ def render_wrapped_view(
             )
             idx += 1
 
-        canvas.move(tag, 0, y_offset)
+        canvas.move(tag, 0, info.y_top)
         canvas.itemconfigure(tag, state="normal")
 
+    virtual_lines = WrappedLineVirtualizer(
+        (canvas, labels),
+        [(info.y_top, info.y_bottom) for info in lines],
+        draw_frame=draw_frame,
+        draw_content=draw_content,
+    )
+    virtual_lines.update(viewport_top, viewport_height)
+
     canvas.tag_raise("measure_number")
 
     highlight_height = geometry.px_per_note
@@ -381,4 +394,5 @@ def render_wrapped_view(
         loop_start_line_id=loop_start_line,
         loop_end_line_id=loop_end_line,
         cursor_line_id=cursor_line,
+        virtual_lines=virtual_lines,
     )
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import copy
+import os
+import threading
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
-from typing import Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Sequence, Tuple
 
 from ocarina_tools import (
     NoteEvent,
+    ScoreLoadResult,
     TempoChange,
     detect_tempo_bpm,
     favor_lower_register,
@@ -19,7 +23,16 @@ from ocarina_tools import (
     load_score,
     transform_to_ocarina,
 )
+from ocarina_tools.grace_settings import GraceSettings as ImporterGraceSettings
+from ocarina_tools.midi_import import (
+    DecodedMidi,
+    build_song,
+    midi_note_events,
+    midi_tempo_changes,
+    midi_time_signature,
+)
 from ocarina_tools.midi_import.models import MidiImportReport
+from ocarina_tools.score_index import ScoreIndex
 from .settings import TransformSettings
 from .events import trim_leading_silence
 
@@ -37,32 +50,200 @@ class PreviewData:
     midi_report: MidiImportReport | None = None
 
 
+@dataclass
+class _PartView:
+    """Score filtered to one part selection plus what depends only on it.
+
+    The filtered tree is only built when something asks for ``root``; MIDI
+    scores answer their events, tempo map and metre from ``midi`` instead,
+    and MusicXML scores from the score's ``index``.
+    """
+
+    load_root: Callable[[], ET.Element]
+    beats: int
+    beat_type: int
+    tempo_bpm: int
+    tempo_changes: tuple[TempoChange, ...]
+    midi: DecodedMidi | None = None
+    selection: tuple[str, ...] = ()
+    index: ScoreIndex | None = None
+    events: dict[ImporterGraceSettings, tuple[tuple[NoteEvent, ...], int]] = field(
+        default_factory=dict
+    )
+    _root: ET.Element | None = field(default=None, repr=False)
+
+    @property
+    def root(self) -> ET.Element:
+        if self._root is None:
+            self._root = self.load_root()
+        return self._root
+
+    def arrangement_root(self) -> ET.Element:
+        """Return a private tree for the arranger to transform in place."""
+
+        if self.midi is not None and self._root is None:
+            # Building from the events costs about as much as copying a built
+            # tree, and leaves no tree behind in the score cache.
+            root = build_song(self.midi).root
+            if self.selection:
+                filter_parts(root, self.selection)
+            return root
+        return copy.deepcopy(self.root)
+
+
+@dataclass
+class _CachedScore:
+    result: ScoreLoadResult
+    midi_report: MidiImportReport | None
+    parts: dict[tuple[str, ...], _PartView] = field(default_factory=dict)
+
+    @property
+    def root(self) -> ET.Element:
+        return self.result.root
+
+    @property
+    def midi(self) -> DecodedMidi | None:
+        return getattr(self.result, "midi", None)
+
+    @property
+    def index(self) -> ScoreIndex | None:
+        return getattr(self.result, "index", None)
+
+
+class ScoreCache:
+    """Parsed scores reused across preview rebuilds.
+
+    Entries are keyed by absolute path, modification time, size and MIDI
+    import mode, so editing the file on disk or toggling lenient import
+    reparses it. Cached trees are never mutated: part filtering works on a
+    copy and the arranger transforms its own copy of the filtered tree.
+    """
+
+    def __init__(self, max_scores: int = 4) -> None:
+        if max_scores <= 0:
+            raise ValueError("ScoreCache must hold at least one score")
+        self._max_scores = max_scores
+        self._scores: OrderedDict[tuple, _CachedScore] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def load(self, path: str, midi_mode: str) -> _CachedScore:
+        """Return the parsed score, loading it unless an identical file is cached."""
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            key = None
+        else:
+            key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, midi_mode)
+            with self._lock:
+                cached = self._scores.get(key)
+                if cached is not None:
+                    self._scores.move_to_end(key)
+                    return cached
+        load_result = load_score(path, midi_mode=midi_mode)
+        score = _CachedScore(load_result, getattr(load_result, "midi_report", None))
+        if key is not None:
+            with self._lock:
+                score = self._scores.setdefault(key, score)
+                self._scores.move_to_end(key)
+                while len(self._scores) > self._max_scores:
+                    self._scores.popitem(last=False)
+        return score
+
+    @staticmethod
+    def part_view(score: _CachedScore, selected_part_ids: Sequence[str]) -> _PartView:
+        selection = tuple(selected_part_ids)
+        view = score.parts.get(selection)
+        if view is None:
+
+            def load_root() -> ET.Element:
+                if not selection:
+                    return score.root
+                root = copy.deepcopy(score.root)
+                filter_parts(root, selection)
+                return root
+
+            midi = score.midi
+            if midi is not None:
+                beats, beat_type = midi_time_signature(midi)
+                tempo_bpm = int(round(midi_tempo_changes(midi, selection)[0].tempo_bpm))
+                tempo_changes = tuple(
+                    midi_tempo_changes(midi, selection, default_bpm=tempo_bpm)
+                )
+                view = _PartView(
+                    load_root, beats, beat_type, tempo_bpm, tempo_changes, midi, selection
+                )
+            elif score.index is not None:
+                index = score.index.select(selection) if selection else score.index
+                beats, beat_type = get_time_signature(index)
+                tempo_bpm = detect_tempo_bpm(index)
+                tempo_changes = tuple(get_tempo_changes(index, default_bpm=tempo_bpm))
+                view = _PartView(
+                    load_root,
+                    beats,
+                    beat_type,
+                    tempo_bpm,
+                    tempo_changes,
+                    selection=selection,
+                    index=index,
+                )
+            else:
+                root = load_root()
+                beats, beat_type = get_time_signature(root)
+                tempo_bpm = detect_tempo_bpm(root)
+                tempo_changes = tuple(get_tempo_changes(root, default_bpm=tempo_bpm))
+                view = _PartView(load_root, beats, beat_type, tempo_bpm, tempo_changes)
+                view._root = root
+            view = score.parts.setdefault(selection, view)
+        return view
+
+    @staticmethod
+    def note_events(
+        view: _PartView, grace_settings: ImporterGraceSettings
+    ) -> tuple[tuple[NoteEvent, ...], int]:
+        cached = view.events.get(grace_settings)
+        if cached is None:
+            if view.midi is not None:
+                # Decoded MIDI carries no grace notes, so the settings do not matter.
+                events, pulses_per_quarter = midi_note_events(view.midi, view.selection)
+            else:
+                source = view.index if view.index is not None else view.root
+                events, pulses_per_quarter = get_note_events(
+                    source, grace_settings=grace_settings
+                )
+            cached = view.events.setdefault(grace_settings, (tuple(events), pulses_per_quarter))
+        return cached
+
+
+_score_cache = ScoreCache()
+
+
+def clear_score_cache() -> None:
+    """Forget every parsed score so the next preview reloads from disk."""
+
+    _score_cache.clear()
+
+
 def build_preview_data(
     input_path: str,
     settings: TransformSettings,
     *,
     midi_mode: str = "auto",
 ) -> PreviewData:
-    load_result = load_score(input_path, midi_mode=midi_mode)
-    root_original = load_result.root
-    midi_report = getattr(load_result, "midi_report", None)
-    root_filtered = copy.deepcopy(root_original)
-    if settings.selected_part_ids:
-        filter_parts(root_filtered, settings.selected_part_ids)
+    score = _score_cache.load(input_path, midi_mode)
+    view = _score_cache.part_view(score, settings.selected_part_ids)
 
     importer_grace = settings.grace_settings.to_importer()
+    cached_events, pulses_per_quarter = _score_cache.note_events(view, importer_grace)
+    events_original = list(cached_events)
 
-    events_original, pulses_per_quarter = get_note_events(
-        root_filtered, grace_settings=importer_grace
-    )
-    beats, beat_type = get_time_signature(root_filtered)
-    tempo_bpm = detect_tempo_bpm(root_filtered)
-    tempo_changes = get_tempo_changes(root_filtered, default_bpm=tempo_bpm)
-
-    # ``transform_to_ocarina`` mutates the supplied score. Deep copy the
-    # original tree so we avoid re-loading the file from disk when only the
-    # preview settings change (e.g. manual transpose).
-    root_arranged = copy.deepcopy(root_filtered)
+    # ``transform_to_ocarina`` mutates the supplied score, so the arranger
+    # works on its own copy and the cached filtered tree stays pristine.
+    root_arranged = view.arrangement_root()
     tree_arranged = ET.ElementTree(root_arranged)
     transform_to_ocarina(
         tree_arranged,
@@ -91,13 +272,13 @@ def build_preview_data(
         original_events=events_original,
         arranged_events=events_arranged,
         pulses_per_quarter=pulses_per_quarter,
-        beats=beats,
-        beat_type=beat_type,
+        beats=view.beats,
+        beat_type=view.beat_type,
         original_range=original_range,
         arranged_range=arranged_range,
-        tempo_bpm=tempo_bpm,
-        tempo_changes=tuple(tempo_changes),
-        midi_report=midi_report,
+        tempo_bpm=view.tempo_bpm,
+        tempo_changes=view.tempo_changes,
+        midi_report=score.midi_report,
     )
 
 
@@ -35,4 +35,7 @@ class StaffRenderer:
         self._wrapped.render(events, pulses_per_quarter, beats, beat_type)
 
     def redraw_visible_region(self, force: bool = False) -> None:
+        if getattr(self._view, "_layout_mode", "horizontal") == "wrapped":
+            self._wrapped.redraw_visible_lines(force=force)
+            return
         self._horizontal.redraw_visible_region(force=force)
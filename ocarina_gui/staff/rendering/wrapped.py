@@ -7,6 +7,7 @@ from bisect import bisect_left
 from typing import List, Tuple, TYPE_CHECKING
 
 from ...note_values import describe_note_glyph
+from ...wrapped_lines import WrappedLineVirtualizer
 from .note_painter import GRACE_NOTE_SCALE, NotePainter
 from .types import Event
 
@@ -20,6 +21,11 @@ class WrappedRenderer:
     def __init__(self, view: "StaffView", note_painter: NotePainter) -> None:
         self._view = view
         self._note_painter = note_painter
+        self._lines: WrappedLineVirtualizer | None = None
+        self._width = 0
+        self._line_height = 0
+        self._line_info: list[dict[str, float]] = []
+        self._pulses_per_quarter = 0
 
     def _note_scale(self, event: Event) -> float:
         if getattr(event, "is_grace", False):
@@ -37,6 +43,7 @@ class WrappedRenderer:
         palette = view._palette
         view._wrap_layout = None
         view._wrap_pending_rerender = False
+        self._lines = None
         try:
             viewport_width = int(view.canvas.winfo_width())
         except Exception:  # pragma: no cover - defensive
@@ -85,201 +92,249 @@ class WrappedRenderer:
             view.cursor.update_loop_markers()
             return
 
-        px_per_tick = max(view.px_per_tick, 1e-6)
-        measure_spacing_px = max(1, int(round(view._ticks_per_measure * px_per_tick)))
-
         for line_index in range(line_count):
             line_start = line_index * ticks_per_line
-            line_end = min(total_ticks, line_start + ticks_per_line)
             y_offset = line_index * (line_height + system_spacing)
-            view.canvas.create_rectangle(
-                0,
-                y_offset,
-                width,
-                y_offset + line_height,
-                outline=palette.outline,
-                fill=palette.background,
-            )
-            y_top = y_offset + 40
             lines.append(
                 {
                     "start": float(line_start),
-                    "end": float(line_end),
-                    "y_top": float(y_top),
+                    "end": float(min(total_ticks, line_start + ticks_per_line)),
+                    "y_top": float(y_offset + 40),
                     "y_bottom": float(y_offset + line_height),
                 }
             )
-            for index in range(5):
-                y = y_top + index * view.staff_spacing
+        self._width = width
+        self._line_height = line_height
+        self._line_info = lines
+        self._pulses_per_quarter = pulses_per_quarter
+        self._lines = WrappedLineVirtualizer(
+            (view.canvas,),
+            [(line["y_top"] - 40, line["y_bottom"]) for line in lines],
+            draw_frame=self._draw_frame,
+            draw_content=self._draw_line,
+        )
+        self._lines.update(*self._viewport())
+
+        view.cursor.create_cursor_lines(total_height)
+        view.cursor.create_loop_lines(total_height)
+        view.set_cursor(view._cursor_tick)
+        view.set_secondary_cursor(view._secondary_cursor_tick)
+        view.cursor.update_loop_markers()
+
+    def redraw_visible_lines(self, force: bool = False) -> None:
+        """Draw the wrapped lines that scrolled near the viewport."""
+
+        lines = self._lines
+        if lines is None:
+            return
+        if lines.update(*self._viewport(), force=force):
+            self._view.cursor.raise_cursor_lines()
+
+    def _viewport(self) -> tuple[float, int]:
+        canvas = self._view.canvas
+        try:
+            top = float(canvas.canvasy(0))
+        except Exception:
+            top = 0.0
+        try:
+            height = int(canvas.winfo_height())
+        except Exception:
+            height = 0
+        return top, height
+
+    def _draw_frame(self, frame_tag: str, y_offset: float) -> None:
+        view = self._view
+        palette = view._palette
+        width = self._width
+        view.canvas.create_rectangle(
+            0,
+            y_offset,
+            width,
+            y_offset + self._line_height,
+            outline=palette.outline,
+            fill=palette.background,
+            tags=(frame_tag,),
+        )
+        for index in range(5):
+            y = y_offset + 40 + index * view.staff_spacing
+            view.canvas.create_line(
+                view.LEFT_PAD,
+                y,
+                width - 20,
+                y,
+                fill=palette.staff_line,
+                tags=(frame_tag,),
+            )
+
+    def _draw_line(self, line_index: int, tag: str) -> None:
+        view = self._view
+        palette = view._palette
+        line = self._line_info[line_index]
+        line_start = int(line["start"])
+        line_end = int(line["end"])
+        y_top = line["y_top"]
+        measure_spacing_px = max(1, int(round(view._ticks_per_measure * max(view.px_per_tick, 1e-6))))
+        if measure_spacing_px > 0:
+            local_tick = max(0, (line_start // view._ticks_per_measure) * view._ticks_per_measure)
+            if local_tick < line_start:
+                local_tick += view._ticks_per_measure
+            while local_tick <= line_end:
+                x = view.LEFT_PAD + int(round((local_tick - line_start) * view.px_per_tick))
                 view.canvas.create_line(
-                    view.LEFT_PAD,
-                    y,
-                    width - 20,
-                    y,
-                    fill=palette.staff_line,
+                    x,
+                    y_top - 12,
+                    x,
+                    y_top + 4 * view.staff_spacing + 12,
+                    fill=palette.measure_line,
+                    tags=(tag,),
                 )
-            if measure_spacing_px > 0:
-                local_tick = max(0, (line_start // view._ticks_per_measure) * view._ticks_per_measure)
-                if local_tick < line_start:
-                    local_tick += view._ticks_per_measure
-                while local_tick <= line_end:
-                    x = view.LEFT_PAD + int(round((local_tick - line_start) * view.px_per_tick))
-                    view.canvas.create_line(
-                        x,
-                        y_top - 12,
+                measure_number = local_tick // max(1, view._ticks_per_measure) + 1
+                if measure_number > 1:
+                    view.canvas.create_text(
                         x,
-                        y_top + 4 * view.staff_spacing + 12,
-                        fill=palette.measure_line,
+                        y_top - 14,
+                        text=str(measure_number),
+                        fill=palette.measure_number_text,
+                        font=("TkDefaultFont", 8),
+                        anchor="s",
+                        tags=(tag,),
                     )
-                    measure_number = local_tick // max(1, view._ticks_per_measure) + 1
-                    if measure_number > 1:
-                        view.canvas.create_text(
-                            x,
-                            y_top - 14,
-                            text=str(measure_number),
-                            fill=palette.measure_number_text,
-                            font=("TkDefaultFont", 8),
-                            anchor="s",
-                        )
-                    local_tick += view._ticks_per_measure
+                local_tick += view._ticks_per_measure
 
-            start_index = bisect_left(view._event_onsets, line_start)
-            while start_index > 0:
-                prev_event = view._events[start_index - 1]
-                if prev_event.onset + prev_event.duration <= line_start:
-                    break
-                start_index -= 1
-            pulses_per_quarter_value = view._cached[1] if view._cached else pulses_per_quarter
+        start_index = bisect_left(view._event_onsets, line_start)
+        while start_index > 0:
+            prev_event = view._events[start_index - 1]
+            if prev_event.onset + prev_event.duration <= line_start:
+                break
+            start_index -= 1
+        pulses_per_quarter_value = view._cached[1] if view._cached else self._pulses_per_quarter
 
-            visible_events: List[tuple[Event, float]] = []
-            idx = start_index
-            while idx < len(view._events):
-                event = view._events[idx]
-                onset = event.onset
-                duration = event.duration
-                if onset >= line_end:
-                    break
-                if onset + duration <= line_start:
-                    idx += 1
-                    continue
-                offset_px = 0.0
-                if idx < len(view._event_spacing_offsets):
-                    offset_px = view._event_spacing_offsets[idx]
-                visible_events.append((event, offset_px))
+        visible_events: List[tuple[Event, float]] = []
+        idx = start_index
+        while idx < len(view._events):
+            event = view._events[idx]
+            onset = event.onset
+            duration = event.duration
+            if onset >= line_end:
+                break
+            if onset + duration <= line_start:
                 idx += 1
+                continue
+            offset_px = 0.0
+            if idx < len(view._event_spacing_offsets):
+                offset_px = view._event_spacing_offsets[idx]
+            visible_events.append((event, offset_px))
+            idx += 1
 
-            for event_index, (event, offset_px) in enumerate(visible_events):
-                scale = self._note_scale(event)
-                width_note, height_note = 12 * scale, 9 * scale
-                onset = event.onset
-                midi = event.midi
-                pos = self._note_painter.staff_pos(midi)
-                y = self._note_painter.y_for_pos(y_top, pos, view.staff_spacing)
-                segment_offsets = (0, *event.tie_offsets)
-                visible_segments: List[float] = []
+        for event_index, (event, offset_px) in enumerate(visible_events):
+            scale = self._note_scale(event)
+            width_note, height_note = 12 * scale, 9 * scale
+            onset = event.onset
+            midi = event.midi
+            pos = self._note_painter.staff_pos(midi)
+            y = self._note_painter.y_for_pos(y_top, pos, view.staff_spacing)
+            segment_offsets = (0, *event.tie_offsets)
+            visible_segments: List[float] = []
 
-                for segment_index, (segment_duration, offset) in enumerate(
-                    zip(event.tied_durations, segment_offsets)
-                ):
-                    segment_onset = onset + offset
-                    segment_end = segment_onset + max(1, segment_duration)
-                    if segment_end <= line_start or segment_onset >= line_end:
-                        continue
-                    if segment_onset < line_start:
-                        continue
-                    x0 = view.LEFT_PAD + int(
-                        round((segment_onset - line_start) * view.px_per_tick + offset_px)
+            for segment_index, (segment_duration, offset) in enumerate(
+                zip(event.tied_durations, segment_offsets)
+            ):
+                segment_onset = onset + offset
+                segment_end = segment_onset + max(1, segment_duration)
+                if segment_end <= line_start or segment_onset >= line_end:
+                    continue
+                if segment_onset < line_start:
+                    continue
+                x0 = view.LEFT_PAD + int(
+                    round((segment_onset - line_start) * view.px_per_tick + offset_px)
+                )
+                x_center = x0 + width_note / 2
+                visible_segments.append(x_center)
+                self._note_painter.draw_ledger_lines(
+                    y_top,
+                    pos,
+                    x_center,
+                    width_note,
+                    (tag, "wrapped_ledger"),
+                    state="normal",
+                )
+
+                if segment_index == 0 and midi % 12 in (1, 3, 6, 8, 10):
+                    view.canvas.create_text(
+                        x0 - 10,
+                        y,
+                        text="#",
+                        fill=palette.accidental_text,
+                        font=("TkDefaultFont", 10),
+                        tags=(tag,),
                     )
-                    x_center = x0 + width_note / 2
-                    visible_segments.append(x_center)
-                    self._note_painter.draw_ledger_lines(
-                        y_top,
-                        pos,
-                        x_center,
+
+                glyph = describe_note_glyph(int(segment_duration), pulses_per_quarter_value)
+                fill_color = palette.note_fill
+                if glyph is not None and glyph.base in {"whole", "half"}:
+                    fill_color = palette.background
+                view.canvas.create_oval(
+                    x0,
+                    y - height_note / 2,
+                    x0 + width_note,
+                    y + height_note / 2,
+                    outline=palette.note_outline,
+                    fill=fill_color,
+                    tags=(tag,),
+                )
+
+                available_space = None
+                if event_index + 1 < len(visible_events):
+                    next_event, next_offset = visible_events[event_index + 1]
+                    next_x0 = view.LEFT_PAD + (
+                        (next_event.onset - line_start) * view.px_per_tick + next_offset
+                    )
+                    available_space = next_x0 - (x0 + width_note)
+
+                if glyph is not None:
+                    self._note_painter.draw_note_stem_and_flags(
+                        x0,
+                        y,
                         width_note,
-                        ("wrapped_ledger",),
+                        glyph,
+                        pos,
+                        (tag, "wrapped_stem"),
                         state="normal",
                     )
-
-                    if segment_index == 0 and midi % 12 in (1, 3, 6, 8, 10):
-                        view.canvas.create_text(
-                            x0 - 10,
-                            y,
-                            text="#",
-                            fill=palette.accidental_text,
-                            font=("TkDefaultFont", 10),
-                        )
-
-                    glyph = describe_note_glyph(int(segment_duration), pulses_per_quarter_value)
-                    fill_color = palette.note_fill
-                    if glyph is not None and glyph.base in {"whole", "half"}:
-                        fill_color = palette.background
-                    view.canvas.create_oval(
+                    self._note_painter.draw_dots(
                         x0,
-                        y - height_note / 2,
-                        x0 + width_note,
-                        y + height_note / 2,
-                        outline=palette.note_outline,
-                        fill=fill_color,
+                        y,
+                        width_note,
+                        glyph,
+                        (tag, "wrapped_dot"),
+                        available_space=available_space,
+                        state="normal",
                     )
 
-                    available_space = None
-                    if event_index + 1 < len(visible_events):
-                        next_event, next_offset = visible_events[event_index + 1]
-                        next_x0 = view.LEFT_PAD + (
-                            (next_event.onset - line_start) * view.px_per_tick + next_offset
-                        )
-                        available_space = next_x0 - (x0 + width_note)
-
-                    if glyph is not None:
-                        self._note_painter.draw_note_stem_and_flags(
-                            x0,
-                            y,
-                            width_note,
-                            glyph,
-                            pos,
-                            ("wrapped_stem",),
-                            state="normal",
-                        )
-                        self._note_painter.draw_dots(
-                            x0,
-                            y,
-                            width_note,
-                            glyph,
-                            ("wrapped_dot",),
-                            available_space=available_space,
-                            state="normal",
-                        )
-
-                    if segment_index == 0:
-                        octave = midi // 12 - 1
-                        octave_offset = view.staff_spacing * 1.6 * scale
-                        octave_y = y - octave_offset if pos >= 8 else y + octave_offset
-                        view.canvas.create_text(
-                            x_center,
-                            octave_y,
-                            text=str(octave),
-                            fill=palette.header_text,
-                            font=("TkDefaultFont", 9),
-                        )
-
-                if len(visible_segments) > 1:
-                    for start_center, end_center in zip(
-                        visible_segments, visible_segments[1:]
-                    ):
-                        if end_center <= start_center:
-                            continue
-                        self._note_painter.draw_tie(
-                            y_top,
-                            pos,
-                            start_center + width_note * 0.45,
-                            end_center - width_note * 0.45,
-                            ("wrapped_tie",),
-                            state="normal",
-                        )
+                if segment_index == 0:
+                    octave = midi // 12 - 1
+                    octave_offset = view.staff_spacing * 1.6 * scale
+                    octave_y = y - octave_offset if pos >= 8 else y + octave_offset
+                    view.canvas.create_text(
+                        x_center,
+                        octave_y,
+                        text=str(octave),
+                        fill=palette.header_text,
+                        font=("TkDefaultFont", 9),
+                        tags=(tag,),
+                    )
 
-        view.cursor.create_cursor_lines(total_height)
-        view.cursor.create_loop_lines(total_height)
-        view.set_cursor(view._cursor_tick)
-        view.set_secondary_cursor(view._secondary_cursor_tick)
-        view.cursor.update_loop_markers()
+            if len(visible_segments) > 1:
+                for start_center, end_center in zip(
+                    visible_segments, visible_segments[1:]
+                ):
+                    if end_center <= start_center:
+                        continue
+                    self._note_painter.draw_tie(
+                        y_top,
+                        pos,
+                        start_center + width_note * 0.45,
+                        end_center - width_note * 0.45,
+                        (tag, "wrapped_tie"),
+                        state="normal",
+                    )
@@ -67,6 +67,7 @@ class ScrollbarManager:
         except Exception:  # pragma: no cover - Tkinter quirk
             return
         self.update_last_scroll_fraction(fraction)
+        view._redraw_visible_region()
 
     def ensure_visible(self, layout_mode: str) -> None:
         view = self._view
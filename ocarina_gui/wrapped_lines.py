@@ -0,0 +1,107 @@
+"""Line-level virtualization for wrapped (vertically scrolling) score layouts."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import tkinter as tk
+
+
+class WrappedLineVirtualizer:
+    """Keep canvas items only for the wrapped lines near the viewport.
+
+    *bounds* holds the ``(y_top, y_bottom)`` box of every line in layout
+    order. Each line is drawn as a *frame*, the items that look the same on
+    every line such as backgrounds and staff or row lines, plus its *content*.
+    ``draw_frame(frame_tag, y_top)`` draws a frame for the box starting at
+    ``y_top`` and ``draw_content(index, tag)`` draws the content of line
+    *index* under *tag*. When lines scroll out of the window their frames are
+    moved onto the lines scrolling in rather than deleted and recreated; only
+    content is redrawn.
+    """
+
+    def __init__(
+        self,
+        canvases: Sequence[tk.Canvas],
+        bounds: Sequence[Tuple[float, float]],
+        *,
+        draw_frame: Callable[[str, float], None],
+        draw_content: Callable[[int, str], None],
+        tag_prefix: str = "wrapped_line_",
+    ) -> None:
+        self._canvases = tuple(canvases)
+        self._tops = [float(top) for top, _bottom in bounds]
+        self._bottoms = [float(bottom) for _top, bottom in bounds]
+        self._draw_frame = draw_frame
+        self._draw_content = draw_content
+        self._tag_prefix = tag_prefix
+        self._drawn: Dict[int, int] = {}
+        self._frame_tops: Dict[int, float] = {}
+        self._window = range(0)
+        self._next_frame = 0
+
+    def line_tag(self, index: int) -> str:
+        return f"{self._tag_prefix}{index}"
+
+    def _frame_tag(self, frame: int) -> str:
+        return f"{self._tag_prefix}frame_{frame}"
+
+    @property
+    def drawn_lines(self) -> Tuple[int, ...]:
+        return tuple(sorted(self._drawn))
+
+    def lines_between(self, top: float, bottom: float) -> range:
+        """Return the indices of lines whose boxes intersect ``[top, bottom]``."""
+
+        first = bisect_left(self._bottoms, top)
+        last = bisect_right(self._tops, bottom)
+        return range(first, max(first, last))
+
+    def update(self, top: float, height: float, *, force: bool = False) -> bool:
+        """Draw the lines within one viewport *height* of the view at *top*.
+
+        Returns ``True`` when any canvas items changed.
+        """
+
+        if not self._tops:
+            return False
+        line_height = self._bottoms[0] - self._tops[0]
+        margin = max(float(height), line_height, 1.0)
+        window = self.lines_between(top - margin, top + max(float(height), 1.0) + margin)
+        if not force and window == self._window:
+            return False
+        self._window = window
+
+        spare: List[int] = []
+        for index in [index for index in self._drawn if index not in window]:
+            spare.append(self._drawn.pop(index))
+            self._delete(self.line_tag(index))
+        for index in window:
+            if index in self._drawn:
+                continue
+            y_top = self._tops[index]
+            if spare:
+                frame = spare.pop()
+                delta = y_top - self._frame_tops[frame]
+                if delta:
+                    for canvas in self._canvases:
+                        canvas.move(self._frame_tag(frame), 0, delta)
+            else:
+                frame = self._next_frame
+                self._next_frame += 1
+                self._draw_frame(self._frame_tag(frame), y_top)
+            self._frame_tops[frame] = y_top
+            self._drawn[index] = frame
+            self._draw_content(index, self.line_tag(index))
+        for frame in spare:
+            self._frame_tops.pop(frame, None)
+            self._delete(self._frame_tag(frame))
+        return True
+
+    def _delete(self, tag: str) -> None:
+        for canvas in self._canvases:
+            canvas.delete(tag)
+
+
+__all__ = ["WrappedLineVirtualizer"]
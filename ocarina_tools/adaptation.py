@@ -21,6 +21,7 @@ from .musicxml import (
 )
 from .parts import _summarize_part_range, filter_parts
 from .pitch import midi_to_name, parse_note_name
+from .score_index import NoteRecord, ScoreIndex, ScoreSource
 
 
 class _MeasureAdapter:
@@ -334,9 +335,16 @@ def favor_lower_register(root: ET.Element, range_min: str = "A4") -> int:
     return shifted
 
 
-def collect_used_pitches(root: ET.Element, flats: bool = True) -> List[str]:
-    q = make_qname_getter(root)
+def collect_used_pitches(root: ScoreSource, flats: bool = True) -> List[str]:
     names: set[str] = set()
+    if isinstance(root, ScoreIndex):
+        for part in root.parts:
+            for measure in part.measures:
+                for record in measure:
+                    if isinstance(record, NoteRecord) and record.midi is not None:
+                        names.add(midi_to_name(record.midi, flats=flats))
+        return sorted(names, key=lambda nm: parse_note_name(nm))
+    q = make_qname_getter(root)
     for part in root.findall(q('part')):
         for measure in part.findall(q('measure')):
             for note in measure.findall(q('note')):
@@ -5,24 +5,31 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Iterable, List, Tuple
-import xml.etree.ElementTree as ET
 
-from .musicxml import first_divisions, get_pitch_data, make_qname_getter
+from .musicxml import first_divisions, make_qname_getter
 from .instruments import OCARINA_GM_PROGRAM, part_programs
 from .grace_settings import (
     GraceSettings,
     _PendingGrace,
     _allocate_grace_durations,
-    _classify_grace,
     _fold_grace_midi,
 )
 from .ottava_utils import (
     _active_shifts,
-    _extract_note_ottavas,
-    _handle_direction_octaves,
+    _apply_direction_octaves,
+    _direction_voices,
     _pop_ottava,
     _total_shift,
 )
+from .score_index import (
+    CursorRecord,
+    DirectionRecord,
+    MeasureRecord,
+    ScoreIndex,
+    ScoreSource,
+    iter_part_records,
+    _parse_time,
+)
 from shared.tempo import TempoChange
 from shared.ottava import OttavaShift
 
@@ -92,18 +99,17 @@ class NoteEvent:
 
 
 def get_note_events(
-    root: ET.Element, *, grace_settings: GraceSettings | None = None
+    root: ScoreSource, *, grace_settings: GraceSettings | None = None
 ) -> tuple[list[NoteEvent], int]:
-    divisions = first_divisions(root)
+    divisions = _divisions(root)
     ppq = 480
     scale = ppq / max(1, divisions)
-    q = make_qname_getter(root)
-    programs = part_programs(root)
+    programs = root.programs if isinstance(root, ScoreIndex) else part_programs(root)
     settings = grace_settings or GraceSettings()
     tempo_bpm = detect_tempo_bpm(root)
     events: List[NoteEvent] = []
-    for index, part in enumerate(root.findall(q('part'))):
-        part_id = (part.get('id') or f'P{index + 1}').strip()
+    for index, (raw_part_id, measures) in enumerate(iter_part_records(root)):
+        part_id = (raw_part_id or f'P{index + 1}').strip()
         if not part_id:
             part_id = f'P{index + 1}'
         program = programs.get(part_id, OCARINA_GM_PROGRAM)
@@ -112,24 +118,22 @@ def get_note_events(
         grace_buffers: defaultdict[str, list[_PendingGrace]] = defaultdict(list)
         voice_anchor_onset: dict[str, int] = {}
         tie_states: dict[tuple[str, int], tuple[int, List[int], int, Tuple[OttavaShift, ...]]] = {}
-        for measure in part.findall(q('measure')):
+        for measure in measures:
             measure_start = max(voice_pos.values(), default=0)
-            for element in list(measure):
-                if element.tag == q('direction'):
-                    _handle_direction_octaves(element, q, voice_ottavas, voice_pos)
+            for note in measure:
+                if isinstance(note, DirectionRecord):
+                    if note.octave_shifts:
+                        voices = _direction_voices(note.voice, voice_pos)
+                        _apply_direction_octaves(note.octave_shifts, voices, voice_ottavas)
                     continue
-                if element.tag != q('note'):
+                if isinstance(note, CursorRecord):
                     continue
-                note = element
-                voice_el = note.find(q('voice'))
-                voice = (voice_el.text.strip() if (voice_el is not None and voice_el.text) else '1')
+                voice = note.voice
                 pos = voice_pos.get(voice, measure_start)
-                dur_el = note.find(q('duration'))
-                dur_text = (dur_el.text or '').strip() if dur_el is not None and dur_el.text else ''
-                dur_div = int(dur_text) if dur_text.isdigit() else 0
-                is_chord = note.find(q('chord')) is not None
-                starts, stops = _extract_note_ottavas(note, q)
-                for shift in starts:
+                dur_div = note.duration
+                is_chord = note.is_chord
+                stops = note.ottava_stops
+                for shift in note.ottava_starts:
                     voice_ottavas[voice].append((shift, shift.number))
                 active_stack = voice_ottavas[voice]
                 active_shifts = _active_shifts(active_stack)
@@ -138,10 +142,7 @@ def get_note_events(
                 if is_chord and voice in voice_anchor_onset:
                     onset_ticks = voice_anchor_onset[voice]
 
-                grace_el = note.find(q('grace'))
-                is_rest = note.find(q('rest')) is not None
-
-                if is_rest:
+                if note.midi is None:
                     grace_buffers.pop(voice, None)
                     voice_anchor_onset.pop(voice, None)
                     for number in stops:
@@ -150,24 +151,14 @@ def get_note_events(
                         voice_pos[voice] = pos + dur_div
                     continue
 
-                pitch_data = get_pitch_data(note, q)
-                if pitch_data is None:
-                    grace_buffers.pop(voice, None)
-                    voice_anchor_onset.pop(voice, None)
-                    for number in stops:
-                        _pop_ottava(voice_ottavas[voice], number)
-                    if not is_chord:
-                        voice_pos[voice] = pos + dur_div
-                    continue
+                midi = note.midi + _total_shift(active_stack)
 
-                midi = pitch_data.midi + _total_shift(active_stack)
-
-                if grace_el is not None:
+                if note.is_grace:
                     grace_buffers[voice].append(
                         _PendingGrace(
                             midi=midi,
                             ottava_shifts=active_shifts,
-                            grace_type=_classify_grace(grace_el),
+                            grace_type=note.grace_type,
                         )
                     )
                     for number in stops:
@@ -213,16 +204,7 @@ def get_note_events(
                 effective_duration = max(1, dur_ticks - stolen_total)
                 voice_anchor_onset[voice] = effective_onset
 
-                tie_types = set()
-                for tie in note.findall(q('tie')):
-                    tie_type = (tie.get('type') or '').strip().lower()
-                    if tie_type:
-                        tie_types.add(tie_type)
-                for notation in note.findall(q('notations')):
-                    for tied in notation.findall(q('tied')):
-                        tie_type = (tied.get('type') or '').strip().lower()
-                        if tie_type:
-                            tie_types.add(tie_type)
+                tie_types = note.tie_types
 
                 tie_key = (voice, midi)
                 existing = tie_states.get(tie_key)
@@ -311,28 +293,23 @@ def get_note_events(
     return events, ppq
 
 
-def get_time_signature(root: ET.Element) -> tuple[int, int]:
+def get_time_signature(root: ScoreSource) -> tuple[int, int]:
+    if isinstance(root, ScoreIndex):
+        return root.time_signature
     q = make_qname_getter(root)
     for part in root.findall(q('part')):
         for measure in part.findall(q('measure')):
             attrs = measure.find(q('attributes'))
             if attrs is not None:
-                ts = attrs.find(q('time'))
-                if ts is not None:
-                    beats_el = ts.find(q('beats'))
-                    beat_type_el = ts.find(q('beat-type'))
-                    try:
-                        beats = int((beats_el.text or '4').strip()) if beats_el is not None else 4
-                        beat_type = int((beat_type_el.text or '4').strip()) if beat_type_el is not None else 4
-                        return beats, beat_type
-                    except Exception:
-                        pass
+                time_signature = _parse_time(attrs, q)
+                if time_signature is not None:
+                    return time_signature
             break
         break
     return 4, 4
 
 
-def detect_tempo_bpm(root: ET.Element, default_bpm: int = 120) -> int:
+def detect_tempo_bpm(root: ScoreSource, default_bpm: int = 120) -> int:
     """Return the first tempo marking found in ``root`` or ``default_bpm``."""
 
     changes = get_tempo_changes(root, default_bpm=default_bpm)
@@ -341,25 +318,33 @@ def detect_tempo_bpm(root: ET.Element, default_bpm: int = 120) -> int:
     return int(round(changes[0].tempo_bpm))
 
 
-def get_tempo_changes(root: ET.Element, default_bpm: int = 120) -> list[TempoChange]:
+def get_tempo_changes(root: ScoreSource, default_bpm: int = 120) -> list[TempoChange]:
     """Extract tempo change events from ``root`` in ascending tick order."""
 
-    q = make_qname_getter(root)
     ppq = 480
-    divisions = max(1, first_divisions(root))
+    divisions = max(1, _divisions(root))
     scale = ppq / divisions
 
-    parts = root.findall(q('part'))
-    if not parts:
-        return [TempoChange(tick=0, tempo_bpm=float(_clamp_tempo(default_bpm)))]
-
     changes: list[TempoChange] = []
-    for part in parts:
-        part_changes = list(_iter_tempo_changes_for_part(part, q, scale))
+    for _part_id, measures in iter_part_records(root):
+        part_changes = list(_iter_tempo_changes_for_part(measures, scale))
         if part_changes:
             changes = part_changes
             break
 
+    return _normalize_tempo_changes(changes, default_bpm)
+
+
+def _divisions(root: ScoreSource) -> int:
+    if isinstance(root, ScoreIndex):
+        return root.divisions
+    return first_divisions(root)
+
+
+def _normalize_tempo_changes(
+    changes: Iterable[TempoChange], default_bpm: int
+) -> list[TempoChange]:
+    changes = list(changes)
     if not changes:
         return [TempoChange(tick=0, tempo_bpm=float(_clamp_tempo(default_bpm)))]
 
@@ -385,91 +370,33 @@ def get_tempo_changes(root: ET.Element, default_bpm: int = 120) -> list[TempoCha
     return pruned
 
 
-def _iter_tempo_changes_for_part(part: ET.Element, q, scale: float) -> Iterable[TempoChange]:
+def _iter_tempo_changes_for_part(
+    measures: Iterable[Iterable[MeasureRecord]], scale: float
+) -> Iterable[TempoChange]:
     measure_start = 0.0
-    for measure in part.findall(q('measure')):
+    for measure in measures:
         position = 0.0
         max_position = 0.0
-        for element in list(measure):
-            tag = element.tag
-            if tag == q('direction'):
-                tempo_value = _tempo_from_direction(element, q)
-                if tempo_value is None:
+        for record in measure:
+            if isinstance(record, DirectionRecord):
+                if record.tempo_bpm is None:
                     continue
-                offset = _parse_offset(element, q)
-                tick = int(round((measure_start + position + offset) * scale))
-                yield TempoChange(tick=tick, tempo_bpm=tempo_value)
-            elif tag == q('note'):
-                duration = _parse_duration(element.find(q('duration')))
-                if element.find(q('chord')) is None:
-                    position += duration
+                tick = int(round((measure_start + position + record.offset) * scale))
+                yield TempoChange(tick=tick, tempo_bpm=record.tempo_bpm)
+            elif isinstance(record, CursorRecord):
+                if record.backup:
+                    position = max(0.0, position - record.duration)
+                else:
+                    position += record.duration
                     if position > max_position:
                         max_position = position
-            elif tag == q('backup'):
-                duration = _parse_duration(element.find(q('duration')))
-                position = max(0.0, position - duration)
-            elif tag == q('forward'):
-                duration = _parse_duration(element.find(q('duration')))
-                position += duration
+            elif not record.is_chord:
+                position += record.duration_value
                 if position > max_position:
                     max_position = position
         measure_start += max_position
 
 
-def _tempo_from_direction(direction: ET.Element, q) -> float | None:
-    sound = direction.find(q('sound'))
-    if sound is not None:
-        tempo_value = _parse_tempo(sound.get('tempo'))
-        if tempo_value is not None:
-            return tempo_value
-
-    for direction_type in direction.findall(q('direction-type')):
-        metronome = direction_type.find(q('metronome'))
-        if metronome is None:
-            continue
-        per_minute = metronome.find(q('per-minute'))
-        if per_minute is not None and per_minute.text:
-            tempo_value = _parse_tempo(per_minute.text)
-            if tempo_value is not None:
-                return tempo_value
-    return None
-
-
-def _parse_offset(direction: ET.Element, q) -> float:
-    offset_el = direction.find(q('offset'))
-    if offset_el is None or offset_el.text is None:
-        return 0.0
-    try:
-        return float(offset_el.text.strip())
-    except (TypeError, ValueError):
-        return 0.0
-
-
-def _parse_duration(duration_el: ET.Element | None) -> float:
-    if duration_el is None or duration_el.text is None:
-        return 0.0
-    text = duration_el.text.strip()
-    if not text:
-        return 0.0
-    try:
-        return float(text)
-    except (TypeError, ValueError):
-        return 0.0
-
-
-def _parse_tempo(value: str | None) -> float | None:
-    if value is None:
-        return None
-    text = str(value).strip()
-    if not text:
-        return None
-    try:
-        tempo = float(text)
-    except (TypeError, ValueError):
-        return None
-    return tempo
-
-
 def _clamp_tempo(value: float | int) -> float:
     try:
         tempo = float(value)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import struct
+import threading
 import zipfile
 from typing import Dict, List, Tuple
 import xml.etree.ElementTree as ET
@@ -13,14 +14,46 @@ from .instruments import OCARINA_GM_PROGRAM, part_programs
 from .pitch import pitch_to_midi
 
 
+class SerializedScore(ET.ElementTree):
+    """Element tree that serializes to MusicXML bytes once and reuses them.
+
+    The bytes are produced on first use, so the tree must not be edited after
+    it has been exported.
+    """
+
+    def __init__(self, tree: ET.ElementTree) -> None:
+        super().__init__(tree.getroot())
+        self._data: bytes | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> bytes:
+        with self._lock:
+            if self._data is None:
+                self._data = _serialize(self.getroot())
+            return self._data
+
+
+def musicxml_bytes(tree: ET.ElementTree) -> bytes:
+    """Return the UTF-8 MusicXML document for ``tree``."""
+
+    if isinstance(tree, SerializedScore):
+        return tree.data
+    return _serialize(tree.getroot())
+
+
+def _serialize(root: ET.Element) -> bytes:
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
 def export_musicxml(tree: ET.ElementTree, out_path: str) -> None:
-    tree.write(out_path, encoding="utf-8", xml_declaration=True)
+    with open(out_path, "wb") as handle:
+        handle.write(musicxml_bytes(tree))
 
 
 def export_mxl(tree: ET.ElementTree, out_path: str) -> None:
     with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        xml_bytes = ET.tostring(tree.getroot(), encoding="utf-8", xml_declaration=True)
-        archive.writestr("score.xml", xml_bytes)
+        archive.writestr("score.xml", musicxml_bytes(tree))
         container_xml = """<?xml version=\"1.0\" encoding=\"UTF-8\"?>
 <container version=\"1.0\" xmlns=\"urn:oasis:names:tc:opendocument:xmlns:container\">
   <rootfiles>
@@ -205,7 +238,9 @@ def export_midi_poly(
 __all__ = [
     'export_midi',
     'export_midi_poly',
+    'SerializedScore',
     'export_musicxml',
     'export_mxl',
+    'musicxml_bytes',
 ]
 
@@ -1,22 +1,62 @@
 """File loading utilities for plain MusicXML, zipped MXL, and MIDI files."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import io
 import re
+import threading
 import zipfile
 import xml.etree.ElementTree as ET
 
-from .midi_import import read_midi
-from .midi_import.models import MidiImportReport
+from .midi_import.models import DecodedMidi, MidiImportReport
+from .midi_import.reader import build_song, decode_midi
+from .score_index import ScoreIndex, parse_score
 
 
-@dataclass(frozen=True)
 class ScoreLoadResult:
-    """Container exposing the parsed tree, root, and MIDI import report."""
+    """Container exposing the parsed tree, root, and MIDI import report.
 
-    tree: ET.ElementTree
-    root: ET.Element
-    midi_report: MidiImportReport | None = None
+    MIDI files also expose their decoded events as ``midi``; their MusicXML
+    tree is only built the first time ``tree`` or ``root`` is read, so callers
+    that work from the events never pay for it. MusicXML files carry the
+    :class:`~ocarina_tools.score_index.ScoreIndex` recorded while parsing as
+    ``index``; it describes the file as loaded, not later edits to ``root``.
+    """
+
+    __slots__ = ("_tree", "_root", "midi_report", "midi", "index", "_lock")
+
+    def __init__(
+        self,
+        tree: ET.ElementTree | None = None,
+        root: ET.Element | None = None,
+        midi_report: MidiImportReport | None = None,
+        *,
+        midi: DecodedMidi | None = None,
+        index: ScoreIndex | None = None,
+    ) -> None:
+        self._tree = tree
+        self._root = root
+        self.midi_report = midi_report
+        self.midi = midi
+        self.index = index
+        self._lock = threading.Lock()
+
+    def _build(self) -> None:
+        with self._lock:
+            if self._tree is None and self.midi is not None:
+                song = build_song(self.midi)
+                self._tree, self._root = song.tree, song.root
+
+    @property
+    def tree(self) -> ET.ElementTree:
+        if self._tree is None:
+            self._build()
+        return self._tree  # type: ignore[return-value]
+
+    @property
+    def root(self) -> ET.Element:
+        if self._tree is None:
+            self._build()
+        return self._root  # type: ignore[return-value]
 
     def __iter__(self):  # type: ignore[override]
         yield self.tree
@@ -50,15 +90,13 @@ def load_score(path: str, *, midi_mode: str = "auto") -> ScoreLoadResult:
                 raise ValueError("No XML found inside MXL.")
             with archive.open(candidate) as handle:
                 data = handle.read()
-        tree = ET.ElementTree(ET.fromstring(data))
-        root = tree.getroot()
-        return ScoreLoadResult(tree=tree, root=root, midi_report=None)
+        tree, index = parse_score(io.BytesIO(data))
+        return ScoreLoadResult(tree=tree, root=tree.getroot(), midi_report=None, index=index)
     if lower.endswith((".mid", ".midi")):
-        song, report = read_midi(path, mode=midi_mode)
-        return ScoreLoadResult(tree=song.tree, root=song.root, midi_report=report)
-    tree = ET.parse(path)
-    root = tree.getroot()
-    return ScoreLoadResult(tree=tree, root=root, midi_report=None)
+        decoded, report = decode_midi(path, mode=midi_mode)
+        return ScoreLoadResult(midi_report=report, midi=decoded)
+    tree, index = parse_score(path)
+    return ScoreLoadResult(tree=tree, root=tree.getroot(), midi_report=None, index=index)
 
 
 __all__ = ["ScoreLoadResult", "load_score"]
@@ -7,6 +7,7 @@ import xml.etree.ElementTree as ET
 
 from .musicxml import make_qname_getter
 from .pitch import NAME_TO_PC_TONIC
+from .score_index import ScoreIndex, ScoreSource
 
 CIRCLE_MAJOR = {
     -7: 'Cb',
@@ -44,7 +45,12 @@ RELATIVE_MINOR = {
 }
 
 
-def analyze_key(root: ET.Element) -> Dict:
+def analyze_key(root: ScoreSource) -> Dict:
+    if isinstance(root, ScoreIndex):
+        key = root.key
+        if key is not None:
+            return _describe_key(*key)
+        return {"fifths": 0, "mode": "major", "tonic": "C"}
     q = make_qname_getter(root)
     for part in root.findall(q('part')):
         for measure in part.findall(q('measure')):
@@ -55,17 +61,21 @@ def analyze_key(root: ET.Element) -> Dict:
                     fifths = key.find(q('fifths'))
                     mode_el = key.find(q('mode'))
                     if fifths is not None:
-                        fifths_val = int((fifths.text or '0').strip())
                         mode = (mode_el.text.strip() if mode_el is not None and mode_el.text else None)
-                        tonic = (
-                            RELATIVE_MINOR.get(fifths_val)
-                            if (mode or '').lower().startswith('min')
-                            else CIRCLE_MAJOR.get(fifths_val)
-                        )
-                        return {"fifths": fifths_val, "mode": mode, "tonic": tonic}
+                        return _describe_key((fifths.text or '0').strip(), mode)
     return {"fifths": 0, "mode": "major", "tonic": "C"}
 
 
+def _describe_key(fifths_text: str, mode: str | None) -> Dict:
+    fifths_val = int(fifths_text)
+    tonic = (
+        RELATIVE_MINOR.get(fifths_val)
+        if (mode or '').lower().startswith('min')
+        else CIRCLE_MAJOR.get(fifths_val)
+    )
+    return {"fifths": fifths_val, "mode": mode, "tonic": tonic}
+
+
 def compute_transpose_semitones(orig_tonic: str, prefer_mode: str) -> int:
     """Return semitone shift needed to move music into C major or A minor."""
     is_minor = orig_tonic.endswith('m')
@@ -3,6 +3,7 @@
 from .models import (
     DEFAULT_TEMPO_BPM,
     DEFAULT_TIME_SIGNATURE,
+    DecodedMidi,
     MidiImportReport,
     MidiSong,
     MidiTrackDecodeResult,
@@ -11,11 +12,19 @@ from .models import (
     TempoEvent,
 )
 from .decoders import LenientMidiDecoder, StrictMidiDecoder, _parse_midi_events
-from .reader import read_midi, read_chunk as _read_chunk
+from .reader import build_song, decode_midi, read_midi, read_chunk as _read_chunk
+from .direct import (
+    midi_note_events,
+    midi_part_id,
+    midi_parts,
+    midi_tempo_changes,
+    midi_time_signature,
+)
 
 __all__ = [
     "DEFAULT_TEMPO_BPM",
     "DEFAULT_TIME_SIGNATURE",
+    "DecodedMidi",
     "LenientMidiDecoder",
     "MidiImportReport",
     "MidiSong",
@@ -26,5 +35,12 @@ __all__ = [
     "StrictMidiDecoder",
     "_parse_midi_events",
     "_read_chunk",
+    "build_song",
+    "decode_midi",
+    "midi_note_events",
+    "midi_part_id",
+    "midi_parts",
+    "midi_tempo_changes",
+    "midi_time_signature",
     "read_midi",
 ]
@@ -0,0 +1,158 @@
+"""Score views computed straight from decoded MIDI events.
+
+``build_musicxml`` writes each channel as one long measure that
+``get_note_events``, ``get_tempo_changes`` and ``list_parts`` then walk
+again. The helpers here replay the same :func:`part_timeline` the builder
+writes from, so they return exactly what those readers would produce for the
+built tree (part selection included) without creating or walking any XML.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+
+from ..events import NoteEvent as ScoreNoteEvent
+from ..events import TempoChange, _normalize_tempo_changes
+from ..instruments import OCARINA_GM_PROGRAM, parse_midi_program
+from ..parts import MusicXmlPartInfo
+from ..pitch import midi_to_name
+from .models import DEFAULT_TIME_SIGNATURE, DecodedMidi
+from .musicxml_builder import (
+    events_by_channel,
+    format_tempo_value,
+    part_timeline,
+    sorted_tempo_list,
+)
+
+_EVENT_PPQ = 480
+
+
+def midi_part_id(channel: int) -> str:
+    return f"CH{channel + 1}"
+
+
+def _selected_channels(
+    decoded: DecodedMidi, selected_part_ids: Iterable[str]
+) -> list[int]:
+    channels = sorted({event[3] for event in decoded.events})
+    selection: list[str] = []
+    for part_id in selected_part_ids:
+        normalized = (part_id or "").strip()
+        if normalized and normalized not in selection:
+            selection.append(normalized)
+    if not selection:
+        return channels
+    # ``filter_parts`` keeps the requested parts in the requested order.
+    by_id = {midi_part_id(channel): channel for channel in channels}
+    return [by_id[part_id] for part_id in selection if part_id in by_id]
+
+
+def _part_program(decoded: DecodedMidi, channel: int) -> Optional[int]:
+    raw_program = decoded.programs.get(channel)
+    if raw_program is None:
+        return None
+    return parse_midi_program(str(max(1, min(128, raw_program + 1))))
+
+
+def _scale(decoded: DecodedMidi) -> float:
+    return _EVENT_PPQ / max(1, decoded.pulses_per_quarter)
+
+
+def midi_note_events(
+    decoded: DecodedMidi, selected_part_ids: Sequence[str] = ()
+) -> tuple[list[ScoreNoteEvent], int]:
+    """Return ``get_note_events`` output for the score built from *decoded*."""
+
+    scale = _scale(decoded)
+    grouped = events_by_channel(decoded.events)
+    events: list[ScoreNoteEvent] = []
+    for channel in _selected_channels(decoded, selected_part_ids):
+        program = _part_program(decoded, channel)
+        if program is None:
+            program = OCARINA_GM_PROGRAM
+        position = 0
+        anchor = 0
+        for item in part_timeline(grouped[channel], ()):
+            if item[0] == "rest":
+                position += item[1]
+                continue
+            _, _start, duration_div, midi, is_chord = item
+            duration = max(1, int(round(duration_div * scale)))
+            if not is_chord:
+                anchor = int(round(position * scale))
+                position += duration_div
+            events.append(
+                ScoreNoteEvent(
+                    onset=anchor,
+                    duration=duration,
+                    midi=midi,
+                    program=program,
+                    tied_durations=(duration,),
+                )
+            )
+    return events, _EVENT_PPQ
+
+
+def midi_tempo_changes(
+    decoded: DecodedMidi,
+    selected_part_ids: Sequence[str] = (),
+    default_bpm: int = 120,
+) -> list[TempoChange]:
+    """Return ``get_tempo_changes`` output for the score built from *decoded*."""
+
+    channels = _selected_channels(decoded, selected_part_ids)
+    grouped = events_by_channel(decoded.events)
+    changes: list[TempoChange] = []
+    # Only the part for the lowest channel carries tempo directions.
+    if channels and min(grouped) in channels:
+        scale = _scale(decoded)
+        position = 0
+        tempo_list = sorted_tempo_list(decoded.tempo_changes)
+        for item in part_timeline(grouped[min(grouped)], tempo_list):
+            kind = item[0]
+            if kind == "tempo":
+                tick = int(round((position + item[2]) * scale))
+                tempo = float(format_tempo_value(item[1]))
+                changes.append(TempoChange(tick=tick, tempo_bpm=tempo))
+            elif kind == "rest":
+                position += item[1]
+            elif not item[4]:
+                position += item[2]
+    return _normalize_tempo_changes(changes, default_bpm)
+
+
+def midi_parts(decoded: DecodedMidi) -> list[MusicXmlPartInfo]:
+    """Return ``list_parts`` output for the score built from *decoded*."""
+
+    grouped = events_by_channel(decoded.events)
+    infos: list[MusicXmlPartInfo] = []
+    for channel in sorted(grouped):
+        pitches = [event[2] for event in grouped[channel]]
+        lowest = min(pitches, default=None)
+        highest = max(pitches, default=None)
+        infos.append(
+            MusicXmlPartInfo(
+                part_id=midi_part_id(channel),
+                name=f"Channel {channel + 1}",
+                midi_program=_part_program(decoded, channel),
+                note_count=len(pitches),
+                min_midi=lowest,
+                max_midi=highest,
+                min_pitch=midi_to_name(lowest) if lowest is not None else None,
+                max_pitch=midi_to_name(highest) if highest is not None else None,
+            )
+        )
+    return infos
+
+
+def midi_time_signature(decoded: DecodedMidi) -> tuple[int, int]:
+    return DEFAULT_TIME_SIGNATURE
+
+
+__all__ = [
+    "midi_note_events",
+    "midi_part_id",
+    "midi_parts",
+    "midi_tempo_changes",
+    "midi_time_signature",
+]
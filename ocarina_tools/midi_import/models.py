@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Mapping, Tuple
 
 NoteEvent = Tuple[int, int, int, int]
 TempoEvent = Tuple[int, float]
@@ -20,6 +20,16 @@ class MidiSong:
     pulses_per_quarter: int
 
 
+@dataclass(frozen=True)
+class DecodedMidi:
+    """Note events, channel programs and tempo map decoded from a MIDI file."""
+
+    events: Tuple[NoteEvent, ...]
+    pulses_per_quarter: int
+    programs: Mapping[int, int]
+    tempo_changes: Tuple[TempoEvent, ...]
+
+
 @dataclass(frozen=True)
 class MidiTrackIssue:
     """Represents a problem encountered while decoding a specific track."""
@@ -59,6 +69,7 @@ if TYPE_CHECKING:  # pragma: no cover - imported for type checking only
 __all__ = [
     "DEFAULT_TEMPO_BPM",
     "DEFAULT_TIME_SIGNATURE",
+    "DecodedMidi",
     "MidiImportReport",
     "MidiSong",
     "MidiTrackDecodeResult",
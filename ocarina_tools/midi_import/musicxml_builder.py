@@ -3,13 +3,19 @@ from __future__ import annotations
 
 import xml.etree.ElementTree as ET
 from collections import defaultdict
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
 
 from ..musicxml import build_pitch_element
 from .models import DEFAULT_TIME_SIGNATURE, NoteEvent, TempoEvent
 
+TimelineItem = Union[
+    Tuple[str, float, int],
+    Tuple[str, int],
+    Tuple[str, int, int, int, bool],
+]
 
-def _format_tempo_value(value: float) -> str:
+
+def format_tempo_value(value: float) -> str:
     text = f"{value:.6f}".rstrip("0").rstrip(".")
     return text or "0"
 
@@ -21,9 +27,9 @@ def _append_tempo_direction(measure: ET.Element, tempo_bpm: float, offset: int)
     direction_type = ET.SubElement(direction, "direction-type")
     metronome = ET.SubElement(direction_type, "metronome")
     ET.SubElement(metronome, "beat-unit").text = "quarter"
-    ET.SubElement(metronome, "per-minute").text = _format_tempo_value(tempo_bpm)
+    ET.SubElement(metronome, "per-minute").text = format_tempo_value(tempo_bpm)
     sound = ET.SubElement(direction, "sound")
-    sound.set("tempo", _format_tempo_value(tempo_bpm))
+    sound.set("tempo", format_tempo_value(tempo_bpm))
 
 
 def _group_events(events: Iterable[NoteEvent]) -> List[Tuple[int, List[NoteEvent]]]:
@@ -33,28 +39,81 @@ def _group_events(events: Iterable[NoteEvent]) -> List[Tuple[int, List[NoteEvent
     return sorted(((start, sorted(items, key=lambda item: item[2]))) for start, items in grouped.items())
 
 
+def events_by_channel(events: Iterable[NoteEvent]) -> Dict[int, List[NoteEvent]]:
+    """Group decoded note events by MIDI channel, keeping their order."""
+
+    grouped: Dict[int, List[NoteEvent]] = defaultdict(list)
+    for event in events:
+        grouped[event[3]].append(event)
+    return grouped
+
+
+def part_timeline(
+    channel_events: Sequence[NoteEvent],
+    tempo_list: Sequence[TempoEvent],
+) -> Iterator[TimelineItem]:
+    """Yield the single-measure contents written for one channel's part.
+
+    Items are ``("tempo", bpm, offset)``, ``("rest", duration)`` or
+    ``("note", start_tick, duration, midi, is_chord)``. Tempo directions are
+    only written into the first part, so pass an empty ``tempo_list`` for the
+    others. :func:`build_musicxml` and the direct event path in
+    :mod:`.direct` both consume this sequence.
+    """
+
+    grouped = _group_events(sorted(channel_events, key=lambda e: e[0]))
+    tempo_index = 0
+    cursor = 0
+
+    def emit_tempos(up_to_tick: int, baseline: int) -> Iterator[TimelineItem]:
+        nonlocal tempo_index
+        while tempo_index < len(tempo_list) and tempo_list[tempo_index][0] <= up_to_tick:
+            tick, tempo_bpm = tempo_list[tempo_index]
+            yield ("tempo", tempo_bpm, max(0, tick - baseline))
+            tempo_index += 1
+
+    for start_tick, chord_events in grouped:
+        max_duration = max((event[1] for event in chord_events), default=0)
+        segment_end = max(start_tick + max_duration, cursor)
+
+        yield from emit_tempos(segment_end, cursor)
+
+        gap = start_tick - cursor
+        if gap > 0:
+            yield ("rest", gap)
+            cursor += gap
+
+        for idx, (_, duration, midi, _) in enumerate(chord_events):
+            duration_div = max(1, duration)
+            yield ("note", start_tick, duration_div, midi, idx > 0)
+            if idx == 0:
+                cursor = max(cursor, start_tick) + duration_div
+
+        cursor = max(cursor, start_tick + max_duration)
+
+    yield from emit_tempos(tempo_list[-1][0] if tempo_list else cursor, cursor)
+
+
+def sorted_tempo_list(tempo_changes: Sequence[TempoEvent]) -> List[TempoEvent]:
+    return sorted(
+        ((max(0, int(tick)), float(tempo)) for tick, tempo in tempo_changes),
+        key=lambda entry: entry[0],
+    )
+
+
 def build_musicxml(
     events: Iterable[NoteEvent],
     divisions: int,
     programs: Dict[int, int],
     tempo_changes: Sequence[TempoEvent],
 ) -> ET.ElementTree:
-    events_by_channel: Dict[int, List[NoteEvent]] = defaultdict(list)
-    for event in events:
-        _, _, _, channel = event
-        events_by_channel[channel].append(event)
-
-    tempo_list = sorted(
-        ((max(0, int(tick)), float(tempo)) for tick, tempo in tempo_changes),
-        key=lambda entry: entry[0],
-    )
+    channels = events_by_channel(events)
+    tempo_list = sorted_tempo_list(tempo_changes)
 
     root = ET.Element("score-partwise", version="3.1")
     part_list = ET.SubElement(root, "part-list")
 
-    tempo_index = 0
-
-    for part_number, channel in enumerate(sorted(events_by_channel)):
+    for part_number, channel in enumerate(sorted(channels)):
         part_id = f"CH{channel + 1}"
         score_part = ET.SubElement(part_list, "score-part", attrib={"id": part_id})
         ET.SubElement(score_part, "part-name").text = f"Channel {channel + 1}"
@@ -78,55 +137,35 @@ def build_musicxml(
         ET.SubElement(clef, "sign").text = "G"
         ET.SubElement(clef, "line").text = "2"
 
-        grouped = _group_events(sorted(events_by_channel[channel], key=lambda e: e[0]))
-
-        cursor = 0
-
-        def emit_tempos(up_to_tick: int, baseline: int) -> None:
-            nonlocal tempo_index
-            if part_number != 0:
-                return
-            while tempo_index < len(tempo_list) and tempo_list[tempo_index][0] <= up_to_tick:
-                tick, tempo_bpm = tempo_list[tempo_index]
-                offset = tick - baseline
-                if offset < 0:
-                    offset = 0
-                _append_tempo_direction(measure, tempo_bpm, offset)
-                tempo_index += 1
-
-        for start_tick, chord_events in grouped:
-            max_duration = max((event[1] for event in chord_events), default=0)
-            segment_end = max(start_tick + max_duration, cursor)
-
-            emit_tempos(segment_end, cursor)
-
-            gap = start_tick - cursor
-            if gap > 0:
+        part_tempos = tempo_list if part_number == 0 else ()
+        for item in part_timeline(channels[channel], part_tempos):
+            kind = item[0]
+            if kind == "tempo":
+                _append_tempo_direction(measure, item[1], item[2])
+            elif kind == "rest":
                 rest_note = ET.SubElement(measure, "note")
                 ET.SubElement(rest_note, "rest")
-                ET.SubElement(rest_note, "duration").text = str(gap)
+                ET.SubElement(rest_note, "duration").text = str(item[1])
                 ET.SubElement(rest_note, "voice").text = "1"
-                cursor += gap
-
-            for idx, (_, duration, midi, _) in enumerate(chord_events):
-                duration_div = max(1, duration)
+            else:
+                _, start_tick, duration_div, midi, is_chord = item
                 note_el = ET.SubElement(measure, "note")
                 note_el.set("data-start-div", str(start_tick))
                 note_el.set("data-duration-div", str(duration_div))
-                if idx > 0:
+                if is_chord:
                     ET.SubElement(note_el, "chord")
                 note_el.append(build_pitch_element(lambda token: token, midi, prefer_flats=True))
                 ET.SubElement(note_el, "duration").text = str(duration_div)
                 ET.SubElement(note_el, "voice").text = "1"
-                if idx == 0:
-                    cursor = max(cursor, start_tick) + duration_div
-
-            cursor = max(cursor, start_tick + max_duration)
-
-        emit_tempos(tempo_list[-1][0] if tempo_list else cursor, cursor)
 
     tree = ET.ElementTree(root)
     return tree
 
 
-__all__ = ["build_musicxml"]
+__all__ = [
+    "build_musicxml",
+    "events_by_channel",
+    "format_tempo_value",
+    "part_timeline",
+    "sorted_tempo_list",
+]
@@ -9,6 +9,7 @@ from .decoders import LenientMidiDecoder, StrictMidiDecoder
 from .models import (
     DEFAULT_TEMPO_BPM,
     DEFAULT_TIME_SIGNATURE,
+    DecodedMidi,
     MidiImportReport,
     MidiSong,
     MidiTrackIssue,
@@ -34,8 +35,8 @@ def read_chunk(stream: io.BufferedReader) -> tuple[bytes, bytes]:
     return chunk_type, payload
 
 
-def read_midi(path: str, mode: str = "auto") -> tuple[MidiSong, MidiImportReport]:
-    """Decode a MIDI file, falling back to lenient mode when requested."""
+def decode_midi(path: str, mode: str = "auto") -> tuple[DecodedMidi, MidiImportReport]:
+    """Decode a MIDI file's notes, programs and tempo map without building MusicXML."""
 
     mode_normalized = mode.lower()
     if mode_normalized not in _VALID_MODES:
@@ -122,10 +123,12 @@ def read_midi(path: str, mode: str = "auto") -> tuple[MidiSong, MidiImportReport
     if not tempo_sequence:
         tempo_sequence.append((0, float(DEFAULT_TEMPO_BPM)))
 
-    tree = build_musicxml(track_events, division, channel_programs, tempo_sequence)
-    root = tree.getroot()
-    song = MidiSong(tree=tree, root=root, pulses_per_quarter=division)
-
+    decoded = DecodedMidi(
+        events=tuple(track_events),
+        pulses_per_quarter=division,
+        programs=dict(channel_programs),
+        tempo_changes=tuple(tempo_sequence),
+    )
     assumed_tempo = tempo_sequence[0][1] if tempo_sequence else float(DEFAULT_TEMPO_BPM)
     report = MidiImportReport(
         mode=used_mode,
@@ -134,7 +137,23 @@ def read_midi(path: str, mode: str = "auto") -> tuple[MidiSong, MidiImportReport
         assumed_tempo_bpm=int(round(max(1.0, assumed_tempo))),
         assumed_time_signature=DEFAULT_TIME_SIGNATURE,
     )
-    return song, report
+    return decoded, report
+
+
+def build_song(decoded: DecodedMidi) -> MidiSong:
+    """Build the single-measure MusicXML score for *decoded*."""
+
+    tree = build_musicxml(
+        decoded.events, decoded.pulses_per_quarter, dict(decoded.programs), decoded.tempo_changes
+    )
+    return MidiSong(tree=tree, root=tree.getroot(), pulses_per_quarter=decoded.pulses_per_quarter)
+
+
+def read_midi(path: str, mode: str = "auto") -> tuple[MidiSong, MidiImportReport]:
+    """Decode a MIDI file, falling back to lenient mode when requested."""
+
+    decoded, report = decode_midi(path, mode=mode)
+    return build_song(decoded), report
 
 
-__all__ = ["read_chunk", "read_midi"]
+__all__ = ["build_song", "decode_midi", "read_chunk", "read_midi"]
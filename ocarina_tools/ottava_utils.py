@@ -10,10 +10,13 @@ from shared.ottava import OttavaShift
 __all__ = [
     "_parse_size",
     "_resolve_direction_voices",
+    "_direction_voices",
     "_pop_ottava",
     "_active_shifts",
     "_total_shift",
     "_handle_direction_octaves",
+    "_direction_octave_shifts",
+    "_apply_direction_octaves",
     "_extract_note_ottavas",
 ]
 
@@ -29,8 +32,13 @@ def _parse_size(value: str | None) -> int:
 
 def _resolve_direction_voices(direction: ET.Element, q, voice_pos: dict[str, int]) -> list[str]:
     voice_el = direction.find(q("voice"))
-    if voice_el is not None and voice_el.text and voice_el.text.strip():
-        return [voice_el.text.strip()]
+    voice = voice_el.text.strip() if voice_el is not None and voice_el.text else ""
+    return _direction_voices(voice or None, voice_pos)
+
+
+def _direction_voices(voice: str | None, voice_pos: dict[str, int]) -> list[str]:
+    if voice:
+        return [voice]
     if voice_pos:
         return list(voice_pos.keys())
     return ["1"]
@@ -64,10 +72,21 @@ def _handle_direction_octaves(
     voice_ottavas: defaultdict[str, list[tuple[OttavaShift, str | None]]],
     voice_pos: dict[str, int],
 ) -> None:
+    shifts = _direction_octave_shifts(direction, q)
+    if shifts:
+        voices = _resolve_direction_voices(direction, q, voice_pos)
+        _apply_direction_octaves(shifts, voices, voice_ottavas)
+
+
+def _direction_octave_shifts(
+    direction: ET.Element, q
+) -> tuple[tuple[OttavaShift | None, str | None], ...]:
+    """Return ``(shift, number)`` pairs of a direction; ``None`` marks a stop."""
+
     direction_type = direction.find(q("direction-type"))
     if direction_type is None:
-        return
-    voices = _resolve_direction_voices(direction, q, voice_pos)
+        return ()
+    shifts: list[tuple[OttavaShift | None, str | None]] = []
     for shift_el in direction_type.findall(q("octave-shift")):
         shift_type = (shift_el.get("type") or "").strip().lower()
         number = (shift_el.get("number") or "").strip() or None
@@ -79,11 +98,23 @@ def _handle_direction_octaves(
                 size=size,
                 number=number,
             )
-            for voice in voices:
-                voice_ottavas[voice].append((shift, number))
+            shifts.append((shift, number))
         elif shift_type == "stop":
-            for voice in voices:
+            shifts.append((None, number))
+    return tuple(shifts)
+
+
+def _apply_direction_octaves(
+    shifts: Iterable[tuple[OttavaShift | None, str | None]],
+    voices: list[str],
+    voice_ottavas: defaultdict[str, list[tuple[OttavaShift, str | None]]],
+) -> None:
+    for shift, number in shifts:
+        for voice in voices:
+            if shift is None:
                 _pop_ottava(voice_ottavas[voice], number)
+            else:
+                voice_ottavas[voice].append((shift, number))
 
 
 def _extract_note_ottavas(note: ET.Element, q) -> tuple[list[OttavaShift], list[str | None]]:
@@ -9,6 +9,7 @@ import xml.etree.ElementTree as ET
 from .instruments import part_programs
 from .musicxml import get_pitch_data, qname
 from .pitch import midi_to_name
+from .score_index import NoteRecord, PartIndex, ScoreIndex, ScoreSource
 
 
 @dataclass(slots=True)
@@ -25,21 +26,28 @@ class MusicXmlPartInfo:
     max_pitch: Optional[str]
 
 
-def _summarize_part_range(part: ET.Element, q) -> tuple[Dict[str, Optional[int]], Dict[str, Optional[str]]]:
-    lowest = highest = None
-    count = 0
-    for measure in part.findall(q("measure")):
-        for note in measure.findall(q("note")):
-            if note.find(q("rest")) is not None:
-                continue
-            pitch_data = get_pitch_data(note, q)
-            if pitch_data is None:
-                continue
-            midi = pitch_data.midi
-            lowest = midi if lowest is None else min(lowest, midi)
-            highest = midi if highest is None else max(highest, midi)
-            count += 1
-    range_midi = {"min": lowest, "max": highest, "count": count}
+def _summarize_part_range(
+    part: ET.Element | PartIndex, q
+) -> tuple[Dict[str, Optional[int]], Dict[str, Optional[str]]]:
+    if isinstance(part, PartIndex):
+        pitches = [
+            record.midi
+            for measure in part.measures
+            for record in measure
+            if isinstance(record, NoteRecord) and record.midi is not None
+        ]
+    else:
+        pitches = []
+        for measure in part.findall(q("measure")):
+            for note in measure.findall(q("note")):
+                if note.find(q("rest")) is not None:
+                    continue
+                pitch_data = get_pitch_data(note, q)
+                if pitch_data is not None:
+                    pitches.append(pitch_data.midi)
+    lowest = min(pitches, default=None)
+    highest = max(pitches, default=None)
+    range_midi = {"min": lowest, "max": highest, "count": len(pitches)}
     range_names = {
         "min": midi_to_name(lowest) if lowest is not None else None,
         "max": midi_to_name(highest) if highest is not None else None,
@@ -47,35 +55,44 @@ def _summarize_part_range(part: ET.Element, q) -> tuple[Dict[str, Optional[int]]
     return range_midi, range_names
 
 
-def list_parts(root: ET.Element) -> List[MusicXmlPartInfo]:
+def list_parts(root: ScoreSource) -> List[MusicXmlPartInfo]:
     """Return summary information for all parts in a MusicXML score."""
 
-    q = lambda tag: qname(root, tag)
-    programs = part_programs(root)
-    part_list = root.find(q("part-list"))
-
     part_names: Dict[str, str] = {}
     ordered_ids: List[str] = []
-    if part_list is not None:
-        for score_part in part_list.findall(q("score-part")):
-            part_id = (score_part.get("id") or "").strip()
-            if not part_id:
-                continue
-            ordered_ids.append(part_id)
-            part_name_el = score_part.find(q("part-name"))
-            name = (part_name_el.text or "").strip() if part_name_el is not None else ""
-            part_names[part_id] = name
-
-    parts_by_id: Dict[str, ET.Element] = {}
-    for part in root.findall(q("part")):
-        part_id = (part.get("id") or "").strip()
-        if part_id:
-            parts_by_id[part_id] = part
+    parts_by_id: Dict[str, ET.Element | PartIndex] = {}
+    if isinstance(root, ScoreIndex):
+        q = None
+        programs = root.programs
+        for entry in root.score_parts:
+            ordered_ids.append(entry.part_id)
+            part_names[entry.part_id] = entry.name
+        for part_index in root.parts:
+            part_id = (part_index.part_id or "").strip()
+            if part_id:
+                parts_by_id[part_id] = part_index
+    else:
+        q = lambda tag: qname(root, tag)
+        programs = part_programs(root)
+        part_list = root.find(q("part-list"))
+        if part_list is not None:
+            for score_part in part_list.findall(q("score-part")):
+                part_id = (score_part.get("id") or "").strip()
+                if not part_id:
+                    continue
+                ordered_ids.append(part_id)
+                part_name_el = score_part.find(q("part-name"))
+                name = (part_name_el.text or "").strip() if part_name_el is not None else ""
+                part_names[part_id] = name
+        for part in root.findall(q("part")):
+            part_id = (part.get("id") or "").strip()
+            if part_id:
+                parts_by_id[part_id] = part
 
     infos: List[MusicXmlPartInfo] = []
     seen: set[str] = set()
 
-    def _append_part(part_id: str, part_el: ET.Element) -> None:
+    def _append_part(part_id: str, part_el: ET.Element | PartIndex) -> None:
         range_midi, range_names = _summarize_part_range(part_el, q)
         infos.append(
             MusicXmlPartInfo(
@@ -0,0 +1,451 @@
+"""Single-pass index of the MusicXML facts the importers read.
+
+Building a preview used to walk the same tree once per question: key, metre,
+tempo, part ranges, used pitches and note events each ran their own
+``findall`` traversal. A :class:`ScoreIndex` records everything those helpers
+need in one pass, either while :func:`xml.etree.ElementTree.iterparse` streams
+the document or from a tree that is already in memory, and
+``analyze_key``, ``get_time_signature``, ``detect_tempo_bpm``,
+``get_tempo_changes``, ``list_parts``, ``collect_used_pitches`` and
+``get_note_events`` all accept it in place of the root element.
+
+An index is a snapshot: it does not follow later edits to the tree it was
+built from, so rebuild it after transforming the score.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import IO, Collection, Dict, Iterable, Iterator, Optional, Union
+import xml.etree.ElementTree as ET
+
+from shared.ottava import OttavaShift
+
+from .grace_settings import _classify_grace
+from .instruments import parse_midi_program
+from .musicxml import get_pitch_data, make_qname_getter
+from .ottava_utils import _direction_octave_shifts, _extract_note_ottavas
+
+
+@dataclass(frozen=True, slots=True)
+class NoteRecord:
+    """What the importers read from one ``<note>``; ``midi`` ignores ottavas."""
+
+    voice: str
+    duration: int
+    duration_value: float
+    is_chord: bool
+    is_rest: bool
+    midi: int | None
+    is_grace: bool
+    grace_type: str | None
+    tie_types: frozenset[str]
+    ottava_starts: tuple[OttavaShift, ...]
+    ottava_stops: tuple[str | None, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DirectionRecord:
+    """Octave shifts and tempo carried by one ``<direction>``."""
+
+    voice: str | None
+    octave_shifts: tuple[tuple[OttavaShift | None, str | None], ...]
+    tempo_bpm: float | None
+    offset: float
+
+
+@dataclass(frozen=True, slots=True)
+class CursorRecord:
+    """A ``<backup>`` or ``<forward>`` move of the measure position."""
+
+    backup: bool
+    duration: float
+
+
+MeasureRecord = Union[NoteRecord, DirectionRecord, CursorRecord]
+
+
+@dataclass(frozen=True, slots=True)
+class PartIndex:
+    """Measures of one ``<part>`` plus the first attributes it declares."""
+
+    part_id: str | None
+    measures: tuple[tuple[MeasureRecord, ...], ...]
+    divisions: int | None = None
+    key: tuple[str, str | None] | None = None
+    opening_time: tuple[int, int] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ScorePartEntry:
+    """One ``<score-part>`` from the part list."""
+
+    part_id: str
+    name: str
+    program: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreIndex:
+    """Everything the preview and conversion helpers read from a score."""
+
+    score_parts: tuple[ScorePartEntry, ...]
+    parts: tuple[PartIndex, ...]
+
+    @property
+    def divisions(self) -> int:
+        for part in self.parts:
+            if part.divisions is not None:
+                return part.divisions
+        return 1
+
+    @property
+    def key(self) -> tuple[str, str | None] | None:
+        """Raw ``(fifths, mode)`` text of the first key signature, if any."""
+
+        for part in self.parts:
+            if part.key is not None:
+                return part.key
+        return None
+
+    @property
+    def time_signature(self) -> tuple[int, int]:
+        if self.parts and self.parts[0].opening_time is not None:
+            return self.parts[0].opening_time
+        return 4, 4
+
+    @property
+    def programs(self) -> Dict[str, int]:
+        return {
+            entry.part_id: entry.program
+            for entry in self.score_parts
+            if entry.program is not None
+        }
+
+    def select(self, keep_ids: Collection[str]) -> "ScoreIndex":
+        """Return the index :func:`~ocarina_tools.parts.filter_parts` would leave."""
+
+        keep_order = list(
+            dict.fromkeys(
+                normalized for normalized in ((part_id or "").strip() for part_id in keep_ids)
+                if normalized
+            )
+        )
+        parts_by_id: Dict[str, PartIndex] = {}
+        for part in self.parts:
+            part_id = (part.part_id or "").strip()
+            if part_id:
+                parts_by_id[part_id] = part
+        entries_by_id = {entry.part_id: entry for entry in self.score_parts}
+        ordered_ids = [part_id for part_id in keep_order if part_id in parts_by_id]
+        return ScoreIndex(
+            score_parts=tuple(
+                entries_by_id[part_id] for part_id in ordered_ids if part_id in entries_by_id
+            ),
+            parts=tuple(parts_by_id[part_id] for part_id in ordered_ids),
+        )
+
+
+def note_record(note: ET.Element, q) -> NoteRecord:
+    voice_el = note.find(q("voice"))
+    voice = voice_el.text.strip() if (voice_el is not None and voice_el.text) else "1"
+    dur_el = note.find(q("duration"))
+    dur_text = (dur_el.text or "").strip() if dur_el is not None and dur_el.text else ""
+    is_rest = note.find(q("rest")) is not None
+    midi: int | None = None
+    if not is_rest:
+        pitch_data = get_pitch_data(note, q)
+        if pitch_data is not None:
+            midi = pitch_data.midi
+    grace_el = note.find(q("grace"))
+    tie_types = set()
+    for tie in note.findall(q("tie")):
+        tie_type = (tie.get("type") or "").strip().lower()
+        if tie_type:
+            tie_types.add(tie_type)
+    for notation in note.findall(q("notations")):
+        for tied in notation.findall(q("tied")):
+            tie_type = (tied.get("type") or "").strip().lower()
+            if tie_type:
+                tie_types.add(tie_type)
+    starts, stops = _extract_note_ottavas(note, q)
+    return NoteRecord(
+        voice=voice,
+        duration=int(dur_text) if dur_text.isdigit() else 0,
+        duration_value=_parse_duration(dur_el),
+        is_chord=note.find(q("chord")) is not None,
+        is_rest=is_rest,
+        midi=midi,
+        is_grace=grace_el is not None,
+        grace_type=_classify_grace(grace_el),
+        tie_types=frozenset(tie_types),
+        ottava_starts=tuple(starts),
+        ottava_stops=tuple(stops),
+    )
+
+
+def measure_records(measure: ET.Element, q) -> Iterator[MeasureRecord]:
+    """Yield the records of ``measure`` in document order."""
+
+    note_tag, direction_tag = q("note"), q("direction")
+    backup_tag, forward_tag = q("backup"), q("forward")
+    for element in measure:
+        tag = element.tag
+        if tag == note_tag:
+            yield note_record(element, q)
+        elif tag == direction_tag:
+            shifts = _direction_octave_shifts(element, q)
+            tempo_bpm = _tempo_from_direction(element, q)
+            if not shifts and tempo_bpm is None:
+                continue
+            voice_el = element.find(q("voice"))
+            voice = voice_el.text.strip() if voice_el is not None and voice_el.text else ""
+            yield DirectionRecord(
+                voice=voice or None,
+                octave_shifts=shifts,
+                tempo_bpm=tempo_bpm,
+                offset=_parse_offset(element, q),
+            )
+        elif tag == backup_tag or tag == forward_tag:
+            yield CursorRecord(
+                backup=tag == backup_tag,
+                duration=_parse_duration(element.find(q("duration"))),
+            )
+
+
+ScoreSource = Union[ET.Element, ScoreIndex]
+
+
+def iter_part_records(
+    source: ScoreSource,
+) -> Iterator[tuple[str | None, Iterator[Iterable[MeasureRecord]]]]:
+    """Yield ``(part_id, measures)`` for each part of a tree or an index.
+
+    Trees are recorded lazily, one measure at a time, so helpers share one
+    reading of the score whichever form they are given.
+    """
+
+    if isinstance(source, ScoreIndex):
+        for part_index in source.parts:
+            yield part_index.part_id, iter(part_index.measures)
+        return
+    q = make_qname_getter(source)
+    for part in source.findall(q("part")):
+        yield part.get("id"), (
+            measure_records(measure, q) for measure in part.findall(q("measure"))
+        )
+
+
+class _PartBuilder:
+    def __init__(self, part_id: str | None) -> None:
+        self.part_id = part_id
+        self.measures: list[tuple[MeasureRecord, ...]] = []
+        self.divisions: int | None = None
+        self.key: tuple[str, str | None] | None = None
+        self.opening_time: tuple[int, int] | None = None
+
+    def add_measure(self, measure: ET.Element, q) -> None:
+        attrs = measure.find(q("attributes"))
+        if attrs is not None:
+            if self.divisions is None:
+                div = attrs.find(q("divisions"))
+                if div is not None and div.text and div.text.strip().isdigit():
+                    self.divisions = int(div.text.strip())
+            if self.key is None:
+                key = attrs.find(q("key"))
+                fifths = key.find(q("fifths")) if key is not None else None
+                if fifths is not None:
+                    mode_el = key.find(q("mode"))
+                    mode = mode_el.text.strip() if mode_el is not None and mode_el.text else None
+                    self.key = ((fifths.text or "0").strip(), mode)
+            if not self.measures:
+                self.opening_time = _parse_time(attrs, q)
+        self.measures.append(tuple(measure_records(measure, q)))
+
+    def build(self) -> PartIndex:
+        return PartIndex(
+            part_id=self.part_id,
+            measures=tuple(self.measures),
+            divisions=self.divisions,
+            key=self.key,
+            opening_time=self.opening_time,
+        )
+
+
+def index_score(root: ET.Element) -> ScoreIndex:
+    """Index a score that is already parsed."""
+
+    q = make_qname_getter(root)
+    part_list = root.find(q("part-list"))
+    parts: list[PartIndex] = []
+    for part in root.findall(q("part")):
+        builder = _PartBuilder(part.get("id"))
+        for measure in part.findall(q("measure")):
+            builder.add_measure(measure, q)
+        parts.append(builder.build())
+    score_parts = _score_parts(part_list, q) if part_list is not None else ()
+    return ScoreIndex(score_parts=score_parts, parts=tuple(parts))
+
+
+def build_score_index(source: Union[str, IO[bytes]]) -> ScoreIndex:
+    """Stream ``source`` once and index it without keeping the tree.
+
+    Each measure is cleared as soon as it has been recorded, so peak memory
+    stays close to the size of the index rather than the document.
+    """
+
+    index, _root = _iterparse(source, keep_tree=False)
+    return index
+
+
+def parse_score(source: Union[str, IO[bytes]]) -> tuple[ET.ElementTree, ScoreIndex]:
+    """Parse ``source`` into a tree and index it during the same pass."""
+
+    index, root = _iterparse(source, keep_tree=True)
+    return ET.ElementTree(root), index
+
+
+def _iterparse(
+    source: Union[str, IO[bytes]], *, keep_tree: bool
+) -> tuple[ScoreIndex, ET.Element]:
+    root: ET.Element | None = None
+    q = make_qname_getter(ET.Element(""))
+    part_tag = measure_tag = list_tag = ""
+    depth = 0
+    builder: _PartBuilder | None = None
+    parts: list[PartIndex] = []
+    score_parts: tuple[ScorePartEntry, ...] | None = None
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if depth == 0:
+                root = element
+                q = make_qname_getter(element)
+                part_tag, measure_tag, list_tag = q("part"), q("measure"), q("part-list")
+            elif depth == 1 and element.tag == part_tag:
+                builder = _PartBuilder(element.get("id"))
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 2 and builder is not None and element.tag == measure_tag:
+            builder.add_measure(element, q)
+            if not keep_tree:
+                element.clear()
+        elif depth == 1 and builder is not None and element.tag == part_tag:
+            parts.append(builder.build())
+            builder = None
+            if not keep_tree:
+                element.clear()
+        elif depth == 1 and score_parts is None and element.tag == list_tag:
+            score_parts = _score_parts(element, q)
+    if root is None:  # pragma: no cover - iterparse raises on empty documents
+        raise ET.ParseError("no element found")
+    return ScoreIndex(score_parts=score_parts or (), parts=tuple(parts)), root
+
+
+def _score_parts(part_list: ET.Element, q) -> tuple[ScorePartEntry, ...]:
+    entries: list[ScorePartEntry] = []
+    for score_part in part_list.findall(q("score-part")):
+        part_id = (score_part.get("id") or "").strip()
+        if not part_id:
+            continue
+        part_name_el = score_part.find(q("part-name"))
+        program: int | None = None
+        for midi_inst in score_part.findall(q("midi-instrument")):
+            program_el = midi_inst.find(q("midi-program"))
+            program = parse_midi_program(program_el.text if program_el is not None else None)
+            if program is not None:
+                break
+        entries.append(
+            ScorePartEntry(
+                part_id=part_id,
+                name=(part_name_el.text or "").strip() if part_name_el is not None else "",
+                program=program,
+            )
+        )
+    return tuple(entries)
+
+
+def _parse_time(attrs: ET.Element, q) -> tuple[int, int] | None:
+    ts = attrs.find(q("time"))
+    if ts is None:
+        return None
+    beats_el = ts.find(q("beats"))
+    beat_type_el = ts.find(q("beat-type"))
+    try:
+        beats = int((beats_el.text or "4").strip()) if beats_el is not None else 4
+        beat_type = int((beat_type_el.text or "4").strip()) if beat_type_el is not None else 4
+    except Exception:
+        return None
+    return beats, beat_type
+
+
+def _tempo_from_direction(direction: ET.Element, q) -> float | None:
+    sound = direction.find(q("sound"))
+    if sound is not None:
+        tempo_value = _parse_tempo(sound.get("tempo"))
+        if tempo_value is not None:
+            return tempo_value
+
+    for direction_type in direction.findall(q("direction-type")):
+        metronome = direction_type.find(q("metronome"))
+        if metronome is None:
+            continue
+        per_minute = metronome.find(q("per-minute"))
+        if per_minute is not None and per_minute.text:
+            tempo_value = _parse_tempo(per_minute.text)
+            if tempo_value is not None:
+                return tempo_value
+    return None
+
+
+def _parse_offset(direction: ET.Element, q) -> float:
+    offset_el = direction.find(q("offset"))
+    if offset_el is None or offset_el.text is None:
+        return 0.0
+    try:
+        return float(offset_el.text.strip())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_duration(duration_el: Optional[ET.Element]) -> float:
+    if duration_el is None or duration_el.text is None:
+        return 0.0
+    text = duration_el.text.strip()
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_tempo(value: str | None) -> float | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        tempo = float(text)
+    except (TypeError, ValueError):
+        return None
+    return tempo
+
+
+__all__ = [
+    "CursorRecord",
+    "DirectionRecord",
+    "MeasureRecord",
+    "NoteRecord",
+    "PartIndex",
+    "ScoreIndex",
+    "ScorePartEntry",
+    "ScoreSource",
+    "build_score_index",
+    "index_score",
+    "iter_part_records",
+    "measure_records",
+    "note_record",
+    "parse_score",
+]
@@ -0,0 +1,115 @@
+"""Convert a folder of scores headlessly and write a JSON summary.
+
+Example::
+
+    python scripts/batch_convert.py songs/ "extra/*.mid" --settings songbook.json \
+        --output-dir build/songbook --summary build/songbook/summary.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ocarina_gui.constants import DEFAULT_MAX, DEFAULT_MIN  # noqa: E402
+from ocarina_gui.fingering import get_current_instrument_id  # noqa: E402
+from ocarina_gui.pdf_export.types import PdfExportOptions  # noqa: E402
+from ocarina_gui.settings import TransformSettings  # noqa: E402
+from services.batch_conversion import (  # noqa: E402
+    ARRANGER_MODES,
+    BatchConfig,
+    BatchOutcome,
+    build_summary,
+    collect_inputs,
+    load_batch_config,
+    plan_jobs,
+    run_batch,
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="directories or glob patterns of .musicxml/.xml/.mxl/.mid files",
+    )
+    parser.add_argument(
+        "--settings",
+        help="settings JSON, project manifest.json or saved project archive",
+    )
+    parser.add_argument("--output-dir", required=True, help="folder receiving one export folder per score")
+    parser.add_argument("--summary", help="summary JSON path (default: <output-dir>/batch-summary.json)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--arranger", choices=ARRANGER_MODES, help="override the arranger mode")
+    parser.add_argument("--instrument", help="override the instrument id")
+    parser.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="leave earlier export folders alone and write to '<name> (n)' folders instead",
+    )
+    return parser.parse_args(argv)
+
+
+def _config(args: argparse.Namespace) -> BatchConfig:
+    if args.settings:
+        config = load_batch_config(args.settings)
+    else:
+        config = BatchConfig(
+            settings=TransformSettings(
+                prefer_mode="auto",
+                range_min=DEFAULT_MIN,
+                range_max=DEFAULT_MAX,
+                prefer_flats=True,
+                collapse_chords=True,
+                favor_lower=False,
+            ),
+            pdf_options=PdfExportOptions.with_defaults(),
+        )
+    if args.arranger:
+        config = replace(config, arranger_mode=args.arranger)
+    instrument_id = args.instrument or config.settings.instrument_id or get_current_instrument_id()
+    return replace(config, settings=replace(config.settings, instrument_id=instrument_id))
+
+
+def _report(outcome: BatchOutcome) -> None:
+    if outcome.ok:
+        total = outcome.timings.get("total", 0.0)
+        print(f"ok     {outcome.input_path} ({total:.1f} s)")
+    else:
+        print(f"FAILED {outcome.input_path}: {outcome.error}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No scores matched the given inputs.", file=sys.stderr)
+        return 2
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = plan_jobs(inputs, output_dir, _config(args), keep_existing=args.keep_existing)
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(jobs)))
+
+    start = time.perf_counter()
+    outcomes = run_batch(jobs, workers=workers, on_outcome=_report)
+    summary = build_summary(outcomes, elapsed=time.perf_counter() - start, workers=workers)
+
+    summary_path = Path(args.summary) if args.summary else output_dir / "batch-summary.json"
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"{summary['succeeded']} converted, {summary['failed']} failed; summary: {summary_path}")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -23,6 +23,7 @@ from ocarina_gui.preview import PreviewData
 from ocarina_tools.events import NoteEvent
 from ocarina_tools.pitch import midi_to_name as pitch_midi_to_name
 from services.arranger_monophonic import ensure_monophonic
+from shared.cancellation import CancellationToken
 
 from viewmodels.arranger_models import (
     ArrangerBudgetSettings,
@@ -142,8 +143,13 @@ def compute_arranger_preview(
     progress_callback: ProgressCallback | None = None,
     grace_settings: GraceSettings | None = None,
     subhole_settings: SubholeConstraintSettings | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> ArrangerComputation:
-    """Return arranger summaries derived from ``preview`` for UI consumption."""
+    """Return arranger summaries derived from ``preview`` for UI consumption.
+
+    Cancelling ``cancellation`` aborts the arranger run with
+    :class:`~shared.cancellation.OperationCancelled`.
+    """
 
     strategy_normalized = (strategy or "current").strip().lower()
     mode = (arranger_mode or "classic").strip().lower()
@@ -279,6 +285,7 @@ def compute_arranger_preview(
                 grace_settings=active_grace,
                 subhole_settings=active_subhole,
                 progress_callback=progress_callback,
+                cancellation=cancellation,
             )
         except Exception:
             logger.exception("Arranger preview failed during best-effort arrange call")
@@ -380,6 +387,7 @@ def compute_arranger_preview(
             preferred_register_shift=auto_register_shift,
             grace_settings=active_grace,
             progress_callback=gp_progress,
+            cancellation=cancellation,
         )
     except Exception:
         logger.exception("Arranger preview failed during GP arrange call")
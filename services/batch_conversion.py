@@ -0,0 +1,375 @@
+"""Headless batch conversion of many scores with one set of settings.
+
+Each input runs the same pipeline as the main window: build the preview,
+optionally arrange it for the configured instrument, then export through
+:func:`~ocarina_gui.conversion.convert_score` using the arranged events. Jobs
+are independent, so :func:`run_batch` fans them out over a process pool and
+collects one :class:`BatchOutcome` per file.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Sequence
+
+from ocarina_gui import export_arranged_pdf, export_musicxml, export_mxl
+from ocarina_gui.constants import DEFAULT_MAX, DEFAULT_MIN
+from ocarina_gui.conversion import convert_score
+from ocarina_gui.pdf_export.types import PdfExportOptions
+from ocarina_gui.preview import build_preview_data
+from ocarina_gui.settings import TransformSettings
+from ocarina_tools import export_midi_poly, load_score
+from viewmodels.arranger_models import ArrangerBudgetSettings, ArrangerGPSettings
+
+from .arranger_preview import compute_arranger_preview
+from .project_manifest import (
+    load_arranger_budgets,
+    load_arranger_dp_slack,
+    load_arranger_gp_settings,
+    load_arranger_mode,
+    load_arranger_strategy,
+    load_pdf_options,
+    load_settings,
+    load_starred_instruments,
+)
+from .score_service import ScoreService
+
+
+logger = logging.getLogger(__name__)
+
+SCORE_SUFFIXES: tuple[str, ...] = (".musicxml", ".xml", ".mxl", ".mid", ".midi")
+ARRANGER_MODES: tuple[str, ...] = ("classic", "best_effort", "gp")
+DEFAULT_BATCH_ARRANGER_MODE = "best_effort"
+_MANIFEST_NAME = "manifest.json"
+_OUTPUT_SUFFIX = "-ocarina-C"
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    """Settings shared by every job, as read from a settings file or project."""
+
+    settings: TransformSettings
+    pdf_options: PdfExportOptions
+    arranger_mode: str = DEFAULT_BATCH_ARRANGER_MODE
+    arranger_strategy: str = "current"
+    starred_instrument_ids: tuple[str, ...] = ()
+    dp_slack_enabled: bool = True
+    budgets: ArrangerBudgetSettings | None = None
+    gp_settings: ArrangerGPSettings | None = None
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """One score to convert and the export path it should be written under.
+
+    With ``export_folder`` set the outputs are written straight into that
+    folder, replacing those of an earlier run; otherwise a fresh folder is
+    derived from ``output_xml_path``.
+    """
+
+    input_path: str
+    output_xml_path: str
+    config: BatchConfig
+    export_folder: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchOutcome:
+    """JSON-friendly record of one job; ``error`` is set when it failed."""
+
+    input_path: str
+    output_folder: str | None = None
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    difficulty: Dict[str, Any] | None = None
+    used_pitches: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def load_batch_config(path: str | os.PathLike[str]) -> BatchConfig:
+    """Read a settings JSON file, a ``manifest.json`` or a saved project archive.
+
+    A manifest or project contributes its ``settings``, ``pdf_options`` and
+    ``arranger`` sections; a file without a ``settings`` key is read as the
+    settings section itself. Part selections are dropped because they name
+    the parts of one particular song.
+    """
+
+    source = Path(path)
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source, "r") as archive:
+            data = json.loads(archive.read(_MANIFEST_NAME).decode("utf-8"))
+    else:
+        data = json.loads(source.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"Batch settings must be a JSON object: {source}")
+
+    settings_data = data.get("settings")
+    if not isinstance(settings_data, dict):
+        settings_data = data
+    settings = load_settings(settings_data)
+    settings = replace(
+        settings,
+        range_min=settings.range_min or DEFAULT_MIN,
+        range_max=settings.range_max or DEFAULT_MAX,
+        selected_part_ids=(),
+    )
+    pdf_options = load_pdf_options(data.get("pdf_options")) or PdfExportOptions.with_defaults()
+
+    arranger = data.get("arranger")
+    dp_slack = load_arranger_dp_slack(arranger)
+    return BatchConfig(
+        settings=settings,
+        pdf_options=pdf_options,
+        arranger_mode=load_arranger_mode(arranger) or DEFAULT_BATCH_ARRANGER_MODE,
+        arranger_strategy=load_arranger_strategy(arranger) or "current",
+        starred_instrument_ids=load_starred_instruments(arranger),
+        dp_slack_enabled=True if dp_slack is None else dp_slack,
+        budgets=load_arranger_budgets(arranger),
+        gp_settings=load_arranger_gp_settings(arranger),
+    )
+
+
+def collect_inputs(sources: Iterable[str]) -> list[Path]:
+    """Expand directories and glob patterns into score files, without duplicates.
+
+    Directories are searched recursively for the suffixes in
+    :data:`SCORE_SUFFIXES`; other entries are treated as glob patterns (a
+    plain path is a pattern matching itself).
+    """
+
+    found: dict[Path, None] = {}
+    for source in sources:
+        if os.path.isdir(source):
+            candidates: Iterable[str] = sorted(
+                str(path) for path in Path(source).rglob("*") if path.is_file()
+            )
+        else:
+            candidates = sorted(glob.glob(source, recursive=True))
+        for candidate in candidates:
+            path = Path(candidate)
+            if path.is_file() and path.suffix.lower() in SCORE_SUFFIXES:
+                found.setdefault(path.resolve(), None)
+    return list(found)
+
+
+def plan_jobs(
+    inputs: Sequence[Path],
+    output_dir: str | os.PathLike[str],
+    config: BatchConfig,
+    *,
+    keep_existing: bool = False,
+) -> list[BatchJob]:
+    """Give each input its own export folder under ``output_dir``.
+
+    By default a score is written into the folder named after it, replacing
+    the outputs a previous run left there, so re-running a batch updates it in
+    place. With ``keep_existing`` folders already on disk are left alone and
+    the new outputs get a ``" (n)"`` suffix instead.
+
+    Names are made unique up front because workers run concurrently and
+    cannot rely on :func:`~ocarina_gui.conversion.derive_export_folder`
+    seeing each other's folders.
+    """
+
+    directory = os.fspath(output_dir)
+    used: set[str] = set()
+    jobs: list[BatchJob] = []
+    for path in inputs:
+        base = f"{path.stem}{_OUTPUT_SUFFIX}"
+        name = base
+        index = 2
+        while name.lower() in used or (
+            keep_existing and os.path.exists(os.path.join(directory, name))
+        ):
+            name = f"{base} ({index})"
+            index += 1
+        used.add(name.lower())
+        output_xml_path = os.path.join(directory, f"{name}.musicxml")
+        export_folder = None if keep_existing else os.path.join(directory, name)
+        jobs.append(BatchJob(str(path), output_xml_path, config, export_folder))
+    return jobs
+
+
+def default_score_service() -> ScoreService:
+    """Return a :class:`ScoreService` wired to the real loaders and exporters."""
+
+    return ScoreService(
+        load_score=load_score,
+        build_preview_data=build_preview_data,
+        convert_score=convert_score,
+        export_musicxml=export_musicxml,
+        export_mxl=export_mxl,
+        export_midi=export_midi_poly,
+        export_pdf=export_arranged_pdf,
+    )
+
+
+def convert_job(job: BatchJob, service: ScoreService | None = None) -> BatchOutcome:
+    """Preview, arrange and export one score; failures become an ``error``."""
+
+    service = service or default_score_service()
+    config = job.config
+    settings = config.settings
+    midi_mode = "auto" if settings.lenient_midi_import else "strict"
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        preview = service.build_preview(job.input_path, settings, midi_mode=midi_mode)
+        timings["preview"] = time.perf_counter() - start
+
+        arrange_start = time.perf_counter()
+        computation = compute_arranger_preview(
+            preview,
+            arranger_mode=config.arranger_mode,
+            instrument_id=settings.instrument_id,
+            starred_instrument_ids=config.starred_instrument_ids,
+            strategy=config.arranger_strategy,
+            dp_slack_enabled=config.dp_slack_enabled,
+            budgets=config.budgets,
+            gp_settings=config.gp_settings,
+            transpose_offset=settings.transpose_offset,
+            selected_instrument_range=(settings.range_min, settings.range_max),
+            grace_settings=settings.grace_settings.to_domain(),
+            subhole_settings=settings.subhole_settings.to_domain(),
+        )
+        timings["arrange"] = time.perf_counter() - arrange_start
+
+        arranged_events = preview.arranged_events
+        if computation.arranged_events is not None:
+            arranged_events = computation.arranged_events
+        if (
+            computation.resolved_instrument_id
+            and computation.resolved_instrument_id != settings.instrument_id
+            and computation.resolved_instrument_range
+        ):
+            range_min, range_max = computation.resolved_instrument_range
+            settings = replace(
+                settings,
+                range_min=range_min or settings.range_min,
+                range_max=range_max or settings.range_max,
+            )
+
+        convert_start = time.perf_counter()
+        result = service.convert(
+            job.input_path,
+            job.output_xml_path,
+            settings,
+            config.pdf_options,
+            midi_mode=midi_mode,
+            arranged_events=tuple(arranged_events),
+            arranged_pulses_per_quarter=preview.pulses_per_quarter,
+            export_folder=job.export_folder,
+        )
+        timings["convert"] = time.perf_counter() - convert_start
+    except Exception as exc:
+        logger.exception("Batch conversion failed", extra={"input_path": job.input_path})
+        timings["total"] = time.perf_counter() - start
+        return BatchOutcome(
+            input_path=job.input_path,
+            timings=timings,
+            error=str(exc) or exc.__class__.__name__,
+        )
+
+    timings.update(getattr(result, "timings", {}) or {})
+    timings["total"] = time.perf_counter() - start
+    difficulty = None
+    if computation.result_summary is not None:
+        summary = asdict(computation.result_summary)
+        summary.pop("edits", None)
+        summary["applied_steps"] = list(summary.get("applied_steps", ()))
+        difficulty = summary
+    return BatchOutcome(
+        input_path=job.input_path,
+        output_folder=result.output_folder,
+        outputs={
+            "musicxml": result.output_xml_path,
+            "mxl": result.output_mxl_path,
+            "midi": result.output_midi_path,
+            "pdf": dict(result.output_pdf_paths),
+        },
+        timings=timings,
+        difficulty=difficulty,
+        used_pitches=list(result.used_pitches),
+    )
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    *,
+    workers: int | None = None,
+    on_outcome: Callable[[BatchOutcome], None] | None = None,
+) -> list[BatchOutcome]:
+    """Run ``jobs`` and return their outcomes in job order.
+
+    ``workers`` of one (or a single job) runs inline; otherwise each job runs
+    in its own worker process, defaulting to one per CPU.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(jobs) or 1))
+    outcomes: list[BatchOutcome] = []
+    if workers == 1:
+        for job in jobs:
+            outcome = convert_job(job)
+            if on_outcome is not None:
+                on_outcome(outcome)
+            outcomes.append(outcome)
+        return outcomes
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_job, job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                outcome = future.result()
+            except Exception as exc:  # worker died or the job could not be pickled
+                outcome = BatchOutcome(
+                    input_path=job.input_path, error=str(exc) or exc.__class__.__name__
+                )
+            if on_outcome is not None:
+                on_outcome(outcome)
+            outcomes.append(outcome)
+    return outcomes
+
+
+def build_summary(
+    outcomes: Sequence[BatchOutcome], *, elapsed: float, workers: int
+) -> Dict[str, Any]:
+    """Return the JSON summary written at the end of a batch run."""
+
+    return {
+        "workers": workers,
+        "elapsed_seconds": elapsed,
+        "succeeded": sum(1 for outcome in outcomes if outcome.ok),
+        "failed": sum(1 for outcome in outcomes if not outcome.ok),
+        "files": [asdict(outcome) for outcome in outcomes],
+    }
+
+
+__all__ = [
+    "ARRANGER_MODES",
+    "BatchConfig",
+    "BatchJob",
+    "BatchOutcome",
+    "SCORE_SUFFIXES",
+    "build_summary",
+    "collect_inputs",
+    "convert_job",
+    "default_score_service",
+    "load_batch_config",
+    "plan_jobs",
+    "run_batch",
+]
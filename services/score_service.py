@@ -10,6 +10,7 @@ from ocarina_gui.preview import PreviewData
 from ocarina_gui.settings import TransformSettings
 from ocarina_gui.pdf_export.types import PdfExportOptions
 from ocarina_tools.parts import MusicXmlPartInfo, list_parts
+from ocarina_tools.midi_import import midi_parts
 from ocarina_tools.midi_import.models import MidiImportReport
 from ocarina_tools.io import ScoreLoadResult
 
@@ -55,9 +56,11 @@ class ScoreService:
             self.last_midi_report = None
             return ()
         self.last_midi_report = getattr(result, "midi_report", None)
-        root = result.root
+        midi = getattr(result, "midi", None)
         try:
-            return tuple(list_parts(root))
+            if midi is not None:
+                return tuple(midi_parts(midi))
+            return tuple(list_parts(result.root))
         except Exception:
             return ()
 
@@ -71,6 +74,7 @@ class ScoreService:
         midi_mode: str = "auto",
         arranged_events=None,
         arranged_pulses_per_quarter: int | None = None,
+        export_folder: str | None = None,
     ) -> ConversionResult:
         result = self.convert_score(
             path,
@@ -84,6 +88,7 @@ class ScoreService:
             midi_mode=midi_mode,
             arranged_events=arranged_events,
             arranged_pulses_per_quarter=arranged_pulses_per_quarter,
+            export_folder=export_folder,
         )
         self.last_midi_report = getattr(result, "midi_report", None)
         return result
@@ -0,0 +1,44 @@
+"""Cooperative cancellation shared by long-running background operations."""
+
+from __future__ import annotations
+
+import threading
+
+
+class OperationCancelled(BaseException):
+    """Raised when a :class:`CancellationToken` is checked after cancellation.
+
+    Derives from :class:`BaseException` so the defensive ``except Exception``
+    guards along the arrangement pipeline let it unwind to the caller that
+    owns the token, mirroring :class:`asyncio.CancelledError`.
+    """
+
+
+class CancellationToken:
+    """Thread-safe flag that a worker polls at convenient checkpoints."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+def raise_if_cancelled(token: CancellationToken | None) -> None:
+    """Check *token* when one was supplied; ``None`` never cancels."""
+
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+__all__ = ["CancellationToken", "OperationCancelled", "raise_if_cancelled"]
@@ -15,18 +15,28 @@ Two environment variables allow customising where the log file is written:
     Directory where the default log file name will be created.  Ignored when
     ``OCARINA_LOG_FILE`` is present.
 
+Records are handed to a :class:`~logging.handlers.QueueHandler` on the root
+logger and written by a :class:`~logging.handlers.QueueListener` thread, so
+redaction and file I/O never run on the GUI, render or arranger threads. The
+root logger level follows the selected :class:`LogVerbosity`, which keeps
+``isEnabledFor(logging.DEBUG)`` guards false (and their payloads unbuilt)
+unless verbose logging was requested.
+
 The helpers are intentionally light-weight so they can be exercised in tests
 without interfering with unrelated logging configuration.
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import queue
 import re
 import sys
+import threading
 from enum import Enum
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Iterable
 
@@ -38,6 +48,11 @@ _CONFIGURED = False
 _LOG_PATH: Path | None = None
 _HANDLER_TAG = "_ocarina_logging_handler"
 _FILE_HANDLER: RotatingFileHandler | None = None
+_STREAM_HANDLER: logging.Handler | None = None
+_LISTENER: QueueListener | None = None
+_LISTENER_RUNNING = False
+_LISTENER_LOCK = threading.Lock()
+_PREVIOUS_ROOT_LEVEL: int | None = None
 _MAX_LOG_BYTES = 5 * 1024 * 1024
 _LOG_BACKUP_COUNT = 2
 
@@ -104,21 +119,24 @@ def _collect_path_candidates() -> set[str]:
     return {candidate for candidate in normalised if candidate}
 
 
-def _compile_username_pattern(username: str) -> re.Pattern[str]:
+def _username_pattern_text(username: str) -> str:
     escaped = re.escape(username)
     if any(character.isalnum() for character in username):
-        return re.compile(rf"(?<!\\w){escaped}(?!\\w)", re.IGNORECASE)
-    return re.compile(escaped, re.IGNORECASE)
+        return rf"(?<!\\w){escaped}(?!\\w)"
+    return escaped
 
 
-def _compile_path_pattern(path: str) -> re.Pattern[str]:
-    flags = re.IGNORECASE if os.name == "nt" else 0
-    return re.compile(re.escape(path), flags)
+def _build_redaction_pattern() -> tuple[re.Pattern[str] | None, tuple[str, ...]]:
+    """Return one alternation matching every home path and user name.
 
+    Home paths come first (longest first) so a path is replaced as a whole
+    before its user name component could match on its own. The second item
+    lists the lower-cased literals; a message containing none of them cannot
+    match, which spares the (much slower) regex scan for almost every record.
+    """
 
-def _build_redaction_patterns() -> list[tuple[re.Pattern[str], str]]:
-    patterns: list[tuple[re.Pattern[str], str]] = []
-    seen: set[tuple[str, str]] = set()
+    path_flags = "(?i:" if os.name == "nt" else "(?:"
+    paths: dict[str, str] = {}
 
     for path in _collect_path_candidates():
         variants = {path}
@@ -132,32 +150,42 @@ def _build_redaction_patterns() -> list[tuple[re.Pattern[str], str]]:
             normalised_variant = os.path.normpath(variant)
             if normalised_variant in {os.sep, ""}:
                 continue
-            key = (
-                normalised_variant.lower() if os.name == "nt" else normalised_variant,
-                USER_HOME_PLACEHOLDER,
-            )
-            if key in seen:
-                continue
-            patterns.append((_compile_path_pattern(normalised_variant), USER_HOME_PLACEHOLDER))
-            seen.add(key)
+            key = normalised_variant.lower() if os.name == "nt" else normalised_variant
+            paths.setdefault(key, normalised_variant)
 
+    path_alternatives = [
+        path_flags + re.escape(path) + ")"
+        for path in sorted(paths.values(), key=len, reverse=True)
+    ]
     usernames = sorted(_collect_username_candidates(), key=len, reverse=True)
-    for username in usernames:
-        patterns.append((_compile_username_pattern(username), USER_PLACEHOLDER))
+    user_alternatives = [f"(?i:{_username_pattern_text(username)})" for username in usernames]
+
+    groups = []
+    if path_alternatives:
+        groups.append("(?P<home>" + "|".join(path_alternatives) + ")")
+    if user_alternatives:
+        groups.append("(?P<user>" + "|".join(user_alternatives) + ")")
+    if not groups:
+        return None, ()
+    literals = {literal.lower() for literal in (*paths.values(), *usernames)}
+    return re.compile("|".join(groups)), tuple(sorted(literals, key=len))
 
-    return patterns
 
+_REDACTION_PATTERN, _REDACTION_LITERALS = _build_redaction_pattern()
+_REPLACEMENTS = {"home": USER_HOME_PLACEHOLDER, "user": USER_PLACEHOLDER}
 
-_REDACTION_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = tuple(_build_redaction_patterns())
+
+def _replacement(match: re.Match[str]) -> str:
+    return _REPLACEMENTS[match.lastgroup or "user"]
 
 
 def _sanitize_text(message: str) -> str:
-    if not message or not _REDACTION_PATTERNS:
+    if not message or _REDACTION_PATTERN is None:
+        return message
+    lowered = message.lower()
+    if not any(literal in lowered for literal in _REDACTION_LITERALS):
         return message
-    redacted = message
-    for pattern, replacement in _REDACTION_PATTERNS:
-        redacted = pattern.sub(replacement, redacted)
-    return redacted
+    return _REDACTION_PATTERN.sub(_replacement, message)
 
 
 class _RedactingFormatter(logging.Formatter):
@@ -166,12 +194,55 @@ class _RedactingFormatter(logging.Formatter):
         return _sanitize_text(formatted)
 
 
+class _AppQueueHandler(QueueHandler):
+    """Queue handler whose :meth:`flush` waits for queued records to be written."""
+
+    def flush(self) -> None:
+        _drain_listener()
+
+
+def _drain_listener() -> None:
+    with _LISTENER_LOCK:
+        listener = _LISTENER
+        if listener is None or not _LISTENER_RUNNING:
+            return
+        # ``stop`` writes everything queued so far before returning.
+        listener.stop()
+        listener.start()
+    for handler in listener.handlers:
+        handler.flush()
+
+
+def _stop_listener() -> None:
+    global _LISTENER_RUNNING
+
+    with _LISTENER_LOCK:
+        if _LISTENER is not None and _LISTENER_RUNNING:
+            _LISTENER.stop()
+        _LISTENER_RUNNING = False
+
+
+atexit.register(_stop_listener)
+
+
+def _sync_root_level() -> None:
+    """Let the root logger drop records that no application handler would write."""
+
+    levels = [_VERBOSITY_LEVELS[_CURRENT_VERBOSITY]]
+    if _STREAM_HANDLER is not None:
+        levels.append(_STREAM_HANDLER.level)
+    logging.getLogger().setLevel(min(levels))
+
+
 def ensure_app_logging() -> Path:
     """Configure the root logger for the desktop application.
 
-    The first invocation sets up a rotating file handler (at DEBUG level) and a
-    console handler (INFO level, only when stderr is interactive).  Subsequent
-    calls are no-ops and return the already configured log file path.
+    The first invocation installs a queue handler on the root logger and
+    starts a listener thread that feeds a rotating file handler (at the
+    current :class:`LogVerbosity`) and a console handler (INFO level, only
+    when stderr is interactive). The root logger level follows the most
+    verbose of those handlers. Subsequent calls are no-ops and return the
+    already configured log file path.
 
     Returns
     -------
@@ -179,7 +250,8 @@ def ensure_app_logging() -> Path:
         Location of the log file that records application diagnostics.
     """
 
-    global _CONFIGURED, _LOG_PATH
+    global _CONFIGURED, _LOG_PATH, _FILE_HANDLER, _STREAM_HANDLER, _LISTENER
+    global _LISTENER_RUNNING, _PREVIOUS_ROOT_LEVEL
 
     if _CONFIGURED and _LOG_PATH is not None:
         return _LOG_PATH
@@ -188,7 +260,6 @@ def ensure_app_logging() -> Path:
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
     root = logging.getLogger()
-    root.setLevel(logging.DEBUG)
 
     formatter = _RedactingFormatter(
         "%(asctime)s %(levelname)s [%(name)s] %(message)s",
@@ -203,17 +274,29 @@ def ensure_app_logging() -> Path:
     )
     file_handler.setLevel(_VERBOSITY_LEVELS[_CURRENT_VERBOSITY])
     file_handler.setFormatter(formatter)
-    setattr(file_handler, _HANDLER_TAG, True)
-    root.addHandler(file_handler)
-    global _FILE_HANDLER
-    _FILE_HANDLER = file_handler
+    handlers: list[logging.Handler] = [file_handler]
 
+    stream_handler: logging.Handler | None = None
     if _should_log_to_stderr(root.handlers):
         stream_handler = logging.StreamHandler()
         stream_handler.setLevel(logging.INFO)
         stream_handler.setFormatter(formatter)
-        setattr(stream_handler, _HANDLER_TAG, True)
-        root.addHandler(stream_handler)
+        handlers.append(stream_handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_handler = _AppQueueHandler(log_queue)
+    setattr(queue_handler, _HANDLER_TAG, True)
+
+    with _LISTENER_LOCK:
+        _LISTENER = listener
+        listener.start()
+        _LISTENER_RUNNING = True
+    _FILE_HANDLER = file_handler
+    _STREAM_HANDLER = stream_handler
+    _PREVIOUS_ROOT_LEVEL = root.level
+    root.addHandler(queue_handler)
+    _sync_root_level()
 
     _CONFIGURED = True
     _LOG_PATH = log_path
@@ -244,6 +327,7 @@ def set_file_log_verbosity(verbosity: LogVerbosity | str) -> None:
 
     _CURRENT_VERBOSITY = verbosity
     handler.setLevel(_VERBOSITY_LEVELS[verbosity])
+    _sync_root_level()
     logging.getLogger(__name__).info("File log verbosity set to %s", verbosity.value)
 
 
@@ -289,19 +373,29 @@ def _should_log_to_stderr(handlers: Iterable[logging.Handler]) -> bool:
 def _reset_for_tests() -> None:
     """Remove handlers installed by :func:`ensure_app_logging`."""
 
-    global _CONFIGURED, _LOG_PATH, _FILE_HANDLER, _CURRENT_VERBOSITY
+    global _CONFIGURED, _LOG_PATH, _FILE_HANDLER, _STREAM_HANDLER, _LISTENER
+    global _CURRENT_VERBOSITY, _PREVIOUS_ROOT_LEVEL
 
     root = logging.getLogger()
     for handler in list(root.handlers):
         if getattr(handler, _HANDLER_TAG, False):
             root.removeHandler(handler)
+
+    _stop_listener()
+    listener = _LISTENER
+    if listener is not None:
+        for handler in listener.handlers:
             try:
                 handler.close()
             except Exception:  # pragma: no cover - close should rarely fail
                 pass
+    if _PREVIOUS_ROOT_LEVEL is not None:
+        root.setLevel(_PREVIOUS_ROOT_LEVEL)
 
     _CONFIGURED = False
     _LOG_PATH = None
     _FILE_HANDLER = None
+    _STREAM_HANDLER = None
+    _LISTENER = None
+    _PREVIOUS_ROOT_LEVEL = None
     _CURRENT_VERBOSITY = _DEFAULT_VERBOSITY
-
@@ -244,6 +244,7 @@ class TempoMap:
                 _TempoSegment(tick, tempo_bpm, last_ticks_per_second, elapsed_seconds)
             )
             self._ticks.append(tick)
+        self._starts = [segment.seconds_at_start for segment in self._segments]
 
     def tempo_at(self, tick: int) -> float:
         segment = self._segment_for_tick(tick)
@@ -268,33 +269,53 @@ class TempoMap:
         segments = self._segments
         if not segments:
             return 0
-        # Handle times before the first segment explicitly.
-        if target <= segments[0].seconds_at_start:
-            return segments[0].tick
-        for index, segment in enumerate(segments):
-            next_start = (
-                segments[index + 1].seconds_at_start
-                if index + 1 < len(segments)
-                else None
-            )
-            if next_start is not None and target >= next_start:
-                continue
-            offset_seconds = target - segment.seconds_at_start
-            if offset_seconds <= 0.0:
-                return segment.tick
-            tick_offset = int(round(offset_seconds * segment.ticks_per_second))
-            return segment.tick + max(0, tick_offset)
-        # Past the last segment; extrapolate using the final tempo.
-        last = segments[-1]
-        offset_seconds = target - last.seconds_at_start
-        tick_offset = int(round(offset_seconds * last.ticks_per_second))
-        return last.tick + max(0, tick_offset)
+        # Times before the first segment (and negative offsets) snap to its tick.
+        index = max(0, bisect_right(self._starts, target) - 1)
+        segment = segments[index]
+        offset_seconds = target - segment.seconds_at_start
+        if offset_seconds <= 0.0:
+            return segment.tick
+        tick_offset = int(round(offset_seconds * segment.ticks_per_second))
+        return segment.tick + max(0, tick_offset)
 
     def tick_to_sample(self, tick: int, sample_rate: int) -> int:
         rate = max(sample_rate or self.sample_rate, 1)
         seconds = self.seconds_at(tick)
         return int(round(seconds * rate))
 
+    def ticks_to_seconds(self, ticks: Iterable[int]) -> list[float]:
+        """Return :meth:`seconds_at` for every tick in *ticks*.
+
+        Ascending ticks are mapped in a single forward pass over the tempo
+        segments; a tick earlier than its predecessor falls back to a bisect.
+        """
+
+        segments = self._segments
+        boundaries = self._ticks
+        index = 0
+        segment = segments[0]
+        next_tick = boundaries[1] if len(boundaries) > 1 else None
+        seconds: list[float] = []
+        for tick in ticks:
+            clamped = max(0, tick)
+            if clamped < segment.tick:
+                index = max(0, bisect_right(boundaries, clamped) - 1)
+                segment = segments[index]
+                next_tick = boundaries[index + 1] if index + 1 < len(boundaries) else None
+            while next_tick is not None and clamped >= next_tick:
+                index += 1
+                segment = segments[index]
+                next_tick = boundaries[index + 1] if index + 1 < len(boundaries) else None
+            offset = max(0, tick - segment.tick)
+            seconds.append(segment.seconds_at_start + offset / segment.ticks_per_second)
+        return seconds
+
+    def ticks_to_samples(self, ticks: Iterable[int], sample_rate: int) -> list[int]:
+        """Return :meth:`tick_to_sample` for every tick in *ticks*."""
+
+        rate = max(sample_rate or self.sample_rate, 1)
+        return [int(round(seconds * rate)) for seconds in self.ticks_to_seconds(ticks)]
+
     def _segment_for_tick(self, tick: int) -> _TempoSegment:
         if not self._segments:
             raise RuntimeError("TempoMap has no segments configured")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib.util
+import os
 import sys
 from pathlib import Path
 
@@ -42,6 +43,17 @@ def _ensure_project_root_on_path() -> None:
 _ensure_project_root_on_path()
 
 
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip ``benchmark`` tests unless ``OCARINA_RUN_BENCHMARKS`` is set."""
+
+    if os.environ.get("OCARINA_RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set OCARINA_RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
 def _preferences_path_env(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory):
     """Isolate GUI preference writes so tests never touch real user data."""
@@ -59,6 +71,13 @@ def _preferences_path_env(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pyt
             pass
 
 
+@pytest.fixture(autouse=True)
+def _render_cache_env(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory):
+    """Keep rendered preview audio out of the user's cache directory."""
+
+    monkeypatch.setenv("OCARINA_RENDER_CACHE_DIR", str(tmp_path_factory.mktemp("render_cache")))
+
+
 @pytest.fixture(autouse=True)
 def _fingering_config_env(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory):
     """Route fingering config persistence to a temporary location during tests."""
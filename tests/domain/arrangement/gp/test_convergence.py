@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pytest
+
+from domain.arrangement.gp import (
+    ConvergenceMonitor,
+    EngineState,
+    GPSessionConfig,
+    Individual,
+    ProgramConstraints,
+    hypervolume,
+    run_gp_session,
+)
+from domain.arrangement.gp.fitness import FitnessVector
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange
+
+
+def _individual(tag: int, *values: float) -> Individual:
+    return Individual(program=(tag,), fitness=FitnessVector(*values))  # type: ignore[arg-type]
+
+
+def _state(generation: int, archive: tuple[Individual, ...]) -> EngineState:
+    return EngineState(generation=generation, population=archive, archive=archive, elapsed_seconds=0.0)
+
+
+def test_hypervolume_matches_hand_computed_fronts() -> None:
+    assert hypervolume([(1.0, 1.0)], (3.0, 3.0)) == pytest.approx(4.0)
+    # Two overlapping boxes: 2x1 + 1x2 - 1x1.
+    assert hypervolume([(1.0, 2.0), (2.0, 1.0)], (3.0, 3.0)) == pytest.approx(3.0)
+    assert hypervolume([(1.0, 1.0, 1.0), (0.0, 2.0, 2.0)], (2.0, 3.0, 3.0)) == pytest.approx(
+        4.0 + 2.0 - 1.0
+    )
+    assert hypervolume([(4.0, 0.0)], (3.0, 3.0)) == 0.0
+
+
+def test_monitor_reports_each_stagnation_reason() -> None:
+    first = (_individual(1, 1.0, 1.0, 1.0, 1.0),)
+    better = (_individual(2, 0.5, 1.0, 1.0, 1.0),)
+
+    archive_monitor = ConvergenceMonitor(2, archive=True)
+    assert [archive_monitor(_state(g, archive)) for g, archive in enumerate((first, better, better, better))] == [
+        None,
+        None,
+        None,
+        "archive_unchanged",
+    ]
+
+    volume_monitor = ConvergenceMonitor(1, hypervolume_epsilon=0.01)
+    assert volume_monitor(_state(0, first)) is None
+    assert volume_monitor(_state(1, better)) is None
+    assert volume_monitor(_state(2, better)) == "hypervolume_converged"
+
+    # Same winner, but the archive keeps gaining members.
+    winner_monitor = ConvergenceMonitor(1, archive=True, winner=True)
+    assert winner_monitor(_state(0, better)) is None
+    assert winner_monitor(_state(1, better + first)) == "winner_unchanged"
+
+
+def test_session_config_validates_convergence_options() -> None:
+    with pytest.raises(ValueError):
+        GPSessionConfig(stop_on_unchanged_archive=True)
+    with pytest.raises(ValueError):
+        GPSessionConfig(stagnation_generations=0, stop_on_unchanged_winner=True)
+    with pytest.raises(ValueError):
+        GPSessionConfig(stagnation_generations=2, hypervolume_epsilon=-0.1)
+
+
+def test_gp_session_stops_once_archive_converges() -> None:
+    notes = tuple(
+        PhraseNote(onset=index * 240, duration=240, midi=midi, tags=frozenset())
+        for index, midi in enumerate((64, 67, 69, 72))
+    )
+    phrase = PhraseSpan(notes, pulses_per_quarter=480)
+    config = GPSessionConfig(
+        generations=40,
+        population_size=6,
+        archive_size=4,
+        random_seed=5,
+        random_program_count=3,
+        constraints=ProgramConstraints(max_operations=2),
+        stagnation_generations=3,
+        stop_on_unchanged_archive=True,
+    )
+
+    result = run_gp_session(phrase, InstrumentRange(60, 84), config=config)
+
+    assert result.termination_reason == "archive_unchanged"
+    assert 4 <= result.generations < config.generations
+    assert result.log.to_dict()["config"]["stagnation_generations"] == 3
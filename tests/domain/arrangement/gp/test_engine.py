@@ -1,8 +1,15 @@
 import pytest
 
-from domain.arrangement.gp.engine import LocalSearchBudgets, evaluate_spans
+from domain.arrangement.gp.engine import (
+    EngineConfig,
+    EngineHooks,
+    LocalSearchBudgets,
+    evaluate_spans,
+    run_engine,
+)
 from domain.arrangement.phrase import PhraseNote, PhraseSpan
 from domain.arrangement.soft_key import InstrumentRange
+from shared.cancellation import CancellationToken, OperationCancelled
 
 
 def _span_for(midis: list[int]) -> PhraseSpan:
@@ -67,3 +74,26 @@ def test_memetic_local_search_respects_budgets() -> None:
         budgets=LocalSearchBudgets(max_total_edits=0, max_edits_per_span=1),
     )
     assert total_limited == baseline
+
+
+def test_run_engine_stops_between_generations_once_cancelled() -> None:
+    token = CancellationToken()
+    logged: list[int] = []
+
+    def _log(state, _population, _archive):
+        logged.append(state.generation)
+        if state.generation == 1:
+            token.cancel()
+        return None
+
+    hooks = EngineHooks(
+        initialize=lambda: (("seed",), ()),
+        variation=lambda population, _state: population,
+        selection=lambda population, _offspring, archive, _state: (population, archive),
+        log_generation=_log,
+    )
+
+    with pytest.raises(OperationCancelled):
+        run_engine(EngineConfig(generations=10), hooks, cancellation=token)
+
+    assert logged == [0, 1]
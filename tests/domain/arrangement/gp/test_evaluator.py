@@ -0,0 +1,174 @@
+"""Tests for the pluggable GP batch evaluators."""
+
+from __future__ import annotations
+
+import pytest
+
+from domain.arrangement.gp import GPSessionConfig, ProgramConstraints, run_gp_session
+from domain.arrangement.gp.evaluation import evaluate_program
+from domain.arrangement.gp.evaluator import (
+    EvaluationContext,
+    ProcessPoolEvaluator,
+    ProgramEvaluator,
+    ThreadPoolEvaluator,
+    create_evaluator,
+)
+from domain.arrangement.gp.fitness import FitnessConfig, FitnessObjective
+from domain.arrangement.gp.ops import (
+    GlobalTranspose,
+    LocalOctave,
+    SimplifyRhythm,
+    SpanDescriptor,
+)
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.phrase_columns import ColumnarPhraseSpan
+from domain.arrangement.soft_key import InstrumentRange, InstrumentWindwayRange
+
+
+def _make_phrase() -> PhraseSpan:
+    notes = tuple(
+        PhraseNote(onset=index * 240, duration=240, midi=midi)
+        for index, midi in enumerate([64, 67, 69, 72, 74, 71, 67, 60])
+    )
+    return PhraseSpan(notes, pulses_per_quarter=480)
+
+
+def _session_config(evaluator: str) -> GPSessionConfig:
+    return GPSessionConfig(
+        generations=3,
+        population_size=6,
+        archive_size=4,
+        random_seed=23,
+        random_program_count=4,
+        crossover_rate=0.7,
+        mutation_rate=0.6,
+        log_best_programs=2,
+        constraints=ProgramConstraints(max_operations=4),
+        evaluator=evaluator,
+        evaluator_workers=2,
+    )
+
+
+def _programs() -> list[tuple]:
+    return [
+        (),
+        (GlobalTranspose(semitones=2),),
+        (LocalOctave(span=SpanDescriptor(start_onset=0, end_onset=480), octaves=1),),
+        (GlobalTranspose(semitones=-3), GlobalTranspose(semitones=12)),
+    ]
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_pooled_evaluators_match_serial_batch(kind: str) -> None:
+    context = EvaluationContext(
+        phrase=_make_phrase(),
+        instrument=InstrumentWindwayRange(
+            60, 84, windway_ids=("primary",), windway_map={60: (0,)}
+        ),
+        fitness_config=FitnessConfig(),
+    )
+    metadata = [{"index": index} for index in range(len(_programs()))]
+
+    expected = [
+        evaluate_program(
+            program,
+            phrase=context.phrase,
+            instrument=context.instrument,
+            fitness_config=context.fitness_config,
+            metadata=entry,
+        )
+        for program, entry in zip(_programs(), metadata)
+    ]
+    with create_evaluator(kind, context, max_workers=2) as evaluator:
+        results = evaluator.evaluate_batch(_programs(), metadata)
+
+    assert results == expected
+    assert [dict(result.metadata) for result in results] == metadata
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_context_scores_columnar_phrase_like_object_phrase(incremental: bool) -> None:
+    phrase = _make_phrase()
+    context = EvaluationContext(
+        phrase=phrase,
+        instrument=InstrumentRange(60, 84),
+        fitness_config=FitnessConfig(),
+        incremental=incremental,
+    )
+    programs = _programs() + [
+        (
+            SimplifyRhythm(span=SpanDescriptor(start_onset=480, end_onset=1440), subdivisions=1),
+            LocalOctave(span=SpanDescriptor(start_onset=960, end_onset=1920), octaves=-1),
+        )
+    ]
+
+    scorer = context.build_scorer()
+
+    assert isinstance(context.phrase, ColumnarPhraseSpan)
+    assert [scorer(program, None) for program in programs] == [
+        evaluate_program(
+            program, phrase=phrase, instrument=context.instrument, fitness_config=FitnessConfig()
+        )
+        for program in programs
+    ]
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_session_results_match_serial_path(kind: str) -> None:
+    phrase = _make_phrase()
+    instrument = InstrumentRange(60, 84)
+
+    serial = run_gp_session(phrase, instrument, config=_session_config("serial"))
+    pooled = run_gp_session(phrase, instrument, config=_session_config(kind))
+
+    assert pooled.winner == serial.winner
+    assert pooled.archive == serial.archive
+    assert pooled.population == serial.population
+
+
+def test_create_evaluator_selects_implementation() -> None:
+    context = EvaluationContext(
+        phrase=_make_phrase(),
+        instrument=InstrumentRange(60, 84),
+        fitness_config=None,
+    )
+
+    assert type(create_evaluator("serial", context)) is ProgramEvaluator
+    assert isinstance(create_evaluator("thread", context), ThreadPoolEvaluator)
+    assert isinstance(create_evaluator("process", context), ProcessPoolEvaluator)
+    with pytest.raises(ValueError):
+        create_evaluator("gpu", context)
+
+
+def test_process_evaluator_falls_back_when_context_is_not_picklable() -> None:
+    context = EvaluationContext(
+        phrase=_make_phrase(),
+        instrument=InstrumentRange(60, 84),
+        fitness_config=FitnessConfig(
+            playability=FitnessObjective(normalizer=lambda value: value * 2.0)
+        ),
+    )
+
+    evaluator = create_evaluator("process", context)
+
+    assert type(evaluator) is ProgramEvaluator
+
+
+def test_evaluate_batch_rejects_misaligned_metadata() -> None:
+    evaluator = ProgramEvaluator(
+        EvaluationContext(
+            phrase=_make_phrase(),
+            instrument=InstrumentRange(60, 84),
+            fitness_config=None,
+        )
+    )
+
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch(_programs(), [{}])
+
+
+def test_session_config_validates_evaluator_options() -> None:
+    with pytest.raises(ValueError):
+        GPSessionConfig(evaluator="cluster")
+    with pytest.raises(ValueError):
+        GPSessionConfig(evaluator="process", evaluator_workers=0)
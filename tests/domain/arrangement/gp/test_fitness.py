@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import random
+import time
+
 import pytest
 
 from domain.arrangement.difficulty import summarize_difficulty
@@ -9,6 +12,7 @@ from domain.arrangement.gp.fitness import (
     FidelityConfig,
     FitnessConfig,
     FitnessObjective,
+    _lcs_length,
     compute_fitness,
     melody_pitch_penalty,
 )
@@ -190,3 +194,48 @@ def test_melody_pitch_penalty_penalises_octave_shifts() -> None:
     penalty = melody_pitch_penalty(original, shifted, beats_per_measure=4)
 
     assert penalty > 0.0
+
+
+def _table_lcs_length(first: list[int], second: list[int]) -> int:
+    dp = [[0] * (len(second) + 1) for _ in range(len(first) + 1)]
+    for i, left in enumerate(first):
+        for j, right in enumerate(second):
+            if left == right:
+                dp[i + 1][j + 1] = dp[i][j] + 1
+            else:
+                dp[i + 1][j + 1] = max(dp[i][j + 1], dp[i + 1][j])
+    return dp[-1][-1]
+
+
+def test_bit_parallel_lcs_matches_dynamic_programming_table() -> None:
+    rng = random.Random(42)
+    for _ in range(300):
+        first = [rng.randint(60, 67) for _ in range(rng.randint(0, 70))]
+        second = [rng.randint(60, 67) for _ in range(rng.randint(0, 70))]
+
+        expected = _table_lcs_length(first, second)
+
+        assert _lcs_length(first, second) == expected
+        assert _lcs_length(second, first) == expected
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", [100, 1000])
+def test_benchmark_bit_parallel_lcs_against_dynamic_programming_table(size: int) -> None:
+    rng = random.Random(size)
+    original = [rng.randint(55, 86) for _ in range(size)]
+    candidate = [midi + rng.choice((0, 0, 0, 0, 12, -12)) for midi in original]
+
+    timings = {}
+    results = {}
+    for label, function in (("bit-parallel", _lcs_length), ("dp-table", _table_lcs_length)):
+        start = time.perf_counter()
+        results[label] = function(original, candidate)
+        timings[label] = time.perf_counter() - start
+
+    print(
+        f"\nLCS of {size} notes: bit-parallel {timings['bit-parallel']:.6f} s, "
+        f"dp-table {timings['dp-table']:.6f} s"
+    )
+    assert results["bit-parallel"] == results["dp-table"]
+    assert timings["bit-parallel"] < timings["dp-table"]
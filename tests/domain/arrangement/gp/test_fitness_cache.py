@@ -0,0 +1,192 @@
+"""Tests for the per-session GP fitness cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from dataclasses import replace
+
+from domain.arrangement.gp import (
+    GPSessionConfig,
+    ProgramConstraints,
+    arrange_v3_gp,
+    run_gp_session,
+)
+from domain.arrangement.gp import strategy_evaluation
+from domain.arrangement.gp.evaluator import EvaluationContext, ProgramEvaluator
+from domain.arrangement.gp.fitness_cache import (
+    FitnessCache,
+    canonical_program_key,
+    span_cache_key,
+)
+from domain.arrangement.gp.ops import GlobalTranspose, LocalOctave, SpanDescriptor
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange
+
+from tests.domain.arrangement.gp._strategy_test_utils import (
+    _gp_config,
+    _register_instruments,
+    clear_registry,
+)
+
+
+def _make_phrase() -> PhraseSpan:
+    notes = tuple(
+        PhraseNote(onset=index * 240, duration=240, midi=midi)
+        for index, midi in enumerate([64, 67, 69, 72, 74, 71])
+    )
+    return PhraseSpan(notes, pulses_per_quarter=480)
+
+
+def test_cache_evicts_least_recently_used_entries() -> None:
+    cache = FitnessCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2}
+
+
+def test_canonical_key_matches_independently_built_programs() -> None:
+    first = (LocalOctave(span=SpanDescriptor(start_onset=0, end_onset=480), octaves=1),)
+    second = (LocalOctave(span=SpanDescriptor(start_onset=0, end_onset=480), octaves=1),)
+    other = (LocalOctave(span=SpanDescriptor(start_onset=0, end_onset=480), octaves=-1),)
+
+    assert canonical_program_key(first) == canonical_program_key(second)
+    assert canonical_program_key(first) != canonical_program_key(other)
+
+
+def test_evaluator_serves_repeated_programs_from_cache() -> None:
+    cache = FitnessCache()
+    evaluator = ProgramEvaluator(
+        EvaluationContext(
+            phrase=_make_phrase(),
+            instrument=InstrumentRange(60, 84),
+            fitness_config=None,
+        ),
+        cache=cache,
+    )
+    programs = [(GlobalTranspose(semitones=2),), (GlobalTranspose(semitones=2),), ()]
+
+    first = evaluator.evaluate_batch(programs, [{"index": 0}, {"index": 1}, {"index": 2}])
+    second = evaluator.evaluate_batch(programs[:1], [{"index": 3}])
+
+    assert first[0].fitness == first[1].fitness == second[0].fitness
+    assert [dict(individual.metadata) for individual in first] == [
+        {"index": 0},
+        {"index": 1},
+        {"index": 2},
+    ]
+    assert dict(second[0].metadata) == {"index": 3}
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_session_reports_cache_counters_without_changing_results() -> None:
+    phrase = _make_phrase()
+    instrument = InstrumentRange(60, 84)
+    base = dict(
+        generations=4,
+        population_size=6,
+        archive_size=4,
+        random_seed=5,
+        random_program_count=4,
+        crossover_rate=0.7,
+        mutation_rate=0.6,
+        constraints=ProgramConstraints(max_operations=3),
+    )
+
+    cached = run_gp_session(phrase, instrument, config=GPSessionConfig(**base))
+    uncached = run_gp_session(
+        phrase, instrument, config=GPSessionConfig(fitness_cache_size=0, **base)
+    )
+
+    assert cached.winner == uncached.winner
+    assert cached.archive == uncached.archive
+    last = cached.log.generations[-1].fitness_cache
+    assert last is not None and last["hits"] > 0
+    assert cached.log.to_dict()["generations"][-1]["fitness_cache"] == last
+    assert uncached.log.generations[-1].fitness_cache["size"] == 0
+
+
+def test_session_config_rejects_negative_cache_size() -> None:
+    with pytest.raises(ValueError):
+        GPSessionConfig(fitness_cache_size=-1)
+
+
+def test_span_key_tracks_note_content() -> None:
+    phrase = _make_phrase()
+
+    assert span_cache_key(phrase) == span_cache_key(PhraseSpan(phrase.notes, 480))
+    assert span_cache_key(phrase) != span_cache_key(phrase.transpose(12))
+    assert span_cache_key(phrase) != span_cache_key(PhraseSpan(phrase.notes, 240))
+
+
+def test_candidate_cache_skips_aligned_evaluations() -> None:
+    phrase = _make_phrase()
+    instrument = InstrumentRange(60, 84)
+    program = (GlobalTranspose(semitones=2),)
+    cache = FitnessCache()
+    common = dict(
+        instrument_id="current",
+        instrument=instrument,
+        phrase=phrase,
+        beats_per_measure=4,
+        fitness_config=None,
+        fitness_cache=cache,
+    )
+
+    plain, _ = strategy_evaluation._evaluate_program_candidate(program, **common)
+    again, _ = strategy_evaluation._evaluate_program_candidate(program, **common)
+    uncached, _ = strategy_evaluation._evaluate_program_candidate(
+        program, **{**common, "fitness_cache": None}
+    )
+    strategy_evaluation._evaluate_program_candidate(
+        program,
+        **common,
+        baseline_top_voice=phrase.notes,
+        expected_offset=0,
+    )
+
+    assert again == plain == uncached
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_strategy_passes_reuse_cached_candidates(monkeypatch) -> None:
+    clear_registry()
+    _register_instruments(
+        (
+            ("current", InstrumentRange(min_midi=60, max_midi=84, comfort_center=72)),
+            ("star_a", InstrumentRange(min_midi=55, max_midi=79, comfort_center=67)),
+        )
+    )
+    scored: list[tuple[object, ...]] = []
+    original = strategy_evaluation._score_program_candidate
+
+    def _count(program, **kwargs):
+        scored.append((kwargs["instrument_id"], canonical_program_key(program)))
+        return original(program, **kwargs)
+
+    monkeypatch.setattr(strategy_evaluation, "_score_program_candidate", _count)
+    config = _gp_config()
+
+    cached = arrange_v3_gp(
+        _make_phrase(), instrument_id="current", starred_ids=("star_a",), config=config
+    )
+    cached_scores = list(scored)
+    scored.clear()
+    uncached = arrange_v3_gp(
+        _make_phrase(),
+        instrument_id="current",
+        starred_ids=("star_a",),
+        config=replace(config, fitness_cache_size=0),
+    )
+
+    assert cached.chosen == uncached.chosen
+    assert cached.comparisons == uncached.comparisons
+    assert len(cached_scores) < len(scored)
+    assert len(set(cached_scores)) == len(cached_scores)
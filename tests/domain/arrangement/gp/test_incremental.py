@@ -0,0 +1,141 @@
+"""Tests for incremental window-based GP program evaluation."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from domain.arrangement.gp import GPSessionConfig, ProgramConstraints, run_gp_session
+from domain.arrangement.gp.evaluation import evaluate_program
+from domain.arrangement.gp.fitness import FitnessConfig
+from domain.arrangement.gp.incremental import IncrementalEvaluator
+from domain.arrangement.gp.ops import (
+    GlobalTranspose,
+    LocalOctave,
+    SimplifyRhythm,
+    SpanDescriptor,
+)
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange, InstrumentWindwayRange
+
+
+def _make_phrase(seed: int, *, count: int = 48) -> PhraseSpan:
+    rng = random.Random(seed)
+    notes: list[PhraseNote] = []
+    onset = 0
+    for _ in range(count):
+        duration = rng.choice([120, 240, 360, 480])
+        notes.append(
+            PhraseNote(
+                onset=onset,
+                duration=duration,
+                midi=rng.randint(55, 86),
+                tags=frozenset({"grace"}) if rng.random() < 0.1 else frozenset(),
+            )
+        )
+        if rng.random() < 0.2:
+            # Stack a chord tone on the same onset.
+            notes.append(PhraseNote(onset=onset, duration=duration, midi=rng.randint(55, 86)))
+        onset += duration
+    return PhraseSpan(tuple(notes), pulses_per_quarter=480)
+
+
+def _random_program(rng: random.Random, phrase: PhraseSpan) -> tuple:
+    total = phrase.total_duration
+    program = []
+    for _ in range(rng.randint(0, 5)):
+        start = rng.randrange(0, total)
+        end = rng.randrange(start + 1, total + 240)
+        span = SpanDescriptor(start_onset=start, end_onset=end, label="window")
+        choice = rng.random()
+        if choice < 0.5:
+            program.append(LocalOctave(span=span, octaves=rng.choice([-1, 1])))
+        elif choice < 0.8:
+            program.append(SimplifyRhythm(span=span, subdivisions=rng.choice([1, 2, 4])))
+        else:
+            program.append(GlobalTranspose(semitones=rng.randint(-5, 5)))
+    return tuple(program)
+
+
+@pytest.mark.parametrize(
+    "instrument",
+    [
+        InstrumentRange(60, 84, comfort_center=71.5),
+        InstrumentWindwayRange(
+            60,
+            84,
+            windway_ids=("low", "high"),
+            windway_map={midi: ((0,) if midi < 72 else (1,)) for midi in range(55, 100)},
+        ),
+    ],
+)
+def test_incremental_scores_match_full_evaluation(instrument: InstrumentRange) -> None:
+    rng = random.Random(11)
+    for seed in range(4):
+        phrase = _make_phrase(seed)
+        scorer = IncrementalEvaluator(
+            phrase, instrument, fitness_config=FitnessConfig(), window_pulses=960
+        )
+        parent = _random_program(rng, phrase)
+        for _ in range(25):
+            # Mix fresh programs with children that extend a shared parent so
+            # both cold states and prefix-cache hits are exercised.
+            program = (
+                parent + _random_program(rng, phrase)
+                if rng.random() < 0.5
+                else _random_program(rng, phrase)
+            )
+            expected = evaluate_program(
+                program,
+                phrase=phrase,
+                instrument=instrument,
+                fitness_config=FitnessConfig(),
+                metadata={"seed": seed},
+            )
+            result = scorer.evaluate(program, {"seed": seed})
+
+            assert result.program == expected.program
+            assert result.metadata == expected.metadata
+            assert result.fitness.as_tuple() == pytest.approx(
+                expected.fitness.as_tuple(), abs=1e-9
+            )
+
+
+def test_incremental_handles_empty_phrase() -> None:
+    phrase = PhraseSpan((), pulses_per_quarter=480)
+    instrument = InstrumentRange(60, 84)
+    program = (GlobalTranspose(semitones=2),)
+
+    expected = evaluate_program(
+        program, phrase=phrase, instrument=instrument, fitness_config=FitnessConfig()
+    )
+    result = IncrementalEvaluator(phrase, instrument, fitness_config=FitnessConfig()).evaluate(
+        program
+    )
+
+    assert result == expected
+
+
+def test_session_results_match_with_incremental_evaluation_disabled() -> None:
+    phrase = _make_phrase(3, count=24)
+    instrument = InstrumentRange(60, 84)
+
+    def _config(incremental: bool) -> GPSessionConfig:
+        return GPSessionConfig(
+            generations=3,
+            population_size=6,
+            archive_size=4,
+            random_seed=5,
+            random_program_count=4,
+            constraints=ProgramConstraints(max_operations=4),
+            incremental_evaluation=incremental,
+        )
+
+    full = run_gp_session(phrase, instrument, config=_config(False))
+    incremental = run_gp_session(phrase, instrument, config=_config(True))
+
+    assert incremental.winner.program == full.winner.program
+    assert incremental.winner.fitness.as_tuple() == pytest.approx(
+        full.winner.fitness.as_tuple(), abs=1e-9
+    )
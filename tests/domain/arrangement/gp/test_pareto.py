@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from domain.arrangement.gp.fitness import FitnessVector
+from domain.arrangement.gp.ops import GlobalTranspose
+from domain.arrangement.gp.pareto import ParetoArchive, pareto_fronts, truncate_by_fronts
+from domain.arrangement.gp.selection import (
+    Individual,
+    crowding_distance,
+    dominates,
+    nondominated_sort,
+    select_population,
+    update_archive,
+)
+
+
+def _individual(program_id: int, fitness: tuple[float, ...]) -> Individual:
+    return Individual(program=(GlobalTranspose(semitones=program_id),), fitness=FitnessVector(*fitness))
+
+
+def _population(seed: int, size: int, *, levels: int = 4) -> list[Individual]:
+    rng = random.Random(seed)
+    return [
+        _individual(index, tuple(rng.randrange(levels) / levels for _ in range(4)))
+        for index in range(size)
+    ]
+
+
+def _reference_fronts(population: list[Individual]) -> list[list[Individual]]:
+    """Pairwise NSGA-II sort as the selection module originally implemented it."""
+
+    dominated: dict[Individual, list[Individual]] = {}
+    counts: dict[Individual, int] = {}
+    for p in population:
+        dominated[p] = [q for q in population if q is not p and dominates(p.fitness, q.fitness)]
+        counts[p] = sum(1 for q in population if q is not p and dominates(q.fitness, p.fitness))
+    fronts = []
+    current = [p for p in population if counts[p] == 0]
+    while current:
+        fronts.append(current)
+        following = []
+        for p in current:
+            for q in dominated[p]:
+                counts[q] -= 1
+                if counts[q] == 0:
+                    following.append(q)
+        current = following
+    return fronts
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_fronts_match_pairwise_reference_including_ties(seed: int) -> None:
+    population = _population(seed, 60, levels=3 + seed % 4)
+
+    assert nondominated_sort(population) == _reference_fronts(population)
+
+
+def test_pareto_fronts_falls_back_for_nan_objectives() -> None:
+    nan = float("nan")
+    vectors = [(0.1, 0.2), (nan, 0.1), (0.2, 0.3), (0.05, 0.4)]
+
+    assert pareto_fronts(vectors) == [[0, 1, 3], [2]]
+
+
+def test_truncate_by_fronts_trims_last_front_by_crowding() -> None:
+    population = _population(3, 40)
+    vectors = [individual.fitness.as_tuple() for individual in population]
+
+    expected = []
+    for front in _reference_fronts(population):
+        space = 15 - len(expected)
+        if len(front) <= space:
+            expected.extend(front)
+            continue
+        distances = crowding_distance(front)
+        ranked = sorted(enumerate(front), key=lambda item: (-distances[item[1]], item[0]))
+        expected.extend(individual for _slot, individual in ranked[:space])
+        break
+
+    assert [population[index] for index in truncate_by_fronts(vectors, 15)] == expected
+    assert select_population(population, 15) == expected
+
+
+def test_archive_updates_incrementally_like_update_archive() -> None:
+    rng = random.Random(7)
+    archive = ParetoArchive(12)
+    expected: list[Individual] = []
+
+    for generation in range(20):
+        candidates = [
+            _individual(rng.randrange(40), tuple(rng.randrange(5) / 5 for _ in range(4)))
+            for _ in range(16)
+        ]
+        expected = update_archive(expected, candidates, max_size=12)
+
+        assert archive.update(candidates) == expected, generation
+        assert len(archive) <= 12
+
+
+def test_archive_keeps_dominating_duplicate_program() -> None:
+    stored = _individual(1, (0.3, 0.3, 0.3, 0.3))
+    better = _individual(1, (0.2, 0.3, 0.3, 0.3))
+    equal = _individual(1, (0.2, 0.3, 0.3, 0.3))
+
+    archive = ParetoArchive(4, [stored])
+
+    assert archive.update([better]) == [better]
+    assert archive.update([equal])[0] is better
+    assert ParetoArchive(0).update([better]) == []
+    with pytest.raises(ValueError):
+        ParetoArchive(-1)
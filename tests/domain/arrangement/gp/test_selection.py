@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import random
+import time
+
 import pytest
 
 from domain.arrangement.gp.fitness import FitnessVector
@@ -9,6 +12,7 @@ from domain.arrangement.gp.selection import (
     SelectionConfig,
     advance_generation,
     crowding_distance,
+    dominates,
     nondominated_sort,
     update_archive,
 )
@@ -93,3 +97,53 @@ def test_advance_generation_preserves_elites_from_archive() -> None:
     assert elite in repeat_population
     assert elite in repeat_archive
     assert repeat_population[0] == next_population[0]
+
+
+def _pairwise_nondominated_sort(population: list[Individual]) -> list[list[Individual]]:
+    """The all-pairs sort ``nondominated_sort`` used before the index-based fronts."""
+
+    counts = {individual: 0 for individual in population}
+    dominated: dict[Individual, list[Individual]] = {individual: [] for individual in population}
+    for p in population:
+        for q in population:
+            if p is q:
+                continue
+            if dominates(p.fitness, q.fitness):
+                dominated[p].append(q)
+            elif dominates(q.fitness, p.fitness):
+                counts[p] += 1
+    fronts: list[list[Individual]] = []
+    current = [individual for individual in population if counts[individual] == 0]
+    while current:
+        fronts.append(current)
+        following: list[Individual] = []
+        for p in current:
+            for q in dominated[p]:
+                counts[q] -= 1
+                if counts[q] == 0:
+                    following.append(q)
+        current = following
+    return fronts
+
+
+@pytest.mark.benchmark
+def test_benchmark_nondominated_sort_against_pairwise_sort() -> None:
+    rng = random.Random(0)
+    population = [
+        _individual(index, tuple(round(rng.random(), 3) for _ in range(4)))  # type: ignore[arg-type]
+        for index in range(400)
+    ]
+
+    start = time.perf_counter()
+    fronts = nondominated_sort(population)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = _pairwise_nondominated_sort(population)
+    pairwise = time.perf_counter() - start
+
+    print(
+        f"\nnondominated_sort of 400: indexed {indexed * 1000:.1f} ms, "
+        f"pairwise {pairwise * 1000:.1f} ms"
+    )
+    assert [set(front) for front in fronts] == [set(front) for front in reference]
+    assert indexed < pairwise
@@ -136,6 +136,7 @@ class FakeScoreService:
         midi_mode: str = "auto",
         arranged_events=None,
         arranged_pulses_per_quarter=None,
+        export_folder=None,
     ) -> ConversionResult:
         if self._conversion_outcomes:
             outcome = self._conversion_outcomes.popleft()
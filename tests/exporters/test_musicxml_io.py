@@ -3,7 +3,8 @@ from __future__ import annotations
 import xml.etree.ElementTree as ET
 import zipfile
 
-from ocarina_tools import analyze_key, export_mxl, load_score
+from ocarina_tools import analyze_key, export_musicxml, export_mxl, load_score
+from ocarina_tools.exporters import SerializedScore
 
 from ..helpers import make_chord_score, make_linear_score
 
@@ -49,3 +50,24 @@ def test_load_score_reads_mxl_zip_double_extension(tmp_path):
     assert loaded_tree.getroot() is loaded_root
     assert loaded_root.tag.endswith("score-partwise")
     assert loaded_root.find("part") is not None
+
+
+def test_serialized_score_writes_musicxml_and_mxl_from_one_serialization(tmp_path, monkeypatch):
+    tree, _ = make_chord_score()
+    expected = ET.tostring(tree.getroot(), encoding="utf-8", xml_declaration=True)
+    calls = []
+    original_tostring = ET.tostring
+
+    def counting_tostring(*args, **kwargs):
+        calls.append(args)
+        return original_tostring(*args, **kwargs)
+
+    monkeypatch.setattr(ET, "tostring", counting_tostring)
+    serialized = SerializedScore(tree)
+    export_musicxml(serialized, tmp_path / "score.musicxml")
+    export_mxl(serialized, tmp_path / "score.mxl")
+
+    assert len(calls) == 1
+    assert (tmp_path / "score.musicxml").read_bytes() == expected
+    with zipfile.ZipFile(tmp_path / "score.mxl") as archive:
+        assert archive.read("score.xml") == expected
@@ -5,8 +5,23 @@ from pathlib import Path
 
 import pytest
 
-from ocarina_tools import export_midi_poly, get_tempo_changes, load_score, read_midi
-from ocarina_tools.midi_import import DEFAULT_TIME_SIGNATURE
+from ocarina_tools import (
+    export_midi_poly,
+    filter_parts,
+    get_note_events,
+    get_tempo_changes,
+    list_parts,
+    load_score,
+    read_midi,
+)
+from ocarina_tools.midi_import import (
+    DEFAULT_TIME_SIGNATURE,
+    build_song,
+    decode_midi,
+    midi_note_events,
+    midi_parts,
+    midi_tempo_changes,
+)
 
 from tests.helpers import make_linear_score
 
@@ -140,3 +155,66 @@ def test_read_midi_reports_tempo_changes_from_fixture() -> None:
     assert [
         change.tempo_bpm for change in tempo_changes
     ] == pytest.approx([80.0, 40.0, 120.0, 220.0], abs=1e-3)
+
+
+def _write_two_channel_midi(path: Path) -> None:
+    track = bytearray()
+    track.extend(_vlq(0))
+    track.extend([0xFF, 0x51, 0x03])
+    track.extend(_tempo_payload(100))
+    track.extend(_vlq(0))
+    track.extend([0xC1, 40])  # channel 2 program change
+    track.extend(_vlq(0))
+    track.extend([0x90, 60, 0x40, 0x00, 0x90, 64, 0x40])  # chord on channel 1
+    track.extend(_vlq(120))
+    track.extend([0x91, 72, 0x40])
+    track.extend(_vlq(360))
+    track.extend([0x80, 60, 0x00, 0x00, 0x80, 64, 0x00])
+    track.extend(_vlq(0))
+    track.extend([0xFF, 0x51, 0x03])
+    track.extend(_tempo_payload(75))
+    track.extend(_vlq(240))
+    track.extend([0x81, 72, 0x00, 0x00, 0x90, 67, 0x40])
+    track.extend(_vlq(480))
+    track.extend([0x80, 67, 0x00])
+    track.extend(_vlq(0))
+    track.extend([0xFF, 0x2F, 0x00])
+    _write_midi(path, bytes(track))
+
+
+def test_load_score_builds_midi_tree_on_demand(tmp_path: Path) -> None:
+    midi_path = tmp_path / "lazy.mid"
+    _write_two_channel_midi(midi_path)
+
+    result = load_score(str(midi_path))
+
+    assert result.midi is not None
+    assert result.midi_report is not None and result.midi_report.mode == "strict"
+    assert result.midi.tempo_changes
+    root = result.root
+    assert result.tree.getroot() is root
+    assert result.root is root
+
+
+@pytest.mark.parametrize("selection", [(), ("CH2",), ("CH2", "CH1"), ("CH9",)])
+def test_direct_midi_views_match_built_score(tmp_path: Path, selection: tuple[str, ...]) -> None:
+    midi_path = tmp_path / "direct.mid"
+    _write_two_channel_midi(midi_path)
+    decoded, _report = decode_midi(str(midi_path))
+    root = build_song(decoded).root
+    if selection:
+        filter_parts(root, selection)
+
+    assert midi_note_events(decoded, selection) == get_note_events(root)
+    assert midi_tempo_changes(decoded, selection) == get_tempo_changes(root)
+
+
+def test_direct_midi_parts_match_built_score(tmp_path: Path) -> None:
+    midi_path = tmp_path / "parts.mid"
+    _write_two_channel_midi(midi_path)
+    decoded, _report = decode_midi(str(midi_path))
+
+    parts = midi_parts(decoded)
+
+    assert parts == list_parts(build_song(decoded).root)
+    assert [part.midi_program for part in parts] == [None, 40]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import copy
+import io
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from ocarina_tools import (
+    analyze_key,
+    collect_used_pitches,
+    filter_parts,
+    get_note_events,
+    get_tempo_changes,
+    get_time_signature,
+    list_parts,
+    load_score,
+)
+from ocarina_tools.score_index import build_score_index, index_score
+
+from helpers import make_chord_score, make_score_with_tempo_changes
+
+
+ASSETS = Path(__file__).resolve().parents[1] / "integration" / "assets"
+SCORES = sorted(ASSETS.glob("*.musicxml")) + sorted(ASSETS.glob("*.xml"))
+
+
+def _answers(source) -> tuple:
+    return (
+        analyze_key(source),
+        get_time_signature(source),
+        get_tempo_changes(source),
+        list_parts(source),
+        collect_used_pitches(source),
+        get_note_events(source),
+    )
+
+
+@pytest.mark.parametrize("path", SCORES, ids=lambda path: path.name)
+def test_streamed_index_answers_like_the_tree(path: Path) -> None:
+    root = ET.parse(path).getroot()
+
+    assert _answers(build_score_index(str(path))) == _answers(root)
+
+
+def test_load_score_indexes_while_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    path = ASSETS / "06_selected_part_filter_input.musicxml"
+    monkeypatch.setattr(
+        "ocarina_tools.score_index.index_score",
+        lambda root: pytest.fail("load_score walked the parsed tree again"),
+    )
+
+    result = load_score(str(path))
+
+    assert result.index is not None
+    assert _answers(result.index) == _answers(result.root)
+
+
+def test_index_of_in_memory_tree_tracks_tempo_and_chords() -> None:
+    for _tree, root in (make_score_with_tempo_changes(), make_chord_score()):
+        data = io.BytesIO(ET.tostring(root))
+        assert _answers(index_score(root)) == _answers(root)
+        assert _answers(build_score_index(data)) == _answers(root)
+
+
+def test_select_matches_filter_parts() -> None:
+    path = ASSETS / "06_selected_part_filter_input.musicxml"
+    root = ET.parse(path).getroot()
+    part_ids = [info.part_id for info in list_parts(root)]
+    assert len(part_ids) > 1
+    keep = [part_ids[-1], "missing", part_ids[0], part_ids[-1]]
+
+    filtered = copy.deepcopy(root)
+    filter_parts(filtered, keep)
+
+    assert _answers(build_score_index(str(path)).select(keep)) == _answers(filtered)
@@ -106,6 +106,7 @@ def test_compute_arranger_preview_runs_gp_algorithm(monkeypatch: pytest.MonkeyPa
         assert callable(progress_cb)
     grace_settings = kwargs.pop("grace_settings", None)
     assert grace_settings == DEFAULT_GRACE_SETTINGS
+    assert kwargs.pop("cancellation") is None
     assert kwargs == {
         "instrument_id": "alto_c_12",
         "starred_ids": (),
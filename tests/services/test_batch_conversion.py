@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import shutil
+import zipfile
+from pathlib import Path
+
+from ocarina_gui.constants import DEFAULT_MAX, DEFAULT_MIN
+from services.batch_conversion import (
+    build_summary,
+    collect_inputs,
+    load_batch_config,
+    plan_jobs,
+    run_batch,
+)
+
+
+ASSETS = Path(__file__).resolve().parents[1] / "integration" / "assets"
+SCORE = ASSETS / "01_melody_from_chords_input.musicxml"
+
+
+def _manifest() -> dict:
+    return {
+        "version": 1,
+        "settings": {
+            "prefer_mode": "major",
+            "range_min": "C5",
+            "range_max": "C7",
+            "instrument_id": "soprano_c_12",
+            "selected_part_ids": ["P1"],
+            "lenient_midi_import": False,
+        },
+        "pdf_options": {"page_size": "A6", "orientation": "landscape"},
+        "arranger": {"mode": "gp", "strategy": "starred-best", "dp_slack_enabled": False},
+    }
+
+
+def test_load_batch_config_reads_project_manifest_and_archive(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(_manifest()), encoding="utf-8")
+    archive_path = tmp_path / "song.ocarina"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("manifest.json", json.dumps(_manifest()))
+
+    for source in (manifest_path, archive_path):
+        config = load_batch_config(source)
+
+        assert config.settings.prefer_mode == "major"
+        assert config.settings.range_min == "C5"
+        assert config.settings.instrument_id == "soprano_c_12"
+        assert config.settings.selected_part_ids == ()
+        assert config.settings.lenient_midi_import is False
+        assert config.pdf_options.page_size == "A6"
+        assert config.arranger_mode == "gp"
+        assert config.arranger_strategy == "starred-best"
+        assert config.dp_slack_enabled is False
+
+
+def test_load_batch_config_reads_bare_settings(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"prefer_flats": False}), encoding="utf-8")
+
+    config = load_batch_config(settings_path)
+
+    assert config.settings.prefer_flats is False
+    assert (config.settings.range_min, config.settings.range_max) == (DEFAULT_MIN, DEFAULT_MAX)
+    assert config.arranger_mode == "best_effort"
+
+
+def test_collect_inputs_expands_directories_and_globs(tmp_path: Path) -> None:
+    songs = tmp_path / "songs"
+    (songs / "nested").mkdir(parents=True)
+    shutil.copy(SCORE, songs / "a.musicxml")
+    shutil.copy(SCORE, songs / "nested" / "b.xml")
+    (songs / "notes.txt").write_text("not a score", encoding="utf-8")
+
+    found = collect_inputs([str(songs), str(songs / "*.musicxml")])
+
+    assert [path.name for path in found] == ["a.musicxml", "b.xml"]
+
+
+def test_plan_jobs_gives_each_song_its_own_export_name(tmp_path: Path) -> None:
+    (tmp_path / "out" / "song-ocarina-C").mkdir(parents=True)
+    config = load_batch_config(_write_settings(tmp_path))
+    inputs = [Path("a/song.mid"), Path("b/song.musicxml")]
+
+    jobs = plan_jobs(inputs, tmp_path / "out", config)
+    kept = plan_jobs(inputs, tmp_path / "out", config, keep_existing=True)
+
+    assert [Path(job.export_folder).name for job in jobs] == [
+        "song-ocarina-C",
+        "song-ocarina-C (2)",
+    ]
+    assert [Path(job.output_xml_path).name for job in kept] == [
+        "song-ocarina-C (2).musicxml",
+        "song-ocarina-C (3).musicxml",
+    ]
+    assert all(job.export_folder is None for job in kept)
+
+
+def test_rerunning_a_batch_replaces_its_outputs(tmp_path: Path) -> None:
+    config = load_batch_config(_write_settings(tmp_path))
+    output_dir = tmp_path / "out"
+
+    first = run_batch(plan_jobs([SCORE], output_dir, config), workers=1)
+    stale = Path(first[0].outputs["musicxml"])
+    stale.write_text("stale", encoding="utf-8")
+    second = run_batch(plan_jobs([SCORE], output_dir, config), workers=1)
+    kept = run_batch(plan_jobs([SCORE], output_dir, config, keep_existing=True), workers=1)
+
+    assert [outcome.ok for outcome in (*first, *second, *kept)] == [True, True, True]
+    assert second[0].output_folder == first[0].output_folder
+    assert second[0].outputs == first[0].outputs
+    assert stale.read_text(encoding="utf-8") != "stale"
+    assert Path(kept[0].output_folder).name == f"{SCORE.stem}-ocarina-C (2)"
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        f"{SCORE.stem}-ocarina-C",
+        f"{SCORE.stem}-ocarina-C (2)",
+    ]
+
+
+def test_run_batch_converts_scores_and_reports_failures(tmp_path: Path) -> None:
+    config = load_batch_config(_write_settings(tmp_path))
+    jobs = plan_jobs([SCORE, tmp_path / "missing.musicxml"], tmp_path / "out", config)
+    reported = []
+
+    outcomes = run_batch(jobs, workers=1, on_outcome=reported.append)
+    summary = build_summary(outcomes, elapsed=1.0, workers=1)
+
+    assert reported == outcomes
+    converted, missing = outcomes
+    assert converted.ok
+    assert Path(converted.outputs["musicxml"]).exists()
+    assert Path(converted.outputs["mxl"]).exists()
+    assert {"preview", "arrange", "convert", "pdf", "total"} <= set(converted.timings)
+    assert converted.difficulty is not None
+    assert converted.difficulty["instrument_id"] == "soprano_c_12"
+    assert not missing.ok and missing.error
+    assert (summary["succeeded"], summary["failed"]) == (1, 1)
+    json.dumps(summary)
+
+
+def _write_settings(tmp_path: Path) -> Path:
+    path = tmp_path / "settings.json"
+    path.write_text(
+        json.dumps({"settings": {"instrument_id": "soprano_c_12"}}), encoding="utf-8"
+    )
+    return path
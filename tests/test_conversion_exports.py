@@ -96,6 +96,8 @@ def test_convert_score_exports_into_unique_folder(tmp_path: Path) -> None:
     assert result.output_midi_path == written["mid"]
     assert list(result.output_pdf_paths.values())[0].startswith(str(expected_folder))
     assert result.output_folder == str(expected_folder)
+    assert set(result.timings) == {"musicxml", "mxl", "midi", "pdf"}
+    assert all(seconds >= 0.0 for seconds in result.timings.values())
 
 
 def test_convert_score_increments_export_folder(tmp_path: Path) -> None:
@@ -364,3 +366,33 @@ def test_convert_score_uses_supplied_arranged_events(
     assert captured["ppq"] == 720
     assert captured["beats"] == 4
     assert captured["beat_type"] == 4
+
+
+def test_convert_score_times_each_export_in_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = ET.Element("score-partwise")
+    monkeypatch.setattr(
+        "ocarina_gui.conversion.load_score",
+        lambda _path, *, midi_mode="auto": ScoreLoadResult(tree=ET.ElementTree(root), root=root),
+    )
+    written: list[str] = []
+
+    def fake_export(_source: object, path: str, *args, **kwargs) -> None:
+        written.append(Path(path).suffix)
+        Path(path).write_bytes(b"data")
+
+    result = convert_score(
+        input_path="ignored",
+        output_xml_path=str(tmp_path / "song.musicxml"),
+        settings=_fake_settings(),
+        export_musicxml=fake_export,
+        export_mxl=fake_export,
+        export_midi=fake_export,
+        export_pdf=fake_export,
+        pdf_options=PdfExportOptions.with_defaults(),
+    )
+
+    assert written == [".musicxml", ".mxl", ".mid", ".pdf"]
+    assert list(result.timings) == ["musicxml", "mxl", "midi", "pdf"]
+    assert all(seconds >= 0 for seconds in result.timings.values())
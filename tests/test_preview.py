@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import random
+import time
 import xml.etree.ElementTree as ET
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
 
 import ocarina_gui.preview as preview
 from ocarina_gui.settings import TransformSettings
@@ -147,3 +153,151 @@ def test_build_preview_respects_selected_parts(monkeypatch) -> None:
 
     assert [event.midi for event in data.original_events] == [72]
     assert [event.midi for event in data.arranged_events] == [72]
+
+
+def test_build_preview_reuses_parsed_score_until_file_changes(monkeypatch, tmp_path) -> None:
+    score_path = tmp_path / "score.musicxml"
+    score_path.write_text("<score/>")
+    loads: list[str] = []
+    event_roots: list[ET.Element] = []
+    transformed: list[int] = []
+
+    def fake_load(path: str, *, midi_mode: str = "auto"):
+        loads.append(midi_mode)
+        root = ET.Element("score")
+        return ScoreLoadResult(tree=ET.ElementTree(root), root=root)
+
+    def fake_get_note_events(root: ET.Element, **_kwargs):
+        event_roots.append(root)
+        return [NoteEvent(0, 1, 60, 79)], 480
+
+    monkeypatch.setattr(preview, "load_score", fake_load)
+    monkeypatch.setattr(preview, "get_note_events", fake_get_note_events)
+    monkeypatch.setattr(preview, "get_time_signature", lambda _root: (3, 4))
+    monkeypatch.setattr(
+        preview,
+        "transform_to_ocarina",
+        lambda *_args, transpose_offset=0, **_kwargs: transformed.append(transpose_offset),
+    )
+    monkeypatch.setattr(preview, "favor_lower_register", lambda *_args, **_kwargs: None)
+    preview.clear_score_cache()
+
+    settings = TransformSettings(
+        prefer_mode="auto",
+        range_min="A4",
+        range_max="F6",
+        prefer_flats=True,
+        collapse_chords=True,
+        favor_lower=False,
+    )
+    try:
+        first = preview.build_preview_data(str(score_path), settings)
+        second = preview.build_preview_data(
+            str(score_path), replace(settings, transpose_offset=2)
+        )
+
+        assert loads == ["auto"]
+        assert transformed == [0, 2]
+        # One original extraction plus one arranged extraction per preview.
+        assert len(event_roots) == 3
+        assert second.original_events == first.original_events
+        assert second.original_events is not first.original_events
+        assert (second.beats, second.beat_type) == (3, 4)
+
+        preview.build_preview_data(str(score_path), settings, midi_mode="strict")
+        score_path.write_text("<score><part/></score>")
+        preview.build_preview_data(str(score_path), settings)
+
+        assert loads == ["auto", "strict", "auto"]
+    finally:
+        preview.clear_score_cache()
+
+
+def test_midi_preview_arranges_without_building_the_cached_tree(tmp_path) -> None:
+    midi_path = Path(__file__).resolve().parent / "fixtures" / "midi" / "tempo-changes.mid"
+    settings = TransformSettings(
+        prefer_mode="auto",
+        range_min="A4",
+        range_max="F6",
+        prefer_flats=True,
+        collapse_chords=True,
+        favor_lower=False,
+    )
+    preview.clear_score_cache()
+    try:
+        data = preview.build_preview_data(str(midi_path), settings)
+        score = preview._score_cache.load(str(midi_path), "auto")
+
+        assert score.result._tree is None
+        assert data.arranged_events
+        # Arranging a copy of the cached tree gives the same preview.
+        preview._score_cache.part_view(score, ())._root = score.root
+        assert preview.build_preview_data(str(midi_path), settings) == data
+    finally:
+        preview.clear_score_cache()
+
+
+def _two_part_score(measures: int) -> str:
+    rng = random.Random(0)
+    parts = []
+    for part_id, octave in (("P1", 5), ("P2", 3)):
+        bars = []
+        for number in range(1, measures + 1):
+            attributes = ""
+            if number == 1:
+                attributes = (
+                    "<attributes><divisions>1</divisions>"
+                    "<time><beats>4</beats><beat-type>4</beat-type></time></attributes>"
+                    '<sound tempo="96"/>'
+                )
+            notes = "".join(
+                f"<note><pitch><step>{rng.choice('CDEFGAB')}</step><octave>{octave}</octave>"
+                "</pitch><duration>1</duration><voice>1</voice><type>quarter</type></note>"
+                for _ in range(4)
+            )
+            bars.append(f'<measure number="{number}">{attributes}{notes}</measure>')
+        parts.append(f'<part id="{part_id}">{"".join(bars)}</part>')
+    part_list = "".join(
+        f'<score-part id="{part_id}"><part-name>{part_id}</part-name></score-part>'
+        for part_id in ("P1", "P2")
+    )
+    return (
+        f'<score-partwise version="3.1"><part-list>{part_list}</part-list>'
+        f'{"".join(parts)}</score-partwise>'
+    )
+
+
+@pytest.mark.benchmark
+def test_benchmark_first_preview_against_re_preview(tmp_path) -> None:
+    score_path = tmp_path / "generated.musicxml"
+    score_path.write_text(_two_part_score(400), encoding="utf-8")
+    settings = TransformSettings(
+        prefer_mode="auto",
+        range_min="A4",
+        range_max="F6",
+        prefer_flats=True,
+        collapse_chords=True,
+        favor_lower=False,
+    )
+    cold: list[float] = []
+    warm: list[float] = []
+    try:
+        for offset in range(1, 4):
+            preview.clear_score_cache()
+            start = time.perf_counter()
+            first = preview.build_preview_data(str(score_path), settings)
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            preview.build_preview_data(
+                str(score_path), replace(settings, transpose_offset=offset)
+            )
+            warm.append(time.perf_counter() - start)
+    finally:
+        preview.clear_score_cache()
+
+    print(
+        f"\n400-bar preview: first {min(cold) * 1000:.1f} ms, "
+        f"re-preview {min(warm) * 1000:.1f} ms (transpose changed)"
+    )
+    assert first.original_events
+    assert min(warm) < min(cold)
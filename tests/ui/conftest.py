@@ -56,6 +56,9 @@ class _StubAudioRenderer(AudioRenderer):
     def set_loop(self, loop) -> None:  # noqa: D401 - protocol compliance
         self.loop_region = loop
 
+    def repeats_loop(self) -> bool:  # noqa: D401 - protocol compliance
+        return False
+
     def set_metronome(self, enabled: bool, beats_per_measure: int, beat_unit: int) -> None:
         self.metronome = (enabled, beats_per_measure, beat_unit)
         self._begin_render()
@@ -239,19 +239,33 @@ def test_vertical_piano_roll_draws_measure_numbers(gui_app):
         assert layout is not None and layout.lines, "expected wrapped layout metadata"
         assert len(layout.lines) > 1, "expected multiple wrapped systems for verification"
 
-        for index, info in enumerate(layout.lines):
-            tag = f"wrapped_line_{index}"
-            line_measure_ids = [
-                item
-                for item in canvas.find_withtag(tag)
-                if "measure_line" in canvas.gettags(item) and canvas.type(item) == "line"
-            ]
-            assert line_measure_ids, f"expected measure lines for wrapped system {index}"
-
-            tops = [canvas.coords(item)[1] for item in line_measure_ids]
-            bottoms = [canvas.coords(item)[3] for item in line_measure_ids]
-            assert any(abs(top - info.y_top) <= 1.5 for top in tops), "measure lines should align with system top"
-            assert any(abs(bottom - info.y_bottom) <= 1.5 for bottom in bottoms), "measure lines should align with system bottom"
+        def drawn_systems() -> list[int]:
+            drawn: list[int] = []
+            for index, info in enumerate(layout.lines):
+                tag = f"wrapped_line_{index}"
+                line_measure_ids = [
+                    item
+                    for item in canvas.find_withtag(tag)
+                    if "measure_line" in canvas.gettags(item) and canvas.type(item) == "line"
+                ]
+                if not line_measure_ids:
+                    continue
+                drawn.append(index)
+
+                tops = [canvas.coords(item)[1] for item in line_measure_ids]
+                bottoms = [canvas.coords(item)[3] for item in line_measure_ids]
+                assert any(abs(top - info.y_top) <= 1.5 for top in tops), "measure lines should align with system top"
+                assert any(abs(bottom - info.y_bottom) <= 1.5 for bottom in bottoms), "measure lines should align with system bottom"
+            return drawn
+
+        # Only systems near the viewport carry canvas items; scrolling draws the rest.
+        assert 0 in drawn_systems(), "expected the first wrapped system to be drawn"
+        canvas.yview_moveto(1.0)
+        labels = getattr(roll, "labels", None)
+        if labels is not None:
+            labels.yview_moveto(1.0)
+        gui_app.update_idletasks()
+        assert len(layout.lines) - 1 in drawn_systems(), "expected the last wrapped system after scrolling"
     finally:
         try:
             roll.set_time_scroll_orientation("horizontal")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from domain.arrangement.api import (
     ArrangementResult,
     _difficulty_score,
@@ -10,6 +12,7 @@ from domain.arrangement.config import FeatureFlags, GraceSettings
 from domain.arrangement.phrase import PhraseNote, PhraseSpan
 from domain.arrangement.salvage import default_salvage_cascade
 from domain.arrangement.soft_key import InstrumentRange, InstrumentWindwayRange
+from shared.cancellation import CancellationToken, OperationCancelled
 
 
 def _make_span(midi_values: list[int]) -> PhraseSpan:
@@ -43,6 +46,23 @@ def test_arrange_span_returns_baseline_when_dp_flag_disabled() -> None:
     assert all(instrument.min_midi <= midi <= instrument.max_midi for midi in final_midis)
 
 
+def test_arrange_span_checks_cancellation_between_transpositions() -> None:
+    span = _make_span([84, 86])
+    instrument = InstrumentRange(min_midi=60, max_midi=88)
+    token = CancellationToken()
+    reported: list[str | None] = []
+
+    def _progress(_percent: float, message: str | None = None) -> None:
+        reported.append(message)
+        if message and message.startswith("Completed transposition"):
+            token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        arrange_span(span, instrument=instrument, progress_callback=_progress, cancellation=token)
+
+    assert sum(1 for message in reported if message and message.startswith("Testing")) == 1
+
+
 def test_arrange_span_runs_dp_when_flag_enabled() -> None:
     span = _make_span([96])  # Above the instrument range.
     instrument = InstrumentRange(min_midi=60, max_midi=86)
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+from domain.arrangement.config import clear_instrument_registry, register_instrument_range
+from domain.arrangement.constraints import SubholeConstraintSettings, SubholePairLimit
+from domain.arrangement.difficulty import difficulty_score, rank_transpositions, summarize_difficulty
+from domain.arrangement.difficulty_profile import CATEGORY_NAMES, difficulty_profile
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.soft_key import InstrumentRange, InstrumentWindwayRange
+
+
+@dataclass(frozen=True)
+class InstrumentWithSubholes(InstrumentWindwayRange):
+    subhole_settings: SubholeConstraintSettings | None = None
+
+
+def _instrument() -> InstrumentWithSubholes:
+    return InstrumentWithSubholes(
+        min_midi=60,
+        max_midi=80,
+        windway_ids=("primary", "secondary"),
+        windway_map={60: (0,), 62: (1,), 64: (0, 1)},
+        subhole_settings=SubholeConstraintSettings(
+            pair_limits={frozenset((60, 62)): SubholePairLimit(max_hz=10.0, ease=0.2)}
+        ),
+    )
+
+
+def test_profile_tables_match_instrument_rules() -> None:
+    instrument = _instrument()
+    profile = difficulty_profile(instrument)
+
+    assert [CATEGORY_NAMES[profile.category(midi)] for midi in (70, 65, 62, 59, 50)] == [
+        "easy",
+        "medium",
+        "hard",
+        "hard",
+        "very_hard",
+    ]
+    # 60 -> 62 switches windway and is a listed subhole pair; 64 shares both windways
+    # but 62 remains a subhole pitch.
+    assert profile.pair_values(60, 120, frozenset(), 62, 240, frozenset(), 120) == (0.0, 120, 120)
+    assert profile.pair_values(62, 120, frozenset(), 64, 120, frozenset(), 120) == (0.0, 0.0, 120)
+    assert profile.pair_values(64, 480, frozenset({"subhole"}), 72, 480, frozenset(), 120) == (
+        480.0,
+        0.0,
+        480,
+    )
+
+
+def test_profile_is_cached_widened_and_dropped_on_registration() -> None:
+    instrument = InstrumentRange(min_midi=60, max_midi=84)
+    profile = difficulty_profile(instrument)
+    assert difficulty_profile(instrument) is profile
+
+    notes = (PhraseNote(onset=0, duration=480, midi=140), PhraseNote(onset=480, duration=480, midi=-3))
+    summary = summarize_difficulty(PhraseSpan(notes, pulses_per_quarter=480), instrument)
+    widened = difficulty_profile(instrument)
+
+    assert summary.very_hard == 960.0
+    assert widened is not profile and widened.covers(140) and widened.covers(-3)
+    try:
+        register_instrument_range("profile-test", instrument)
+        assert difficulty_profile(instrument) is not widened
+    finally:
+        clear_instrument_registry()
+
+
+def test_rank_transpositions_matches_exhaustive_ranking() -> None:
+    instrument = _instrument()
+    pitches = (58, 60, 62, 60, 67, 79, 81, 62, 64, 84)
+    notes = tuple(
+        PhraseNote(onset=index * 120, duration=120 * (1 + index % 3), midi=midi)
+        for index, midi in enumerate(pitches)
+    )
+    span = PhraseSpan(notes, pulses_per_quarter=480)
+
+    exhaustive = []
+    for transposition in range(-10, 11):
+        summary = summarize_difficulty(span.transpose(transposition), instrument)
+        score = difficulty_score(summary)
+        exhaustive.append(
+            (score, summary.fast_windway_switch_exposure, abs(transposition), transposition)
+        )
+    exhaustive.sort()
+
+    assert rank_transpositions(span, instrument, range(-10, 11), top_k=4) == exhaustive[:4]
+    assert rank_transpositions(span, instrument, (), top_k=4) == []
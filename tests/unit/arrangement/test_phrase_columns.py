@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from domain.arrangement.difficulty import summarize_difficulty
+from domain.arrangement.folding import fold_octaves_with_slack
+from domain.arrangement.gp.ops import GlobalTranspose, LocalOctave, SimplifyRhythm, SpanDescriptor
+from domain.arrangement.gp.program_ops import apply_program
+from domain.arrangement.melody import isolate_melody
+from domain.arrangement.phrase import PhraseNote, PhraseSpan
+from domain.arrangement.phrase_columns import ColumnarPhraseSpan
+from domain.arrangement.soft_key import InstrumentRange, InstrumentWindwayRange
+
+
+def _make_span(seed: int, count: int = 64) -> PhraseSpan:
+    rng = random.Random(seed)
+    notes: list[PhraseNote] = []
+    onset = 0
+    for _ in range(count):
+        duration = rng.choice([120, 240, 480])
+        tags = rng.choice([frozenset(), frozenset({"grace"}), frozenset({"subhole"})])
+        notes.append(PhraseNote(onset=onset, duration=duration, midi=rng.randint(52, 90), tags=tags))
+        if rng.random() < 0.3:
+            notes.append(PhraseNote(onset=onset, duration=duration * 2, midi=rng.randint(52, 90)))
+        onset += duration
+    return PhraseSpan(tuple(notes), pulses_per_quarter=480)
+
+
+def test_columnar_span_round_trips_notes() -> None:
+    span = _make_span(1)
+    columns = ColumnarPhraseSpan.from_span(span)
+
+    assert len(columns) == len(span.notes)
+    assert columns.to_span() == span
+    assert columns.total_duration == span.total_duration
+    assert columns.first_onset == span.first_onset
+    assert columns.bar_number(beats_per_measure=3) == span.bar_number(beats_per_measure=3)
+    assert ColumnarPhraseSpan.from_notes(reversed(span.notes)) == columns
+
+
+def test_columnar_transpose_materialises_equivalent_notes() -> None:
+    span = _make_span(2)
+    base = ColumnarPhraseSpan.from_span(span)
+    columns = base.transpose(-5)
+
+    assert columns.notes == span.transpose(-5).notes
+    assert columns.onsets is base.onsets
+    assert columns.tag_table is base.tag_table
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_apply_program_on_columns_matches_note_objects(seed: int) -> None:
+    rng = random.Random(seed)
+    span = _make_span(seed)
+    program = []
+    for _ in range(6):
+        start = rng.randrange(0, span.total_duration)
+        descriptor = SpanDescriptor(start_onset=start, end_onset=start + rng.randint(1, 4000))
+        program.append(
+            rng.choice(
+                [
+                    LocalOctave(span=descriptor, octaves=rng.choice([-1, 1])),
+                    SimplifyRhythm(span=descriptor, subdivisions=rng.choice([1, 2, 4])),
+                    GlobalTranspose(semitones=rng.randint(-3, 3)),
+                ]
+            )
+        )
+
+    expected = apply_program(program, span)
+    result = apply_program(program, ColumnarPhraseSpan.from_span(span))
+
+    assert isinstance(result, ColumnarPhraseSpan)
+    assert result.to_span() == expected
+
+
+@pytest.mark.parametrize(
+    "instrument",
+    [
+        InstrumentRange(60, 84, comfort_center=70),
+        InstrumentWindwayRange(
+            60,
+            84,
+            windway_ids=("low", "high"),
+            windway_map={midi: ((0,) if midi < 72 else (1,)) for midi in range(48, 100)},
+        ),
+    ],
+)
+def test_summarize_difficulty_columns_match_note_objects(instrument: InstrumentRange) -> None:
+    span = _make_span(5)
+
+    assert summarize_difficulty(ColumnarPhraseSpan.from_span(span), instrument) == (
+        summarize_difficulty(span, instrument)
+    )
+
+
+def test_fold_octaves_on_columns_matches_note_objects() -> None:
+    span = _make_span(6, count=24)
+    instrument = InstrumentRange(60, 72, comfort_center=66)
+
+    expected = fold_octaves_with_slack(span, instrument)
+    result = fold_octaves_with_slack(ColumnarPhraseSpan.from_span(span), instrument)
+
+    assert result.steps == expected.steps
+    assert result.total_cost == expected.total_cost
+    assert isinstance(result.span, ColumnarPhraseSpan)
+    assert result.span.to_span() == expected.span
+
+
+def test_isolate_melody_keeps_columnar_span() -> None:
+    span = _make_span(7)
+
+    expected = isolate_melody(span)
+    result = isolate_melody(ColumnarPhraseSpan.from_span(span))
+
+    assert isinstance(result.span, ColumnarPhraseSpan)
+    assert result.span.to_span() == expected.span
+    assert result.actions == expected.actions
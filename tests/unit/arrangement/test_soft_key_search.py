@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from domain.arrangement.phrase import PhraseNote, PhraseSpan
-from domain.arrangement.soft_key import InstrumentRange, soft_key_search
+from domain.arrangement.soft_key import InstrumentRange, PitchHistogram, soft_key_search
 
 
 def test_soft_key_search_prioritizes_transpositions_that_fit_range() -> None:
@@ -34,3 +34,22 @@ def test_soft_key_search_limits_results_to_top_k() -> None:
 
     assert len(fits) == 1
     assert fits[0].transposition == 0
+
+
+def test_pitch_histogram_merges_repeated_pitches() -> None:
+    notes = (
+        PhraseNote(onset=0, duration=240, midi=74),
+        PhraseNote(onset=240, duration=480, midi=60),
+        PhraseNote(onset=720, duration=240, midi=74),
+    )
+    histogram = PitchHistogram.from_span(PhraseSpan(notes, pulses_per_quarter=480))
+    instrument = InstrumentRange(min_midi=60, max_midi=72, comfort_center=66)
+
+    assert (histogram.pitches, histogram.durations, histogram.total_duration) == (
+        (60, 74),
+        (480, 480),
+        960,
+    )
+    assert histogram.range_ratios(0, instrument) == (0.5, 0.5, 0.0)
+    assert histogram.range_ratios(-2, instrument) == (0.5, 0.0, 0.5)
+    assert histogram.tessitura_spread(-2, instrument) == (480 * 8 + 480 * 6) / 960 / 12
@@ -33,6 +33,37 @@ class DummyPlayer(audio._AudioPlayer):
         self.stop_all_calls += 1
 
 
+class RecordingStream(audio._PlaybackStream):
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+        self.finished = False
+        self.stopped = False
+
+    def write(self, pcm: bytes) -> bool:
+        self.writes.append(pcm)
+        return not self.stopped
+
+    def finish(self) -> None:
+        self.finished = True
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+class StreamingPlayer(DummyPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.streams: list[RecordingStream] = []
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def open_stream(self, sample_rate: int) -> audio._PlaybackStream:
+        stream = RecordingStream()
+        self.streams.append(stream)
+        return stream
+
+
 class FailingPlayer(audio._AudioPlayer):
     def __init__(self) -> None:
         self.play_calls = 0
@@ -79,6 +110,15 @@ def wait_for_playback(
     raise AssertionError("expected playback to start")
 
 
+def wait_until(condition, timeout: float = 2.0) -> None:  # type: ignore[no-untyped-def]
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met before timeout")
+
+
 def render_simple_events(renderer: audio._SynthRenderer) -> None:
     events = [(0, 480, 69, 79), (480, 480, 71, 79)]
     renderer.prepare(events, 480)
@@ -114,7 +154,10 @@ __all__ = [
     "DummyPlayer",
     "FailingPlayer",
     "FakeWinsound",
+    "RecordingStream",
+    "StreamingPlayer",
     "render_simple_events",
     "tempo_config",
     "wait_for_playback",
+    "wait_until",
 ]
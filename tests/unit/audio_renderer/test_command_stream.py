@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+
+from ocarina_gui import audio
+
+
+def test_command_stream_stop_does_not_wait_on_blocked_writer() -> None:
+    # A player that never drains stdin, so the feeder blocks once the pipe fills.
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    stream = audio._CommandStream(process)
+    results: list[bool] = []
+    writer = threading.Thread(
+        target=lambda: results.append(stream.write(b"\0" * (4 << 20))), daemon=True
+    )
+    writer.start()
+    time.sleep(0.2)
+    assert writer.is_alive()
+
+    started = time.perf_counter()
+    stream.stop()
+    elapsed = time.perf_counter() - started
+
+    writer.join(timeout=2.0)
+    assert elapsed < 1.5
+    assert not writer.is_alive()
+    assert results == [False]
+    assert process.poll() is not None
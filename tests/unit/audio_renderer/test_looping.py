@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from array import array
+
+from ocarina_gui import audio
+from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth.chunks import ChunkSource
+from ocarina_gui.audio.synth.looping import loop_clip
+from ocarina_gui.audio.synth.streaming import StreamingPlayback
+from viewmodels.preview_playback_viewmodel import LoopRegion
+
+from .helpers import RecordingStream, StreamingPlayer, wait_until
+
+EVENTS = [(0, 960, 69, 79), (480, 480, 64, 0), (960, 1440, 72, 40), (1920, 240, 60, 79)]
+
+
+def _source() -> ChunkSource:
+    config = rendering.RenderConfig(
+        sample_rate=8000,
+        amplitude=0.45,
+        chunk_size=1024,
+        metronome=rendering.MetronomeSettings(False, 4, 4),
+    )
+    return ChunkSource(EVENTS, 120.0, 480, config)
+
+
+def test_loop_clip_fades_its_end_into_the_lead_in() -> None:
+    source = _source()
+    start, end = source.sample_at_tick(480), source.sample_at_tick(1440)
+
+    clip = array("h", loop_clip(source.render, start, end, 40))
+    body = array("h", source.render(start, end))
+    lead = array("h", source.render(start - 40, start))
+
+    assert len(clip) == end - start
+    assert clip[:-40] == body[:-40]
+    assert abs(clip[-1] - lead[-1]) <= abs(body[-1] - lead[-1]) / 40 + 1
+    # Windows before the score or past its tail are padded with silence.
+    padded = loop_clip(source.render, source.sample_count - 10, source.sample_count + 90, 0)
+    assert padded == source.render(source.sample_count - 10, source.sample_count) + bytes(180)
+    from_zero = array("h", loop_clip(source.render, 0, 100, 20))
+    assert abs(from_zero[-1]) <= abs(array("h", source.render(0, 100))[-1]) / 20 + 1
+
+
+def test_streaming_loop_repeats_clip_on_one_stream() -> None:
+    source = _source()
+    stream = RecordingStream()
+    tasks: list = []  # type: ignore[type-arg]
+    playback = StreamingPlayback(
+        stream, source, 0, submit=lambda task: tasks.append(task) or True,
+        chunk_samples=1000, capacity=4, volume=lambda pcm: pcm, loop=(480, 1440),
+    )
+    start, end = source.sample_at_tick(480), source.sample_at_tick(1440)
+    clip = loop_clip(source.render, start, end, 80)
+    expected = source.render(0, start) + clip * 3
+    try:
+        playback.start()
+        while sum(map(len, stream.writes)) < len(expected):
+            while tasks:
+                tasks.pop(0)()
+            wait_until(lambda: tasks)
+    finally:
+        playback.stop()
+
+    assert b"".join(stream.writes)[: len(expected)] == expected
+    assert not stream.finished
+
+
+class _UnopenableStreamPlayer(StreamingPlayer):
+    def open_stream(self, sample_rate: int) -> None:  # type: ignore[override]
+        return None
+
+
+def test_renderer_reports_gapless_loops_only_while_streaming() -> None:
+    streaming, unopenable = StreamingPlayer(), _UnopenableStreamPlayer()
+    loop = LoopRegion(enabled=True, start_tick=480, end_tick=960)
+    streaming_renderer = audio._SynthRenderer(streaming)
+    fallback_renderer = audio._SynthRenderer(unopenable)
+    try:
+        streaming_renderer.prepare([(0, 1920, 69, 79)], 480)
+        assert not streaming_renderer.set_loop(loop)
+        assert streaming_renderer.start(720, 120.0)
+        assert streaming_renderer.repeats_loop()
+        assert not streaming_renderer.set_loop(LoopRegion(enabled=False, end_tick=960))
+        assert streaming_renderer.set_loop(loop)
+        streaming_renderer.pause()
+        assert not streaming_renderer.repeats_loop()
+
+        fallback_renderer.prepare([(0, 1920, 69, 79)], 480)
+        assert not fallback_renderer.set_loop(loop)
+        assert fallback_renderer.start(720, 120.0)
+        assert not fallback_renderer.repeats_loop()
+    finally:
+        streaming_renderer.shutdown()
+        fallback_renderer.shutdown()
+
+    rate = audio._SynthRenderer._SAMPLE_RATE
+    worker = fallback_renderer._worker  # type: ignore[attr-defined]
+    start, end, position = (worker.tick_to_sample(tick, rate) for tick in (480, 960, 720))
+    clip = loop_clip(lambda a, b: worker.buffer[2 * a : 2 * b], start, end, rate // 100)
+    assert unopenable.calls[-1][0] == clip[2 * (position - start) :] + clip
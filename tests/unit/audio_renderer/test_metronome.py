@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from ocarina_gui import audio
+from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth.metronome import (
+    CLICK_LEVEL,
+    MetronomeSettings,
+    click_positions,
+    click_samples,
+    overlay_click_stem,
+)
+from shared.tempo import TempoChange, TempoMap
+
+from .helpers import DummyPlayer, await_render, wait_until
+
+CHANGES = [TempoChange(0, 120.0), TempoChange(960, 75.0), TempoChange(1500, 200.0)]
+
+
+@pytest.mark.parametrize("ticks", [range(0, 4000, 160), [3000, 0, 961, 959, 1500, -5]])
+def test_ticks_to_samples_matches_tick_to_sample(ticks) -> None:  # type: ignore[no-untyped-def]
+    tempo_map = TempoMap(480, CHANGES)
+
+    assert tempo_map.ticks_to_samples(ticks, 8000) == [
+        tempo_map.tick_to_sample(tick, 8000) for tick in ticks
+    ]
+
+
+def test_click_stem_places_accents_on_downbeats() -> None:
+    tempo_map = TempoMap(480, CHANGES)
+    settings = MetronomeSettings(True, 3, 4)
+    positions = click_positions(tempo_map.ticks_to_samples, 2400, 20000, settings, 480, 8000)
+
+    assert [start for start, _accent in positions] == [
+        tempo_map.tick_to_sample(tick, 8000) for tick in range(0, 2401, 480)
+    ]
+    assert [accent for _start, accent in positions] == [True, False, False, True, False, False]
+    assert click_samples(8000) is click_samples(8000)
+
+    pcm = bytearray(array("h", [100] * 20000).tobytes())
+    overlay_click_stem(pcm, positions + [(19990, True)], 8000, 10000.0)
+    stem = array("h", pcm)
+    accent, weak = click_samples(8000)
+    first, second = positions[0][0], positions[1][0]
+    assert stem[first + 10] == 100 + int(accent[10] * 10000.0)
+    assert stem[second + 10] == 100 + int(weak[10] * 10000.0)
+    assert stem[second - 1] == 100 and len(stem) == 20000
+
+
+def test_render_events_keeps_metronome_mix_and_progress() -> None:
+    config = rendering.RenderConfig(8000, 0.45, 512, MetronomeSettings(True, 4, 4))
+    progress: list[float] = []
+
+    pcm, _ = rendering.render_events([(0, 1920, 69, 79)], 120.0, 480, config, progress.append)
+
+    assert progress[0] == 0.0 and progress[-1] == 1.0
+    assert progress == sorted(progress)
+    silent, _ = rendering.render_events(
+        [(0, 1920, 69, 79)], 120.0, 480, rendering.RenderConfig(8000, 0.45, 512, MetronomeSettings(False, 4, 4))
+    )
+    assert len(pcm) == len(silent) and pcm != silent
+
+
+def test_metronome_toggle_remixes_buffer_without_rendering() -> None:
+    player = DummyPlayer()
+    renderer = audio._SynthRenderer(player, streaming=False)
+    renders: list[int] = []
+    original = renderer._render_events
+
+    def counting_render(*args, **kwargs):  # type: ignore[no-untyped-def]
+        renders.append(1)
+        return original(*args, **kwargs)
+
+    renderer._render_events = counting_render  # type: ignore[method-assign]
+    try:
+        renderer.prepare([(0, 1920, 69, 79)], 480)
+        await_render(renderer)
+        assert renderer.start(0, 120.0)
+        notes = player.calls[-1][0]
+
+        renderer.set_metronome(True, 4, 4)
+        wait_until(lambda: len(player.calls) == 2)
+        clicked = player.calls[-1][0]
+        renderer.set_metronome(False, 4, 4)
+        wait_until(lambda: len(player.calls) == 3)
+    finally:
+        renderer.shutdown()
+
+    assert len(renders) == 1
+    assert len(clicked) == len(notes) and clicked != notes
+    peak = max(map(abs, array("h", notes)))
+    assert max(map(abs, array("h", clicked))) <= peak * (1.0 + CLICK_LEVEL) + 1
+    # Notes keep their level; only the samples under each click change.
+    gap = 2 * int(renderer._SAMPLE_RATE * 0.1)
+    assert clicked[gap : gap + 200] == notes[gap : gap + 200]
+    assert player.calls[-1][0] == notes
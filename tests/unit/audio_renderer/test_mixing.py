@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+import time
+import tracemalloc
+from array import array
+
+import pytest
+
+from ocarina_gui.audio.synth import synthesis
+from ocarina_gui.audio.synth.mixing import MixBuffer
+
+
+@pytest.fixture(params=synthesis.SYNTHESIS_BACKENDS)
+def backend(request):
+    original = synthesis.synthesis_backend()
+    synthesis.set_synthesis_backend(request.param)
+    yield request.param
+    synthesis.set_synthesis_backend(original)
+
+
+def test_mix_buffer_accumulates_in_place_and_clips(backend: str) -> None:
+    mix = MixBuffer(6)
+
+    assert mix.add(1, (0.5, -0.25, 1.0)) == 3
+    assert mix.add(3, (0.5, 0.5, 0.5, 0.5)) == 3
+    assert mix.add(10, (1.0,)) == 0
+
+    assert list(mix.samples) == [0.0, 0.5, -0.25, 1.5, 0.5, 0.5]
+
+
+def test_scaled_pcm16_matches_reference_conversion(backend: str) -> None:
+    values = (0.0, 0.2, -0.35, 0.7, -0.69, 0.1)
+    for amplitude in (0.3, 1.5):
+        mix = MixBuffer(len(values))
+        mix.add(0, values)
+        scale = (amplitude * 32767.0) / 0.7
+        expected = array(
+            "h", (int(max(-32767, min(32767, value * scale))) for value in values)
+        ).tobytes()
+
+        assert mix.scaled_pcm16(scale) == expected
+
+
+def _list_mix_pcm16(
+    segments: list[tuple[int, list[float]]], sample_count: int, amplitude: float
+) -> bytes:
+    """The ``list[float]`` mix ``render_events`` used before :class:`MixBuffer`."""
+
+    mix = [0.0] * sample_count
+    for start, segment in segments:
+        end = min(sample_count, start + len(segment))
+        existing = mix[start:end]
+        mix[start:end] = [current + addition for current, addition in zip(existing, segment)]
+    peak = max((abs(value) for value in mix), default=0.0)
+    scale = (amplitude * 32767.0) / peak
+    return array("h", (int(max(-32767, min(32767, value * scale))) for value in mix)).tobytes()
+
+
+def _buffer_mix_pcm16(
+    segments: list[tuple[int, list[float]]], sample_count: int, amplitude: float
+) -> bytes:
+    mix = MixBuffer(sample_count)
+    for start, segment in segments:
+        mix.add(start, segment)
+    return mix.scaled_pcm16((amplitude * 32767.0) / mix.peak())
+
+
+@pytest.mark.benchmark
+def test_benchmark_mix_buffer_against_list_mix(backend: str) -> None:
+    sample_rate = 44100
+    sample_count = sample_rate * 30
+    note = [
+        math.sin(2.0 * math.pi * 440.0 * index / sample_rate) * (1.0 - index / 22050)
+        for index in range(22050)
+    ]
+    segments = [(index * 11025 % (sample_count - len(note)), note) for index in range(240)]
+
+    results = {}
+    for label, function in (("list", _list_mix_pcm16), ("buffer", _buffer_mix_pcm16)):
+        start = time.perf_counter()
+        pcm = function(segments, sample_count, 0.8)
+        elapsed = time.perf_counter() - start
+        # Trace a separate run so allocation tracking does not skew the timing.
+        tracemalloc.start()
+        function(segments, sample_count, 0.8)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = (pcm, elapsed, peak)
+
+    print(
+        f"\n30 s mix ({backend}): "
+        + ", ".join(
+            f"{label} {elapsed:.2f} s / {peak / 2**20:.0f} MiB"
+            for label, (_, elapsed, peak) in results.items()
+        )
+    )
+    assert results["buffer"][0] == results["list"][0]
+    assert results["buffer"][1] < results["list"][1]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth.render_cache import (
+    RenderCache,
+    render_cache_key,
+    render_events_cached,
+)
+from shared.tempo import TempoChange
+
+
+def _config(*, metronome: bool = False, sample_rate: int = 8000) -> rendering.RenderConfig:
+    return rendering.RenderConfig(
+        sample_rate=sample_rate,
+        amplitude=0.45,
+        chunk_size=1024,
+        metronome=rendering.MetronomeSettings(metronome, 4, 4),
+    )
+
+
+def test_cache_key_covers_every_render_input() -> None:
+    events = [(0, 480, 60, 79)]
+    tempo = [TempoChange(tick=0, tempo_bpm=120.0)]
+    base = render_cache_key(events, 480, tempo, _config())
+
+    assert render_cache_key(list(events), 480, list(tempo), _config()) == base
+    assert render_cache_key([(0, 480, 61, 79)], 480, tempo, _config()) != base
+    assert render_cache_key(events, 240, tempo, _config()) != base
+    assert render_cache_key(events, 480, [TempoChange(tick=0, tempo_bpm=90.0)], _config()) != base
+    assert render_cache_key(events, 480, tempo, _config(metronome=True)) != base
+    assert render_cache_key(events, 480, tempo, _config(sample_rate=22050)) != base
+
+
+def test_cache_prunes_least_recently_used_files(tmp_path) -> None:
+    cache = RenderCache(tmp_path, max_bytes=25)
+    cache.store("a", bytes(10))
+    cache.store("b", bytes(10))
+    os.utime(tmp_path / "a.pcm", (1, 1))
+    os.utime(tmp_path / "b.pcm", (2, 2))
+    assert cache.load("a") is not None  # refreshes "a"
+
+    cache.store("c", bytes(10))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.pcm", "c.pcm"]
+    assert cache.load("b") is None
+    cache.store("huge", bytes(26))
+    assert cache.load("huge") is None
+    with pytest.raises(ValueError):
+        RenderCache(tmp_path, max_bytes=-1)
+
+
+def test_render_events_cached_memory_maps_hits(tmp_path) -> None:
+    cache = RenderCache(tmp_path)
+    events = [(0, 480, 69, 79), (480, 960, 64, 0)]
+    changes = [TempoChange(tick=480, tempo_bpm=90.0)]
+    expected, expected_map = rendering.render_events(
+        events, 120.0, 480, _config(), tempo_changes=changes
+    )
+
+    miss, _ = render_events_cached(events, 120.0, 480, _config(), tempo_changes=changes, cache=cache)
+    progress: list[float] = []
+    hit, tempo_map = render_events_cached(
+        events, 120.0, 480, _config(), progress.append, tempo_changes=changes, cache=cache
+    )
+
+    assert miss == expected
+    assert not isinstance(hit, bytes) and hit[:] == expected and len(hit) == len(expected)
+    assert progress == [1.0]
+    assert tempo_map.sample_rate == 8000
+    assert tempo_map.tick_to_sample(960, 8000) == expected_map.tick_to_sample(960, 8000)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth.segment_cache import SegmentCache
+
+
+def _segment(count: int) -> array:
+    return array("f", bytes(4 * count))
+
+
+def test_cache_evicts_least_recently_used_within_byte_budget() -> None:
+    cache = SegmentCache(byte_budget=40, shards=1)
+    cache.put("a", _segment(4))
+    cache.put("b", _segment(4))
+    assert cache.get("a") is not None
+
+    cache.put("c", _segment(4))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    info = cache.info()
+    assert (info.currsize, info.nbytes, info.evictions, info.budget) == (2, 32, 1, 40)
+    assert (info.hits, info.misses) == (3, 1)
+
+
+def test_cache_skips_oversized_segments_and_keeps_first_writer() -> None:
+    cache = SegmentCache(byte_budget=64, shards=2)
+    large = _segment(16)
+    assert cache.put("large", large) is large
+    assert cache.get("large") is None
+
+    first, second = _segment(2), _segment(2)
+    assert cache.put("key", first) is first
+    assert cache.put("key", second) is first
+
+
+def test_shrinking_budget_evicts_and_validates() -> None:
+    cache = SegmentCache(byte_budget=1024, shards=4)
+    for index in range(16):
+        cache.put(index, _segment(8))
+
+    cache.set_budget(128)
+
+    info = cache.info()
+    assert info.nbytes <= 128 and info.evictions >= 8
+    with pytest.raises(ValueError):
+        cache.set_budget(-1)
+    with pytest.raises(ValueError):
+        SegmentCache(shards=0)
+
+
+def test_note_segment_returns_cached_float32_buffers() -> None:
+    rendering.clear_note_segment_cache()
+    try:
+        first = rendering.note_segment(79, 69, 480, 120_000, 480, 8000)
+        second = rendering.note_segment(79, 69, 480, 120_000, 480, 8000)
+
+        assert isinstance(first, array) and first.typecode == "f"
+        assert second is first
+        info = rendering.get_note_segment_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+        assert info.nbytes == 4 * len(first)
+    finally:
+        rendering.clear_note_segment_cache()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from ocarina_gui import audio
+from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth.chunks import ChunkSource
+from ocarina_gui.audio.synth.metronome import CLICK_LEVEL
+from ocarina_gui.audio.synth.streaming import ChunkRing, StreamChunk, StreamingPlayback
+
+from .helpers import RecordingStream, StreamingPlayer, wait_until
+
+EVENTS = [(0, 960, 69, 79), (480, 480, 64, 0), (960, 1440, 72, 40), (1920, 240, 60, 79)]
+
+
+def _source(tempo: float = 120.0, *, metronome: bool = False) -> ChunkSource:
+    config = rendering.RenderConfig(
+        sample_rate=8000,
+        amplitude=0.45,
+        chunk_size=1024,
+        metronome=rendering.MetronomeSettings(metronome, 4, 4),
+    )
+    return ChunkSource(EVENTS, tempo, 480, config)
+
+
+@pytest.mark.parametrize("metronome", [False, True])
+def test_chunks_concatenate_to_one_window(metronome: bool) -> None:
+    source = _source(metronome=metronome)
+    whole = source.render(0, source.sample_count)
+
+    chunked = b"".join(
+        source.render(start, start + 1234) for start in range(0, source.sample_count, 1234)
+    )
+
+    assert chunked == whole
+    assert len(whole) == 2 * source.sample_count
+    notes = _source().render(0, source.sample_count)
+    assert max(map(abs, array("h", notes))) <= int(0.45 * 32767)
+    # Clicks sit on top of the notes at a fixed level instead of scaling them.
+    assert max(map(abs, array("h", whole))) <= int(0.45 * 32767 * (1.0 + CLICK_LEVEL))
+    gap = source.sample_at_tick(240)
+    assert whole[2 * gap : 2 * gap + 200] == notes[2 * gap : 2 * gap + 200]
+    # Streaming and full renders share one normalisation and click level.
+    full, _ = rendering.render_events(EVENTS, 120.0, 480, source.config)
+    assert whole == full
+
+
+@pytest.mark.parametrize(
+    "chord",
+    [(60, 64, 67), (48, 55, 60, 64, 67, 72)],
+    ids=["triad", "six-note"],
+)
+@pytest.mark.parametrize("program", [0, 48])
+def test_chord_previews_reach_full_scale(chord: tuple[int, ...], program: int) -> None:
+    events = [(bar * 1920, 1920, midi, program) for bar in range(3) for midi in chord]
+    config = _source().config
+    target = 0.45 * 32767
+
+    full, _ = rendering.render_events(events, 120.0, 480, config)
+    source = ChunkSource(events, 120.0, 480, config)
+    streamed = b"".join(
+        source.render(start, start + 1024) for start in range(0, source.sample_count, 1024)
+    )
+
+    assert streamed == full
+    assert 0.98 * target <= max(map(abs, array("h", full))) <= target
+
+
+def test_chunk_ring_wraps_and_clears() -> None:
+    source = _source()
+    ring = ChunkRing(2)
+    chunks = [StreamChunk(0, source, index, index + 1, bytes([index])) for index in range(3)]
+
+    assert ring.put(chunks[0]) and ring.put(chunks[1])
+    assert not ring.put(chunks[2])
+    assert ring.get(0) is chunks[0]
+    assert ring.put(chunks[2])
+    assert [ring.get(0), ring.get(0)] == [chunks[1], chunks[2]]
+    assert ring.get(0) is None
+
+    ring.put(chunks[0])
+    assert ring.clear() == 1 and len(ring) == 0
+    ring.close()
+    assert ring.get(None) is None
+
+
+def _run(tasks: list) -> None:  # type: ignore[type-arg]
+    while tasks:
+        tasks.pop(0)()
+
+
+def test_streaming_playback_writes_chunks_in_order_and_finishes() -> None:
+    source = _source()
+    stream = RecordingStream()
+    tasks: list = []  # type: ignore[type-arg]
+    playback = StreamingPlayback(
+        stream, source, 480, submit=lambda task: tasks.append(task) or True,
+        chunk_samples=1000, capacity=3, volume=lambda pcm: pcm,
+    )
+    playback.start()
+    assert len(tasks) == 3
+    try:
+        while not stream.finished:
+            _run(tasks)
+            wait_until(lambda: tasks or stream.finished)
+    finally:
+        playback.stop()
+
+    start = source.sample_at_tick(480)
+    assert b"".join(stream.writes) == source.render(start, source.sample_count)
+    assert all(len(pcm) == 2000 for pcm in stream.writes[:-1])
+
+
+def test_retarget_keeps_played_audio_and_rerenders_from_playhead() -> None:
+    old_source, new_source = _source(120.0), _source(60.0)
+    stream = RecordingStream()
+    tasks: list = []  # type: ignore[type-arg]
+    playback = StreamingPlayback(
+        stream, old_source, 0, submit=lambda task: tasks.append(task) or True,
+        chunk_samples=1000, capacity=4, volume=lambda pcm: pcm,
+    )
+    ready: list[bool] = []
+    try:
+        playback.start()
+        tasks.pop(0)()
+        tasks.pop(0)()
+        wait_until(lambda: len(stream.writes) == 2)
+        playhead = playback.playhead_tick
+        assert playhead == old_source.tick_at_sample(2000)
+
+        playback.retarget(new_source, lambda: ready.append(True))
+        _run(tasks)
+        wait_until(lambda: len(stream.writes) >= 3)
+    finally:
+        playback.stop()
+
+    assert ready == [True]
+    assert stream.writes[:2] == [old_source.render(0, 1000), old_source.render(1000, 2000)]
+    resume = new_source.sample_at_tick(playhead)
+    assert stream.writes[2] == new_source.render(resume, resume + 1000)
+
+
+def test_renderer_streams_without_full_render_and_retargets_tempo() -> None:
+    player = StreamingPlayer()
+    renderer = audio._SynthRenderer(player)
+    tasks: list = []  # type: ignore[type-arg]
+    renderer._worker.submit = lambda task: tasks.append(task) or True  # type: ignore[method-assign]
+    try:
+        renderer.prepare([(0, 480 * 64, 69, 79)], 480)
+        assert renderer.start(0, 120.0)
+        assert len(player.streams) == 1 and tasks
+        _run(tasks)
+        assert renderer._worker.buffer == b""  # type: ignore[attr-defined]
+
+        renderer.set_tempo(90.0)
+
+        # Chunks after the playhead are re-rendered on the same stream.
+        assert tasks
+        _run(tasks)
+        assert len(player.streams) == 1 and not player.streams[0].stopped
+        assert player.calls == []
+        renderer.pause()
+        assert player.streams[0].stopped
+    finally:
+        renderer.shutdown()
@@ -8,7 +8,7 @@ import time
 import pytest
 
 from ocarina_gui import audio
-from ocarina_gui.audio.synth import rendering
+from ocarina_gui.audio.synth import render_cache, rendering
 from shared.tempo import TempoChange
 
 from .helpers import (
@@ -129,7 +129,8 @@ def test_synth_renderer_caches_note_segments() -> None:
         await_render(renderer, timeout=5.0)
         first_cache = rendering.get_note_segment_cache_info()
 
-        renderer.prepare(events, 480)
+        # Identical events would be served by the on-disk render cache.
+        renderer.prepare(events + [(1920, 960, 60, 79)], 480)
         await_render(renderer, timeout=5.0)
         second_cache = rendering.get_note_segment_cache_info()
 
@@ -303,3 +304,27 @@ def test_render_worker_shuts_down_on_gc() -> None:
         gc.collect()
 
     assert not _worker_alive()
+
+
+def test_synth_renderer_reuses_disk_render_cache(monkeypatch) -> None:
+    events = [(0, 960, 60, 79), (960, 480, 64, 0)]
+    first_player, second_player = DummyPlayer(), DummyPlayer()
+    first, second = audio._SynthRenderer(first_player), audio._SynthRenderer(second_player)
+    try:
+        first.prepare(events, 480)
+        await_render(first, timeout=5.0)
+        rendered = bytes(first._worker.buffer)  # type: ignore[attr-defined]
+
+        def fail(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+            raise AssertionError("expected a render cache hit")
+
+        monkeypatch.setattr(render_cache, "render_events", fail)
+        second.prepare(events, 480)
+        await_render(second, timeout=5.0)
+
+        assert bytes(second._worker.buffer) == rendered  # type: ignore[attr-defined]
+        assert second.start(0, 120.0)
+        assert second_player.calls[-1][0] == rendered
+    finally:
+        first.shutdown()
+        second.shutdown()
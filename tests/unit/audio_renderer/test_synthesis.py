@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from ocarina_gui.audio.synth import synthesis
+from ocarina_gui.audio.synth.patches import _SynthPatch, _patch_for_program
+
+
+def _reference_samples(
+    patch: _SynthPatch, frequency: float, length: int, sample_rate: int, pitch_gain: float
+) -> list[float]:
+    """Original per-sample synthesis loop kept as the parity reference."""
+
+    base_step = 2.0 * math.pi * frequency / sample_rate
+    vibrato_step = 2.0 * math.pi * patch.vibrato_hz / sample_rate if patch.vibrato_hz else 0.0
+    attack = max(1, min(length, int(length * patch.attack_ratio)))
+    release = max(1, min(length, int(length * patch.release_ratio)))
+    release_start = max(0, length - release)
+    segment = [0.0] * length
+    base_phase = 0.0
+    vibrato_phase = 0.0
+    for index in range(length):
+        if index < attack:
+            envelope = index * (1.0 / attack)
+        elif index >= release_start:
+            envelope = (length - index) * (1.0 / release)
+        else:
+            envelope = 1.0
+        vibrato_scale = 1.0
+        if patch.vibrato_depth and vibrato_step:
+            vibrato_scale += patch.vibrato_depth * math.sin(vibrato_phase)
+            vibrato_phase += vibrato_step
+        sample_value = 0.0
+        for multiple, amplitude in patch.harmonics:
+            sample_value += math.sin(base_phase * multiple) * amplitude
+        segment[index] = sample_value * envelope * patch.gain * pitch_gain
+        base_phase += base_step * (vibrato_scale if vibrato_scale > 0.0 else 0.0)
+    return segment
+
+
+@pytest.fixture
+def restore_backend():
+    original = synthesis.synthesis_backend()
+    yield
+    synthesis.set_synthesis_backend(original)
+
+
+@pytest.mark.parametrize("backend", synthesis.SYNTHESIS_BACKENDS)
+@pytest.mark.parametrize("program", [0, 20, 40, 70, 79, 90, 120])
+@pytest.mark.parametrize("length", [1, 7, synthesis.BLOCK_SIZE + 13, 20_000])
+def test_backends_match_reference_loop(
+    backend: str, program: int, length: int, restore_backend
+) -> None:
+    synthesis.set_synthesis_backend(backend)
+    patch = _patch_for_program(program)
+
+    expected = _reference_samples(patch, 523.25, length, 22050, 1.2)
+    result = list(synthesis.synthesize_note(patch, 523.25, length, 22050, 1.2))
+
+    assert len(result) == length
+    assert result == pytest.approx(expected, rel=0.0, abs=1e-9)
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        synthesis.set_synthesis_backend("gpu")
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 import os
+import threading
 from pathlib import Path
 
 import pytest
@@ -54,24 +55,22 @@ def test_logging_configuration_is_idempotent(tmp_path, monkeypatch):
         if getattr(handler, logging_config._HANDLER_TAG, False)  # type: ignore[attr-defined]
     ]
 
-    # Only the file handler should be installed during tests (stderr is not a tty).
+    # Only the queue handler should be installed during tests, and the listener
+    # only feeds the file handler (stderr is not a tty).
     assert len(managed_handlers) == 1
-    assert isinstance(managed_handlers[0], RotatingFileHandler)
-    assert Path(managed_handlers[0].baseFilename) == first_path
+    assert isinstance(managed_handlers[0], QueueHandler)
+    listener = logging_config._LISTENER
+    assert listener is not None and len(listener.handlers) == 1
+    assert listener.handlers[0] is logging_config._FILE_HANDLER
+    assert Path(listener.handlers[0].baseFilename) == first_path
 
 
 def test_logging_uses_rotating_file_handler(tmp_path, monkeypatch):
     monkeypatch.setenv("OCARINA_LOG_DIR", str(tmp_path))
 
     logging_config.ensure_app_logging()
-    managed_handlers = [
-        handler
-        for handler in logging.getLogger().handlers
-        if getattr(handler, logging_config._HANDLER_TAG, False)  # type: ignore[attr-defined]
-    ]
+    handler = logging_config._FILE_HANDLER
 
-    assert len(managed_handlers) == 1
-    handler = managed_handlers[0]
     assert isinstance(handler, RotatingFileHandler)
     assert handler.maxBytes == logging_config._MAX_LOG_BYTES
     assert handler.backupCount == logging_config._LOG_BACKUP_COUNT
@@ -133,3 +132,42 @@ def test_logging_masks_user_identifiers(tmp_path, monkeypatch):
     home_path = str(Path.home())
     assert home_path not in contents
     assert logging_config.USER_HOME_PLACEHOLDER in contents
+
+
+def test_root_level_follows_verbosity(tmp_path, monkeypatch):
+    monkeypatch.setenv("OCARINA_LOG_DIR", str(tmp_path))
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+
+    logging_config.ensure_app_logging()
+    assert not logging.getLogger("tests.logging").isEnabledFor(logging.DEBUG)
+    assert logging.getLogger("tests.logging").isEnabledFor(logging.INFO)
+
+    logging_config.set_file_log_verbosity(logging_config.LogVerbosity.VERBOSE)
+    assert logging.getLogger("tests.logging").isEnabledFor(logging.DEBUG)
+
+    logging_config.set_file_log_verbosity(logging_config.LogVerbosity.DISABLED)
+    assert not logging.getLogger("tests.logging").isEnabledFor(logging.CRITICAL)
+
+    logging_config._reset_for_tests()
+    assert root.level == logging.WARNING
+
+
+def test_records_are_written_by_listener_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("OCARINA_LOG_DIR", str(tmp_path))
+    logging_config.ensure_app_logging()
+    handler = logging_config._FILE_HANDLER
+    assert handler is not None
+    threads: list[str] = []
+    original_emit = handler.emit
+
+    def recording_emit(record: logging.LogRecord) -> None:
+        threads.append(threading.current_thread().name)
+        original_emit(record)
+
+    monkeypatch.setattr(handler, "emit", recording_emit)
+    logging.getLogger("tests.logging").warning("queued message")
+    _flush_managed_handlers()
+
+    assert threads and threading.current_thread().name not in threads
+    assert "queued message" in logging_config._LOG_PATH.read_text(encoding="utf-8")
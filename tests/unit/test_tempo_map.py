@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from shared.tempo import TempoChange, TempoMap
+
+
+def _rubato_map() -> TempoMap:
+    rng = random.Random(7)
+    changes = [TempoChange(tick * 37, rng.uniform(40.0, 180.0)) for tick in range(400)]
+    return TempoMap(480, changes)
+
+
+def test_seconds_to_tick_inverts_seconds_at_across_many_changes() -> None:
+    tempo_map = _rubato_map()
+
+    for tick in range(0, 400 * 37 + 500, 13):
+        assert tempo_map.seconds_to_tick(tempo_map.seconds_at(tick)) == tick
+
+    assert tempo_map.seconds_to_tick(-1.0) == 0
+
+
+@pytest.mark.parametrize("ticks", [range(0, 16000, 11), [9000, 0, 74, 73, 15000, -5, 38]])
+def test_bulk_conversions_match_single_tick_lookups(ticks) -> None:  # type: ignore[no-untyped-def]
+    tempo_map = _rubato_map()
+
+    assert tempo_map.ticks_to_seconds(ticks) == [tempo_map.seconds_at(tick) for tick in ticks]
+    assert tempo_map.ticks_to_samples(ticks, 22050) == [
+        tempo_map.tick_to_sample(tick, 22050) for tick in ticks
+    ]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from ocarina_gui.piano_roll.geometry import RenderGeometry
+from ocarina_gui.piano_roll.wrapped import render_wrapped_view
+from ocarina_gui.themes import get_current_theme
+from ocarina_gui.wrapped_lines import WrappedLineVirtualizer
+
+
+class _RecordingCanvas:
+    """Canvas stand-in that tracks item coordinates by tag."""
+
+    def __init__(self) -> None:
+        self.items: dict[int, tuple[list[float], tuple[str, ...]]] = {}
+        self.created = 0
+        self.moves: list[tuple[str, float]] = []
+        self._next_id = 1
+
+    def _create(self, *coords: float, tags=(), **_kwargs) -> int:
+        item = self._next_id
+        self._next_id += 1
+        self.created += 1
+        self.items[item] = (list(coords), tuple(tags))
+        return item
+
+    create_rectangle = create_line = create_text = create_oval = _create
+
+    def find_withtag(self, tag: str) -> tuple[int, ...]:
+        if tag == "all":
+            return tuple(self.items)
+        return tuple(item for item, (_coords, tags) in self.items.items() if tag in tags)
+
+    def delete(self, tag: str) -> None:
+        for item in self.find_withtag(tag):
+            del self.items[item]
+
+    def move(self, tag: str, dx: float, dy: float) -> None:
+        self.moves.append((tag, dy))
+        for item in self.find_withtag(tag):
+            coords = self.items[item][0]
+            for index in range(len(coords)):
+                coords[index] += dx if index % 2 == 0 else dy
+
+    def config(self, **_kwargs) -> None:
+        return None
+
+    def itemconfigure(self, *_args, **_kwargs) -> None:
+        return None
+
+    def tag_raise(self, *_args) -> None:
+        return None
+
+
+def _virtualizer(canvas: _RecordingCanvas, count: int) -> tuple[WrappedLineVirtualizer, list[int]]:
+    drawn: list[int] = []
+
+    def draw_frame(frame_tag: str, y_top: float) -> None:
+        canvas.create_rectangle(0, y_top, 100, y_top + 90, tags=(frame_tag,))
+
+    def draw_content(index: int, tag: str) -> None:
+        drawn.append(index)
+        y_top = index * 100.0
+        canvas.create_line(10, y_top, 10, y_top + 90, tags=(tag,))
+
+    bounds = [(index * 100.0, index * 100.0 + 90.0) for index in range(count)]
+    return WrappedLineVirtualizer([canvas], bounds, draw_frame=draw_frame, draw_content=draw_content), drawn
+
+
+def test_virtualizer_draws_only_lines_near_viewport() -> None:
+    canvas = _RecordingCanvas()
+    lines, drawn = _virtualizer(canvas, 200)
+
+    assert lines.update(0.0, 250)
+
+    # One viewport of margin on each side of [0, 250].
+    assert lines.drawn_lines == (0, 1, 2, 3, 4, 5)
+    assert drawn == [0, 1, 2, 3, 4, 5]
+    assert not lines.update(10.0, 250)
+    assert len(canvas.items) == 12
+
+
+def test_virtualizer_recycles_frames_on_scroll() -> None:
+    canvas = _RecordingCanvas()
+    lines, drawn = _virtualizer(canvas, 200)
+    lines.update(0.0, 250)
+    created = canvas.created
+
+    lines.update(10_000.0, 250)
+
+    assert lines.drawn_lines == tuple(range(97, 106))
+    assert canvas.created - created == 9 + 3  # content plus frames beyond the pool of six
+    frames = [coords[1] for coords, tags in canvas.items.values() if tags[0].startswith("wrapped_line_frame_")]
+    assert sorted(frames) == [index * 100.0 for index in range(97, 106)]
+    assert not canvas.find_withtag("wrapped_line_0")
+    assert drawn[-9:] == list(range(97, 106))
+
+    lines.update(0.0, 250)
+
+    assert lines.drawn_lines == (0, 1, 2, 3, 4, 5)
+    assert len(canvas.items) == 12
+
+
+def test_render_wrapped_view_draws_visible_lines_and_scrolls() -> None:
+    canvas, labels = _RecordingCanvas(), _RecordingCanvas()
+    geometry = RenderGeometry(
+        min_midi=60, max_midi=71, px_per_note=10, px_per_tick=1.0, left_pad=10, right_pad=10, label_width=40
+    )
+
+    class _Renderer:
+        def _draw_note_rect(self, tag, onset, duration, midi, geometry, palette) -> None:  # type: ignore[no-untyped-def]
+            canvas.create_rectangle(onset, geometry.note_y(midi), onset + duration, 0, tags=(tag, "note_rect"))
+
+    events = tuple((index * 480, 240, 60 + index % 12, 0) for index in range(400))
+    result = render_wrapped_view(
+        events=events,
+        geometry=geometry,
+        palette=get_current_theme().palette.piano_roll,
+        canvas=canvas,  # type: ignore[arg-type]
+        labels=labels,  # type: ignore[arg-type]
+        renderer=_Renderer(),  # type: ignore[arg-type]
+        px_per_tick=1.0,
+        left_pad=10,
+        right_pad=10,
+        viewport_width=620,
+        ticks_per_measure=1920,
+        viewport_height=300,
+    )
+
+    layout = result.layout
+    assert len(layout.lines) > 200
+    drawn = result.virtual_lines.drawn_lines
+    assert drawn and drawn[0] == 0 and len(drawn) < 10
+    assert all(canvas.find_withtag(f"wrapped_line_{index}") for index in drawn)
+
+    last = layout.lines[-1]
+    result.virtual_lines.update(last.y_top, 300)
+
+    tag = f"wrapped_line_{len(layout.lines) - 1}"
+    measure_lines = [
+        coords for coords, tags in canvas.items.values() if tag in tags and "measure_line" in tags
+    ]
+    assert measure_lines
+    assert all(abs(coords[1] - last.y_top) <= 1.5 for coords in measure_lines)
+    assert not canvas.find_withtag("wrapped_line_0")
+    label_tops = sorted(round(coords[1]) for coords, tags in labels.items.values() if tags)
+    assert label_tops[0] >= layout.lines[drawn[-1] + 1].y_top
@@ -144,3 +144,20 @@ def test_wrapped_renderer_tracks_available_space_between_events() -> None:
 
     assert painter.available_spaces[0] is not None
     assert painter.available_spaces[0] == -4
+
+
+def test_wrapped_renderer_draws_only_lines_near_viewport() -> None:
+    events = tuple(NoteEvent(onset, 240, 60 + onset % 7, 0) for onset in range(0, 200_000, 480))
+    view = _DummyView(events)
+    view._total_ticks = 200_000
+    painter = _DummyNotePainter()
+
+    renderer = WrappedRenderer(view, painter)
+    renderer.render(events, pulses_per_quarter=480, beats=4, beat_type=4)
+
+    lines = view._wrap_layout["lines"]
+    assert len(lines) > 200
+    drawn = renderer._lines.drawn_lines
+    assert drawn[0] == 0 and len(drawn) <= 3
+    # Only notes from the drawn lines reach the painter.
+    assert len(painter.available_spaces) < len(events) // 50
@@ -23,6 +23,7 @@ class StubAudioRenderer:
         self.prepare_calls = 0
         self.auto_render = True
         self.volume_requires_render = False
+        self.loops_itself = False
         self.tempo_changes: tuple = ()
 
     def prepare(self, events, pulses_per_quarter: int, tempo_changes=None) -> None:  # type: ignore[override]
@@ -50,8 +51,12 @@ class StubAudioRenderer:
         self.tempo_updates.append(tempo_bpm)
         self._notify_render()
 
-    def set_loop(self, loop: LoopRegion) -> None:
+    def set_loop(self, loop: LoopRegion) -> bool:
         self.loop_updates.append(loop)
+        return self.loops_itself and loop.enabled
+
+    def repeats_loop(self) -> bool:
+        return bool(self.loops_itself and self.loop_updates and self.loop_updates[-1].enabled)
 
     def set_metronome(self, enabled: bool, beats_per_measure: int, beat_unit: int) -> None:
         self.metronome_updates.append((enabled, beats_per_measure, beat_unit))
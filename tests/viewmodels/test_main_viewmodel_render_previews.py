@@ -130,3 +130,36 @@ def test_render_previews_passes_filtered_part_selection(
     assert service.last_preview_settings.selected_part_ids == ("P2",)
 
 
+
+
+def test_render_previews_newer_request_supersedes_pending_one(
+    preview_data: PreviewData, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from shared.cancellation import OperationCancelled
+
+    file_path = tmp_path / "score.musicxml"
+    file_path.write_text("<score />", encoding="utf-8")
+    service = StubScoreService(preview=preview_data)
+    viewmodel = MainViewModel(dialogs=FakeDialogs(), score_service=service)
+    viewmodel.update_settings(input_path=str(file_path))
+    tokens = []
+    newer_results = []
+
+    def _fake_apply(_viewmodel, _preview, *, progress_callback=None, cancellation=None):
+        tokens.append(cancellation)
+        if len(tokens) == 1:
+            # A second request arrives while the first is still arranging.
+            newer_results.append(viewmodel.render_previews())
+        cancellation.raise_if_cancelled()
+        return None
+
+    monkeypatch.setattr(
+        "viewmodels.main_viewmodel.apply_arranger_results_from_preview", _fake_apply
+    )
+
+    with pytest.raises(OperationCancelled):
+        viewmodel.render_previews()
+
+    assert [token.cancelled for token in tokens] == [True, False]
+    assert newer_results[0].is_ok()
+    assert viewmodel._preview_cancellation is None
@@ -311,6 +311,20 @@ def test_set_metronome_persists_and_resets_on_reload() -> None:
     assert renderer.metronome_updates[-1] == (False, 5, 4)
 
 
+def test_set_metronome_settles_when_renderer_completes_immediately() -> None:
+    viewmodel, renderer = _build_viewmodel()
+    viewmodel.load(_make_events((0, 480, 60)), pulses_per_quarter=120, beats_per_measure=4, beat_unit=4)
+    assert viewmodel.toggle_playback()
+
+    # The stub reports a whole render from inside set_metronome.
+    viewmodel.set_metronome(True)
+
+    assert not viewmodel.state.is_rendering
+    assert viewmodel.state.render_progress == 1.0
+    viewmodel.advance(0.5)
+    assert viewmodel.state.position_tick > 0
+
+
 def test_render_listener_updates_state_flags() -> None:
     viewmodel, renderer = _build_viewmodel()
 
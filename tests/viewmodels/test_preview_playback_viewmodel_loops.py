@@ -75,3 +75,41 @@ def test_load_resets_audio_loop_region() -> None:
     assert not reset_region.enabled
     assert reset_region.start_tick == 0
     assert reset_region.end_tick == viewmodel.state.track_end_tick
+
+
+def test_loop_wrap_skips_seek_when_renderer_loops_itself() -> None:
+    viewmodel, renderer = _build_viewmodel()
+    events = _make_events((0, 480, 60))
+    viewmodel.load(events, pulses_per_quarter=120, beats_per_measure=4, beat_unit=4)
+    viewmodel.set_loop(LoopRegion(enabled=True, start_tick=120, end_tick=240))
+    viewmodel.seek_to(220)
+    viewmodel.toggle_playback()
+
+    renderer.sought.clear()
+    viewmodel.advance(0.5)
+    assert renderer.sought == [220]
+
+    renderer.loops_itself = True
+    viewmodel.set_loop(LoopRegion(enabled=True, start_tick=120, end_tick=240))
+    renderer.sought.clear()
+    viewmodel.advance(0.5)
+
+    assert 120 <= viewmodel.state.position_tick < 240
+    assert renderer.sought == []
+
+
+def test_loop_wrap_seeks_when_renderer_falls_back_on_start() -> None:
+    viewmodel, renderer = _build_viewmodel()
+    events = _make_events((0, 480, 60))
+    viewmodel.load(events, pulses_per_quarter=120, beats_per_measure=4, beat_unit=4)
+    renderer.loops_itself = True
+    viewmodel.set_loop(LoopRegion(enabled=True, start_tick=120, end_tick=240))
+    viewmodel.seek_to(220)
+
+    # The stream failed to open, so playback starts from a rendered buffer.
+    renderer.loops_itself = False
+    viewmodel.toggle_playback()
+    renderer.sought.clear()
+    viewmodel.advance(0.5)
+
+    assert renderer.sought == [220]
@@ -9,10 +9,13 @@ from tkinter import messagebox
 from typing import Any
 
 from ocarina_gui.preview import PreviewData
+from shared.cancellation import OperationCancelled
 from shared.result import Result
 
 logger = logging.getLogger(__name__)
 
+PREVIEW_SUPERSEDED_MESSAGE = "Preview superseded by a newer request."
+
 
 class PreviewRenderHandle:
     """Track asynchronous preview rendering dispatched to a worker thread."""
@@ -22,6 +25,7 @@ class PreviewRenderHandle:
         self._done = threading.Event()
         self.result: Result[PreviewData, str] | None = None
         self.error: BaseException | None = None
+        self.superseded = False
         self._thread: threading.Thread | None = None
 
     @property
@@ -155,6 +159,10 @@ def render_previews_for_ui(ui: Any) -> PreviewRenderHandle:
                 if kind == "err":
                     raise payload
                 result = payload
+        except OperationCancelled:
+            logger.info("Preview rendering superseded by a newer request")
+            events.put(("superseded",))
+            return
         except Exception as exc:  # pragma: no cover - propagated via UI thread
             logger.exception("Preview rendering failed")
             events.put(("exception", exc))
@@ -168,6 +176,8 @@ def render_previews_for_ui(ui: Any) -> PreviewRenderHandle:
     else:
         try:
             result = _invoke_render()
+        except OperationCancelled:
+            events.put(("superseded",))
         except Exception as exc:  # pragma: no cover - propagated via handle
             events.put(("exception", exc))
         else:
@@ -207,6 +217,14 @@ def render_previews_for_ui(ui: Any) -> PreviewRenderHandle:
         ui._set_transpose_controls_enabled(True)
         handle._finalise(result=result, error=error)
 
+    def _handle_superseded() -> None:
+        # The newer render owns the loading overlays and transpose controls.
+        handles = getattr(ui, "_preview_render_handles", None)
+        if isinstance(handles, set):
+            handles.discard(handle)
+        handle.superseded = True
+        handle._finalise(result=Result.err(PREVIEW_SUPERSEDED_MESSAGE))
+
     def _handle_result(result: Result[PreviewData, str]) -> None:
         handle.result = result
         if result.is_err():
@@ -349,6 +367,8 @@ def render_previews_for_ui(ui: Any) -> PreviewRenderHandle:
             elif kind == "result":
                 _, result = event
                 _handle_result(result)
+            elif kind == "superseded":
+                _handle_superseded()
             elif kind == "exception":
                 _, exc = event
                 for side in sides:
@@ -38,7 +38,7 @@ class PreviewTransposeMixin:
             finally:
                 self._suspend_transpose_update = False
             raise
-        if result.is_err():
+        if result.is_err() and not getattr(outcome, "superseded", False):
             self._transpose_applied_offset = previous
             self._viewmodel.update_settings(transpose_offset=previous)
             self._suspend_transpose_update = True
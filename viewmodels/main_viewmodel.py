@@ -17,6 +17,7 @@ from services.project_service import (
     PreviewPlaybackSnapshot,
 )
 from services.score_service import ScoreService
+from shared.cancellation import CancellationToken
 from shared.result import Result
 
 from domain.arrangement.api import ArrangementStrategyResult
@@ -73,6 +74,7 @@ class MainViewModel(
         self._pending_input_confirmation = False
         self._last_successful_input_snapshot: PreviewStateSnapshot | None = None
         self._state_lock = RLock()
+        self._preview_cancellation: CancellationToken | None = None
         logger.info("MainViewModel initialised")
 
     # ------------------------------------------------------------------
@@ -108,6 +110,31 @@ class MainViewModel(
     def render_previews(
         self,
         progress_callback: Callable[[float, str | None], None] | None = None,
+    ) -> Result[PreviewData, str]:
+        """Build the preview and run the arranger for the current settings.
+
+        Starting a render cancels any render still in flight; the superseded
+        call raises :class:`~shared.cancellation.OperationCancelled` without
+        touching state, so only the newest request updates the view-model.
+        """
+
+        cancellation = CancellationToken()
+        with self._state_lock:
+            superseded = self._preview_cancellation
+            self._preview_cancellation = cancellation
+        if superseded is not None:
+            superseded.cancel()
+        try:
+            return self._render_previews(cancellation, progress_callback)
+        finally:
+            with self._state_lock:
+                if self._preview_cancellation is cancellation:
+                    self._preview_cancellation = None
+
+    def _render_previews(
+        self,
+        cancellation: CancellationToken,
+        progress_callback: Callable[[float, str | None], None] | None,
     ) -> Result[PreviewData, str]:
         with self._state_lock:
             require_result = self._require_existing_input("Choose a file first.")
@@ -139,6 +166,7 @@ class MainViewModel(
             self.update_midi_import_error(error_message)
             logger.exception("Failed to build preview", extra={"path": path})
             return Result.err(error_message)
+        cancellation.raise_if_cancelled()
         with self._state_lock:
             self.state.status_message = "Preview rendered."
         computation: ArrangerComputation | None = None
@@ -147,6 +175,7 @@ class MainViewModel(
                 self,
                 preview,
                 progress_callback=progress_callback,
+                cancellation=cancellation,
             )
         except Exception:
             logger.exception("Failed to apply arranger results from preview")
@@ -154,6 +183,7 @@ class MainViewModel(
             self.update_arranger_results(summary=None, explanations=(), telemetry=())
         updated_preview = preview_with_arranger_events(preview, computation)
         with self._state_lock:
+            cancellation.raise_if_cancelled()
             self.state.status_message = "Preview rendered."
             self._pending_input_confirmation = False
             self._last_successful_input_snapshot = capture_preview_state(
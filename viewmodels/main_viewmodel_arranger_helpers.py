@@ -10,6 +10,7 @@ from ocarina_gui.preview import PreviewData
 from ocarina_gui.settings import GraceTransformSettings, SubholeTransformSettings
 
 from services.arranger_preview import ArrangerComputation, compute_arranger_preview
+from shared.cancellation import CancellationToken, raise_if_cancelled
 
 
 __all__ = [
@@ -23,6 +24,7 @@ def apply_arranger_results_from_preview(
     preview: PreviewData,
     *,
     progress_callback: Callable[[float, str | None], None] | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> ArrangerComputation:
     with viewmodel._state_lock:
         arranger_mode = viewmodel.state.arranger_mode
@@ -56,7 +58,10 @@ def apply_arranger_results_from_preview(
         progress_callback=progress_callback,
         grace_settings=grace_settings.to_domain(),
         subhole_settings=subhole_settings.to_domain(),
+        cancellation=cancellation,
     )
+    # A superseded run must not overwrite state owned by the newer request.
+    raise_if_cancelled(cancellation)
 
     winner_id = next(
         (summary.instrument_id for summary in computation.summaries if summary.is_winner),
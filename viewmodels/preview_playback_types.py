@@ -68,7 +68,12 @@ class AudioRenderer(Protocol):
     def set_tempo(self, tempo_bpm: float) -> None:
         ...
 
-    def set_loop(self, loop: LoopRegion) -> None:
+    def set_loop(self, loop: LoopRegion) -> bool:
+        """Return ``True`` when the renderer repeats *loop* without wrap seeks."""
+        ...
+
+    def repeats_loop(self) -> bool:
+        """Return ``True`` while live playback repeats the loop without wrap seeks."""
         ...
 
     def set_metronome(
@@ -122,8 +127,11 @@ class NullAudioRenderer:
     def set_tempo(self, tempo_bpm: float) -> None:
         return None
 
-    def set_loop(self, loop: LoopRegion) -> None:
-        return None
+    def set_loop(self, loop: LoopRegion) -> bool:
+        return False
+
+    def repeats_loop(self) -> bool:
+        return False
 
     def set_metronome(
         self, enabled: bool, beats_per_measure: int, beat_unit: int
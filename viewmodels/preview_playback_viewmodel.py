@@ -42,6 +42,7 @@ class PreviewPlaybackViewModel:
         self._prepared_signature: bytes | None = None
         self._render_observer: Callable[[], None] | None = None
         self._pending_playback_resume = False
+        self._audio_loops = False
         self._render_tracker = PreviewRenderTracker(self.state, self._state_lock)
         self._audio.set_render_listener(self._RenderListener(self))
         self._audio.set_volume(self.state.volume)
@@ -127,11 +128,9 @@ class PreviewPlaybackViewModel:
         self.state.tempo_bpm = self._normalize_tempo(desired_tempo)
 
         # Ensure the audio renderer discards any previously configured loop.
-        self._audio.set_loop(
-            LoopRegion(
-                enabled=False,
-                start_tick=0,
-                end_tick=self.state.track_end_tick,
+        self._audio_loops = bool(
+            self._audio.set_loop(
+                LoopRegion(enabled=False, start_tick=0, end_tick=self.state.track_end_tick)
             )
         )
 
@@ -206,6 +205,8 @@ class PreviewPlaybackViewModel:
 
         started = self._audio.start(self.state.position_tick, self.state.tempo_bpm)
         self.state.is_playing = started
+        # The backend may stream or fall back to a rendered buffer on start.
+        self._audio_loops = started and bool(self._audio.repeats_loop())
         if started:
             self.state.last_error = None
             if self.state.is_rendering:
@@ -272,6 +273,7 @@ class PreviewPlaybackViewModel:
         self.state.position_tick = target
         self._fractional_ticks = 0.0
         self._audio.seek(target)
+        self._audio_loops = bool(self._audio.repeats_loop())
         logger.debug("seek_to: moved cursor to tick=%d", target)
 
     def set_tempo(self, tempo_bpm: float) -> None:
@@ -322,16 +324,17 @@ class PreviewPlaybackViewModel:
             return
 
         self.state.metronome_enabled = desired
+        # Mark the render pending first: renderers that only remix the click
+        # stem report the render complete before set_metronome returns.
+        if self._render_tracker.mark_pending(len(self._events)):
+            self._notify_render_observer()
+        if self.state.is_playing:
+            self._pending_playback_resume = True
         self._audio.set_metronome(
             self.state.metronome_enabled,
             self.state.beats_per_measure,
             self.state.beat_unit,
         )
-        # ensure applied state reflects actual renderer configuration
-        if self._render_tracker.mark_pending(len(self._events)):
-            self._notify_render_observer()
-        if self.state.is_playing:
-            self._pending_playback_resume = True
 
     def set_loop(self, loop: LoopRegion) -> None:
         if not self.state.is_loaded:
@@ -369,7 +372,7 @@ class PreviewPlaybackViewModel:
             )
 
         self.state.loop = requested_loop
-        self._audio.set_loop(playback_loop)
+        self._audio_loops = bool(self._audio.set_loop(playback_loop))
         self.seek_to(self.state.position_tick)
         logger.debug(
             "set_loop: enabled=%s start=%d end=%d",
@@ -421,7 +424,7 @@ class PreviewPlaybackViewModel:
             self.state.beats_per_measure,
             self.state.beat_unit,
         )
-        self._audio.set_loop(loop)
+        self._audio_loops = bool(self._audio.set_loop(loop))
         self._audio.set_volume(self.state.volume)
 
     def stop(self) -> None:
@@ -497,8 +500,10 @@ class PreviewPlaybackViewModel:
                 wrapped = True
             target = min(target, loop_end)
             self.state.position_tick = target
-            if wrapped or target < start:
+            # A renderer that loops by itself already continued at the seam.
+            if (wrapped or target < start) and not self._audio_loops:
                 self._audio.seek(target)
+                self._audio_loops = bool(self._audio.repeats_loop())
             return
 
         if target >= self.state.duration_tick: